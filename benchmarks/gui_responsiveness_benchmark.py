@@ -0,0 +1,107 @@
+"""
+Responsividade da interface gráfica com uma fila de 10 mil jobs.
+
+Abre PrinterMonitorApp contra o spooler simulado (com a fila andando),
+seleciona a impressora com `--jobs` jobs e, enquanto as atualizações
+chegam, rola a tabela e troca a ordenação a cada 30 ms. Mede o maior
+atraso da thread da interface em relação ao quadro esperado. Falha
+(código 1) se a fila não carregar, se algum quadro atrasar mais de
+`--max-gap-ms` ou se a tabela de jobs criar itens de Canvas além das
+linhas visíveis.
+
+Precisa de um display; no Linux, use um X virtual:
+    xvfb-run -a python -m benchmarks.gui_responsiveness_benchmark
+    xvfb-run -a python -m benchmarks.gui_responsiveness_benchmark --jobs 50000 --seconds 15
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+os.environ.setdefault('LOGGING_FILE', 'none')
+os.environ.setdefault('LOGGING_LEVEL', 'WARNING')
+
+from utils.spooler_simulator import install  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de responsividade da interface gráfica")
+    parser.add_argument('--printers', type=int, default=20, help="Impressoras simuladas")
+    parser.add_argument('--jobs', type=int, default=10000, help="Jobs na fila selecionada")
+    parser.add_argument('--seconds', type=float, default=8.0, help="Duração da interação")
+    parser.add_argument('--fps', type=float, default=20.0, help="Quadros por segundo da interface")
+    parser.add_argument('--max-gap-ms', type=float, default=100.0, help="Atraso máximo aceito de um quadro (ms)")
+    args = parser.parse_args()
+
+    spooler = install(latency=0.002, seed=7)
+    for index in range(args.printers):
+        spooler.add_printer(f"P{index:03d}")
+        spooler.add_jobs(f"P{index:03d}", 20)
+    target = "P000"
+    spooler.add_jobs(target, args.jobs - 20)
+    stop = threading.Event()
+
+    def tick():
+        while not stop.wait(0.2):
+            spooler.tick(pages=2)
+
+    threading.Thread(target=tick, daemon=True).start()
+
+    import tkinter as tk
+    from gui.main_gui import PrinterMonitorApp
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Sem display ({e}); rode com: xvfb-run -a python -m benchmarks.gui_responsiveness_benchmark")
+        return 1
+    root.geometry("1120x720")
+    app = PrinterMonitorApp(root, fps=args.fps, status_interval=1.0, job_interval=0.5)
+    rng = random.Random(1)
+    result = {'loaded_after': None, 'items': 0, 'rows': 0}
+    started = time.monotonic()
+
+    def drive() -> None:
+        if app.job_printer != target and target in app.printers.model.rows:
+            app.printers.select(target)
+        elif result['loaded_after'] is None and len(app.jobs.model) >= args.jobs * 0.9:
+            result['loaded_after'] = time.monotonic() - started
+        elif result['loaded_after'] is not None:
+            if rng.random() < 0.1:
+                app.jobs.sort_by(rng.randrange(len(app.jobs.model.columns)))
+            app.jobs.yview('moveto', rng.random())
+        root.after(30, drive)
+
+    def finish() -> None:
+        result['items'] = len(app.jobs.body.find_all())
+        result['rows'] = app.jobs.visible_rows
+        app.close()
+
+    app.start()
+    root.after(30, drive)
+    root.after(int(args.seconds * 1000), finish)
+    root.mainloop()
+    stop.set()
+
+    stats = app.stats
+    columns = len(app.jobs.model.columns)
+    print(f"fila carregada em {result['loaded_after'] or float('nan'):.2f} s | {stats['frames']} quadros | "
+          f"maior atraso {stats['max_frame_gap_ms']:.1f} ms | maior aplicação {stats['max_apply_ms']:.1f} ms | "
+          f"{result['items']} itens no Canvas para {result['rows']} linhas visíveis")
+    failures = []
+    if result['loaded_after'] is None:
+        failures.append("a fila não carregou")
+    if stats['max_frame_gap_ms'] > args.max_gap_ms:
+        failures.append(f"quadro atrasou {stats['max_frame_gap_ms']:.1f} ms (limite {args.max_gap_ms:.0f} ms)")
+    if result['items'] > (result['rows'] + 2) * (columns + 1):
+        failures.append("a tabela criou itens além das linhas visíveis")
+    if failures:
+        print("FALHA: " + "; ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
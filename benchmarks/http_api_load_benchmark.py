@@ -0,0 +1,124 @@
+"""
+Teste de carga da API HTTP local contra o spooler simulado.
+
+Sobe PrinterHttpApi em uma thread e dispara `--clients` clientes asyncio
+(conexões keep-alive com If-None-Match) que, a cada segundo, consultam o
+inventário e o status e os jobs de uma impressora. A fila anda durante o
+teste (SimulatedSpooler.tick). Falha (código 1) se o spooler receber mais
+de uma consulta de status (GetPrinter) ou de fila (EnumJobs) por
+impressora a cada `--ttl` segundos, ou se alguma requisição falhar.
+
+Uso:
+    python -m benchmarks.http_api_load_benchmark
+    python -m benchmarks.http_api_load_benchmark --clients 200 --printers 20 --duration 10
+"""
+import argparse
+import asyncio
+import math
+import os
+import sys
+import time
+from urllib.parse import quote
+
+os.environ.setdefault('LOGGING_FILE', 'none')
+os.environ.setdefault('LOGGING_LEVEL', 'WARNING')
+
+from utils.spooler_simulator import install  # noqa: E402
+
+
+async def request(reader, writer, path: str, etag):
+    headers = f"GET {path} HTTP/1.1\r\nHost: localhost\r\n"
+    if etag:
+        headers += f"If-None-Match: {etag}\r\n"
+    writer.write((headers + "\r\n").encode('latin-1'))
+    head = (await reader.readuntil(b"\r\n\r\n")).decode('latin-1').split("\r\n")
+    fields = {name.lower(): value.strip() for name, _, value in (line.partition(':') for line in head[1:]) if name}
+    await reader.readexactly(int(fields.get('content-length', 0)))
+    return int(head[0].split(' ')[1]), fields.get('etag')
+
+
+async def client(host: str, port: int, paths, duration: float, results: dict) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    deadline = time.monotonic() + duration
+    try:
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            for path in paths:
+                begin = time.perf_counter()
+                status, etag = await request(reader, writer, path, etags.get(path))
+                results['latencies'].append(time.perf_counter() - begin)
+                results[status] = results.get(status, 0) + 1
+                if etag:
+                    etags[path] = etag
+            await asyncio.sleep(max(0.0, 1.0 - (time.monotonic() - started)))
+    finally:
+        writer.close()
+
+
+async def run_clients(host: str, port: int, args, names, spooler) -> dict:
+    results = {'latencies': []}
+
+    async def advance_queues():
+        for _ in range(int(args.duration)):
+            await asyncio.sleep(1.0)
+            spooler.tick()
+
+    tasks = []
+    for index in range(args.clients):
+        name = quote(names[index % len(names)], safe='')
+        paths = ['/printers', f'/printers/{name}/status', f'/printers/{name}/jobs']
+        tasks.append(client(host, port, paths, args.duration, results))
+    await asyncio.gather(advance_queues(), *tasks)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga da API HTTP local")
+    parser.add_argument('--clients', type=int, default=100, help="Clientes simultâneos")
+    parser.add_argument('--printers', type=int, default=10, help="Impressoras simuladas")
+    parser.add_argument('--jobs', type=int, default=50, help="Jobs por impressora")
+    parser.add_argument('--duration', type=float, default=5.0, help="Duração do teste (s)")
+    parser.add_argument('--ttl', type=float, default=1.0, help="Validade dos snapshots (s)")
+    parser.add_argument('--latency', type=float, default=0.005, help="Latência de cada chamada ao spooler (s)")
+    args = parser.parse_args()
+
+    spooler = install(latency=args.latency, seed=42)
+    names = [f"Impressora {index:02d}" for index in range(args.printers)]
+    for name in names:
+        spooler.add_printer(name)
+        spooler.add_jobs(name, args.jobs)
+
+    from services.api import PrinterHttpApi
+
+    api = PrinterHttpApi(port=0, ttl=args.ttl)
+    host, port = api.serve_in_thread()
+    spooler.reset_stats()
+    start = time.perf_counter()
+    try:
+        results = asyncio.run(run_clients(host, port, args, names, spooler))
+    finally:
+        elapsed = time.perf_counter() - start
+        api.shutdown()
+
+    calls = spooler.stats()['calls']
+    latencies = sorted(results.pop('latencies'))
+    total = len(latencies)
+    # Uma consulta por impressora por intervalo, mais a da primeira requisição
+    allowed = args.printers * (math.ceil(elapsed / args.ttl) + 1)
+    print(f"{args.clients} clientes, {args.printers} impressoras, {elapsed:.1f} s: {total} requisições "
+          f"({total / elapsed:.0f}/s) | respostas {dict(sorted(results.items()))}")
+    print(f"latência p50 {latencies[total // 2] * 1000:.1f} ms  p95 {latencies[int(total * 0.95)] * 1000:.1f} ms")
+    print(f"spooler: GetPrinter {calls.get('GetPrinter', 0)}  EnumJobs {calls.get('EnumJobs', 0)}  "
+          f"GetJob {calls.get('GetJob', 0)}  (limite {allowed} por tipo) | snapshots {api.store.get_stats()}")
+
+    failed = any(status not in (200, 304) for status in results)
+    for funcname in ('GetPrinter', 'EnumJobs'):
+        if calls.get(funcname, 0) > allowed:
+            print(f"FALHA: {funcname} chamado {calls[funcname]} vezes (limite {allowed})")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Benchmark do monitoramento de jobs em duas fases contra o spooler simulado.
+
+Compara, por ciclo de monitoramento, o caminho antigo (EnumJobs nível 2 de
+toda a fila) com PrinterJobPoller (EnumJobs nível 1 + GetJob nível 2 só dos
+jobs novos/alterados) em uma fila grande e quase estável. Falha (código 1)
+se a redução de payload ficar abaixo de `--min-reduction`.
+
+Uso:
+    python -m benchmarks.job_polling_benchmark
+    python -m benchmarks.job_polling_benchmark --jobs 5000 --cycles 30 --changes 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('LOGGING_FILE', 'none')
+os.environ.setdefault('LOGGING_LEVEL', 'WARNING')
+
+from utils.spooler_simulator import JOB_STATUS_PRINTING, install  # noqa: E402
+
+PRINTER = "EPSON L3250 (simulada)"
+
+
+def mutate(spooler, rng: random.Random, changes: int) -> None:
+    """Altera `changes` jobs aleatórios (páginas impressas/status)"""
+    queue = spooler.jobs[PRINTER]
+    for job in rng.sample(queue, min(changes, len(queue))):
+        job["PagesPrinted"] = min(job["TotalPages"], job["PagesPrinted"] + 1)
+        job["Status"] |= JOB_STATUS_PRINTING
+
+
+def run(label: str, poll, spooler, cycles: int, changes: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    poll()  # ciclo inicial (preenche caches) fora da medição
+    spooler.reset_stats()
+    start = time.perf_counter()
+    for _ in range(cycles):
+        mutate(spooler, rng, changes)
+        poll()
+    elapsed = time.perf_counter() - start
+    stats = spooler.stats()
+    result = {
+        'label': label,
+        'bytes_per_poll': stats['bytes_returned'] / cycles,
+        'calls_per_poll': stats['total_calls'] / cycles,
+        'ms_per_poll': elapsed * 1000 / cycles,
+    }
+    print(f"{label:<12} {result['bytes_per_poll'] / 1024:10.1f} KiB/ciclo "
+          f"{result['calls_per_poll']:8.1f} chamadas/ciclo {result['ms_per_poll']:8.2f} ms/ciclo")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do monitoramento de jobs em duas fases")
+    parser.add_argument('--jobs', type=int, default=2000, help="Jobs na fila")
+    parser.add_argument('--cycles', type=int, default=20, help="Ciclos medidos")
+    parser.add_argument('--changes', type=int, default=5, help="Jobs alterados por ciclo")
+    parser.add_argument('--min-reduction', type=float, default=10.0,
+                        help="Redução mínima de payload exigida (x)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    spooler = install(seed=args.seed)
+    spooler.add_printer(PRINTER)
+    spooler.add_jobs(PRINTER, args.jobs)
+
+    from core import PrinterAccessManager
+    from services.job import PrinterJobPoller, format_job_info
+    import win32print
+
+    access_manager = PrinterAccessManager.instance
+
+    def legacy_poll():
+        handle = access_manager.open_printer(PRINTER)
+        if not handle:
+            return {}
+        try:
+            jobs = win32print.EnumJobs(handle, 0, -1, 2)
+            return {job["JobId"]: format_job_info(job, access_manager) for job in jobs}
+        finally:
+            access_manager.close_printer(PRINTER)
+
+    poller = PrinterJobPoller()
+
+    print(f"Fila: {args.jobs} jobs | {args.changes} alterações por ciclo | {args.cycles} ciclos")
+    legacy = run("nível 2", legacy_poll, spooler, args.cycles, args.changes, args.seed)
+    two_phase = run("duas fases", lambda: poller.poll(PRINTER), spooler, args.cycles, args.changes, args.seed)
+
+    reduction = legacy['bytes_per_poll'] / max(two_phase['bytes_per_poll'], 1)
+    print(f"Redução de payload: {reduction:.1f}x | estatísticas do poller: {poller.get_stats()}")
+    if reduction < args.min_reduction:
+        print(f"FALHA: redução abaixo de {args.min_reduction:.1f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Descoberta de impressoras em vários servidores de impressão.
+
+Monta no spooler simulado `--local` impressoras locais e `--servers`
+servidores remotos com `--per-server` filas cada (todas também conectadas
+localmente), cada servidor com `--server-latency` de atraso, mais um
+servidor inacessível que trava por `--hang` segundos. Mede
+PrinterListManager.list_available_printers com `--timeout` por origem.
+Falha (código 1) se a enumeração levar mais que o prazo (mais uma folga),
+se faltar ou repetir alguma impressora dos servidores que responderam ou
+se o servidor inacessível não for reportado.
+
+Uso:
+    python -m benchmarks.printer_discovery_benchmark
+    python -m benchmarks.printer_discovery_benchmark --servers 20 --server-latency 1 --timeout 3
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('LOGGING_FILE', 'none')
+os.environ.setdefault('LOGGING_LEVEL', 'ERROR')
+
+from utils.spooler_simulator import install  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da descoberta de impressoras remotas")
+    parser.add_argument('--local', type=int, default=10, help="Impressoras locais")
+    parser.add_argument('--servers', type=int, default=8, help="Servidores de impressão acessíveis")
+    parser.add_argument('--per-server', type=int, default=25, help="Filas por servidor")
+    parser.add_argument('--server-latency', type=float, default=0.4, help="Atraso (s) de cada servidor")
+    parser.add_argument('--hang', type=float, default=30.0, help="Tempo (s) que o servidor inacessível trava")
+    parser.add_argument('--timeout', type=float, default=2.0, help="Prazo (s) por origem")
+    args = parser.parse_args()
+
+    spooler = install(latency=0.001)
+    for index in range(args.local):
+        spooler.add_printer(f"Local {index:02d}")
+    servers = [f"PRINTSRV{index:02d}" for index in range(args.servers)]
+    for server in servers + ["OFFLINE"]:
+        spooler.set_server_latency(server, args.server_latency)
+        for index in range(args.per_server):
+            spooler.add_printer(f"Fila {index:03d}", server=server)
+    spooler.set_server_latency("OFFLINE", args.hang)
+    spooler.set_server_unreachable("OFFLINE")
+
+    from core import PrinterListManager
+
+    manager = PrinterListManager(servers=servers + ["OFFLINE"], timeout=args.timeout)
+    start = time.perf_counter()
+    printers = manager.organize_printer_data(manager.list_available_printers())
+    elapsed = time.perf_counter() - start
+
+    names = [printer['display_name'] for printer in printers]
+    expected = {f"Local {index:02d}" for index in range(args.local)}
+    expected |= {f"\\\\{server}\\Fila {index:03d}" for server in servers for index in range(args.per_server)}
+    sequential = (args.servers * args.server_latency) + args.hang
+    by_server = {}
+    for printer in printers:
+        by_server[printer['server']] = by_server.get(printer['server'], 0) + 1
+    print(f"{len(printers)} impressoras em {elapsed:.2f} s (sequencial: ~{sequential:.1f} s) | "
+          f"por servidor: {by_server}")
+    for label, result in manager.last_enumeration.items():
+        print(f"  {label:<22} {'ok' if result['success'] else 'falha':<6} {result['count']:>4} "
+              f"{result['elapsed']:.2f} s {result['error'] or ''}")
+
+    failures = []
+    if elapsed > args.timeout + 0.5:
+        failures.append(f"enumeração levou {elapsed:.2f} s (prazo {args.timeout:.1f} s)")
+    if len(names) != len(set(names)):
+        failures.append("impressoras repetidas no inventário")
+    missing = expected - set(names)
+    if missing:
+        failures.append(f"{len(missing)} impressoras ausentes")
+    if manager.last_enumeration.get("server:OFFLINE", {}).get('success', True):
+        failures.append("servidor inacessível não reportado")
+    if failures:
+        print("FALHA: " + "; ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
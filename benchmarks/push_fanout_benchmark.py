@@ -0,0 +1,107 @@
+"""
+Benchmark do fan-out de eventos por SSE para milhares de clientes.
+
+Sobe PrinterHttpApi com enable_push em uma thread, conecta `--clients`
+clientes SSE (cada um filtrando uma impressora, e um em cada dez sem
+filtro) e publica `--events` mudanças de jobs no EventBus. Mede quanto
+tempo leva até todos os clientes receberem todos os seus eventos. Falha
+(código 1) se algum cliente perder eventos ou a entrega passar de
+`--max-seconds`.
+
+Uso:
+    python -m benchmarks.push_fanout_benchmark
+    python -m benchmarks.push_fanout_benchmark --clients 5000 --events 1000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault('LOGGING_FILE', 'none')
+os.environ.setdefault('LOGGING_LEVEL', 'WARNING')
+
+from utils.spooler_simulator import install  # noqa: E402
+
+
+async def sse_client(host: str, port: int, printer, expected: int, connected: asyncio.Event,
+                     ready: list, done: list, clients: int) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    query = f"?printers={printer}" if printer else ""
+    writer.write(f"GET /events{query} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode('latin-1'))
+    await reader.readuntil(b"\r\n\r\n")
+    await reader.readuntil(b"\n\n")  # preâmbulo (retry + comentário)
+    ready.append(1)
+    if len(ready) == clients:
+        connected.set()
+    received = 0
+    try:
+        while received < expected:
+            data = await reader.read(65536)
+            if not data:
+                break
+            received += data.count(b"\nevent: ")
+    finally:
+        done.append(received == expected)
+        writer.close()
+
+
+async def run(host: str, port: int, args, bus) -> float:
+    printers = [f"P{index:02d}" for index in range(args.printers)]
+    per_printer = args.events // args.printers
+    connected = asyncio.Event()
+    ready, done = [], []
+    tasks = []
+    for index in range(args.clients):
+        printer = None if index % 10 == 0 else printers[index % args.printers]
+        expected = per_printer * args.printers if printer is None else per_printer
+        tasks.append(asyncio.create_task(sse_client(host, port, printer, expected, connected, ready, done,
+                                                    args.clients)))
+    await asyncio.wait_for(connected.wait(), 60)
+    print(f"{len(ready)} clientes conectados")
+
+    start = time.perf_counter()
+    for number in range(per_printer):
+        for printer in printers:
+            bus.publish({'type': 'JOB_UPDATED', 'printer_name': printer, 'job_id': number,
+                         'new_pages_printed': number})
+        await asyncio.sleep(0)
+    await asyncio.wait_for(asyncio.gather(*tasks), args.max_seconds * 4)
+    elapsed = time.perf_counter() - start
+    lost = done.count(False)
+    print(f"{per_printer * args.printers} eventos entregues em {elapsed:.2f} s "
+          f"({sum(1 for _ in done)} clientes, {lost} com eventos faltando)")
+    return elapsed if lost == 0 else float('inf')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do fan-out SSE")
+    parser.add_argument('--clients', type=int, default=2000, help="Clientes SSE conectados")
+    parser.add_argument('--printers', type=int, default=20, help="Impressoras (filtros dos clientes)")
+    parser.add_argument('--events', type=int, default=500, help="Eventos publicados")
+    parser.add_argument('--max-seconds', type=float, default=10.0, help="Tempo máximo de entrega (s)")
+    args = parser.parse_args()
+
+    install()
+    from services.api import PrinterHttpApi
+    from utils import EventBus
+
+    bus = EventBus(maxsize=args.events * 2)
+    api = PrinterHttpApi(port=0)
+    changes = api.enable_push(event_bus=bus, history=args.events * 2)
+    host, port = api.serve_in_thread()
+    try:
+        elapsed = asyncio.run(run(host, port, args, bus))
+    finally:
+        api.shutdown()
+        bus.close(drain=False)
+
+    print(f"estatísticas: {changes.stats} | barramento: {bus.get_stats()}")
+    if elapsed > args.max_seconds:
+        print(f"FALHA: entrega incompleta ou acima de {args.max_seconds:.1f} s")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Benchmark da compressão das páginas digitalizadas: serial x pool de processos.
+
+Gera as páginas A4 do scanner simulado uma vez, em memória, e mede só a
+gravação em cada formato com o gravador em fluxo (na thread da
+digitalização) e com ParallelPageEncoder, em 150, 300 e 600 dpi. A coluna
+"política" mostra o que parallel_encoding_pays_off escolheria.
+
+Uso:
+    python -m benchmarks.scan_encoding_benchmark
+    python -m benchmarks.scan_encoding_benchmark --pages 20 --workers 4 --formats PDF TIFF
+    python -m benchmarks.scan_encoding_benchmark --min-speedup 1.5
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('LOGGING_FILE', 'none')
+os.environ.setdefault('LOGGING_LEVEL', 'WARNING')
+
+from utils.spooler_simulator import install  # noqa: E402
+
+
+def encode(writer, pages) -> float:
+    start = time.perf_counter()
+    for page in pages:
+        writer.begin_page(page)
+        for chunk in page.chunks():
+            writer.write(chunk)
+        writer.end_page(page)
+    writer.close()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da compressão serial x paralela")
+    parser.add_argument('--pages', type=int, default=10, help="Páginas por digitalização")
+    parser.add_argument('--dpi', type=int, nargs='+', default=[150, 300, 600], help="Resoluções")
+    parser.add_argument('--formats', nargs='+', default=['PDF', 'TIFF'], help="Formatos de saída")
+    parser.add_argument('--color-mode', default='Grayscale', help="Color, Grayscale ou 'Black & White'")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Processos do pool")
+    parser.add_argument('--min-speedup', type=float, default=None,
+                        help="Falha se o paralelo não for pelo menos tantas vezes mais rápido em 600 dpi")
+    args = parser.parse_args()
+
+    install()
+
+    from services.scan.page_writers import create_page_writer
+    from services.scan.parallel_encoder import (ParallelPageEncoder, create_encode_executor,
+                                                parallel_encoding_pays_off)
+    from services.scan.postprocess import page_from_array, page_to_array
+    from services.scan.scan_engine import SimulatedScanDevice
+
+    output_dir = tempfile.mkdtemp(prefix="scan_encoding_")
+    executor = create_encode_executor(args.workers)
+    # Sobe os processos antes de medir
+    list(executor.map(abs, range(args.workers)))
+    failed = False
+    print(f"{args.pages} páginas A4 ({args.color_mode}), pool de {args.workers} processos")
+    try:
+        for dpi in args.dpi:
+            device = SimulatedScanDevice(pages=1, seed=11)
+            image = page_to_array(next(device.pages({'resolution': dpi, 'color_mode': args.color_mode})))
+            for fmt in args.formats:
+                serial_pages = [page_from_array(image, index, dpi) for index in range(args.pages)]
+                parallel_pages = [page_from_array(image, index, dpi) for index in range(args.pages)]
+                serial = encode(create_page_writer(fmt, os.path.join(output_dir, f"serial_{dpi}")), serial_pages)
+                parallel = encode(ParallelPageEncoder(fmt, os.path.join(output_dir, f"parallel_{dpi}"),
+                                                      workers=args.workers, executor=executor), parallel_pages)
+                speedup = serial / parallel
+                policy = "paralelo" if parallel_encoding_pays_off(args.pages, dpi, args.workers) else "serial"
+                print(f"{dpi:4d} dpi {fmt:<5} serial {serial / args.pages * 1000:8.1f} ms/página  "
+                      f"paralelo {parallel / args.pages * 1000:8.1f} ms/página  {speedup:5.2f}x  "
+                      f"política: {policy}")
+                if args.min_speedup is not None and dpi == max(args.dpi) and speedup < args.min_speedup:
+                    failed = True
+    finally:
+        executor.shutdown()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
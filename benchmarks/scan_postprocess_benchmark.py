@@ -0,0 +1,77 @@
+"""
+Benchmark do pós-processamento das páginas digitalizadas.
+
+Gera páginas A4 do scanner simulado (inclinadas em --skew graus), processa
+em lotes com PagePostProcessor em uma única thread e mede o tempo por
+página de cada combinação de modo de cor. Falha (código 1) se alguma
+combinação passar de `--max-seconds` por página.
+
+Uso:
+    python -m benchmarks.scan_postprocess_benchmark
+    python -m benchmarks.scan_postprocess_benchmark --dpi 300 --pages 6 --batch 3
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('LOGGING_FILE', 'none')
+os.environ.setdefault('LOGGING_LEVEL', 'WARNING')
+
+from utils.spooler_simulator import install  # noqa: E402
+
+CASES = [
+    # (modo de aquisição, configurações de pós-processamento)
+    ('Grayscale', {'color_mode': 'Grayscale', 'brightness': 10, 'contrast': 20, 'deskew': True}),
+    ('Grayscale', {'color_mode': 'Black & White', 'brightness': 10, 'deskew': True, 'auto_crop': True}),
+    ('Color', {'color_mode': 'Grayscale', 'contrast': 15, 'deskew': True}),
+    ('Color', {'color_mode': 'Color', 'brightness': -10, 'contrast': 10, 'deskew': True}),
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do pós-processamento de páginas")
+    parser.add_argument('--dpi', type=int, default=600, help="Resolução das páginas")
+    parser.add_argument('--pages', type=int, default=4, help="Páginas por combinação")
+    parser.add_argument('--batch', type=int, default=1, help="Páginas por lote")
+    parser.add_argument('--skew', type=float, default=1.5, help="Inclinação aplicada às páginas (graus)")
+    parser.add_argument('--max-seconds', type=float, default=0.75, help="Tempo máximo por página (s)")
+    args = parser.parse_args()
+
+    install()
+
+    import numpy as np
+    from services.scan.postprocess import PagePostProcessor, estimate_skew, page_to_array, rotate
+    from services.scan.scan_engine import SimulatedScanDevice
+
+    failed = False
+    print(f"{args.pages} páginas A4 a {args.dpi} dpi, lotes de {args.batch}, 1 thread")
+    for acquisition_mode, options in CASES:
+        settings = {'resolution': args.dpi, 'page_size': 'A4', **options, 'batch_size': args.batch}
+        device = SimulatedScanDevice(pages=args.pages, seed=7)
+        source = [rotate(page_to_array(page), args.skew)
+                  for page in device.pages({**settings, 'color_mode': acquisition_mode})]
+        processor = PagePostProcessor.from_settings(settings)
+
+        elapsed, residual = 0.0, 0.0
+        for start in range(0, len(source), args.batch):
+            batch = np.stack(source[start:start + args.batch])
+            begin = time.perf_counter()
+            processed = processor.process_batch(batch, args.dpi)
+            elapsed += time.perf_counter() - begin
+            for image in processed:
+                gray = np.where(image, 0, 255).astype(np.uint8) if image.dtype == bool else image
+                gray = gray if gray.ndim == 2 else gray[..., 1]
+                residual = max(residual, abs(estimate_skew(gray, args.dpi)))
+
+        per_page = elapsed / len(source)
+        label = f"{acquisition_mode} -> {options['color_mode']}"
+        status = "ok" if per_page <= args.max_seconds else "LENTO"
+        print(f"{label:<28} {per_page * 1000:8.1f} ms/página  inclinação residual {residual:4.2f}°  {status}")
+        failed |= per_page > args.max_seconds or residual > 0.2
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Benchmark de tempo de inicialização (imports) da aplicação.
+
+Executa cada cenário em um interpretador novo com `python -X importtime`,
+agrega o detalhamento por módulo e mede o tempo de parede de ponta a ponta.
+O cenário `status` representa uma consulta de status pela linha de comando e
+precisa ficar dentro do orçamento (`--budget-ms`); caso contrário o script
+termina com código 1.
+
+Uso:
+    python -m benchmarks.startup_benchmark
+    python -m benchmarks.startup_benchmark --repeat 10 --budget-ms 150 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS: Dict[str, str] = {
+    # Caminho mínimo de uma consulta de status
+    'status': (
+        "from core import AppLogger, PrinterListManager, PrinterAccessManager\n"
+        "from services.status.status_checker import PrinterStatusChecker\n"
+    ),
+    # Carga do módulo de entrada da aplicação
+    'main': "import main\n",
+    # Tudo carregado, como acontecia antes do carregamento tardio
+    'full': (
+        "import core, services\n"
+        "from core import *\n"
+        "from services import *\n"
+        "import docx, pythoncom, win32api\n"
+    ),
+}
+
+DEFAULT_BUDGET_MS = 150.0
+
+
+def run_scenario(code: str) -> Tuple[float, str, int]:
+    """
+    Executa um cenário em um processo novo
+
+    Returns:
+        Tupla (tempo de parede em ms, saída do -X importtime, código de retorno)
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return elapsed_ms, proc.stderr, proc.returncode
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    """
+    Interpreta as linhas do `-X importtime`
+
+    Returns:
+        Lista de (módulo, self em µs, cumulativo em µs)
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line.split('|', 2)
+            self_us = self_us.replace('import time:', '')
+            entries.append((module.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return entries
+
+
+def summarize(entries: List[Tuple[str, int, int]], top: int) -> List[Tuple[str, int]]:
+    """Agrega o tempo próprio por pacote de topo e retorna os `top` mais caros"""
+    totals: Dict[str, int] = {}
+    for module, self_us, _ in entries:
+        package = module.split('.')[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização")
+    parser.add_argument('--repeat', type=int, default=5, help="Execuções por cenário")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="Orçamento (mediana) do cenário status em ms")
+    parser.add_argument('--top', type=int, default=10, help="Pacotes exibidos no detalhamento")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Cenários a executar (padrão: todos)")
+    args = parser.parse_args()
+
+    results: Dict[str, float] = {}
+    exit_code = 0
+
+    for name in args.scenario or list(SCENARIOS):
+        code = SCENARIOS[name]
+        timings = []
+        last_output = ''
+        failed = False
+        for _ in range(args.repeat):
+            elapsed_ms, output, returncode = run_scenario(code)
+            if returncode != 0:
+                failed = True
+                last_output = output
+                break
+            timings.append(elapsed_ms)
+            last_output = output
+
+        print(f"== {name}")
+        if failed:
+            print("  falhou ao importar:")
+            print('  ' + last_output.strip().splitlines()[-1] if last_output.strip() else '  (sem saída)')
+            exit_code = 1
+            continue
+
+        median_ms = statistics.median(timings)
+        results[name] = median_ms
+        print(f"  parede: mediana {median_ms:.1f} ms | min {min(timings):.1f} ms | max {max(timings):.1f} ms")
+
+        entries = parse_importtime(last_output)
+        total_us = sum(self_us for _, self_us, _ in entries)
+        print(f"  imports: {len(entries)} módulos, {total_us / 1000:.1f} ms")
+        for package, self_us in summarize(entries, args.top):
+            print(f"    {package:<30} {self_us / 1000:8.1f} ms")
+
+    if 'status' in results and 'full' in results and results['full'] > 0:
+        ratio = results['status'] / results['full']
+        print(f"status/full: {ratio:.0%} do tempo de inicialização completo")
+
+    if 'status' in results:
+        if results['status'] > args.budget_ms:
+            print(f"FALHA: status {results['status']:.1f} ms excede o orçamento de {args.budget_ms:.1f} ms")
+            exit_code = 1
+        else:
+            print(f"OK: status dentro do orçamento de {args.budget_ms:.1f} ms")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Benchmark dos níveis de consulta de status contra o spooler simulado.
+
+Mede, por consulta, chamadas ao spooler, bytes retornados e tempo de cada
+StatusDetail e do caminho antigo (GetPrinter nível 2 + EnumJobs da fila
+inteira só para contar os jobs). Falha (código 1) se COUNTERS não for mais
+barato em bytes que o caminho antigo por pelo menos `--min-reduction`.
+
+Uso:
+    python -m benchmarks.status_levels_benchmark
+    python -m benchmarks.status_levels_benchmark --jobs 500 --queries 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('LOGGING_FILE', 'none')
+os.environ.setdefault('LOGGING_LEVEL', 'WARNING')
+
+from utils.spooler_simulator import install  # noqa: E402
+
+PRINTER = "EPSON L3250 (simulada)"
+
+
+def run(label: str, query, spooler, queries: int) -> dict:
+    query()
+    spooler.reset_stats()
+    start = time.perf_counter()
+    for _ in range(queries):
+        query()
+    elapsed = time.perf_counter() - start
+    stats = spooler.stats()
+    result = {
+        'label': label,
+        'calls': stats['total_calls'] / queries,
+        'bytes': stats['bytes_returned'] / queries,
+        'us': elapsed * 1_000_000 / queries,
+    }
+    print(f"{label:<10} {result['calls']:6.1f} chamadas {result['bytes']:10.0f} bytes {result['us']:10.1f} µs")
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark dos níveis de consulta de status")
+    parser.add_argument('--jobs', type=int, default=200, help="Jobs na fila")
+    parser.add_argument('--queries', type=int, default=1000, help="Consultas por nível")
+    parser.add_argument('--min-reduction', type=float, default=5.0,
+                        help="Redução mínima de bytes de COUNTERS sobre o caminho antigo (x)")
+    args = parser.parse_args()
+
+    spooler = install(seed=42)
+    spooler.add_printer(PRINTER)
+    spooler.add_jobs(PRINTER, args.jobs)
+
+    from core import PrinterAccessManager, StatusDetail
+    from core.status_imp import build_status_result
+    from services.status.status_checker import PrinterStatusChecker
+    import win32print
+
+    access_manager = PrinterAccessManager.instance
+    checker = PrinterStatusChecker(access_manager)
+
+    def legacy_query():
+        handle = access_manager.open_printer(PRINTER)
+        if not handle:
+            return None
+        try:
+            printer_info = win32print.GetPrinter(handle, 2)
+            result = build_status_result(PRINTER, printer_info, StatusDetail.FULL, access_manager)
+            result['job_count'] = len(win32print.EnumJobs(handle, 0, -1, 1))
+            return result
+        finally:
+            access_manager.close_printer(PRINTER)
+
+    print(f"Fila: {args.jobs} jobs | {args.queries} consultas por nível")
+    legacy = run("antigo", legacy_query, spooler, args.queries)
+    results = {detail: run(detail.name.lower(), lambda d=detail: checker.get_printer_status(PRINTER, d),
+                           spooler, args.queries)
+               for detail in StatusDetail}
+
+    reduction = legacy['bytes'] / max(results[StatusDetail.COUNTERS]['bytes'], 1)
+    speedup = legacy['us'] / max(results[StatusDetail.COUNTERS]['us'], 1e-9)
+    print(f"COUNTERS vs antigo: {reduction:.1f}x menos bytes, {speedup:.1f}x mais rápido")
+    if reduction < args.min_reduction:
+        print(f"FALHA: redução abaixo de {args.min_reduction:.1f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,56 @@
-from .list_available_imp import PrinterListManager
-from .status_imp import PrinterStatusManager
-from .logging import AppLogger
-from .printer_access_manager import PrinterAccessManager, PrinterStatus
-from .printer_job_manager import PrinterJobManager
-from . print_manager import PrinterPrint
\ No newline at end of file
+"""
+Pacote core com carregamento tardio (lazy) dos submódulos.
+
+Os símbolos públicos só importam o módulo que os define (e suas dependências
+pesadas, como python-docx ou pythoncom) no primeiro acesso, de modo que uma
+consulta de status não paga pelo custo de importar a pilha de impressão.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from utils import container
+
+_LAZY_ATTRS = {
+    'PrinterListManager': '.list_available_imp',
+    'PrinterStatusManager': '.status_imp',
+    'StatusDetail': '.status_imp',
+    'is_sleeping_status': '.status_imp',
+    'read_polling_status': '.status_imp',
+    'AppLogger': '.logging',
+    'PrinterAccessManager': '.printer_access_manager',
+    'PrinterStatus': '.printer_access_manager',
+    'PrinterJobManager': '.printer_job_manager',
+    'JobOperations': '.job_operations',
+    'format_job_info': '.job_operations',
+    'PrinterPrint': '.print_manager',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+# Serviços compartilhados: construídos sob demanda, uma única vez, após suas dependências
+container.register('app_logger', 'core.logging:AppLogger')
+container.register('printer_list_manager', 'core.list_available_imp:PrinterListManager')
+container.register('printer_access_manager', 'core.printer_access_manager:PrinterAccessManager',
+                   depends_on=('app_logger', 'printer_list_manager'))
+
+if TYPE_CHECKING:
+    from .list_available_imp import PrinterListManager
+    from .status_imp import PrinterStatusManager, StatusDetail, is_sleeping_status, read_polling_status
+    from .logging import AppLogger
+    from .printer_access_manager import PrinterAccessManager, PrinterStatus
+    from .printer_job_manager import PrinterJobManager
+    from .job_operations import JobOperations, format_job_info
+    from .print_manager import PrinterPrint
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
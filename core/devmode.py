@@ -0,0 +1,202 @@
+from contextlib import contextmanager
+from typing import Any, Collection, Dict, Iterator, Optional, Set, Tuple
+import getpass
+import os
+import threading
+import time
+import win32print
+
+from .logging import AppLogger
+
+# Campos de DEVMODE (wingdi.h)
+DM_COLLATE = 0x00008000
+DM_COPIES = 0x00000100
+DM_DUPLEX = 0x00001000
+DMCOLLATE_FALSE = 0
+DMCOLLATE_TRUE = 1
+DM_IN_BUFFER = 8
+DM_OUT_BUFFER = 2
+
+# Capacidades consultadas com DeviceCapabilities
+DC_DUPLEX = 7
+DC_COPIES = 18
+DC_COLLATE = 22
+
+# Modos de duplex aceitos em `duplex`
+DUPLEX_MODES = {'simplex': 1, 'long_edge': 2, 'short_edge': 3}
+
+# O DEVMODE por usuário é único por impressora: um envio por vez entre aplicar e restaurar
+_printer_locks: Dict[str, threading.Lock] = {}
+_printer_locks_guard = threading.Lock()
+
+
+def needs_devmode(copies: int, duplex: Optional[str]) -> bool:
+    """Indica se a impressão precisa alterar o DEVMODE (agrupar só faz sentido com cópias)"""
+    return copies > 1 or duplex is not None
+
+
+def _printer_lock(printer_name: str) -> threading.Lock:
+    with _printer_locks_guard:
+        return _printer_locks.setdefault(printer_name.lower(), threading.Lock())
+
+
+@contextmanager
+def devmode_settings(printer_name: str,
+                     copies: int = 1,
+                     collate: Optional[bool] = None,
+                     duplex: Optional[str] = None) -> Iterator[bool]:
+    """
+    Aplica cópias, agrupamento e duplex ao DEVMODE do usuário durante o bloco
+
+    O aplicativo chamado por ShellExecute "print" lê o DEVMODE por usuário
+    (PRINTER_INFO_9) ao criar o job; com cópias nele, N cópias viram um único
+    job que a própria impressora repete. Ao sair do bloco o DEVMODE original
+    é restaurado, então o job precisa ter aparecido na fila antes disso
+    (ver `wait_for_new_job`). Outros envios à mesma impressora por este
+    processo aguardam o bloco terminar.
+
+    Sem cópias nem duplex (ver `needs_devmode`) o DEVMODE não é tocado; o
+    bloco só aguarda a vez, para o envio não cair no DEVMODE de outro.
+
+    Args:
+        printer_name: Nome da impressora
+        copies: Número de cópias
+        collate: Agrupar cópias (None mantém o padrão do driver)
+        duplex: 'simplex', 'long_edge' ou 'short_edge' (None mantém o padrão)
+
+    Yields:
+        True se o driver aceitou as configurações; False se o chamador deve
+        recorrer a um job por cópia
+    """
+    logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+    if duplex is not None and duplex not in DUPLEX_MODES:
+        raise ValueError(f"Modo de duplex {duplex} inválido")
+
+    with _printer_lock(printer_name):
+        if not needs_devmode(copies, duplex):
+            yield True
+            return
+
+        try:
+            handle = win32print.OpenPrinter(printer_name)
+        except Exception as e:
+            logger.warning(f"Não foi possível abrir {printer_name} para ajustar o DEVMODE: {e}")
+            yield False
+            return
+
+        applied, original = False, None
+        try:
+            applied, original = _apply_devmode(handle, printer_name, copies, collate, duplex)
+        except Exception as e:
+            logger.warning(f"Não foi possível aplicar o DEVMODE em {printer_name}: {e}")
+
+        try:
+            yield applied
+        finally:
+            if applied:
+                try:
+                    win32print.SetPrinter(handle, 9, {'pDevMode': original}, 0)
+                except Exception as e:
+                    logger.warning(f"Erro ao restaurar o DEVMODE de {printer_name}: {e}")
+            win32print.ClosePrinter(handle)
+
+
+def _apply_devmode(handle, printer_name: str, copies: int, collate: Optional[bool],
+                   duplex: Optional[str]) -> Tuple[bool, Any]:
+    """
+    Grava o DEVMODE por usuário com as configurações pedidas
+
+    Returns:
+        (aplicado, DEVMODE original para restaurar)
+    """
+    logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+    port_name = win32print.GetPrinter(handle, 2)['pPortName']
+    max_copies = win32print.DeviceCapabilities(printer_name, port_name, DC_COPIES)
+    if copies > 1 and max_copies < copies:
+        logger.info(f"Driver de {printer_name} aceita até {max_copies} cópias; usando um job por cópia")
+        return False, None
+    if duplex not in (None, 'simplex') and not win32print.DeviceCapabilities(printer_name, port_name, DC_DUPLEX):
+        logger.warning(f"{printer_name} não suporta duplex; imprimindo em simplex")
+        duplex = None
+    if collate and copies > 1 and not win32print.DeviceCapabilities(printer_name, port_name, DC_COLLATE):
+        logger.info(f"{printer_name} não agrupa cópias; usando um job por cópia")
+        return False, None
+
+    # GetPrinter devolve um objeto novo a cada chamada: um para restaurar, outro para alterar
+    original = win32print.GetPrinter(handle, 9)['pDevMode']
+    devmode = win32print.GetPrinter(handle, 9)['pDevMode'] or win32print.GetPrinter(handle, 2)['pDevMode']
+    if devmode is None:
+        return False, None
+
+    devmode.Copies = copies
+    devmode.Fields |= DM_COPIES
+    if collate is not None:
+        devmode.Collate = DMCOLLATE_TRUE if collate else DMCOLLATE_FALSE
+        devmode.Fields |= DM_COLLATE
+    if duplex is not None:
+        devmode.Duplex = DUPLEX_MODES[duplex]
+        devmode.Fields |= DM_DUPLEX
+
+    # O driver valida e ajusta o DEVMODE; se ignorar as cópias, cai no laço por cópia
+    win32print.DocumentProperties(0, handle, printer_name, devmode, devmode, DM_IN_BUFFER | DM_OUT_BUFFER)
+    if devmode.Copies != copies:
+        logger.info(f"Driver de {printer_name} ignora cópias no DEVMODE; usando um job por cópia")
+        return False, None
+
+    win32print.SetPrinter(handle, 9, {'pDevMode': devmode}, 0)
+    logger.debug(f"DEVMODE de {printer_name}: {copies} cópias, collate={collate}, duplex={duplex}")
+    return True, original
+
+
+def list_job_ids(printer_name: str) -> Set[int]:
+    """IDs dos jobs atualmente na fila (EnumJobs nível 1)"""
+    handle = win32print.OpenPrinter(printer_name)
+    try:
+        return {job['JobId'] for job in win32print.EnumJobs(handle, 0, -1, 1)}
+    finally:
+        win32print.ClosePrinter(handle)
+
+
+def wait_for_new_job(printer_name: str, known_ids: Collection[int], document: Optional[str] = None,
+                     user: Optional[str] = None, timeout: float = 30,
+                     interval: float = 0.25) -> Optional[int]:
+    """
+    Aguarda o job enviado pelo chamador aparecer na fila
+
+    Outros usuários e processos podem enviar jobs à mesma impressora no
+    intervalo; só conta um job que não estava em `known_ids`, do usuário
+    esperado e cujo nome (pDocument) contenha o nome do arquivo impresso.
+
+    Args:
+        printer_name: Nome da impressora
+        known_ids: IDs dos jobs que já estavam na fila antes do envio
+        document: Arquivo impresso (None aceita qualquer documento)
+        user: Dono esperado do job (padrão: usuário atual)
+        timeout: Tempo máximo de espera em segundos
+        interval: Intervalo entre consultas em segundos
+
+    Returns:
+        ID do novo job ou None se o timeout expirou
+    """
+    known_ids = set(known_ids)
+    # Os aplicativos costumam exibir o nome sem extensão ("Word - relatorio")
+    stem = os.path.splitext(os.path.basename(document))[0].lower() if document else None
+    user = (user or getpass.getuser()).lower()
+    deadline = time.monotonic() + timeout
+    while True:
+        handle = win32print.OpenPrinter(printer_name)
+        try:
+            jobs = win32print.EnumJobs(handle, 0, -1, 1)
+        finally:
+            win32print.ClosePrinter(handle)
+        matches = [
+            job['JobId'] for job in jobs
+            if job['JobId'] not in known_ids
+            and (job['pUserName'] or '').lower() == user
+            and (stem is None or stem in (job['pDocument'] or '').lower())
+        ]
+        if matches:
+            return min(matches)
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(interval)
@@ -0,0 +1,389 @@
+import win32print
+from datetime import datetime, timedelta
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from .logging import AppLogger
+from .printer_access_manager import PrinterAccessManager
+
+# Campos que só existem em JOB_INFO_2 (inclui strings derivadas do DEVMODE)
+LEVEL2_FIELDS = frozenset({"size", "driver_name", "print_processor", "notify_name", "parameters", "elapsed_time"})
+
+
+def job_info_level(fields: Optional[Iterable[str]] = None) -> int:
+    """Retorna o nível de informação mais barato (1 ou 2) que contém os campos pedidos"""
+    if fields is None:
+        return 1
+    return 2 if LEVEL2_FIELDS.intersection(fields) else 1
+
+
+def format_job_info(job, access_manager) -> Dict:
+    info = {
+        "job_id": job["JobId"],
+        "document_name": job["pDocument"],
+        "status": access_manager._decode_job_status(job["Status"]),  # type: ignore
+        "status_code": job["Status"],
+        "pages_printed": job["PagesPrinted"],
+        "total_pages": job["TotalPages"],
+        "submitted_time": job["Submitted"].isoformat() if job["Submitted"] else None,
+        "user_name": job["pUserName"],
+        "machine_name": job["pMachineName"],
+        "data_type": job["pDatatype"],
+        "priority": job["Priority"]
+    }
+    if "Size" in job:  # JOB_INFO_2
+        info.update({
+            "size": job["Size"],
+            "driver_name": job["pDriverName"],
+            "print_processor": job["pPrintProcessor"],
+            "notify_name": job["pNotifyName"],
+            "parameters": job["pParameters"],
+            "elapsed_time": job["Time"]
+        })
+    return info
+
+
+def iter_job_pages(handle, page_size: int, level: int = 1) -> Iterator[List[Dict]]:
+    """
+    Percorre a fila em páginas de EnumJobs, retomando cada uma a partir do último job visto
+
+    Jobs que terminam entre as páginas deslocam os demais para trás; a página
+    seguinte é lida a partir do último job da anterior (procurado pelo ID se
+    a posição mudou), então nenhum job é pulado e nenhum se repete.
+
+    Args:
+        handle: Handle aberto da impressora
+        page_size: Jobs por chamada a EnumJobs
+        level: Nível de JOB_INFO (1 ou 2)
+
+    Yields:
+        Listas de jobs (dicionários de EnumJobs) ainda não entregues
+    """
+    seen = set()
+    first = 0
+    anchor = None
+    while True:
+        if anchor is None:
+            page = list(win32print.EnumJobs(handle, first, page_size, level))
+        else:
+            # Relê o último job da página anterior para confirmar a posição
+            page = list(win32print.EnumJobs(handle, first - 1, page_size + 1, level))
+            if page and page[0]["JobId"] == anchor:
+                page = page[1:]
+            else:
+                # A fila andou entre as páginas: reposiciona pelo ID
+                first, page = _page_after(handle, first, anchor, page_size, level)
+        new = [job for job in page if job["JobId"] not in seen]
+        seen.update(job["JobId"] for job in new)
+        yield new
+        if len(page) < page_size:
+            return
+        anchor = page[-1]["JobId"]
+        first += len(page)
+
+
+def _page_after(handle, first: int, anchor: int, page_size: int, level: int) -> Tuple[int, List[Dict]]:
+    """
+    Localiza o job `anchor` a partir da posição esperada e retorna a página seguinte
+
+    Procura em janelas cada vez mais próximas do início da fila (jobs que
+    terminam deslocam os demais para trás).
+
+    Returns:
+        Tupla (posição do primeiro job da página, página)
+    """
+    end = first
+    while True:
+        start = max(0, end - page_size)
+        window = win32print.EnumJobs(handle, start, end - start + page_size, level)
+        for index, job in enumerate(window):
+            if job["JobId"] == anchor:
+                return start + index + 1, list(window[index + 1:index + 1 + page_size])
+        if start == 0:
+            break
+        end = start
+    # O próprio job âncora saiu da fila: recomeça do início (iter_job_pages evita repetições)
+    return 0, list(win32print.EnumJobs(handle, 0, page_size, level))
+
+
+class JobOperations:
+    """
+    Paginação da fila e operações em lote sobre jobs
+
+    Base compartilhada pelos gerenciadores de jobs de core e de services.job:
+    cada operação em lote usa um único handle da impressora.
+    """
+
+    def __init__(self):
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.access_manager = PrinterAccessManager.instance
+
+    def iter_jobs(self,
+                  printer_name: str,
+                  page_size: int = 100,
+                  status: Optional[int] = None,
+                  user: Optional[str] = None,
+                  machine: Optional[str] = None,
+                  submitted_after: Optional[datetime] = None,
+                  job_ids: Optional[Collection[int]] = None,
+                  predicate: Optional[Callable[[Dict], bool]] = None,
+                  fields: Optional[Iterable[str]] = None,
+                  limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Percorre a fila em páginas de EnumJobs (FirstJob/NoJobs), filtrando cada página
+
+        Usa nível 1 (sem DEVMODE) a menos que `fields` peça campos de JOB_INFO_2.
+        A enumeração para assim que o consumidor para de iterar ou `limit` é
+        atingido, sem buscar as páginas restantes. Cada página é retomada a
+        partir do último job visto, então jobs que terminam entre as páginas
+        não fazem a enumeração pular outros.
+
+        Args:
+            printer_name: Nome da impressora
+            page_size: Jobs por chamada a EnumJobs
+            status: Máscara de flags JOB_STATUS_* (basta uma coincidir)
+            user: Usuário dono do job (sem diferenciar maiúsculas)
+            machine: Máquina de origem (sem diferenciar maiúsculas, com ou sem o prefixo de rede)
+            submitted_after: Apenas jobs enviados depois deste instante
+            job_ids: Apenas estes IDs
+            predicate: Filtro adicional aplicado ao job formatado
+            fields: Campos desejados; o resultado é reduzido a eles
+            limit: Número máximo de jobs retornados
+
+        Yields:
+            Jobs no formato de format_job_info
+        """
+        if page_size <= 0:
+            raise ValueError("page_size deve ser positivo")
+        level = job_info_level(fields)
+        wanted = set(fields) if fields is not None else None
+        wanted_ids = set(job_ids) if job_ids is not None else None
+        user = user.lower() if user else None
+        machine = machine.lower().lstrip('\\') if machine else None
+
+        # Handle próprio: o gerador pode ficar suspenso entre páginas e o handle
+        # compartilhado do access_manager seria fechado por outras chamadas
+        try:
+            handle = win32print.OpenPrinter(printer_name)
+        except Exception as e:
+            self.logger.error(f"Erro ao abrir impressora {printer_name}: {e}", exc_info=True)
+            return
+
+        try:
+            seen = set()
+            yielded = 0
+            pages = iter_job_pages(handle, page_size, level)
+            while True:
+                try:
+                    page = next(pages, None)
+                except Exception as e:
+                    self.logger.error(f"Erro ao listar jobs em {printer_name}: {e}", exc_info=True)
+                    return
+                if page is None:
+                    return
+
+                for job in page:
+                    job_id = job["JobId"]
+                    seen.add(job_id)
+
+                    if wanted_ids is not None and job_id not in wanted_ids:
+                        continue
+                    if status is not None and not job["Status"] & status:
+                        continue
+                    if user is not None and (job["pUserName"] or '').lower() != user:
+                        continue
+                    if machine is not None and (job["pMachineName"] or '').lower().lstrip('\\') != machine:
+                        continue
+                    if submitted_after is not None and not (job["Submitted"] and job["Submitted"] > submitted_after):
+                        continue
+
+                    info = format_job_info(job, self.access_manager)
+                    if predicate is not None and not predicate(info):
+                        continue
+                    if wanted is not None:
+                        info = {key: value for key, value in info.items() if key in wanted}
+
+                    yield info
+                    yielded += 1
+                    if limit is not None and yielded >= limit:
+                        return
+
+                if wanted_ids is not None and wanted_ids <= seen:
+                    return
+        finally:
+            win32print.ClosePrinter(handle)
+
+    def cancel_jobs(self, printer_name: str, job_ids: Iterable[int]) -> Dict[str, Any]:
+        """Cancela vários jobs abrindo a impressora uma única vez"""
+        return self._control_jobs(printer_name, job_ids, win32print.JOB_CONTROL_CANCEL, "cancelado")
+
+    def pause_jobs(self, printer_name: str, job_ids: Iterable[int]) -> Dict[str, Any]:
+        """Pausa vários jobs abrindo a impressora uma única vez"""
+        return self._control_jobs(printer_name, job_ids, win32print.JOB_CONTROL_PAUSE, "pausado")
+
+    def resume_jobs(self, printer_name: str, job_ids: Iterable[int]) -> Dict[str, Any]:
+        """Retoma vários jobs abrindo a impressora uma única vez"""
+        return self._control_jobs(printer_name, job_ids, win32print.JOB_CONTROL_RESUME, "retomado")
+
+    def restart_jobs(self, printer_name: str, job_ids: Iterable[int]) -> Dict[str, Any]:
+        """Reinicia vários jobs abrindo a impressora uma única vez"""
+        return self._control_jobs(printer_name, job_ids, win32print.JOB_CONTROL_RESTART, "reiniciado")
+
+    def set_priority_many(self, printer_name: str, job_ids: Iterable[int], priority: int) -> Dict[str, Any]:
+        """
+        Altera a prioridade de vários jobs em uma única sessão
+
+        Args:
+            printer_name: Nome da impressora
+            job_ids: IDs dos jobs
+            priority: Nova prioridade (1 = mínima, 99 = máxima)
+
+        Returns:
+            Resultado por job (ver _control_jobs)
+        """
+        job_ids = list(job_ids)
+        result = self._new_batch_result(printer_name, "prioridade alterada", job_ids)
+        if not win32print.MIN_PRIORITY <= priority <= win32print.MAX_PRIORITY:
+            result['error'] = f"Prioridade {priority} fora do intervalo {win32print.MIN_PRIORITY}-{win32print.MAX_PRIORITY}"
+            self.logger.error(result['error'])
+            return result
+
+        handle = self.access_manager.open_printer(printer_name)  # type: ignore
+        if not handle:
+            result['error'] = f"Não foi possível abrir a impressora {printer_name}"
+            return result
+
+        try:
+            for job_id in job_ids:
+                try:
+                    job_info = win32print.GetJob(handle, job_id, 1)
+                    job_info["Priority"] = priority
+                    job_info["Position"] = win32print.JOB_POSITION_UNSPECIFIED
+                    win32print.SetJob(handle, job_id, 1, job_info, 0)
+                    self._record_job_result(result, job_id, None)
+                except Exception as e:
+                    self._record_job_result(result, job_id, e)
+        finally:
+            self.access_manager.close_printer(printer_name)  # type: ignore
+
+        return self._finish_batch(result)
+
+    def cancel_where(self,
+                     printer_name: str,
+                     status: Optional[int] = None,
+                     user: Optional[str] = None,
+                     older_than: Optional[Union[timedelta, float]] = None) -> Dict[str, Any]:
+        """
+        Cancela os jobs que atendem a todos os critérios informados
+
+        A listagem (nível 1, sem DEVMODE) e os cancelamentos usam o mesmo handle.
+
+        Args:
+            printer_name: Nome da impressora
+            status: Máscara de flags JOB_STATUS_* (basta uma coincidir)
+            user: Nome do usuário dono do job (sem diferenciar maiúsculas)
+            older_than: Idade mínima do job (timedelta ou segundos)
+
+        Returns:
+            Resultado por job (ver _control_jobs)
+        """
+        if status is None and user is None and older_than is None:
+            result = self._new_batch_result(printer_name, "cancelado", [])
+            result['error'] = "Nenhum critério informado; use cancel_all_jobs para esvaziar a fila"
+            self.logger.error(result['error'])
+            return result
+
+        if older_than is not None and not isinstance(older_than, timedelta):
+            older_than = timedelta(seconds=older_than)
+        cutoff = datetime.now() - older_than if older_than is not None else None
+
+        handle = self.access_manager.open_printer(printer_name)  # type: ignore
+        if not handle:
+            result = self._new_batch_result(printer_name, "cancelado", [])
+            result['error'] = f"Não foi possível abrir a impressora {printer_name}"
+            return result
+
+        try:
+            try:
+                jobs = win32print.EnumJobs(handle, 0, -1, 1)
+            except Exception as e:
+                self.logger.error(f"Erro ao listar jobs em {printer_name}: {e}", exc_info=True)
+                result = self._new_batch_result(printer_name, "cancelado", [])
+                result['error'] = str(e)
+                return result
+
+            job_ids = []
+            for job in jobs:
+                if status is not None and not job["Status"] & status:
+                    continue
+                if user is not None and (job["pUserName"] or '').lower() != user.lower():
+                    continue
+                if cutoff is not None and not (job["Submitted"] and job["Submitted"] < cutoff):
+                    continue
+                job_ids.append(job["JobId"])
+
+            result = self._new_batch_result(printer_name, "cancelado", job_ids)
+            for job_id in job_ids:
+                try:
+                    win32print.SetJob(handle, job_id, 0, None, win32print.JOB_CONTROL_CANCEL)
+                    self._record_job_result(result, job_id, None)
+                except Exception as e:
+                    self._record_job_result(result, job_id, e)
+        finally:
+            self.access_manager.close_printer(printer_name)  # type: ignore
+
+        return self._finish_batch(result)
+
+    def _control_jobs(self, printer_name: str, job_ids: Iterable[int], command: int, action: str) -> Dict[str, Any]:
+        """
+        Executa um comando em vários jobs usando um único handle
+
+        Returns:
+            Dict com 'success' (todos os jobs ok), 'succeeded', 'failed'
+            (lista de {'job_id', 'error'}), 'results' (job_id -> bool) e 'error'
+            (falha ao abrir a impressora)
+        """
+        job_ids = list(job_ids)
+        result = self._new_batch_result(printer_name, action, job_ids)
+
+        handle = self.access_manager.open_printer(printer_name)  # type: ignore
+        if not handle:
+            result['error'] = f"Não foi possível abrir a impressora {printer_name}"
+            return result
+
+        try:
+            for job_id in job_ids:
+                try:
+                    win32print.SetJob(handle, job_id, 0, None, command)
+                    self._record_job_result(result, job_id, None)
+                except Exception as e:
+                    self._record_job_result(result, job_id, e)
+        finally:
+            self.access_manager.close_printer(printer_name)  # type: ignore
+
+        return self._finish_batch(result)
+
+    def _new_batch_result(self, printer_name: str, action: str, job_ids: List[int]) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'printer_name': printer_name,
+            'action': action,
+            'requested': len(job_ids),
+            'succeeded': [],
+            'failed': [],
+            'results': {},
+            'error': None
+        }
+
+    def _record_job_result(self, result: Dict[str, Any], job_id: int, error: Optional[Exception]) -> None:
+        result['results'][job_id] = error is None
+        if error is None:
+            result['succeeded'].append(job_id)
+        else:
+            result['failed'].append({'job_id': job_id, 'error': str(error)})
+
+    def _finish_batch(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        result['success'] = result['error'] is None and not result['failed']
+        printer_name, action = result['printer_name'], result['action']
+        self.logger.info(f"{len(result['succeeded'])}/{result['requested']} jobs {action}(s) na impressora {printer_name}")
+        if result['failed']:
+            self.logger.warning(f"{len(result['failed'])} jobs falharam ({action}) em {printer_name}: {result['failed']}")
+        return result
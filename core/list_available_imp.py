@@ -1,25 +1,210 @@
-from typing import List, Tuple, Optional
-from utils import Singleton
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Tuple, Optional
+from utils import ServiceRef
+from .logging import AppLogger
 import win32print
 
-@Singleton
 class PrinterListManager:
     """Classe para gerenciar e organizar informações de impressoras"""
     
-    def __init__(self):
+    instance = ServiceRef('printer_list_manager')
+    
+    # Enumerações em andamento por origem (flags, servidor), compartilhadas entre
+    # instâncias: uma chamada travada num servidor é reaproveitada pelas seguintes
+    # em vez de cada uma deixar mais uma thread presa no mesmo servidor
+    _inflight: Dict[Tuple[int, Optional[str]], Dict[str, Any]] = {}
+    _inflight_lock = threading.Lock()
+    
+    def __init__(self, servers: Optional[Iterable[str]] = None, timeout: Optional[float] = None):
+        """
+        Args:
+            servers: Servidores de impressão remotos (padrão: PRINT_SERVERS do .env, separados por vírgula)
+            timeout: Prazo (s) de cada enumeração (padrão: PRINT_SERVERS_TIMEOUT do .env ou 5)
+        """
         self.raw_data = None
         self.organized_data = None
+        # Incrementado a cada enumeração
+        self.enumeration_generation = 0
+        # Por impressora (nome em minúsculas): (entrada, geração em que a entrada mudou)
+        self._printer_entries: Dict[str, Tuple[Tuple, int]] = {}
+        self.servers = [self._server_name(server) for server in servers] if servers is not None else None
+        self.timeout = timeout
+        # Resultado de cada origem na última enumeração: success, count, elapsed, error
+        self.last_enumeration: Dict[str, Dict[str, Any]] = {}
+    
+    @staticmethod
+    def _server_name(server: str) -> str:
+        return server.strip().lstrip('\\')
     
-    def list_available_printers(self) -> Tuple:
+    def _configured_servers(self) -> List[str]:
+        if self.servers is not None:
+            return self.servers
+        # Lido na hora da enumeração: o .env é carregado pelo AppLogger
+        return [self._server_name(server) for server in os.getenv('PRINT_SERVERS', '').split(',') if server.strip()]
+    
+    def _configured_timeout(self) -> float:
+        if self.timeout is not None:
+            return self.timeout
+        return float(os.getenv('PRINT_SERVERS_TIMEOUT', '5'))
+    
+    def list_available_printers(self,
+                                servers: Optional[Iterable[str]] = None,
+                                timeout: Optional[float] = None) -> Tuple:
         """
-        Lista todas as impressoras disponíveis e retorna os dados brutos
+        Lista as impressoras locais, as conectadas e as dos servidores remotos
+        
+        Cada origem (locais, conexões e cada servidor) é enumerada em sua
+        própria thread, todas ao mesmo tempo e com o mesmo prazo; um servidor
+        lento ou inacessível só perde a própria parte do inventário. A chamada
+        travada não pode ser interrompida e termina em segundo plano; enquanto
+        isso, novas listagens aguardam essa mesma enumeração em vez de abrir
+        outra thread para a origem.
+        
+        Impressoras vistas por mais de uma origem aparecem uma vez (prioridade:
+        local, conexão, servidor). Cada item é a tupla de PRINTER_INFO_1
+        acrescida do servidor e da origem:
+        (flags, descrição, nome, comentário, servidor, origem)
+        
+        Args:
+            servers: Servidores remotos (padrão: os configurados)
+            timeout: Prazo (s) de cada origem (padrão: o configurado)
         
         Returns:
             Tuple com dados brutos das impressoras
+        
+        Raises:
+            RuntimeError: Nenhuma origem respondeu
         """
-        self.raw_data = win32print.EnumPrinters(win32print.PRINTER_ENUM_LOCAL, None, 1)
+        logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        servers = [self._server_name(server) for server in servers] if servers is not None \
+            else self._configured_servers()
+        timeout = self._configured_timeout() if timeout is None else timeout
+        
+        sources: List[Tuple[str, int, Optional[str]]] = [
+            ('local', win32print.PRINTER_ENUM_LOCAL, None),
+            ('connections', win32print.PRINTER_ENUM_CONNECTIONS, None),
+        ]
+        sources += [(f"server:{server}", win32print.PRINTER_ENUM_NAME, server)
+                    for server in dict.fromkeys(servers) if server]
+        
+        pending = {label: self._start_enumeration(label, flags, server) for label, flags, server in sources}
+        
+        deadline = time.monotonic() + timeout
+        received: Dict[str, Tuple] = {}
+        for label, enumeration in pending.items():
+            if enumeration['done'].wait(max(0.0, deadline - time.monotonic())):
+                received[label] = enumeration['result']
+        
+        status: Dict[str, Dict[str, Any]] = {}
+        merged: Dict[str, Tuple] = {}
+        for label, _, server in sources:
+            if label not in received:
+                status[label] = {'success': False, 'count': 0, 'elapsed': timeout,
+                                 'error': f"Prazo de {timeout:.1f}s excedido"}
+                logger.warning(f"Enumeração de impressoras ({label}) excedeu o prazo de {timeout:.1f}s")
+                continue
+            printers, error, elapsed = received[label]
+            if error is not None:
+                status[label] = {'success': False, 'count': 0, 'elapsed': elapsed, 'error': str(error)}
+                logger.warning(f"Erro ao enumerar impressoras ({label}): {error}")
+                continue
+            status[label] = {'success': True, 'count': len(printers), 'elapsed': elapsed, 'error': None}
+            source = label.split(':', 1)[0]
+            for printer in printers:
+                key = printer[2].lower()
+                if key not in merged:
+                    merged[key] = tuple(printer[:4]) + (server or self._server_from_name(printer[2]), source)
+        
+        self.last_enumeration = status
+        if not any(result['success'] for result in status.values()):
+            errors = '; '.join(f"{label}: {result['error']}" for label, result in status.items())
+            raise RuntimeError(f"Nenhuma origem de impressoras respondeu ({errors})")
+        
+        self.raw_data = tuple(merged.values())
+        self.enumeration_generation += 1
+        self._update_printer_entries(merged, status)
+        logger.debug(f"{len(self.raw_data)} impressoras enumeradas de {len(sources)} origens")
         return self.raw_data
     
+    @classmethod
+    def _start_enumeration(cls, label: str, flags: int, server: Optional[str]) -> Dict[str, Any]:
+        """
+        Enumeração da origem em andamento ou, se não houver, uma nova em segundo plano
+
+        Returns:
+            Dict com 'done' (threading.Event) e 'result' (impressoras, erro, duração)
+        """
+        key = (flags, server.lower() if server else None)
+        with cls._inflight_lock:
+            enumeration = cls._inflight.get(key)
+            if enumeration is not None:
+                return enumeration
+            enumeration = {'done': threading.Event(), 'result': None}
+            cls._inflight[key] = enumeration
+        
+        def enumerate_source() -> None:
+            started = time.monotonic()
+            try:
+                printers = win32print.EnumPrinters(flags, f"\\\\{server}" if server else None, 1)
+                enumeration['result'] = (printers, None, time.monotonic() - started)
+            except Exception as e:
+                enumeration['result'] = (None, e, time.monotonic() - started)
+            finally:
+                with cls._inflight_lock:
+                    cls._inflight.pop(key, None)
+                enumeration['done'].set()
+        
+        # Thread daemon: uma enumeração travada não impede o encerramento do processo
+        threading.Thread(target=enumerate_source, name=f"enum-{label}", daemon=True).start()
+        return enumeration
+    
+    def _update_printer_entries(self, merged: Dict[str, Tuple], status: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Registra em que geração a entrada de cada impressora mudou
+
+        Impressoras de uma origem que falhou nesta enumeração mantêm a entrada
+        anterior: a origem não respondeu, o que não significa que saíram.
+        """
+        previous = self._printer_entries
+        # Na primeira enumeração nada mudou em relação ao que os caches já viam (geração 0)
+        generation = self.enumeration_generation if self.enumeration_generation > 1 else 0
+        entries: Dict[str, Tuple[Tuple, int]] = {}
+        for key, entry in merged.items():
+            old = previous.get(key)
+            entries[key] = old if old is not None and old[0] == entry else (entry, generation)
+        for key, old in previous.items():
+            if key in entries:
+                continue
+            entry = old[0]
+            label = f"server:{entry[4]}" if entry[5] == 'server' else entry[5]
+            if label in status and not status[label]['success']:
+                entries[key] = old
+        self._printer_entries = entries
+
+    def printer_generation(self, printer_name: str) -> Optional[int]:
+        """
+        Geração da enumeração em que a entrada da impressora mudou pela última vez
+
+        Caches por dispositivo comparam com este valor: enumerar de novo só
+        invalida as impressoras que mudaram, apareceram ou saíram do inventário.
+
+        Returns:
+            0 antes da primeira enumeração; None se a impressora não está no inventário
+        """
+        if not self.enumeration_generation:
+            return 0
+        entry = self._printer_entries.get(printer_name.lower())
+        return entry[1] if entry is not None else None
+
+    @staticmethod
+    def _server_from_name(name: str) -> Optional[str]:
+        """Servidor de um nome UNC (\\\\servidor\\impressora); None para impressoras locais"""
+        if name.startswith('\\\\'):
+            return name[2:].split('\\', 1)[0] or None
+        return None
+    
     def organize_printer_data(self, printer_data: Optional[Tuple] = None) -> List[dict]:
         """
         Organiza os dados das impressoras em formato estruturado
@@ -39,13 +224,16 @@ class PrinterListManager:
         
         for printer in printer_data: # type: ignore
             full_name = printer[1]
+            server = printer[4] if len(printer) > 4 else None
             printer_info = {
                 'id': printer[0],
                 'full_name': full_name,
                 'display_name': printer[2],
                 'description': printer[3],
-                'type': 'network' if any(x in full_name for x in ['http://', 'WSD']) else 'local',
-                'protocol': self._detect_protocol(full_name)
+                'type': 'network' if server or any(x in full_name for x in ['http://', 'WSD']) else 'local',
+                'protocol': self._detect_protocol(full_name),
+                'server': server,
+                'source': printer[5] if len(printer) > 5 else 'local'
             }
             organized_printers.append(printer_info)
         
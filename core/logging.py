@@ -4,16 +4,13 @@ import os
 import sys
 from typing import Optional, Union
 from pathlib import Path
-from dotenv import load_dotenv
 
-from utils import Singleton
+from utils import ServiceRef
 
-# Carrega variáveis do .env
-load_dotenv()
 
-
-@Singleton
 class AppLogger:
+    instance = ServiceRef('app_logger')
+
     def __init__(self) -> None:
         """
         Inicializa o sistema de logging baseado nas configurações do .env
@@ -21,9 +18,16 @@ class AppLogger:
         self._initialized = False
         self._setup_logging()
     
+    def _load_env(self, override: bool = False) -> None:
+        """Carrega variáveis do .env (python-dotenv só é importado aqui)"""
+        from dotenv import load_dotenv
+        load_dotenv(override=override)
+    
     def _setup_logging(self) -> None:
         """Configura o sistema de logging baseado nas configurações do .env"""
-        if self._initialized:
+        if not self._initialized:
+            self._load_env()
+        else:
             # Remove handlers existentes para evitar duplicação
             root_logger = logging.getLogger()
             for handler in root_logger.handlers[:]:
@@ -36,6 +40,8 @@ class AppLogger:
         backup_count = int(os.getenv('LOGGING_BACKUP_COUNT', '5'))
         environment = os.getenv('ENVIRONMENT', 'dev')
         log_to_console = os.getenv('LOGGING_CONSOLE', 'true').lower() == 'true'
+        # 'stderr' mantém o stdout livre para a saída de comandos (ex: exportação NDJSON)
+        console_stream = os.getenv('LOGGING_STREAM', 'stdout').lower()
         
         # Converte string de nível para constante do logging
         level = self._get_log_level(log_level)
@@ -56,7 +62,7 @@ class AppLogger:
         # Handler para console
         if (environment.lower() in ['development', 'test', 'dev'] or 
             (environment.lower() == 'production' and log_to_console)):
-            console_handler = self._create_console_handler(level, formatter)
+            console_handler = self._create_console_handler(level, formatter, console_stream)
             logger.addHandler(console_handler)
         
         # Configura logging de terceiros
@@ -113,9 +119,10 @@ class AppLogger:
             logging.error(f"Erro ao criar file handler: {e}")
             return None
     
-    def _create_console_handler(self, level: int, formatter: logging.Formatter) -> logging.Handler:
-        """Cria handler para console"""
-        console_handler = logging.StreamHandler(sys.stdout)
+    def _create_console_handler(self, level: int, formatter: logging.Formatter,
+                                stream: str = 'stdout') -> logging.Handler:
+        """Cria handler para console (stdout ou stderr)"""
+        console_handler = logging.StreamHandler(sys.stderr if stream == 'stderr' else sys.stdout)
         console_handler.setFormatter(formatter)
         console_handler.setLevel(level)
         return console_handler
@@ -149,7 +156,7 @@ class AppLogger:
     
     def reload_config(self) -> None:
         """Recarrega as configurações e reconfigura o logging"""
-        load_dotenv(override=True)
+        self._load_env(override=True)
         self._setup_logging()
         logging.info("Configuração de logging recarregada")
     
@@ -201,7 +208,7 @@ class AppLogger:
 # Exemplo de uso aprimorado:
 if __name__ == "__main__":
     # Obtém o logger singleton
-    log = AppLogger()
+    log = AppLogger.instance
     
     # Exemplos de logging
     log.debug("Mensagem de debug detalhada")
@@ -3,10 +3,7 @@ import tempfile
 import os
 import time
 from datetime import datetime, timedelta
-from docx import Document
-import pythoncom
-import win32api
-import win32print
+from utils import AdaptivePollingPolicy
 
 class PrinterPrint:
     """Classe para imprimir documentos DOCX e monitorar jobs de impressão"""
@@ -24,6 +21,8 @@ class PrinterPrint:
         Returns:
             Caminho do arquivo temporário criado
         """
+        from docx import Document
+        
         try:
             # Cria documento em branco
             doc = Document()
@@ -44,7 +43,8 @@ class PrinterPrint:
             self.logger.error(f"Erro ao criar documento em branco: {e}", exc_info=True)
             raise
     
-    def print_blank_page(self, printer_name: str, copies: int = 1, timeout_seconds: int = 30) -> Dict[str, Any]:
+    def print_blank_page(self, printer_name: str, copies: int = 1, timeout_seconds: int = 30,
+                         collate: Optional[bool] = None, duplex: Optional[str] = None) -> Dict[str, Any]:
         """
         Imprime uma página em branco usando documento DOCX e monitora o status
         
@@ -52,6 +52,8 @@ class PrinterPrint:
             printer_name: Nome da impressora
             copies: Número de cópias
             timeout_seconds: Tempo máximo para aguardar conclusão
+            collate: Agrupar cópias (via DEVMODE; None mantém o padrão do driver)
+            duplex: 'simplex', 'long_edge' ou 'short_edge' (via DEVMODE)
             
         Returns:
             Dict com informações detalhadas sobre a impressão
@@ -69,6 +71,8 @@ class PrinterPrint:
             'paper_out_error': False  # Nova flag para indicar erro de falta de papel
         }
         
+        import pythoncom
+        
         temp_file_path = None
         
         try:
@@ -80,7 +84,7 @@ class PrinterPrint:
             pythoncom.CoInitialize()
             
             # Usa o comando de impressão do Windows para o arquivo DOCX
-            job_ids = self._print_docx_file(temp_file_path, printer_name, copies)
+            job_ids = self._print_docx_file(temp_file_path, printer_name, copies, collate, duplex)
             
             if job_ids:
                 result['job_ids'] = job_ids
@@ -155,13 +159,15 @@ class PrinterPrint:
                         paper_error_detected = True
                         self.logger.warning(f"Erro de falta de papel detectado no job {job_info['job_id']}")
         
-        # Inicia monitoramento específico para os jobs
+        # Inicia monitoramento específico para os jobs: rápido enquanto imprimem,
+        # recuando até 2 segundos quando nada muda
         self.job_manager.monitor_jobs(
             printer_name=printer_name,
             callback=job_callback,
-            interval=2,  # Verifica a cada 2 segundos
+            interval=2,
             specific_job_ids=job_ids,
-            monitor_all=False  # Monitora apenas os jobs específicos
+            monitor_all=False,  # Monitora apenas os jobs específicos
+            polling_policy=AdaptivePollingPolicy(min_interval=0.5, max_interval=2)
         )
         
         try:
@@ -205,48 +211,69 @@ class PrinterPrint:
         
         return result
     
-    def _print_docx_file(self, file_path: str, printer_name: str, copies: int) -> List[int]:
+    def _print_docx_file(self, file_path: str, printer_name: str, copies: int,
+                         collate: Optional[bool] = None, duplex: Optional[str] = None) -> List[int]:
         """
         Imprime um arquivo DOCX usando o comando de impressão do Windows
         
+        As cópias, o agrupamento e o duplex vão no DEVMODE, gerando um único job
+        que a impressora repete. Se o driver ignorar as cópias no DEVMODE, envia
+        um job por cópia.
+        
         Args:
             file_path: Caminho do arquivo DOCX
             printer_name: Nome da impressora
             copies: Número de cópias
+            collate: Agrupar cópias
+            duplex: Modo de duplex
             
         Returns:
             Lista de IDs de jobs criados
         """
+        import win32api
+        from .devmode import devmode_settings, list_job_ids, wait_for_new_job
+        
         job_ids = []
         
         try:
-            # Usa o comando de impressão nativo do Windows
-            for copy in range(copies):
-                # Comando para imprimir o arquivo
-                win32api.ShellExecute(
-                    0,              # hwnd
-                    "print",        # operation
-                    file_path,      # file
-                    f'"{printer_name}"',  # parameters (printer name)
-                    ".",            # directory
-                    0               # show command
-                )
-                
-                self.logger.info(f"Cópia {copy + 1} enviada para impressora '{printer_name}'")
-                
-                # Pequena pausa entre cópias
-                time.sleep(3)
+            with devmode_settings(printer_name, copies, collate, duplex) as native:
+                known_ids = list_job_ids(printer_name)
+                if native:
+                    win32api.ShellExecute(0, "print", file_path, f'"{printer_name}"', ".", 0)
+                    
+                    # O DEVMODE só pode ser restaurado depois que o aplicativo criar o job
+                    job_id = wait_for_new_job(printer_name, known_ids, document=file_path)
+                    if job_id is not None:
+                        self.logger.info(f"{copies} cópia(s) enviadas para '{printer_name}' no job {job_id}")
+                        return [job_id]
+                    self.logger.warning(f"Job não apareceu na fila de '{printer_name}' dentro do tempo esperado")
+                else:
+                    # Fallback: driver ignora cópias no DEVMODE, um job por cópia
+                    for copy in range(copies):
+                        # Comando para imprimir o arquivo
+                        win32api.ShellExecute(
+                            0,              # hwnd
+                            "print",        # operation
+                            file_path,      # file
+                            f'"{printer_name}"',  # parameters (printer name)
+                            ".",            # directory
+                            0               # show command
+                        )
+                        
+                        self.logger.info(f"Cópia {copy + 1} enviada para impressora '{printer_name}'")
+                        
+                        # Pequena pausa entre cópias
+                        time.sleep(3)
             
             # Para obter os job IDs, precisamos verificar os jobs recém-criados
             time.sleep(2)  # Aguarda um pouco para os jobs aparecerem
             
             # Obtém jobs atuais usando o job_manager
             current_jobs = self.job_manager.list_jobs(printer_name)
-            job_ids = [job['job_id'] for job in current_jobs]
+            job_ids = [job['job_id'] for job in current_jobs if job['job_id'] not in known_ids]
             
         except Exception as e:
             self.logger.error(f"Erro ao imprimir arquivo DOCX: {e}", exc_info=True)
             raise
         
         return job_ids
-    
\ No newline at end of file
@@ -1,7 +1,8 @@
-from typing import Dict, Optional, Any, List
-from utils import Singleton
+from typing import Dict, Optional, Any, List, Tuple
+from utils import ServiceRef
 from .logging import AppLogger  # importa o logger centralizado
 import win32print
+import threading
 import time
 from enum import Enum
 
@@ -37,51 +38,96 @@ class PrinterStatus(Enum):
     UNKNOWN = 99
 
 
-@Singleton
 class PrinterAccessManager:
     """Classe para gerenciar acesso e operações em impressoras"""
     
+    instance = ServiceRef('printer_access_manager')
+    
     def __init__(self):
         from .list_available_imp import PrinterListManager
-        self.open_handles: Dict[str, Any] = {}
+        # Handles por (impressora, acesso): um handle de administração não é
+        # reaproveitado para consultas e vice-versa
+        self.open_handles: Dict[Tuple[str, int], Any] = {}
+        # Usuários de cada handle: threads distintas consultando a mesma impressora
+        # compartilham o handle e só a última a liberar o fecha
+        self._handle_refs: Dict[Tuple[str, int], int] = {}
+        self._handles_lock = threading.Lock()
         self.printer_list_manager = PrinterListManager.instance
         self.logger = AppLogger.instance.get_logger(__name__) # type: ignore
     
     def open_printer(self, printer_name: str, desired_access: int = win32print.PRINTER_ACCESS_USE) -> Optional[Any]:
         """Abre uma conexão com a impressora com nível de acesso específico"""
+        key = (printer_name, desired_access)
         try:
-            if printer_name in self.open_handles:
-                self.logger.debug(f"Handle já aberto para a impressora: {printer_name}")
-                return self.open_handles[printer_name]
-            
+            with self._handles_lock:
+                if key in self.open_handles:
+                    self._handle_refs[key] += 1
+                    self.logger.debug(f"Handle já aberto para a impressora: {printer_name}")
+                    return self.open_handles[key]
+
+            # OpenPrinter fora do lock: um servidor lento não bloqueia as demais impressoras
             handle = win32print.OpenPrinter(printer_name, {"DesiredAccess": desired_access})
-            self.open_handles[printer_name] = handle
+            with self._handles_lock:
+                existing = self.open_handles.get(key)
+                if existing is None:
+                    self.open_handles[key] = handle
+                    self._handle_refs[key] = 1
+                else:
+                    self._handle_refs[key] += 1
+            if existing is not None:
+                # Outra thread abriu a mesma impressora enquanto isso: usa o handle dela
+                win32print.ClosePrinter(handle)
+                return existing
             self.logger.info(f"Impressora '{printer_name}' aberta com sucesso (acesso: {desired_access}).")
             return handle
         except Exception as e:
             self.logger.error(f"Erro ao abrir impressora {printer_name}: {e}", exc_info=True)
             return None
-    def close_printer(self, printer_name: str) -> bool:
-        """Fecha a conexão com uma impressora"""
+    def close_printer(self, printer_name: str, desired_access: int = win32print.PRINTER_ACCESS_USE) -> bool:
+        """Libera a conexão com uma impressora; o handle é fechado quando o último usuário o libera"""
+        key = (printer_name, desired_access)
         try:
-            if printer_name in self.open_handles:
-                win32print.ClosePrinter(self.open_handles[printer_name])
-                del self.open_handles[printer_name]
-                self.logger.info(f"Impressora '{printer_name}' fechada com sucesso.")
+            with self._handles_lock:
+                if key not in self.open_handles:
+                    return True
+                refs = self._handle_refs[key] - 1
+                if refs > 0:
+                    self._handle_refs[key] = refs
+                    return True
+                handle = self.open_handles.pop(key)
+                del self._handle_refs[key]
+            win32print.ClosePrinter(handle)
+            self.logger.info(f"Impressora '{printer_name}' fechada com sucesso.")
             return True
         except Exception as e:
             self.logger.error(f"Erro ao fechar impressora {printer_name}: {e}", exc_info=True)
             return False 
     def close_all_printers(self) -> bool:
-        """Fecha todas as conexões abertas com impressoras"""
+        """
+        Fecha todas as conexões ociosas com impressoras
+
+        Handles ainda em uso por outra thread não são fechados aqui: continuam
+        válidos e são fechados quando o último usuário chamar close_printer.
+        """
+        with self._handles_lock:
+            idle = [key for key in self.open_handles if self._handle_refs.get(key, 0) <= 0]
+            handles = [(key, self.open_handles.pop(key)) for key in idle]
+            for key in idle:
+                self._handle_refs.pop(key, None)
+            in_use = len(self.open_handles)
         success = True
-        for printer_name in list(self.open_handles.keys()):
-            if not self.close_printer(printer_name):
+        for (printer_name, _), handle in handles:
+            try:
+                win32print.ClosePrinter(handle)
+            except Exception as e:
+                self.logger.error(f"Erro ao fechar impressora {printer_name}: {e}", exc_info=True)
                 success = False
-        if success:
-            self.logger.info("Todas as conexões com impressoras foram fechadas.")
-        else:
+        if not success:
             self.logger.warning("Algumas impressoras não puderam ser fechadas corretamente.")
+        elif in_use:
+            self.logger.info(f"{in_use} conexões ainda em uso serão fechadas ao serem liberadas.")
+        else:
+            self.logger.info("Todas as conexões com impressoras foram fechadas.")
         return success
     def _decode_status(self, status_code: int) -> List[str]:
         """Decodifica o código de status da impressora"""
@@ -3,18 +3,24 @@ from typing import List, Dict, Optional, Callable
 import time
 from .logging import AppLogger
 from .printer_access_manager import PrinterAccessManager
+from .job_operations import JobOperations
+from .status_imp import is_sleeping_status, read_polling_status
+from utils import EventBus
 from datetime import datetime, timedelta
 import threading
 
 
-class PrinterJobManager:
-    """Classe para gerenciar jobs de impressão"""
+class PrinterJobManager(JobOperations):
+    """Classe para gerenciar jobs de impressão (paginação e operações em lote em JobOperations)"""
 
-    def __init__(self):
+    def __init__(self, event_bus: Optional[EventBus] = None):
         self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
         self.access_manager = PrinterAccessManager.instance
+        self.events = event_bus or EventBus()
+        self._subscription = None
         self._monitoring = False
         self._monitor_threading = None
+        self._polling_policy = None
     def __del__(self):
         """Destrutor - garante que o monitoramento seja parado antes da destruição do objeto"""
         try:
@@ -28,35 +34,10 @@ class PrinterJobManager:
             except:
                 pass  # Ignora erros de logging durante a destruição
     def list_jobs(self, printer_name: str) -> List[Dict]:
-        """Lista todos os jobs de impressão de uma impressora"""
-        handle = self.access_manager.open_printer(printer_name) # type: ignore
-        if not handle:
-            return []
-
-        try:
-            jobs = win32print.EnumJobs(handle, 0, -1, 2)
-            jobs_info = []
-            for job in jobs:
-                jobs_info.append({
-                    "job_id": job["JobId"],
-                    "document_name": job["pDocument"],
-                    "status": self.access_manager._decode_job_status(job["Status"]), # type: ignore
-                    "status_code": job["Status"],
-                    "pages_printed": job["PagesPrinted"],
-                    "total_pages": job["TotalPages"],
-                    "submitted_time": job["Submitted"].isoformat() if job["Submitted"] else None,
-                    "user_name": job["pUserName"],
-                    "machine_name": job["pMachineName"],
-                    "data_type": job["pDatatype"],
-                    "priority": job["Priority"]
-                })
-            self.logger.info(f"Encontrados {len(jobs_info)} jobs em {printer_name}")
-            return jobs_info
-        except Exception as e:
-            self.logger.error(f"Erro ao listar jobs em {printer_name}: {e}", exc_info=True)
-            return []
-        finally:
-            self.access_manager.close_printer(printer_name) # type: ignore
+        """Lista todos os jobs de impressão de uma impressora (em páginas, via iter_jobs)"""
+        jobs_info = list(self.iter_jobs(printer_name))
+        self.logger.info(f"Encontrados {len(jobs_info)} jobs em {printer_name}")
+        return jobs_info
     def get_job(self, printer_name: str, job_id: int) -> Optional[Dict]:
         """Obtém informações detalhadas de um job específico"""
         handle = self.access_manager.open_printer(printer_name) # type: ignore
@@ -142,16 +123,19 @@ class PrinterJobManager:
                     callback: Callable[[Dict], None],
                     interval: int = 5,
                     specific_job_ids: Optional[List[int]] = None,
-                    monitor_all: bool = True) -> bool:
+                    monitor_all: bool = True,
+                    polling_policy=None) -> bool:
         """
         Inicia o monitoramento de jobs de impressão
         
         Args:
             printer_name: Nome da impressora a ser monitorada
-            callback: Função chamada quando há mudanças nos jobs
+            callback: Função chamada quando há mudanças nos jobs (na thread do
+                assinante no barramento `self.events`, fora do loop de consulta)
             interval: Intervalo de verificação em segundos
             specific_job_ids: Lista de IDs específicos para monitorar
             monitor_all: Se True, monitora todos os jobs; se False, apenas os específicos
+            polling_policy: AdaptivePollingPolicy opcional; substitui o intervalo fixo
         
         Returns:
             bool: True se o monitoramento foi iniciado com sucesso
@@ -161,9 +145,12 @@ class PrinterJobManager:
             return False
 
         self._monitoring = True
+        self._polling_policy = polling_policy
+        self._subscription = self.events.subscribe(callback, printers=[printer_name],
+                                                   name=f"job-manager-{printer_name}")
         self._monitor_thread = threading.Thread(
             target=self._monitor_loop,
-            args=(printer_name, callback, interval, specific_job_ids, monitor_all),
+            args=(printer_name, interval, specific_job_ids, monitor_all),
             daemon=True
         )
         self._monitor_thread.start()
@@ -175,10 +162,12 @@ class PrinterJobManager:
         self._monitoring = False
         if self._monitor_thread and self._monitor_thread.is_alive():
             self._monitor_thread.join(timeout=2.0)
+        if self._subscription is not None:
+            self.events.unsubscribe(self._subscription, timeout=2.0)
+            self._subscription = None
         self.logger.info("Monitoramento parado")
     def _monitor_loop(self, 
                     printer_name: str, 
-                    callback: Callable[[Dict], None],
                     interval: int,
                     specific_job_ids: Optional[List[int]],  # ← Parâmetro definido aqui
                     monitor_all: bool):
@@ -198,20 +187,27 @@ class PrinterJobManager:
                 # Verificar mudanças
                 changes = self._detect_job_changes(last_jobs_state, current_jobs_dict)
                 
-                if changes:
-                    for change_info in changes:
-                        callback(change_info)
+                # Só enfileira: callbacks lentos não atrasam a próxima consulta
+                for change_info in changes:
+                    self.events.publish({**change_info, 'printer_name': printer_name})
                 
                 last_jobs_state = current_jobs_dict
                 
             except Exception as e:
                 self.logger.error(f"Erro no loop de monitoramento: {e}", exc_info=True)
+                changes = []
             
             # Aguardar próximo ciclo
-            for _ in range(interval * 10):
-                if not self._monitoring:
-                    break
-                time.sleep(0.1)
+            wait_time = interval
+            if self._polling_policy is not None:
+                status = read_polling_status(printer_name, self.access_manager)
+                wait_time = self._polling_policy.next_interval(
+                    printer_name, active=bool(last_jobs_state), changed=bool(changes),
+                    sleeping=is_sleeping_status(status)
+                )
+            deadline = time.monotonic() + wait_time
+            while self._monitoring and time.monotonic() < deadline:
+                time.sleep(min(0.1, max(0.0, deadline - time.monotonic())))
     def _detect_job_changes(self, 
                           old_jobs: Dict[int, Dict], 
                           new_jobs: Dict[int, Dict]) -> List[Dict]:
@@ -277,42 +273,12 @@ class PrinterJobManager:
         Returns:
             Lista de jobs recentes
         """
-        handle = self.access_manager.open_printer(printer_name) # type: ignore
-        if not handle:
-            return []
-
-        try:
-            # Buscar jobs completados/falhos (status 4 ou 5)
-            jobs = win32print.EnumJobs(handle, 0, -1, 2)
-            
-            cutoff_time = datetime.now() - timedelta(hours=hours_back)
-            recent_jobs = []
-            
-            for job in jobs:
-                if job["Submitted"] and job["Submitted"] > cutoff_time:
-                    job_info = {
-                        "job_id": job["JobId"],
-                        "document_name": job["pDocument"],
-                        "status": self.access_manager._decode_job_status(job["Status"]), # type: ignore
-                        "status_code": job["Status"],
-                        "pages_printed": job["PagesPrinted"],
-                        "total_pages": job["TotalPages"],
-                        "submitted_time": job["Submitted"].isoformat() if job["Submitted"] else None,
-                        "completion_time": None,
-                        "user_name": job["pUserName"],
-                        "machine_name": job["pMachineName"],
-                        "data_type": job["pDatatype"],
-                        "priority": job["Priority"]
-                    }
-                    recent_jobs.append(job_info)
-            
-            return sorted(recent_jobs, key=lambda x: x['submitted_time'] or '', reverse=True)
-            
-        except Exception as e:
-            self.logger.error(f"Erro ao obter histórico de jobs: {e}", exc_info=True)
-            return []
-        finally:
-            self.access_manager.close_printer(printer_name) # type: ignore
+        cutoff_time = datetime.now() - timedelta(hours=hours_back)
+        recent_jobs = [
+            {**job_info, "completion_time": None}
+            for job_info in self.iter_jobs(printer_name, submitted_after=cutoff_time)
+        ]
+        return sorted(recent_jobs, key=lambda x: x['submitted_time'] or '', reverse=True)
     def is_monitoring(self) -> bool:
         """Verifica se o monitoramento está ativo"""
         return self._monitoring
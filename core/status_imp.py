@@ -1,4 +1,5 @@
-from typing import Dict, Union
+from typing import Any, Dict, Union
+from enum import IntEnum
 import time
 import win32print
 
@@ -8,6 +9,109 @@ from .printer_access_manager import PrinterStatus
 from .print_manager import PrinterPrint
 
 
+class StatusDetail(IntEnum):
+    """
+    Nível de detalhe de uma consulta de status
+
+    Custo no spooler de cada nível:
+        COUNTERS: OpenPrinter + GetPrinter(2) + ClosePrinter (sem decodificação)
+        STATUS:   mesmas chamadas + status e atributos decodificados
+        FULL:     mesmas chamadas + servidor, porta, driver, local e modelo
+        DRIVER:   FULL + GetPrinterDriver(2) no mesmo handle
+    O número de jobs vem de cJobs (PRINTER_INFO_2); nenhum nível enumera a fila.
+    """
+    COUNTERS = 1
+    STATUS = 2
+    FULL = 3
+    DRIVER = 4
+
+
+def build_status_result(printer_name: str, printer_info: Dict[str, Any],
+                        detail: StatusDetail, access_manager) -> Dict[str, Any]:
+    """
+    Monta o resultado de status a partir de um PRINTER_INFO_2 já obtido
+
+    Args:
+        printer_name: Nome da impressora
+        printer_info: Retorno de GetPrinter nível 2
+        detail: Nível de detalhe desejado
+        access_manager: PrinterAccessManager (decodificação de flags)
+    """
+    status_code = printer_info['Status']
+    result: Dict[str, Any] = {
+        'printer_name': printer_name,
+        'detail': detail.name.lower(),
+        'status_code': status_code,
+        'is_online': not bool(status_code & win32print.PRINTER_STATUS_OFFLINE),
+        'is_ready': status_code == 0,
+        'job_count': printer_info['cJobs'],
+    }
+    if detail >= StatusDetail.STATUS:
+        result['status'] = access_manager._decode_status(status_code)
+        result['attributes'] = access_manager._decode_attributes(printer_info['Attributes'])
+    if detail >= StatusDetail.FULL:
+        from utils import detect_printer_model
+        result.update({
+            'server_name': printer_info['pServerName'],
+            'share_name': printer_info['pShareName'],
+            'port_name': printer_info['pPortName'],
+            'driver_name': printer_info['pDriverName'],
+            'location': printer_info['pLocation'],
+            'comment': printer_info['pComment'],
+            'model': detect_printer_model(printer_name, printer_info['pShareName'],
+                                          printer_info['pDriverName'], printer_info['pComment'])
+        })
+    return result
+
+
+def read_printer_status(handle, printer_name: str, detail: StatusDetail, access_manager) -> Dict[str, Any]:
+    """Executa as chamadas mínimas do nível pedido em um handle já aberto"""
+    printer_info = win32print.GetPrinter(handle, 2)
+    result = build_status_result(printer_name, printer_info, detail, access_manager)
+    if detail >= StatusDetail.DRIVER:
+        driver_info = win32print.GetPrinterDriver(handle, None, 2)
+        result['driver'] = {
+            'name': driver_info['Name'],
+            'version': driver_info['Version'],
+            'environment': driver_info['Environment'],
+            'driver_path': driver_info['DriverPath'],
+            'data_file': driver_info['DataFile'],
+            'config_file': driver_info['ConfigFile']
+        }
+    return result
+
+
+def is_sleeping_status(status: Dict[str, Any]) -> bool:
+    """
+    Indica se o status é de uma impressora offline ou em economia de energia
+
+    Args:
+        status: Resultado de read_printer_status (ou snapshot com
+            'status_code' e 'is_online')
+    """
+    status_code = status.get('status_code') or 0
+    return not status.get('is_online') or bool(status_code & win32print.PRINTER_STATUS_POWER_SAVE)
+
+
+def read_polling_status(printer_name: str, access_manager) -> Dict[str, Any]:
+    """
+    Lê o status COUNTERS usado pelas políticas de consulta adaptativas
+
+    Returns:
+        Resultado de read_printer_status, ou {'is_online': False} se a
+        impressora não abrir ou a consulta falhar
+    """
+    handle = access_manager.open_printer(printer_name)
+    if not handle:
+        return {'is_online': False}
+    try:
+        return read_printer_status(handle, printer_name, StatusDetail.COUNTERS, access_manager)
+    except Exception:
+        return {'is_online': False}
+    finally:
+        access_manager.close_printer(printer_name)
+
+
 class PrinterStatusManager:
     """Classe para gerenciar e verificar o status de impressoras de forma mais alto nível"""
 
@@ -17,11 +121,16 @@ class PrinterStatusManager:
         self.access_manager = PCA
         self.printer_print = PrinterPrint(PCA, logger_instance)
         self.logger.info("PrinterStatusManager inicializado")
-    def get_printer_status(self, printer_name: str) -> Dict:
+    def get_printer_status(self, printer_name: str, detail: StatusDetail = StatusDetail.FULL) -> Dict:
         """
-        Obtém o status completo da impressora
+        Obtém o status da impressora no nível de detalhe pedido
+
+        Args:
+            printer_name: Nome da impressora
+            detail: StatusDetail (COUNTERS é o caminho rápido "online e quantos jobs")
         """
-        self.logger.debug(f"Obtendo status da impressora: {printer_name}")
+        detail = StatusDetail(detail)
+        self.logger.debug(f"Obtendo status ({detail.name}) da impressora: {printer_name}")
 
         handle = self.access_manager.open_printer(printer_name) # type: ignore
         if not handle:
@@ -34,31 +143,8 @@ class PrinterStatusManager:
             }
 
         try:
-            printer_info = win32print.GetPrinter(handle, 2)
-
-            # Usa o decode já existente
-            status_list = self.access_manager._decode_status(printer_info['Status']) # type: ignore
-            attributes_list = self.access_manager._decode_attributes(printer_info['Attributes']) # type: ignore
-
-            jobs = self.get_job_count(printer_name)
-
-            result = {
-                'status': status_list,
-                'status_code': printer_info['Status'],
-                'is_online': not bool(printer_info['Status'] & win32print.PRINTER_STATUS_OFFLINE),
-                'is_ready': printer_info['Status'] == 0,
-                'attributes': attributes_list,
-                'job_count': jobs,
-                'printer_name': printer_name,
-                'server_name': printer_info['pServerName'],
-                'share_name': printer_info['pShareName'],
-                'port_name': printer_info['pPortName'],
-                'driver_name': printer_info['pDriverName'],
-                'location': printer_info['pLocation'],
-                'comment': printer_info['pComment']
-            }
-
-            self.logger.debug(f"Status completo obtido: {result}")
+            result = read_printer_status(handle, printer_name, detail, self.access_manager)
+            self.logger.debug(f"Status obtido: {result}")
             return result
         except Exception as e:
             self.logger.error(f"Erro ao obter status da impressora {printer_name}: {e}", exc_info=True)
@@ -71,26 +157,16 @@ class PrinterStatusManager:
         finally:
             self.access_manager.close_printer(printer_name) # type: ignore
     def get_job_count(self, printer_name: str) -> int:
-        """Obtém o número de jobs na fila de impressão"""
-        try:
-            handle = self.access_manager.open_printer(printer_name) # type: ignore
-            if not handle:
-                return 0
-
-            jobs = win32print.EnumJobs(handle, 0, -1, 1)
-            return len(jobs)
-        except Exception as e:
-            self.logger.error(f"Erro ao obter contagem de jobs para {printer_name}: {e}")
-            return 0
-        finally:
-            self.access_manager.close_printer(printer_name) # type: ignore
+        """Obtém o número de jobs na fila de impressão (cJobs, sem enumerar a fila)"""
+        status = self.get_printer_status(printer_name, StatusDetail.COUNTERS)
+        return status.get('job_count', 0)
     def monitor_printer_status(self, printer_name: str, interval: int = 5, duration: int = 60) -> None:
         """Monitora o status da impressora por um período"""
         self.logger.info(f"Iniciando monitoramento da impressora {printer_name}")
 
         start_time = time.time()
         while time.time() - start_time < duration:
-            status = self.get_printer_status(printer_name)
+            status = self.get_printer_status(printer_name, StatusDetail.STATUS)
             self.logger.info(
                 f"[Monitoramento] {printer_name}: {status['status']} | "
                 f"Online: {status['is_online']} | Jobs: {status['job_count']}"
@@ -99,15 +175,13 @@ class PrinterStatusManager:
 
         self.logger.info(f"Monitoramento da impressora {printer_name} concluído")
     def modify_printer_status(self, printer_name: str, action: str) -> bool:
-        handle = None
-        try:
-            desired_access = win32print.PRINTER_ACCESS_ADMINISTER
-            handle = self.access_manager.open_printer(printer_name, desired_access) # type: ignore
-            
-            if not handle:
-                self.logger.error(f"Não foi possível abrir a impressora {printer_name}")
-                return False
+        desired_access = win32print.PRINTER_ACCESS_ADMINISTER
+        handle = self.access_manager.open_printer(printer_name, desired_access) # type: ignore
+        if not handle:
+            self.logger.error(f"Não foi possível abrir a impressora {printer_name}")
+            return False
 
+        try:
             if action == 'pause':
                 # Para Level=0 (PRINTER_CONTROL_*), pPrinter deve ser None
                 win32print.SetPrinter(handle, 0, None, win32print.PRINTER_CONTROL_PAUSE)
@@ -128,7 +202,7 @@ class PrinterStatusManager:
             self.logger.error(f"Erro ao modificar status da impressora {printer_name}: {e}", exc_info=True)
             return False
         finally:
-            self.access_manager.close_printer(printer_name) # type: ignore
+            self.access_manager.close_printer(printer_name, desired_access) # type: ignore
     def check_paper_status(self, printer_name: str, force_update: bool = False) -> Dict[str, Union[bool, str]]:
         """
         Verifica o estado do papel na impressora com verificações adicionais
@@ -156,7 +230,7 @@ class PrinterStatusManager:
                 # Aguarda um breve momento para o sistema atualizar o status
                 time.sleep(2)
             
-            status = self.get_printer_status(printer_name)
+            status = self.get_printer_status(printer_name, StatusDetail.COUNTERS)
             
             paper_status: Dict[str, Union[bool, str]] = {
                 'paper_available': True,
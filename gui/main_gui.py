@@ -0,0 +1,748 @@
+"""
+Interface gráfica de monitoramento de impressoras e jobs.
+
+Toda consulta ao spooler roda em threads de trabalho (SpoolerWorker); a
+thread da interface só recebe diferenças já calculadas por uma fila e as
+aplica em lote, no máximo `fps` vezes por segundo. As tabelas são
+virtualizadas: apenas as linhas visíveis existem no Canvas, então uma fila
+de 10 mil jobs custa para desenhar o mesmo que uma de 30.
+
+Uso:
+    python -m gui.main_gui
+    python -m gui.main_gui --simulate 200 --jobs 50        (spooler simulado, ex: Linux)
+    xvfb-run -a python -m gui.main_gui --simulate 5 --jobs 10000 --exit-after 10
+"""
+import argparse
+import queue
+import threading
+import time
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+Row = Tuple[Any, ...]
+
+
+class Column(NamedTuple):
+    key: str
+    title: str
+    width: int
+    anchor: str = 'w'
+
+
+PRINTER_COLUMNS = [
+    Column('name', "Impressora", 280),
+    Column('status', "Status", 260),
+    Column('jobs', "Jobs", 60, 'e'),
+    Column('online', "Online", 60),
+    Column('type', "Tipo", 80),
+    Column('protocol', "Protocolo", 80),
+]
+
+JOB_COLUMNS = [
+    Column('job_id', "ID", 60, 'e'),
+    Column('document_name', "Documento", 240),
+    Column('status', "Status", 160),
+    Column('pages_printed', "Impressas", 70, 'e'),
+    Column('total_pages', "Páginas", 60, 'e'),
+    Column('user_name', "Usuário", 90),
+    Column('machine_name', "Máquina", 110),
+    Column('submitted_time', "Enviado", 150),
+    Column('priority', "Prioridade", 70, 'e'),
+]
+
+
+def printer_row(name: str, status: Dict[str, Any], info: Dict[str, Any]) -> Row:
+    states = status.get('status')
+    # Falha de consulta: status é PrinterStatus.UNKNOWN e o motivo vem em 'details'
+    text = ', '.join(states) if isinstance(states, list) else status.get('details') or str(states)
+    return (name, text, status.get('job_count'), "Sim" if status.get('is_online') else "Não",
+            info.get('type'), info.get('protocol'))
+
+
+def job_row(job: Dict[str, Any]) -> Row:
+    submitted = job.get('submitted_time')
+    return (job['job_id'], job.get('document_name'), ', '.join(job.get('status') or ()),
+            job.get('pages_printed'), job.get('total_pages'), job.get('user_name'), job.get('machine_name'),
+            submitted.replace('T', ' ')[:19] if submitted else None, job.get('priority'))
+
+
+def diff_rows(old: Dict[Hashable, Row], new: Dict[Hashable, Row]) -> Tuple[Dict[Hashable, Row], List[Hashable]]:
+    """Linhas novas ou alteradas e chaves removidas de `old` para `new`"""
+    upserts = {key: row for key, row in new.items() if old.get(key) != row}
+    removed = [key for key in old if key not in new]
+    return upserts, removed
+
+
+class TableModel:
+    """
+    Linhas de uma tabela (chave -> valores) com ordenação sob demanda
+
+    Não depende de Tk. A ordem só é recalculada quando entram ou saem
+    linhas ou muda o valor da coluna ordenada; atualizar outros campos
+    (ex: páginas impressas) não reordena a tabela.
+    """
+
+    def __init__(self, columns: Sequence[Column], sort_column: int = 0, reverse: bool = False) -> None:
+        self.columns = list(columns)
+        self.rows: Dict[Hashable, Row] = {}
+        self.sort_column = sort_column
+        self.reverse = reverse
+        self._order: List[Hashable] = []
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def apply(self, upserts: Dict[Hashable, Row], removed: Iterable[Hashable] = ()) -> bool:
+        """Aplica uma diferença; retorna True se alguma linha mudou"""
+        changed = False
+        for key in removed:
+            if self.rows.pop(key, None) is not None:
+                changed = self._dirty = True
+        column = self.sort_column
+        for key, row in upserts.items():
+            old = self.rows.get(key)
+            if old == row:
+                continue
+            if old is None or old[column] != row[column]:
+                self._dirty = True
+            self.rows[key] = row
+            changed = True
+        return changed
+
+    def clear(self) -> None:
+        self.rows = {}
+        self._order = []
+        self._dirty = False
+
+    def sort_by(self, column: int, reverse: Optional[bool] = None) -> None:
+        """Ordena pela coluna; sem `reverse`, clicar de novo na mesma coluna inverte a ordem"""
+        if reverse is None:
+            reverse = not self.reverse if column == self.sort_column else False
+        self.sort_column = column
+        self.reverse = reverse
+        self._dirty = True
+
+    def _sort_key(self, key: Hashable) -> Tuple:
+        value = self.rows[key][self.sort_column]
+        return (value is None, value if value is not None else 0, key)
+
+    @property
+    def order(self) -> List[Hashable]:
+        if self._dirty:
+            self._order = sorted(self.rows, key=self._sort_key, reverse=self.reverse)
+            self._dirty = False
+        return self._order
+
+    def index_of(self, key: Hashable) -> Optional[int]:
+        try:
+            return self.order.index(key)
+        except ValueError:
+            return None
+
+
+def format_cell(value: Any, limit: int) -> str:
+    if value is None:
+        return ''
+    text = str(value)
+    return text if len(text) <= limit else text[:max(1, limit - 1)] + '…'
+
+
+class VirtualTable(ttk.Frame):
+    """
+    Tabela virtualizada sobre um Canvas
+
+    Existem itens de Canvas apenas para as linhas que cabem na área visível
+    (mais uma); rolar ou atualizar só troca o texto desses itens, e somente
+    quando ele muda. O custo de desenhar independe do número de linhas.
+    """
+
+    ROW_HEIGHT = 20
+    CHAR_WIDTH = 7
+    STRIPE = '#f5f5f5'
+    SELECTED = '#cce4ff'
+
+    def __init__(self,
+                 master,
+                 model: TableModel,
+                 on_select: Optional[Callable[[Optional[Hashable]], None]] = None,
+                 **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        self.model = model
+        self.on_select = on_select
+        self.selected: Optional[Hashable] = None
+        self._top = 0
+        self._height = 0
+        self._slots: List[Tuple[int, List[int]]] = []
+        self._cache: List[List[Any]] = []
+        self._render_pending = False
+
+        self._x: List[int] = []
+        x = 0
+        for column in model.columns:
+            self._x.append(x)
+            x += column.width
+        self._width = x
+        self._limits = [max(1, (column.width - 8) // self.CHAR_WIDTH) for column in model.columns]
+
+        self.header = tk.Canvas(self, height=self.ROW_HEIGHT + 4, highlightthickness=0, background='#e6e6e6')
+        self.body = tk.Canvas(self, highlightthickness=0, background='white', takefocus=1)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.header.grid(row=0, column=0, columnspan=2, sticky='ew')
+        self.body.grid(row=1, column=0, sticky='nsew')
+        self.scrollbar.grid(row=1, column=1, sticky='ns')
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self._header_items = []
+        for index, column in enumerate(model.columns):
+            self.header.create_line(self._x[index] + column.width - 1, 2,
+                                    self._x[index] + column.width - 1, self.ROW_HEIGHT + 2, fill='#c0c0c0')
+            self._header_items.append(self.header.create_text(self._text_x(index), self.ROW_HEIGHT // 2 + 2,
+                                                              anchor=column.anchor, text=column.title))
+        self._update_header()
+
+        self.header.bind('<Button-1>', self._on_header_click)
+        self.body.bind('<Configure>', self._on_configure)
+        self.body.bind('<Button-1>', self._on_click)
+        self.body.bind('<MouseWheel>', self._on_wheel)
+        self.body.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.body.bind('<Button-5>', lambda event: self.scroll(3))
+        self.body.bind('<Up>', lambda event: self.move_selection(-1))
+        self.body.bind('<Down>', lambda event: self.move_selection(1))
+        self.body.bind('<Prior>', lambda event: self.move_selection(-self.visible_rows))
+        self.body.bind('<Next>', lambda event: self.move_selection(self.visible_rows))
+
+    @property
+    def visible_rows(self) -> int:
+        return max(1, self._height // self.ROW_HEIGHT)
+
+    @property
+    def top(self) -> int:
+        return self._top
+
+    def _text_x(self, index: int) -> int:
+        column = self.model.columns[index]
+        return self._x[index] + (column.width - 6 if column.anchor == 'e' else 4)
+
+    # ------------------------------------------------------------------
+    # Desenho
+    # ------------------------------------------------------------------
+    def refresh(self) -> None:
+        """Agenda o redesenho (vários pedidos no mesmo ciclo viram um só)"""
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _on_configure(self, event) -> None:
+        self._height = event.height
+        needed = event.height // self.ROW_HEIGHT + 1
+        while len(self._slots) < needed:
+            y = len(self._slots) * self.ROW_HEIGHT
+            rect = self.body.create_rectangle(0, y, max(self._width, event.width), y + self.ROW_HEIGHT,
+                                              width=0, fill='white')
+            items = [self.body.create_text(self._text_x(index), y + self.ROW_HEIGHT // 2,
+                                           anchor=column.anchor, text='')
+                     for index, column in enumerate(self.model.columns)]
+            self._slots.append((rect, items))
+            self._cache.append(['white'] + [''] * len(items))
+        while len(self._slots) > needed:
+            rect, items = self._slots.pop()
+            self._cache.pop()
+            self.body.delete(rect, *items)
+        for rect, _ in self._slots:
+            x0, y0, _, y1 = self.body.coords(rect)
+            self.body.coords(rect, x0, y0, max(self._width, event.width), y1)
+        self._render()
+
+    def _render(self) -> None:
+        self._render_pending = False
+        order = self.model.order
+        rows = self.model.rows
+        total = len(order)
+        self._top = max(0, min(self._top, total - self.visible_rows))
+        blank = [''] * len(self.model.columns)
+        for slot, (rect, items) in enumerate(self._slots):
+            index = self._top + slot
+            cache = self._cache[slot]
+            if index < total:
+                key = order[index]
+                fill = self.SELECTED if key == self.selected else (self.STRIPE if index % 2 else 'white')
+                texts = [format_cell(value, limit) for value, limit in zip(rows[key], self._limits)]
+            else:
+                fill, texts = 'white', blank
+            if cache[0] != fill:
+                self.body.itemconfigure(rect, fill=fill)
+                cache[0] = fill
+            for position, (item, text) in enumerate(zip(items, texts), 1):
+                if cache[position] != text:
+                    self.body.itemconfigure(item, text=text)
+                    cache[position] = text
+        if total:
+            self.scrollbar.set(self._top / total, min(1.0, (self._top + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _update_header(self) -> None:
+        for index, column in enumerate(self.model.columns):
+            title = column.title
+            if index == self.model.sort_column:
+                title += ' ▼' if self.model.reverse else ' ▲'
+            self.header.itemconfigure(self._header_items[index], text=title)
+
+    # ------------------------------------------------------------------
+    # Rolagem, ordenação e seleção
+    # ------------------------------------------------------------------
+    def yview(self, *args) -> None:
+        """Comandos da Scrollbar: ('moveto', fração) ou ('scroll', n, 'units'|'pages')"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self._top = int(float(args[1]) * len(self.model))
+        elif args[0] == 'scroll':
+            step = int(args[1]) * (self.visible_rows if args[2] == 'pages' else 1)
+            self._top += step
+        self.refresh()
+
+    def scroll(self, rows: int) -> None:
+        self._top += rows
+        self.refresh()
+
+    def scroll_to(self, index: int) -> None:
+        self._top = index
+        self.refresh()
+
+    def _on_wheel(self, event) -> None:
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_header_click(self, event) -> None:
+        for index in range(len(self.model.columns) - 1, -1, -1):
+            if event.x >= self._x[index]:
+                self.sort_by(index)
+                return
+
+    def sort_by(self, column: int, reverse: Optional[bool] = None) -> None:
+        self.model.sort_by(column, reverse)
+        self._update_header()
+        self.refresh()
+
+    def _on_click(self, event) -> None:
+        self.body.focus_set()
+        index = self._top + event.y // self.ROW_HEIGHT
+        order = self.model.order
+        if index < len(order):
+            self.select(order[index])
+
+    def select(self, key: Optional[Hashable]) -> None:
+        self.selected = key
+        self.refresh()
+        if self.on_select:
+            self.on_select(key)
+
+    def move_selection(self, delta: int) -> None:
+        order = self.model.order
+        if not order:
+            return
+        current = self.model.index_of(self.selected) if self.selected is not None else None
+        index = max(0, min(len(order) - 1, (current if current is not None else -1) + delta))
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + self.visible_rows:
+            self._top = index - self.visible_rows + 1
+        self.select(order[index])
+
+    @property
+    def selected_row(self) -> Optional[Row]:
+        return self.model.rows.get(self.selected) if self.selected is not None else None
+
+
+class SpoolerWorker:
+    """
+    Consultas ao spooler fora da thread da interface
+
+    Uma thread agenda as consultas (inventário, status de cada impressora e
+    jobs da impressora selecionada) em um pool; cada resultado vira linhas e
+    é comparado com o último enviado ainda na thread do pool, e só a
+    diferença vai para a fila `updates`. Uma impressora lenta ou travada
+    ocupa apenas uma thread do pool e nunca atrasa as demais: a próxima
+    consulta dela só é agendada quando a anterior termina.
+
+    Mensagens publicadas em `updates`:
+        ('printers', {nome: linha}, [nomes removidos])
+        ('jobs', impressora, {job_id: linha}, [job_ids removidos])
+        ('jobs_reset', impressora)
+        ('message', texto)
+    """
+
+    def __init__(self,
+                 updates: "queue.Queue",
+                 max_workers: int = 8,
+                 status_interval: float = 5.0,
+                 job_interval: float = 2.0,
+                 inventory_interval: float = 60.0) -> None:
+        """
+        Args:
+            updates: Fila lida pela thread da interface
+            max_workers: Consultas simultâneas ao spooler
+            status_interval: Intervalo (s) entre consultas de status de cada impressora
+            job_interval: Intervalo (s) entre consultas da fila selecionada
+            inventory_interval: Intervalo (s) entre enumerações de impressoras
+        """
+        from core import AppLogger, PrinterAccessManager, PrinterListManager
+        from services.job import PrinterJobManager
+        from services.status.status_checker import PrinterStatusChecker
+
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.updates = updates
+        self.printer_list = PrinterListManager.instance
+        self.checker = PrinterStatusChecker(PrinterAccessManager.instance)
+        self.job_manager = PrinterJobManager()
+        self.intervals = {'inventory': inventory_interval, 'status': status_interval, 'jobs': job_interval}
+        self._due = dict.fromkeys(self.intervals, 0.0)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gui-spooler")
+        self._in_flight: set = set()
+        self._lock = threading.Lock()
+        self._inventory: Dict[str, Dict[str, Any]] = {}
+        self._printer_rows: Dict[Hashable, Row] = {}
+        self._job_printer: Optional[str] = None
+        self._job_rows: Dict[Hashable, Row] = {}
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="gui-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        # Consultas travadas no spooler não seguram o fechamento da janela
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def refresh(self, *kinds: str) -> None:
+        """Antecipa as consultas indicadas ('inventory', 'status', 'jobs'; padrão: todas)"""
+        for kind in kinds or self.intervals:
+            self._due[kind] = 0.0
+        self._wakeup.set()
+
+    def watch_jobs(self, printer_name: Optional[str]) -> None:
+        """Troca a impressora cuja fila é acompanhada"""
+        with self._lock:
+            if printer_name == self._job_printer:
+                return
+            self._job_printer = printer_name
+            self._job_rows = {}
+            self.updates.put(('jobs_reset', printer_name))
+        self.refresh('jobs')
+
+    def control_jobs(self, action: str, printer_name: str, job_ids: List[int]) -> None:
+        """Executa cancel/pause/resume/restart em segundo plano"""
+        self._submit(('control', printer_name, action), self._control_jobs, action, printer_name, job_ids)
+
+    # ------------------------------------------------------------------
+    # Agendamento
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self._wakeup.clear()
+            now = time.monotonic()
+            if now >= self._due['inventory']:
+                self._due['inventory'] = now + self.intervals['inventory']
+                self._submit(('inventory',), self._load_inventory)
+            if now >= self._due['status']:
+                self._due['status'] = now + self.intervals['status']
+                with self._lock:
+                    names = list(self._inventory)
+                for name in names:
+                    self._submit(('status', name), self._load_status, name)
+            if now >= self._due['jobs']:
+                self._due['jobs'] = now + self.intervals['jobs']
+                printer_name = self._job_printer
+                if printer_name:
+                    self._submit(('jobs', printer_name), self._load_jobs, printer_name)
+            self._wakeup.wait(max(0.05, min(self._due.values()) - time.monotonic()))
+
+    def _submit(self, key: Tuple, function: Callable, *args) -> None:
+        with self._lock:
+            if key in self._in_flight:
+                return
+            self._in_flight.add(key)
+        try:
+            self._executor.submit(self._call, key, function, *args)
+        except RuntimeError:
+            # Pool já encerrado (janela fechando)
+            with self._lock:
+                self._in_flight.discard(key)
+
+    def _call(self, key: Tuple, function: Callable, *args) -> None:
+        try:
+            function(*args)
+        except Exception as e:
+            self.logger.error(f"Erro na consulta {key}: {e}", exc_info=True)
+            self.updates.put(('message', f"Erro: {e}"))
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+    # ------------------------------------------------------------------
+    # Consultas (threads do pool)
+    # ------------------------------------------------------------------
+    def _load_inventory(self) -> None:
+        printers = self.printer_list.organize_printer_data(self.printer_list.list_available_printers())  # type: ignore
+        inventory = {printer['display_name']: printer for printer in printers}
+        with self._lock:
+            added = [name for name in inventory if name not in self._inventory]
+            removed = [name for name in self._inventory if name not in inventory]
+            self._inventory = inventory
+            for name in removed:
+                self._printer_rows.pop(name, None)
+            upserts = {name: printer_row(name, {'status': ["Consultando..."]}, inventory[name]) for name in added}
+            self._printer_rows.update(upserts)
+            if upserts or removed:
+                self.updates.put(('printers', upserts, removed))
+        if added:
+            self.refresh('status')
+
+    def _load_status(self, printer_name: str) -> None:
+        from core import StatusDetail
+
+        status = self.checker.get_printer_status(printer_name, StatusDetail.STATUS)
+        with self._lock:
+            info = self._inventory.get(printer_name)
+            if info is None:
+                return
+            row = printer_row(printer_name, status, info)
+            if self._printer_rows.get(printer_name) == row:
+                return
+            self._printer_rows[printer_name] = row
+            self.updates.put(('printers', {printer_name: row}, []))
+
+    def _load_jobs(self, printer_name: str) -> None:
+        # Nível 1 em páginas grandes: uma fila de 10 mil jobs custa ~20 chamadas, sem GetJob por job
+        rows = {job['job_id']: job_row(job) for job in self.job_manager.iter_jobs(printer_name, page_size=500)}
+        # Publica dentro do lock: uma troca de impressora (jobs_reset) nunca fica atrás de um diff antigo
+        with self._lock:
+            if printer_name != self._job_printer:
+                return
+            upserts, removed = diff_rows(self._job_rows, rows)
+            self._job_rows = rows
+            if upserts or removed:
+                self.updates.put(('jobs', printer_name, upserts, removed))
+
+    def _control_jobs(self, action: str, printer_name: str, job_ids: List[int]) -> None:
+        result = getattr(self.job_manager, f"{action}_jobs")(printer_name, job_ids)
+        if result['error']:
+            self.updates.put(('message', result['error']))
+        else:
+            self.updates.put(('message', f"{len(result['succeeded'])}/{result['requested']} jobs "
+                                         f"{result['action']}(s) em {printer_name}"))
+        self.refresh('jobs', 'status')
+
+
+class PrinterMonitorApp:
+    """
+    Janela principal: impressoras em cima, fila da impressora selecionada embaixo
+
+    A thread da interface nunca chama o spooler. A cada quadro (no máximo
+    `fps` por segundo) ela esvazia a fila de atualizações do SpoolerWorker,
+    funde as diferenças recebidas e aplica uma única vez em cada tabela; o
+    esvaziamento tem um orçamento de tempo por quadro e o que sobrar fica
+    para o próximo.
+    """
+
+    ACTIONS = (('cancel', "Cancelar"), ('pause', "Pausar"), ('resume', "Retomar"), ('restart', "Reiniciar"))
+
+    def __init__(self, root: tk.Tk, fps: float = 20.0, frame_budget: float = 0.010, **worker_options) -> None:
+        """
+        Args:
+            root: Janela Tk
+            fps: Máximo de aplicações de atualizações por segundo
+            frame_budget: Tempo máximo (s) por quadro para consumir a fila de atualizações
+            worker_options: Repassados ao SpoolerWorker (intervalos, max_workers)
+        """
+        self.root = root
+        self.updates: "queue.Queue" = queue.Queue()
+        self.worker = SpoolerWorker(self.updates, **worker_options)
+        self.frame_interval = max(1, int(1000 / fps))
+        self.frame_budget = frame_budget
+        self.job_printer: Optional[str] = None
+        self.message = ''
+        self.stats = {'frames': 0, 'messages': 0, 'max_apply_ms': 0.0, 'max_frame_gap_ms': 0.0}
+        self._after_id: Optional[str] = None
+        self._last_frame: Optional[float] = None
+        self._build()
+        root.protocol('WM_DELETE_WINDOW', self.close)
+
+    def _build(self) -> None:
+        self.root.title("Monitor de impressoras")
+        toolbar = ttk.Frame(self.root, padding=4)
+        toolbar.pack(side='top', fill='x')
+        ttk.Button(toolbar, text="Atualizar", command=self.worker.refresh).pack(side='left')
+        ttk.Separator(toolbar, orient='vertical').pack(side='left', fill='y', padx=6)
+        for action, label in self.ACTIONS:
+            ttk.Button(toolbar, text=label, command=lambda action=action: self.control_selected_job(action)
+                       ).pack(side='left', padx=1)
+
+        self.status_bar = ttk.Label(self.root, anchor='w', padding=(6, 2))
+        self.status_bar.pack(side='bottom', fill='x')
+
+        panes = ttk.PanedWindow(self.root, orient='vertical')
+        panes.pack(side='top', fill='both', expand=True)
+        self.printers = VirtualTable(panes, TableModel(PRINTER_COLUMNS), on_select=self._on_printer_selected)
+        jobs_frame = ttk.Frame(panes)
+        self.jobs_label = ttk.Label(jobs_frame, text="Selecione uma impressora", padding=(6, 2))
+        self.jobs_label.pack(side='top', fill='x')
+        self.jobs = VirtualTable(jobs_frame, TableModel(JOB_COLUMNS))
+        self.jobs.pack(side='top', fill='both', expand=True)
+        panes.add(self.printers, weight=1)
+        panes.add(jobs_frame, weight=2)
+
+    def start(self) -> None:
+        self.worker.start()
+        self._after_id = self.root.after(self.frame_interval, self._pump)
+
+    def close(self) -> None:
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self.worker.stop()
+        self.root.destroy()
+
+    # ------------------------------------------------------------------
+    # Atualizações
+    # ------------------------------------------------------------------
+    def _pump(self) -> None:
+        """Aplica em lote as diferenças que chegaram desde o último quadro"""
+        started = time.perf_counter()
+        if self._last_frame is not None:
+            gap = (started - self._last_frame) * 1000 - self.frame_interval
+            self.stats['max_frame_gap_ms'] = max(self.stats['max_frame_gap_ms'], gap)
+        deadline = started + self.frame_budget
+        printer_upserts: Dict[Hashable, Row] = {}
+        printer_removed: set = set()
+        job_upserts: Dict[Hashable, Row] = {}
+        job_removed: set = set()
+
+        while time.perf_counter() < deadline:
+            try:
+                message = self.updates.get_nowait()
+            except queue.Empty:
+                break
+            self.stats['messages'] += 1
+            kind = message[0]
+            if kind == 'printers':
+                self._merge(printer_upserts, printer_removed, message[1], message[2])
+            elif kind == 'jobs':
+                if message[1] == self.job_printer:
+                    self._merge(job_upserts, job_removed, message[2], message[3])
+            elif kind == 'jobs_reset':
+                self.job_printer = message[1]
+                job_upserts.clear()
+                job_removed.clear()
+                self.jobs.model.clear()
+                self.jobs.selected = None
+                self.jobs.scroll_to(0)
+                self.jobs_label.configure(text=f"Fila de {message[1]}" if message[1] else "Selecione uma impressora")
+            elif kind == 'message':
+                self.message = message[1]
+
+        if self.printers.model.apply(printer_upserts, printer_removed):
+            self.printers.refresh()
+        if self.jobs.model.apply(job_upserts, job_removed):
+            self.jobs.refresh()
+        self._update_status_bar()
+
+        finished = time.perf_counter()
+        self.stats['frames'] += 1
+        self.stats['max_apply_ms'] = max(self.stats['max_apply_ms'], (finished - started) * 1000)
+        self._last_frame = finished
+        self._after_id = self.root.after(self.frame_interval, self._pump)
+
+    @staticmethod
+    def _merge(upserts: Dict[Hashable, Row], removed: set,
+               new_upserts: Dict[Hashable, Row], new_removed: Iterable[Hashable]) -> None:
+        for key in new_removed:
+            upserts.pop(key, None)
+            removed.add(key)
+        for key, row in new_upserts.items():
+            removed.discard(key)
+            upserts[key] = row
+
+    def _update_status_bar(self) -> None:
+        text = f"{len(self.printers.model)} impressoras"
+        if self.job_printer:
+            text += f" | {len(self.jobs.model)} jobs em {self.job_printer}"
+        if self.message:
+            text += f" | {self.message}"
+        if text != self.status_bar.cget('text'):
+            self.status_bar.configure(text=text)
+
+    # ------------------------------------------------------------------
+    # Ações do usuário
+    # ------------------------------------------------------------------
+    def _on_printer_selected(self, printer_name: Optional[Hashable]) -> None:
+        self.worker.watch_jobs(printer_name)  # type: ignore[arg-type]
+
+    def control_selected_job(self, action: str) -> None:
+        row = self.jobs.selected_row
+        if row is None or not self.job_printer:
+            self.message = "Selecione um job"
+            return
+        self.message = f"Enviando comando ao job {row[0]}..."
+        self.worker.control_jobs(action, self.job_printer, [row[0]])
+
+
+def _install_simulator(printers: int, jobs: int) -> None:
+    """Spooler simulado com impressão contínua (uma página por segundo em cada fila)"""
+    from utils.spooler_simulator import install
+
+    spooler = install(latency=0.002, seed=1)
+    for index in range(printers):
+        name = f"Simulada {index + 1:03d}"
+        spooler.add_printer(name)
+        spooler.add_jobs(name, jobs)
+
+    def tick():
+        while True:
+            time.sleep(1.0)
+            spooler.tick()
+
+    threading.Thread(target=tick, name="spooler-tick", daemon=True).start()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Monitor gráfico de impressoras e jobs")
+    parser.add_argument('--fps', type=float, default=20.0, help="Máximo de atualizações da tela por segundo")
+    parser.add_argument('--workers', type=int, default=8, help="Consultas simultâneas ao spooler")
+    parser.add_argument('--status-interval', type=float, default=5.0, help="Intervalo (s) do status")
+    parser.add_argument('--job-interval', type=float, default=2.0, help="Intervalo (s) da fila selecionada")
+    parser.add_argument('--simulate', type=int, metavar='N', help="Usa um spooler simulado com N impressoras")
+    parser.add_argument('--jobs', type=int, default=20, help="Jobs por impressora simulada")
+    parser.add_argument('--exit-after', type=float, metavar='S', help="Fecha após S segundos e imprime as métricas")
+    args = parser.parse_args(argv)
+
+    if args.simulate:
+        _install_simulator(args.simulate, args.jobs)
+
+    root = tk.Tk()
+    root.geometry("1120x720")
+    app = PrinterMonitorApp(root, fps=args.fps, max_workers=args.workers,
+                            status_interval=args.status_interval, job_interval=args.job_interval)
+    app.start()
+    if args.exit_after:
+        root.after(int(args.exit_after * 1000), app.close)
+    root.mainloop()
+    if args.exit_after:
+        print(app.stats)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
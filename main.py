@@ -1,5 +1,8 @@
-from utils import LockApp
-from core import ( PrinterListManager, PrinterStatusManager, AppLogger, PrinterAccessManager, PrinterJobManager)
+import argparse
+import os
+import sys
+from utils import LockApp, container
+from core import AppLogger, PrinterAccessManager, StatusDetail
 
 def main():
     singleton = LockApp()
@@ -7,86 +10,78 @@ def main():
     if singleton.is_already_running():
         raise RuntimeError("Aplicativo já está em execução")
 
-    # Garante inicialização das singletons
-    AppLogger()
-    PrinterListManager()
-    PrinterAccessManager()
-
-def test():
-    access_manager = PrinterAccessManager.instance
-    printer_list = PrinterListManager.instance
+    # Aquece os serviços compartilhados (independentes em paralelo)
+    timings = container.warm_up()
+    logger = AppLogger.instance.get_logger(__name__)
+    for name, elapsed in timings.items():
+        logger.debug("Serviço %s construído em %.1f ms", name, elapsed * 1000)
 
-    if not AppLogger.instance or not printer_list:
-        raise ImportError("Instância do logger não inicializada")
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Exporta inventário, status e jobs de todas as impressoras em NDJSON",
+        epilog="Exemplos:\n"
+               "  python main.py > frota.ndjson\n"
+               "  python main.py --printers \"EPSON L3250\" --no-jobs\n"
+               "  python main.py -o exportacao/frota.ndjson --interval 60 --gzip",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-o', '--output', default='-', help="Arquivo de saída ('-' = stdout)")
+    parser.add_argument('--printers', nargs='+', help="Impressoras a exportar (padrão: todas)")
+    parser.add_argument('--timeout', type=float, default=10.0, help="Prazo (s) por impressora")
+    parser.add_argument('--workers', type=int, default=16, help="Impressoras consultadas em paralelo")
+    parser.add_argument('--no-jobs', action='store_true', help="Não inclui a lista de jobs")
+    parser.add_argument('--detail', choices=[level.name.lower() for level in StatusDetail], default='full',
+                        help="Nível de detalhe do status")
+    periodic = parser.add_argument_group("modo periódico")
+    periodic.add_argument('--interval', type=float, help="Acrescenta um snapshot ao arquivo a cada N segundos")
+    periodic.add_argument('--count', type=int, help="Número de snapshots (padrão: até Ctrl+C)")
+    periodic.add_argument('--max-bytes', type=int, default=50 * 1024 * 1024,
+                          help="Tamanho que dispara a rotação do arquivo")
+    periodic.add_argument('--backup-count', type=int, default=10, help="Arquivos rotacionados mantidos")
+    periodic.add_argument('--gzip', action='store_true', help="Comprime os arquivos rotacionados")
+    args = parser.parse_args(argv)
+    if args.interval is not None and args.output == '-':
+        parser.error("o modo periódico (--interval) precisa de um arquivo de saída (-o)")
+    return args
 
-    logger = AppLogger.instance.get_logger(__name__)
+def export(args: argparse.Namespace) -> int:
+    """Executa a exportação; retorna 0 se todas as impressoras responderam, 1 caso contrário"""
+    from services.status.fleet_exporter import FleetSnapshotExporter, RotatingNdjsonWriter
 
-    # Cria instâncias de gerenciadores
-    printer_status = PrinterStatusManager(access_manager)
-    printer_job = PrinterJobManager()
+    exporter = FleetSnapshotExporter(PrinterAccessManager.instance,
+                                     max_workers=args.workers,
+                                     timeout=args.timeout,
+                                     include_jobs=not args.no_jobs,
+                                     detail=StatusDetail[args.detail.upper()])
 
-    # Obtém lista de impressoras
-    printers = printer_list.list_name_printers()
+    if args.interval is not None:
+        writer = RotatingNdjsonWriter(args.output, args.max_bytes, args.backup_count, args.gzip)
+        try:
+            exporter.run_periodic(writer, args.interval, args.count, args.printers)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            writer.close()
+        return 0
 
-    if not printers:
-        logger.error("Nenhuma impressora encontrada no sistema")
-        return
-    
-    logger.info("Impressoras disponíveis: %d", len(printers))
-    for i, printer in enumerate(printers, 1):
-        logger.debug("Impressora %d: %s", i, printer)
-    
-    # Testa a primeira impressora
-    printer_name = printers[0]
-    logger.info("Testando verificação de papel na impressora: '%s'", printer_name)
-    
-    jobs = printer_job.list_jobs(printer_name)
-    if len(jobs) > 0:
-        printer_job.cancel_all_jobs(printer_name)
-    
-    
-    try:
-        # Verifica status do papel
-        paper_status = printer_status.check_paper_status(printer_name, force_update=True)
-        
-        # Exibe resultados de forma clara usando logger
-        logger.info("STATUS DO PAPEL - %s", printer_name)
-        logger.info("• Papel disponível: %s", "SIM" if paper_status.get('paper_available') else "NÃO")
-        logger.info("• Papel esgotado: %s", "SIM" if paper_status.get('paper_out') else "NÃO")
-        logger.info("• Papel encravado: %s", "SIM" if paper_status.get('paper_jam') else "NÃO")
-        logger.info("• Papel baixo: %s", "SIM" if paper_status.get('paper_low') else "NÃO")
-        
-        # Verifica se há erro
-        if 'error' in paper_status:
-            logger.warning("Erro na verificação: %s", paper_status['error'])
-        
-        # Resumo do status
-        if paper_status.get('paper_available'):
-            if paper_status.get('paper_low'):
-                logger.warning("Papel disponível, mas quantidade baixa")
-            else:
-                logger.info("Papel disponível e em bom estado")
-        else:
-            if paper_status.get('paper_out'):
-                logger.error("PAPEL ESGOTADO - Inserir novo papel")
-            if paper_status.get('paper_jam'):
-                logger.error("PAPEL ENCRAVADO - Verificar impressora")
-            if paper_status.get('error'):
-                logger.error("Erro na verificação: %s", paper_status['error'])
-        
-        # Log detalhado para debug
-        logger.debug("Estado completo do papel: %s", paper_status)
-        
-    except Exception as e:
-        logger.error("Erro durante a verificação de papel: %s", e, exc_info=True)
+    if args.output == '-':
+        summary = exporter.export(sys.stdout.buffer.write, args.printers, sys.stdout.buffer.flush)
+    else:
+        with open(args.output, 'ab') as output:
+            summary = exporter.export(output.write, args.printers, output.flush)
+    return 0 if not summary['failed'] and not summary['timed_out'] else 1
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.output == '-':
+        # stdout fica só com os registros NDJSON; os logs do console vão para o stderr
+        os.environ['LOGGING_STREAM'] = 'stderr'
     try:
         main()
-        test()
+        sys.exit(export(args))
     except Exception as e:
         logger = AppLogger.instance.get_logger(__name__) if AppLogger.instance else None
         if logger:
             logger.critical("Erro fatal: %s", e, exc_info=True)
         else:
-            print(f"Erro fatal: {e}")
\ No newline at end of file
+            print(f"Erro fatal: {e}", file=sys.stderr)
+        sys.exit(1)
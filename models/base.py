@@ -22,6 +22,16 @@ class BasePrinter:
         return self.job_manager.resume_job(self.printer_name, job_id)
     def restart_job(self, job_id: int):
         return self.job_manager.restart_job(self.printer_name, job_id)
+    def cancel_jobs(self, job_ids):
+        return self.job_manager.cancel_jobs(self.printer_name, job_ids)
+    def pause_jobs(self, job_ids):
+        return self.job_manager.pause_jobs(self.printer_name, job_ids)
+    def resume_jobs(self, job_ids):
+        return self.job_manager.resume_jobs(self.printer_name, job_ids)
+    def set_priority_many(self, job_ids, priority: int):
+        return self.job_manager.set_priority_many(self.printer_name, job_ids, priority)
+    def cancel_where(self, status=None, user=None, older_than=None):
+        return self.job_manager.cancel_where(self.printer_name, status=status, user=user, older_than=older_than)
     def test_printer_connection(self):
         return
     def getMonitorJob(self):
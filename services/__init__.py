@@ -1,2 +1,42 @@
-from .job import PrinterJobHistory, PrinterJobManager, PrinterJobMonitor, format_job_info, detect_job_changes
-from .print import PrinterPrint
\ No newline at end of file
+"""
+Pacote services com carregamento tardio (lazy) dos subpacotes.
+
+`services.job` só é importado ao acessar os gerenciadores de jobs e
+`services.print` (python-docx, pythoncom, win32api) só ao acessar PrinterPrint.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_LAZY_ATTRS = {
+    'PrinterJobHistory': '.job',
+    'PrinterJobManager': '.job',
+    'PrinterJobMonitor': '.job',
+    'format_job_info': '.job',
+    'detect_job_changes': '.job',
+    'PrinterPrint': '.print',
+    'PrintDispatcher': '.print',
+    'PrintPriority': '.print',
+    'PrinterPool': '.print',
+    'PrintRouter': '.print',
+    'ScanScheduler': '.scan',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+if TYPE_CHECKING:
+    from .job import PrinterJobHistory, PrinterJobManager, PrinterJobMonitor, format_job_info, detect_job_changes
+    from .print import PrinterPrint, PrintDispatcher, PrintPriority, PrinterPool, PrintRouter
+    from .scan import ScanScheduler
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,4 @@
+from .snapshots import Snapshot, SnapshotStore
+from .delta_sync import DeltaSyncStore, apply_changes
+from .push import ChangeFeed, ChangeStream
+from .http_api import PrinterHttpApi, Request, Response
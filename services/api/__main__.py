@@ -0,0 +1,38 @@
+"""
+Servidor da API HTTP local.
+
+Uso:
+    python -m services.api
+    python -m services.api --port 8631 --ttl 1 --push
+"""
+import argparse
+import asyncio
+
+from .http_api import PrinterHttpApi
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API HTTP local de impressoras, status e jobs")
+    parser.add_argument('--host', default='127.0.0.1', help="Endereço de escuta")
+    parser.add_argument('--port', type=int, default=8631, help="Porta")
+    parser.add_argument('--allow-host', action='append', default=[],
+                        help="Nome aceito nos cabeçalhos Host/Origin além dos locais (pode repetir)")
+    parser.add_argument('--ttl', type=float, default=1.0, help="Validade (s) dos snapshots de status e jobs")
+    parser.add_argument('--inventory-ttl', type=float, default=30.0, help="Validade (s) do inventário")
+    parser.add_argument('--push', action='store_true', help="Habilita /events (SSE) e /ws (WebSocket)")
+    parser.add_argument('--job-interval', type=float, default=2.0, help="Intervalo (s) do monitoramento de jobs")
+    parser.add_argument('--status-interval', type=float, default=5.0, help="Intervalo (s) do monitoramento de status")
+    args = parser.parse_args()
+
+    api = PrinterHttpApi(args.host, args.port, ttl=args.ttl, inventory_ttl=args.inventory_ttl,
+                         allowed_hosts=args.allow_host)
+    if args.push:
+        api.enable_push(job_interval=args.job_interval, status_interval=args.status_interval)
+    try:
+        asyncio.run(api.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
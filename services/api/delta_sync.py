@@ -0,0 +1,240 @@
+import secrets
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+def encode_rows(items: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Serialização colunar de uma lista de dicionários: {'k': [chaves], 'r': [[valores], ...]}
+
+    Em filas grandes os nomes dos campos se repetem em todo job; em colunas
+    eles aparecem uma única vez.
+    """
+    items = list(items)
+    keys: List[str] = []
+    seen = set()
+    for item in items:
+        for key in item:
+            if key not in seen:
+                seen.add(key)
+                keys.append(key)
+    return {'k': keys, 'r': [[item.get(key) for key in keys] for item in items]}
+
+
+def decode_rows(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    keys = data['k']
+    return [dict(zip(keys, row)) for row in data['r']]
+
+
+def diff_fields(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Campos alterados de `old` para `new` (campos removidos viram None)"""
+    patch = {key: value for key, value in new.items() if old.get(key, _MISSING) != value}
+    patch.update({key: None for key in old if key not in new})
+    return patch
+
+
+class PrinterState:
+    """Estado versionado (jobs e status) de uma impressora com histórico limitado de mudanças"""
+
+    __slots__ = ('version', 'jobs', 'status', 'history', 'base_version')
+
+    def __init__(self, max_history: int) -> None:
+        self.version = 0
+        self.jobs: Dict[int, Dict[str, Any]] = {}
+        self.status: Dict[str, Any] = {}
+        # (versão, operações) - operações: ('a', job) | ('r', job_id) | ('u', job_id, campos) | ('s', campos)
+        self.history: Deque[Tuple[int, List[Tuple]]] = deque(maxlen=max_history)
+        # Menor versão a partir da qual o histórico ainda reconstrói as mudanças
+        self.base_version = 0
+
+    def record(self, operations: List[Tuple]) -> int:
+        if not operations:
+            return self.version
+        if len(self.history) == self.history.maxlen:
+            self.base_version = self.history[0][0]
+        self.version += 1
+        self.history.append((self.version, operations))
+        return self.version
+
+
+class DeltaSyncStore:
+    """
+    Estado de jobs e status por impressora com versão crescente e consultas incrementais
+
+    Cada atualização com alguma diferença (apply_jobs / apply_status) gera
+    uma nova versão da impressora e um registro no histórico (limitado a
+    `max_history` versões). `changes_since` devolve apenas o que mudou
+    desde a versão do cliente - jobs adicionados, removidos e campos
+    alterados - ou o estado completo quando o cliente está fora do
+    histórico, em outra época (reinício do servidor) ou quando o delta
+    seria maior que o próprio estado.
+
+    Formato compacto (JSON):
+        completo: {'e': época, 'v': versão, 'full': True, 'jobs': linhas, 's': status}
+        delta:    {'e': época, 'v': versão, 'since': versão do cliente,
+                   'a': linhas dos jobs adicionados, 'r': [job_ids removidos],
+                   'u': {job_id: {campo: valor}}, 's': {campo de status: valor}}
+    onde "linhas" é a serialização colunar de encode_rows. Chaves vazias são omitidas.
+    """
+
+    def __init__(self, max_history: int = 1000) -> None:
+        """
+        Args:
+            max_history: Versões mantidas por impressora para consultas incrementais
+        """
+        self.max_history = max_history
+        # Identifica esta instância: versões de outra época não são comparáveis
+        self.epoch = secrets.token_hex(4)
+        self._states: Dict[str, PrinterState] = {}
+        self._lock = threading.Lock()
+        self.stats = {'full': 0, 'delta': 0, 'unchanged': 0}
+
+    def _state(self, printer_name: str) -> PrinterState:
+        state = self._states.get(printer_name)
+        if state is None:
+            state = self._states[printer_name] = PrinterState(self.max_history)
+        return state
+
+    def version(self, printer_name: str) -> int:
+        with self._lock:
+            state = self._states.get(printer_name)
+            return state.version if state else 0
+
+    def apply_jobs(self, printer_name: str, jobs: Dict[int, Dict[str, Any]]) -> int:
+        """
+        Registra a fila atual da impressora
+
+        Args:
+            printer_name: Nome da impressora
+            jobs: Fila atual {job_id: job_info}
+
+        Returns:
+            Versão da impressora após a atualização
+        """
+        with self._lock:
+            state = self._state(printer_name)
+            operations: List[Tuple] = []
+            for job_id in state.jobs.keys() - jobs.keys():
+                operations.append(('r', job_id))
+            for job_id, job in jobs.items():
+                old = state.jobs.get(job_id)
+                if old is None:
+                    operations.append(('a', job))
+                elif old is not job and old != job:
+                    operations.append(('u', job_id, diff_fields(old, job)))
+            state.jobs = dict(jobs)
+            return state.record(operations)
+
+    def apply_status(self, printer_name: str, status: Dict[str, Any]) -> int:
+        """Registra o status atual da impressora; retorna a versão"""
+        with self._lock:
+            state = self._state(printer_name)
+            patch = diff_fields(state.status, status)
+            state.status = dict(status)
+            return state.record([('s', patch)] if patch else [])
+
+    def changes_since(self, printer_name: str, since: int = 0, epoch: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Mudanças da impressora desde a versão `since` do cliente
+
+        Args:
+            printer_name: Nome da impressora
+            since: Última versão que o cliente aplicou (0 = nenhuma)
+            epoch: Época recebida junto com essa versão
+
+        Returns:
+            Dicionário no formato compacto descrito na classe
+        """
+        with self._lock:
+            state = self._state(printer_name)
+            if epoch == self.epoch and since == state.version:
+                self.stats['unchanged'] += 1
+                return {'e': self.epoch, 'v': state.version, 'since': since}
+            if epoch != self.epoch or since > state.version or since < state.base_version:
+                return self._full(state)
+
+            added: Dict[int, Dict[str, Any]] = {}
+            updated: Dict[int, Dict[str, Any]] = {}
+            removed = set()
+            status: Dict[str, Any] = {}
+            operation_count = 0
+            for version, operations in state.history:
+                if version <= since:
+                    continue
+                for operation in operations:
+                    operation_count += 1
+                    kind = operation[0]
+                    if kind == 'a':
+                        job = operation[1]
+                        removed.discard(job['job_id'])
+                        updated.pop(job['job_id'], None)
+                        added[job['job_id']] = job
+                    elif kind == 'u':
+                        job_id, fields = operation[1], operation[2]
+                        if job_id in added:
+                            added[job_id] = {**added[job_id], **fields}
+                        else:
+                            updated.setdefault(job_id, {}).update(fields)
+                    elif kind == 'r':
+                        added.pop(operation[1], None)
+                        updated.pop(operation[1], None)
+                        removed.add(operation[1])
+                    else:
+                        status.update(operation[1])
+
+            # Delta maior que a fila inteira: o estado completo sai mais barato
+            if operation_count > max(len(state.jobs), 16) and len(added) + len(updated) >= len(state.jobs):
+                return self._full(state)
+
+            self.stats['delta'] += 1
+            result: Dict[str, Any] = {'e': self.epoch, 'v': state.version, 'since': since}
+            if added:
+                result['a'] = encode_rows(added[job_id] for job_id in sorted(added))
+            if removed:
+                result['r'] = sorted(removed)
+            if updated:
+                result['u'] = {str(job_id): fields for job_id, fields in sorted(updated.items())}
+            if status:
+                result['s'] = status
+            return result
+
+    def _full(self, state: PrinterState) -> Dict[str, Any]:
+        self.stats['full'] += 1
+        return {'e': self.epoch, 'v': state.version, 'full': True,
+                'jobs': encode_rows(state.jobs[job_id] for job_id in sorted(state.jobs)), 's': dict(state.status)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, 'printers': len(self._states), 'epoch': self.epoch}
+
+
+def apply_changes(local: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Aplica uma resposta de changes_since ao estado local de um cliente
+
+    Args:
+        local: {'e': época, 'v': versão, 'jobs': {job_id: job}, 'status': {...}} (vazio na primeira vez)
+        payload: Resposta de changes_since
+
+    Returns:
+        O próprio `local`, atualizado
+    """
+    if payload.get('full'):
+        local['jobs'] = {job['job_id']: job for job in decode_rows(payload['jobs'])}
+        local['status'] = dict(payload.get('s', {}))
+    else:
+        jobs = local.setdefault('jobs', {})
+        for job_id in payload.get('r', ()):
+            jobs.pop(job_id, None)
+        if 'a' in payload:
+            for job in decode_rows(payload['a']):
+                jobs[job['job_id']] = job
+        for job_id, fields in payload.get('u', {}).items():
+            job = jobs.setdefault(int(job_id), {'job_id': int(job_id)})
+            job.update(fields)
+        local.setdefault('status', {}).update(payload.get('s', {}))
+    local['e'], local['v'] = payload['e'], payload['v']
+    return local
@@ -0,0 +1,663 @@
+import asyncio
+import gzip
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from core import AppLogger, PrinterAccessManager, PrinterListManager, StatusDetail
+from services.job import PrinterJobManager, PrinterJobPoller
+from services.status.status_checker import PrinterStatusChecker
+from utils import EventBus
+from .delta_sync import DeltaSyncStore
+from .push import (ChangeFeed, ChangeStream, StreamEvent, WS_CLOSE, WS_PING, WS_PONG, read_websocket_frame,
+                   websocket_accept, websocket_frame)
+from .snapshots import Snapshot, SnapshotStore, encode_json
+
+# Ações de controle de job aceitas em POST /printers/{nome}/jobs/{id}/{ação}
+JOB_ACTIONS = ('cancel', 'pause', 'resume', 'restart')
+
+MAX_BODY_BYTES = 64 * 1024
+
+# Corpos menores que isto não compensam a compressão
+GZIP_MIN_BYTES = 1024
+
+# Nomes aceitos por padrão nos cabeçalhos Host e Origin
+LOOPBACK_HOSTS = frozenset({'localhost', '127.0.0.1', '::1'})
+
+
+class Request:
+    """Requisição HTTP já interpretada"""
+
+    __slots__ = ('method', 'path', 'query', 'headers', 'body', 'params')
+
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> None:
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path
+        self.query = dict(parse_qsl(parts.query))
+        self.headers = headers
+        self.body = body
+        self.params: Tuple[str, ...] = ()
+
+
+class Response:
+    """
+    Resposta HTTP; `body` já serializado
+
+    Com `stream`, apenas o cabeçalho é enviado e a conexão passa para
+    `stream(reader, writer)` (SSE, WebSocket).
+    """
+
+    __slots__ = ('status', 'body', 'headers', 'stream')
+
+    def __init__(self,
+                 status: int = 200,
+                 body: bytes = b'',
+                 headers: Optional[Dict[str, str]] = None,
+                 stream: Optional[Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]] = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.stream = stream
+
+    @classmethod
+    def json(cls, data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> "Response":
+        return cls(status, encode_json(data), headers)
+
+    @classmethod
+    def error(cls, status: int, message: str) -> "Response":
+        return cls.json({'success': False, 'error': message}, status)
+
+    def encode(self, keep_alive: bool) -> bytes:
+        if self.stream is not None:
+            return self._head(self.headers)
+        return self._head({'Content-Type': 'application/json; charset=utf-8', **self.headers,
+                           'Content-Length': str(len(self.body)),
+                           'Connection': 'keep-alive' if keep_alive else 'close'}) + self.body
+
+    def _head(self, headers: Dict[str, str]) -> bytes:
+        lines = [f"HTTP/1.1 {self.status} {HTTPStatus(self.status).phrase}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparação fraca de If-None-Match (lista de ETags ou '*')"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+
+
+class PrinterHttpApi:
+    """
+    API HTTP local (JSON) para inventário, status e jobs das impressoras
+
+    Servida por um único loop asyncio; as consultas ao spooler rodam em um
+    pool de threads e o resultado fica em snapshots compartilhados
+    (SnapshotStore), então muitos clientes consultando a mesma impressora
+    geram no máximo uma consulta por impressora a cada `ttl` segundos.
+    Respostas levam ETag e Cache-Control; If-None-Match igual ao ETag
+    atual recebe 304 sem corpo. Requisições com Host ou Origin fora de
+    `allowed_hosts` recebem 403: uma página aberta no navegador do operador
+    não consegue controlar jobs (nem via DNS rebinding).
+
+    Rotas:
+        GET    /printers
+        GET    /printers/{nome}
+        GET    /printers/{nome}/status
+        GET    /printers/{nome}/jobs
+        GET    /printers/{nome}/jobs/{id}
+        POST   /printers/{nome}/jobs/{id}/{cancel|pause|resume|restart}
+        DELETE /printers/{nome}/jobs/{id}
+        GET    /printers/{nome}/sync?since={versão}&epoch={época}
+        POST   /sync  {"e": época, "printers": {nome: versão}}
+        GET    /stats
+        GET    /events  (SSE) e /ws (WebSocket), após enable_push()
+
+    As rotas /sync devolvem só as mudanças desde a versão do cliente
+    (DeltaSyncStore). Corpos a partir de 1 KiB saem em gzip para clientes
+    com Accept-Encoding: gzip.
+    """
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 8631,
+                 ttl: float = 1.0,
+                 inventory_ttl: float = 30.0,
+                 max_workers: int = 8,
+                 keep_alive_timeout: float = 15.0,
+                 store: Optional[SnapshotStore] = None,
+                 sync_history: int = 1000,
+                 allowed_hosts: Optional[Iterable[str]] = None) -> None:
+        """
+        Args:
+            host: Endereço de escuta (padrão: apenas local)
+            port: Porta (0 escolhe uma livre)
+            ttl: Validade (s) dos snapshots de status e jobs
+            inventory_ttl: Validade (s) do snapshot do inventário
+            max_workers: Threads para consultas ao spooler
+            keep_alive_timeout: Tempo (s) que uma conexão ociosa fica aberta
+            store: SnapshotStore compartilhada (padrão: uma nova com `ttl`)
+            sync_history: Versões por impressora mantidas para consultas incrementais
+            allowed_hosts: Nomes aceitos em Host e Origin além dos locais
+                (localhost, 127.0.0.1, ::1) e de `host`
+        """
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.host = host
+        self.port = port
+        self.ttl = ttl
+        self.inventory_ttl = inventory_ttl
+        self.keep_alive_timeout = keep_alive_timeout
+        self.allowed_hosts = set(LOOPBACK_HOSTS) | {name.lower().strip('[]') for name in (allowed_hosts or ())}
+        if host not in ('', '0.0.0.0', '::'):
+            self.allowed_hosts.add(host.lower())
+        self.store = store or SnapshotStore(ttl)
+        self.delta = DeltaSyncStore(sync_history)
+        self.access_manager = PrinterAccessManager.instance
+        self.printer_list = PrinterListManager.instance
+        self.status_checker = PrinterStatusChecker(self.access_manager)
+        self.job_poller = PrinterJobPoller()
+        self.job_manager = PrinterJobManager()
+        self.stats = {'requests': 0, 'not_modified': 0, 'errors': 0, 'connections': 0, 'open_connections': 0,
+                      'coalesced': 0, 'forbidden': 0}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http-api")
+        self._routes: List[Tuple[str, Pattern, Handler]] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._connections: set = set()
+        # Consulta em andamento por chave (só acessado na thread do loop)
+        self._loading: Dict[str, asyncio.Future] = {}
+        self.changes: Optional[ChangeStream] = None
+        self._feed: Optional[ChangeFeed] = None
+        self._feed_options: Optional[Dict[str, Any]] = None
+        self._register_routes()
+
+    def enable_push(self,
+                    event_bus: Optional[EventBus] = None,
+                    printers: Optional[Iterable[str]] = None,
+                    job_interval: float = 2.0,
+                    status_interval: float = 5.0,
+                    history: int = 10000,
+                    heartbeat: float = 15.0) -> ChangeStream:
+        """
+        Habilita /events (SSE) e /ws (WebSocket) com as mudanças de jobs e status
+
+        Args:
+            event_bus: Barramento já alimentado por monitores próprios; se
+                omitido, a API monitora `printers` ao iniciar
+            printers: Impressoras monitoradas (padrão: todo o inventário)
+            job_interval: Intervalo (s) do monitoramento de jobs
+            status_interval: Intervalo (s) do monitoramento de status
+            history: Eventos mantidos para retomada por número de sequência
+            heartbeat: Intervalo (s) dos heartbeats
+
+        Returns:
+            ChangeStream que distribui os eventos
+        """
+        self.changes = ChangeStream(history, heartbeat)
+        if event_bus is None:
+            event_bus = EventBus()
+            self._feed_options = {'event_bus': event_bus, 'printers': printers,
+                                  'job_interval': job_interval, 'status_interval': status_interval}
+        self.changes.subscribe_to(event_bus)
+        self.route('GET', r'/events', self._get_events)
+        self.route('GET', r'/ws', self._get_websocket)
+        return self.changes
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+    async def start(self) -> Tuple[str, int]:
+        """Começa a aceitar conexões no loop atual e retorna (host, porta)"""
+        self._loop = asyncio.get_running_loop()
+        if self.changes is not None:
+            self.changes.attach(self._loop)
+        if self._feed_options is not None:
+            options = dict(self._feed_options)
+            if options['printers'] is None:
+                options['printers'] = [printer['display_name'] for printer in (await self.inventory()).data['printers']]
+            self._feed = ChangeFeed(**options)
+            await self._loop.run_in_executor(self._executor, self._feed.start)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        self.logger.info(f"API HTTP escutando em http://{self.host}:{self.port}")
+        return self.host, self.port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()  # type: ignore
+
+    async def stop(self) -> None:
+        if self.changes is not None:
+            await self.changes.close()
+        if self._feed is not None:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._feed.stop)
+            self._feed = None
+        if self._server is not None:
+            self._server.close()
+            # Conexões keep-alive ociosas impediriam wait_closed de retornar
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.logger.info("API HTTP encerrada")
+
+    def serve_in_thread(self) -> Tuple[str, int]:
+        """Executa o servidor em um loop próprio em thread daemon; retorna (host, porta)"""
+        started = threading.Event()
+        errors: List[BaseException] = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as e:
+                errors.append(e)
+                started.set()
+                loop.close()
+                return
+            started.set()
+            try:
+                loop.run_forever()
+            finally:
+                loop.run_until_complete(self.stop())
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name="http-api", daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+        return self.host, self.port
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        """Encerra o servidor iniciado por serve_in_thread"""
+        if self._thread is None or self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Protocolo
+    # ------------------------------------------------------------------
+    def route(self, method: str, pattern: str, handler: Handler) -> None:
+        """Registra uma rota; grupos de `pattern` viram `request.params` (já decodificados)"""
+        self._routes.append((method, re.compile(f"^{pattern}$"), handler))
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats['connections'] += 1
+        self.stats['open_connections'] += 1
+        self._connections.add(writer)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                if isinstance(request, Response):
+                    writer.write(request.encode(keep_alive=False))
+                    await writer.drain()
+                    break
+                keep_alive = request.headers.get('connection', '').lower() != 'close'
+                response = await self.dispatch(request)
+                writer.write(response.encode(keep_alive))
+                await writer.drain()
+                if response.stream is not None:
+                    await response.stream(reader, writer)
+                    break
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.stats['open_connections'] -= 1
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """Lê uma requisição; None quando o cliente fecha ou fica ocioso, Response em caso de erro"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keep_alive_timeout)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            return Response.error(431, "Cabeçalhos muito grandes")
+
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, version = lines[0].split(' ', 2)
+        except ValueError:
+            return Response.error(400, "Linha de requisição inválida")
+        headers = {}
+        for line in lines[1:]:
+            name, separator, value = line.partition(':')
+            if separator:
+                headers[name.strip().lower()] = value.strip()
+        if version == 'HTTP/1.0' and headers.get('connection', '').lower() != 'keep-alive':
+            headers['connection'] = 'close'
+
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            return Response.error(400, "Content-Length inválido")
+        if length > MAX_BODY_BYTES:
+            return Response.error(413, "Corpo muito grande")
+        try:
+            body = await reader.readexactly(length) if length else b''
+        except asyncio.IncompleteReadError:
+            return None
+        return Request(method.upper(), target, headers, body)
+
+    async def dispatch(self, request: Request) -> Response:
+        self.stats['requests'] += 1
+        forbidden = self._check_origin(request)
+        if forbidden is not None:
+            self.stats['forbidden'] += 1
+            return forbidden
+        allowed = False
+        for method, pattern, handler in self._routes:
+            match = pattern.match(request.path)
+            if match is None:
+                continue
+            if method != request.method:
+                allowed = True
+                continue
+            request.params = tuple(unquote(group) for group in match.groups())
+            try:
+                response = await handler(request)
+            except LookupError as e:
+                response = Response.error(404, str(e))
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.logger.error(f"Erro em {request.method} {request.path}: {e}", exc_info=True)
+                response = Response.error(502, f"Falha ao consultar o spooler: {e}")
+            if response.status == 304:
+                self.stats['not_modified'] += 1
+            elif response.stream is None:
+                self._compress(request, response)
+            return response
+        return Response.error(405 if allowed else 404, "Método não permitido" if allowed else "Rota não encontrada")
+
+    def _check_origin(self, request: Request) -> Optional[Response]:
+        """
+        Recusa requisições vindas de páginas web de outra origem
+
+        O navegador envia Origin em requisições entre origens (inclusive na
+        abertura do WebSocket) e, num ataque de DNS rebinding, Host com o nome
+        do atacante; clientes locais não enviam Origin e usam um nome local.
+        """
+        host = request.headers.get('host')
+        if host is not None and urlsplit(f"//{host}").hostname not in self.allowed_hosts:
+            self.logger.warning(f"Requisição recusada: Host {host!r} não permitido")
+            return Response.error(403, "Host não permitido")
+        origin = request.headers.get('origin')
+        if origin is not None and urlsplit(origin).hostname not in self.allowed_hosts:
+            self.logger.warning(f"Requisição recusada: Origin {origin!r} não permitida")
+            return Response.error(403, "Origem não permitida")
+        return None
+
+    def _compress(self, request: Request, response: Response) -> None:
+        if len(response.body) < GZIP_MIN_BYTES or 'Content-Encoding' in response.headers:
+            return
+        response.headers['Vary'] = 'Accept-Encoding'
+        if 'gzip' not in request.headers.get('accept-encoding', ''):
+            return
+        response.body = gzip.compress(response.body, compresslevel=5)
+        response.headers['Content-Encoding'] = 'gzip'
+        # Outra representação: o ETag passa a ser fraco
+        if 'ETag' in response.headers and not response.headers['ETag'].startswith('W/'):
+            response.headers['ETag'] = 'W/' + response.headers['ETag']
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+    async def snapshot(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None) -> Snapshot:
+        """
+        Snapshot da chave; a consulta ao spooler (se expirou) roda no pool de threads
+
+        Requisições simultâneas da mesma chave aguardam, no loop, a mesma
+        Future: só a consulta ocupa uma thread do pool.
+        """
+        snapshot = self.store.peek(key)
+        if snapshot is not None:
+            return snapshot
+        future = self._loading.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, self.store.get, key, loader, ttl)
+            self._loading[key] = future
+            future.add_done_callback(lambda done: self._loading_done(key, done))
+        else:
+            self.stats['coalesced'] += 1
+        # shield: um cliente que desconecta não cancela a consulta dos demais
+        return await asyncio.shield(future)
+
+    def _loading_done(self, key: str, future: asyncio.Future) -> None:
+        if self._loading.get(key) is future:
+            del self._loading[key]
+        if not future.cancelled():
+            future.exception()  # evita o aviso de exceção não lida se todos desistiram
+
+    def respond(self, request: Request, snapshot: Snapshot, ttl: float) -> Response:
+        headers = {'ETag': snapshot.etag,
+                   'Cache-Control': f"private, max-age={max(0, int(ttl - snapshot.age))}"}
+        if etag_matches(request.headers.get('if-none-match'), snapshot.etag):
+            return Response(304, b'', headers)
+        if len(snapshot.body) >= GZIP_MIN_BYTES and 'gzip' in request.headers.get('accept-encoding', ''):
+            # Comprimido uma vez por snapshot, não por requisição
+            headers.update({'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding', 'ETag': 'W/' + snapshot.etag})
+            return Response(200, snapshot.gzipped(), headers)
+        return Response(200, snapshot.body, headers)
+
+    async def inventory(self) -> Snapshot:
+        return await self.snapshot('inventory', self._load_inventory, self.inventory_ttl)
+
+    async def require_printer(self, printer_name: str) -> Dict[str, Any]:
+        """Entrada do inventário da impressora (LookupError -> 404)"""
+        for printer in (await self.inventory()).data['printers']:
+            if printer['display_name'] == printer_name:
+                return printer
+        raise LookupError(f"Impressora {printer_name} não encontrada")
+
+    def _load_inventory(self) -> Dict[str, Any]:
+        printers = self.printer_list.organize_printer_data(self.printer_list.list_available_printers())  # type: ignore
+        return {'count': len(printers), 'printers': printers}
+
+    async def status_snapshot(self, printer_name: str) -> Snapshot:
+        return await self.snapshot(f"status:{printer_name}", lambda: self._load_status(printer_name))
+
+    async def jobs_snapshot(self, printer_name: str) -> Snapshot:
+        return await self.snapshot(f"jobs:{printer_name}", lambda: self._load_jobs(printer_name))
+
+    def _load_status(self, printer_name: str) -> Dict[str, Any]:
+        status = {'printer_name': printer_name,
+                  **self.status_checker.get_printer_status(printer_name, StatusDetail.FULL)}
+        # Normaliza para JSON antes de versionar: o delta compara o mesmo que o cliente recebe
+        self.delta.apply_status(printer_name, json.loads(encode_json(status)))
+        return status
+
+    def _load_jobs(self, printer_name: str) -> Dict[str, Any]:
+        jobs = self.job_poller.poll(printer_name)
+        if jobs is None:
+            raise RuntimeError(f"Não foi possível consultar os jobs de {printer_name}")
+        self.delta.apply_jobs(printer_name, jobs)
+        return {'printer_name': printer_name, 'count': len(jobs),
+                'jobs': [jobs[job_id] for job_id in sorted(jobs)]}
+
+    # ------------------------------------------------------------------
+    # Rotas
+    # ------------------------------------------------------------------
+    def _register_routes(self) -> None:
+        self.route('GET', r'/printers/?', self._get_printers)
+        self.route('GET', r'/printers/([^/]+)', self._get_printer)
+        self.route('GET', r'/printers/([^/]+)/status', self._get_status)
+        self.route('GET', r'/printers/([^/]+)/jobs', self._get_jobs)
+        self.route('GET', r'/printers/([^/]+)/jobs/(\d+)', self._get_job)
+        self.route('POST', r'/printers/([^/]+)/jobs/(\d+)/([a-z]+)', self._control_job)
+        self.route('DELETE', r'/printers/([^/]+)/jobs/(\d+)', self._delete_job)
+        self.route('GET', r'/printers/([^/]+)/sync', self._get_sync)
+        self.route('POST', r'/sync', self._post_sync)
+        self.route('GET', r'/stats', self._get_stats)
+
+    async def _get_printers(self, request: Request) -> Response:
+        return self.respond(request, await self.inventory(), self.inventory_ttl)
+
+    async def _get_printer(self, request: Request) -> Response:
+        return self.respond(request, Snapshot(await self.require_printer(request.params[0])), self.inventory_ttl)
+
+    async def _get_status(self, request: Request) -> Response:
+        name = request.params[0]
+        await self.require_printer(name)
+        return self.respond(request, await self.status_snapshot(name), self.ttl)
+
+    async def _get_jobs(self, request: Request) -> Response:
+        name = request.params[0]
+        await self.require_printer(name)
+        return self.respond(request, await self.jobs_snapshot(name), self.ttl)
+
+    async def _get_job(self, request: Request) -> Response:
+        name, job_id = request.params[0], int(request.params[1])
+        await self.require_printer(name)
+        # Servido a partir do snapshot da fila: nenhuma consulta extra por job
+        jobs = await self.jobs_snapshot(name)
+        for job in jobs.data['jobs']:
+            if job['job_id'] == job_id:
+                return self.respond(request, Snapshot(job), self.ttl)
+        raise LookupError(f"Job {job_id} não encontrado em {name}")
+
+    async def _control_job(self, request: Request) -> Response:
+        name, job_id, action = request.params[0], int(request.params[1]), request.params[2]
+        if action not in JOB_ACTIONS:
+            return Response.error(404, f"Ação {action} inválida")
+        await self.require_printer(name)
+        control = getattr(self.job_manager, f"{action}_job")
+        loop = asyncio.get_running_loop()
+        success = await loop.run_in_executor(self._executor, control, name, job_id)
+        # A fila mudou: a próxima leitura consulta o spooler de novo
+        self.store.invalidate(f"jobs:{name}")
+        self.store.invalidate(f"status:{name}")
+        result = {'success': success, 'printer_name': name, 'job_id': job_id, 'action': action}
+        if not success:
+            result['error'] = f"Não foi possível executar {action} no job {job_id}"
+        return Response.json(result, 200 if success else 409)
+
+    async def _delete_job(self, request: Request) -> Response:
+        request.params = (*request.params, 'cancel')
+        return await self._control_job(request)
+
+    async def _get_stats(self, request: Request) -> Response:
+        return Response.json({'server': dict(self.stats), 'snapshots': self.store.get_stats(),
+                              'job_poller': self.job_poller.get_stats(),
+                              'sync': self.delta.get_stats(),
+                              'push': dict(self.changes.stats) if self.changes else None},
+                             headers={'Cache-Control': 'no-store'})
+
+    async def sync(self, printer_name: str, since: int, epoch: Optional[str]) -> Dict[str, Any]:
+        """Renova (se expirados) os snapshots da impressora e devolve as mudanças desde `since`"""
+        await asyncio.gather(self.jobs_snapshot(printer_name), self.status_snapshot(printer_name))
+        return self.delta.changes_since(printer_name, since, epoch)
+
+    async def _get_sync(self, request: Request) -> Response:
+        name = request.params[0]
+        await self.require_printer(name)
+        try:
+            since = int(request.query.get('since') or 0)
+        except ValueError:
+            return Response.error(400, "since deve ser um número de versão")
+        return Response.json(await self.sync(name, since, request.query.get('epoch')),
+                             headers={'Cache-Control': 'no-store'})
+
+    async def _post_sync(self, request: Request) -> Response:
+        """Várias impressoras em uma requisição; sem 'printers', todo o inventário desde a versão 0"""
+        try:
+            body = json.loads(request.body or b'{}')
+            versions = {str(name): int(version) for name, version in (body.get('printers') or {}).items()}
+        except (ValueError, TypeError, AttributeError):
+            return Response.error(400, 'Corpo esperado: {"e": época, "printers": {nome: versão}}')
+        if not versions:
+            versions = {printer['display_name']: 0 for printer in (await self.inventory()).data['printers']}
+        for name in versions:
+            await self.require_printer(name)
+        names = list(versions)
+        results = await asyncio.gather(*(self.sync(name, versions[name], body.get('e')) for name in names),
+                                       return_exceptions=True)
+        printers = {}
+        for name, result in zip(names, results):
+            printers[name] = {'error': str(result)} if isinstance(result, Exception) else result
+        return Response.json({'e': self.delta.epoch, 'printers': printers}, headers={'Cache-Control': 'no-store'})
+
+    # ------------------------------------------------------------------
+    # Push (SSE / WebSocket)
+    # ------------------------------------------------------------------
+    def _stream_options(self, request: Request) -> Tuple[int, Optional[frozenset]]:
+        """Cursor inicial (Last-Event-ID ou ?since=) e filtro ?printers=a,b"""
+        since = request.headers.get('last-event-id') or request.query.get('since')
+        try:
+            cursor = int(since) if since not in (None, '') else self.changes.last_seq  # type: ignore
+        except ValueError:
+            cursor = self.changes.last_seq  # type: ignore
+        printers = request.query.get('printers')
+        return cursor, frozenset(name for name in printers.split(',') if name) if printers else None
+
+    async def _get_events(self, request: Request) -> Response:
+        cursor, printers = self._stream_options(request)
+        changes: ChangeStream = self.changes  # type: ignore
+
+        async def stream(reader, writer):
+            writer.write(f"retry: 3000\n: conectado em {changes.last_seq}\n\n".encode('utf-8'))
+            await changes.pump(writer, cursor, printers, StreamEvent.sse, b": heartbeat\n\n")
+
+        return Response(200, headers={'Content-Type': 'text/event-stream; charset=utf-8',
+                                      'Cache-Control': 'no-cache', 'Connection': 'keep-alive',
+                                      'X-Accel-Buffering': 'no'}, stream=stream)
+
+    async def _get_websocket(self, request: Request) -> Response:
+        key = request.headers.get('sec-websocket-key')
+        if request.headers.get('upgrade', '').lower() != 'websocket' or not key:
+            return Response.error(426, "Requer WebSocket (Upgrade: websocket)")
+        cursor, printers = self._stream_options(request)
+        changes: ChangeStream = self.changes  # type: ignore
+
+        async def stream(reader, writer):
+            closed = asyncio.Event()
+
+            async def read_frames():
+                # Responde pings e encerra no quadro de fechamento; mensagens de texto são ignoradas
+                try:
+                    while True:
+                        opcode, payload = await read_websocket_frame(reader)
+                        if opcode == WS_PING:
+                            writer.write(websocket_frame(payload, WS_PONG))
+                        elif opcode == WS_CLOSE:
+                            writer.write(websocket_frame(payload[:2], WS_CLOSE))
+                            break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    pass
+                closed.set()
+                writer.close()
+
+            reader_task = asyncio.create_task(read_frames())
+            try:
+                await changes.pump(writer, cursor, printers, StreamEvent.websocket,
+                                   websocket_frame(b'', WS_PING), closed)
+            finally:
+                reader_task.cancel()
+
+        return Response(101, headers={'Upgrade': 'websocket', 'Connection': 'Upgrade',
+                                      'Sec-WebSocket-Accept': websocket_accept(key)}, stream=stream)
@@ -0,0 +1,300 @@
+import asyncio
+import base64
+import hashlib
+import struct
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from core import AppLogger, PrinterAccessManager
+from services.job import PrinterJobMonitor
+from services.status.status_checker import PrinterStatusChecker
+from services.status.status_monitor import PrinterStatusMonitor
+from utils import EventBus
+from .snapshots import encode_json
+
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC11B85"
+
+# Opcodes WebSocket (RFC 6455)
+WS_TEXT, WS_CLOSE, WS_PING, WS_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+def websocket_accept(key: str) -> str:
+    return base64.b64encode(hashlib.sha1(key.encode('latin-1') + WEBSOCKET_GUID).digest()).decode('ascii')
+
+
+def websocket_frame(payload: bytes, opcode: int = WS_TEXT) -> bytes:
+    """Quadro final, sem máscara (servidor -> cliente)"""
+    size = len(payload)
+    if size < 126:
+        header = struct.pack('!BB', 0x80 | opcode, size)
+    elif size < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, size)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, size)
+    return header + payload
+
+
+async def read_websocket_frame(reader: asyncio.StreamReader, max_size: int = 64 * 1024) -> Tuple[int, bytes]:
+    """Lê um quadro do cliente (sempre mascarado) e retorna (opcode, payload)"""
+    first, second = await reader.readexactly(2)
+    size = second & 0x7F
+    if size == 126:
+        size = struct.unpack('!H', await reader.readexactly(2))[0]
+    elif size == 127:
+        size = struct.unpack('!Q', await reader.readexactly(8))[0]
+    if size > max_size:
+        raise ConnectionError("Quadro WebSocket muito grande")
+    mask = await reader.readexactly(4) if second & 0x80 else b''
+    payload = await reader.readexactly(size)
+    if mask:
+        payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+    return first & 0x0F, payload
+
+
+class StreamEvent:
+    """Evento numerado; os quadros SSE e WebSocket são montados uma vez e compartilhados por todos os clientes"""
+
+    __slots__ = ('seq', 'type', 'printer_name', 'body', '_sse', '_ws')
+
+    def __init__(self, seq: int, event: Dict[str, Any]) -> None:
+        self.seq = seq
+        self.type = str(getattr(event.get('type'), 'name', event.get('type')))
+        self.printer_name = event.get('printer_name')
+        self.body = encode_json({'seq': seq, **event, 'type': self.type})
+        self._sse: Optional[bytes] = None
+        self._ws: Optional[bytes] = None
+
+    def sse(self) -> bytes:
+        if self._sse is None:
+            self._sse = f"id: {self.seq}\nevent: {self.type}\ndata: ".encode('utf-8') + self.body + b"\n\n"
+        return self._sse
+
+    def websocket(self) -> bytes:
+        if self._ws is None:
+            self._ws = websocket_frame(self.body)
+        return self._ws
+
+
+class ChangeStream:
+    """
+    Histórico numerado de mudanças com fan-out para muitos clientes em um loop asyncio
+
+    Eventos chegam de qualquer thread (`publish`, normalmente como assinante
+    de um EventBus) e são incorporados em lote no loop: cada lote recebe
+    números de sequência consecutivos, vira quadros SSE/WebSocket uma única
+    vez e acorda todos os clientes com um só Event. Cada cliente mantém
+    apenas um cursor no histórico, então não há fila por cliente; quem
+    retoma com um número de sequência mais antigo que o histórico recebe
+    um evento RESET e segue a partir do presente.
+    """
+
+    def __init__(self,
+                 history: int = 10000,
+                 heartbeat: float = 15.0,
+                 max_buffer: int = 1024 * 1024) -> None:
+        """
+        Args:
+            history: Eventos mantidos para retomada (no mínimo)
+            heartbeat: Intervalo (s) dos heartbeats para clientes sem eventos
+            max_buffer: Bytes pendentes de envio acima dos quais o cliente lento é desconectado
+        """
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.history = history
+        self.heartbeat = heartbeat
+        self.max_buffer = max_buffer
+        self.stats = {'events': 0, 'clients': 0, 'connections': 0, 'resets': 0, 'slow_disconnects': 0}
+        self._events: List[StreamEvent] = []
+        self._first_seq = 1
+        self._next_seq = 1
+        self._incoming: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tick = 0
+        self._ticker: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def last_seq(self) -> int:
+        return self._next_seq - 1
+
+    # ------------------------------------------------------------------
+    # Produção
+    # ------------------------------------------------------------------
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Associa ao loop que atende os clientes (chamado dentro do loop)"""
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._ticker = loop.create_task(self._heartbeat_loop())
+        with self._lock:
+            self._scheduled = bool(self._incoming)
+        if self._scheduled:
+            loop.call_soon(self._flush)
+
+    async def close(self) -> None:
+        """Encerra os clientes conectados e o heartbeat"""
+        self._closing = True
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+        self._wake()
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Acrescenta um evento (seguro a partir de qualquer thread; não bloqueia)"""
+        with self._lock:
+            self._incoming.append(event)
+            if self._scheduled or self._loop is None:
+                return
+            self._scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._flush)
+        except RuntimeError:
+            # Loop já encerrado
+            pass
+
+    def subscribe_to(self, event_bus: EventBus, printers: Optional[Iterable[str]] = None):
+        """Assina o barramento de eventos; retorna a Subscription"""
+        return event_bus.subscribe(self.publish, printers=printers, coalesce=False, name="change-stream")
+
+    def _flush(self) -> None:
+        with self._lock:
+            batch = list(self._incoming)
+            self._incoming.clear()
+            self._scheduled = False
+        for event in batch:
+            self._events.append(StreamEvent(self._next_seq, event))
+            self._next_seq += 1
+        self.stats['events'] += len(batch)
+        # Descarte amortizado: a lista cresce até 2x o histórico antes de ser cortada
+        if len(self._events) > 2 * self.history:
+            dropped = len(self._events) - self.history
+            del self._events[:dropped]
+            self._first_seq += dropped
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            wakeup, self._wakeup = self._wakeup, asyncio.Event()
+            wakeup.set()
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            self._tick += 1
+            self._wake()
+
+    def events_since(self, seq: int) -> Tuple[List[StreamEvent], bool]:
+        """
+        Eventos com sequência maior que `seq`
+
+        Returns:
+            (eventos, reset) - reset é True se parte dos eventos já saiu do histórico
+            ou se `seq` está à frente do fluxo (cursor de uma instância anterior)
+        """
+        if seq < self._first_seq - 1 or seq > self.last_seq:
+            return [], True
+        return self._events[max(0, seq + 1 - self._first_seq):], False
+
+    # ------------------------------------------------------------------
+    # Clientes
+    # ------------------------------------------------------------------
+    async def pump(self,
+                   writer: asyncio.StreamWriter,
+                   cursor: int,
+                   printers: Optional[FrozenSet[str]],
+                   encode: Callable[[StreamEvent], bytes],
+                   heartbeat_frame: bytes,
+                   closed: Optional[asyncio.Event] = None) -> None:
+        """
+        Envia ao cliente os eventos posteriores a `cursor` até a conexão fechar
+
+        Args:
+            writer: Conexão do cliente
+            cursor: Último número de sequência que o cliente já tem
+            printers: Impressoras de interesse (None = todas)
+            encode: StreamEvent.sse ou StreamEvent.websocket
+            heartbeat_frame: Quadro enviado a cada heartbeat sem eventos
+            closed: Sinalizado quando o cliente encerra a conexão
+        """
+        self.stats['clients'] += 1
+        self.stats['connections'] += 1
+        tick = self._tick
+        try:
+            while not self._closing and not writer.transport.is_closing() and not (closed and closed.is_set()):
+                events, reset = self.events_since(cursor)
+                if reset:
+                    self.stats['resets'] += 1
+                    cursor = self.last_seq
+                    events = [StreamEvent(cursor, {'type': 'RESET', 'last_seq': cursor,
+                                                   'oldest_seq': self._first_seq})]
+                if events:
+                    cursor = events[-1].seq
+                    chunk = b''.join(encode(event) for event in events
+                                     if printers is None or event.printer_name is None
+                                     or event.printer_name in printers)
+                    if chunk:
+                        writer.write(chunk)
+                        tick = self._tick
+                        if writer.transport.get_write_buffer_size() > self.max_buffer:
+                            # Cliente lento: desconecta; ele pode retomar pelo número de sequência
+                            self.stats['slow_disconnects'] += 1
+                            break
+                        await writer.drain()
+                    continue
+                if tick != self._tick:
+                    tick = self._tick
+                    writer.write(heartbeat_frame)
+                    await writer.drain()
+                    continue
+                await self._wakeup.wait()  # type: ignore
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.stats['clients'] -= 1
+
+
+class ChangeFeed:
+    """
+    Monitores de jobs (um por impressora) e de status publicando em um EventBus
+
+    Alimenta o ChangeStream da API: a consulta ao spooler é a mesma, não
+    importa quantos clientes estejam conectados.
+    """
+
+    def __init__(self,
+                 event_bus: EventBus,
+                 printers: Iterable[str],
+                 job_interval: float = 2.0,
+                 status_interval: float = 5.0) -> None:
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.event_bus = event_bus
+        self.printers = list(printers)
+        self.job_interval = job_interval
+        self.status_interval = status_interval
+        self._job_monitors: List[PrinterJobMonitor] = []
+        self._status_monitor = PrinterStatusMonitor(PrinterStatusChecker(PrinterAccessManager.instance))
+        self._stop_event = threading.Event()
+        self._status_thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        for name in self.printers:
+            monitor = PrinterJobMonitor(self.event_bus)
+            monitor.monitor_jobs(name, interval=self.job_interval)  # type: ignore[arg-type]
+            self._job_monitors.append(monitor)
+        if self.printers:
+            self._status_thread = self._status_monitor.publish_status_changes(
+                self.printers, self.event_bus, self.status_interval, self._stop_event)
+        self.logger.info(f"Monitorando mudanças de {len(self.printers)} impressoras")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        for monitor in self._job_monitors:
+            monitor.stop_monitoring()
+        self._job_monitors = []
+        if self._status_thread is not None:
+            self._status_thread.join(timeout=2.0)
+            self._status_thread = None
@@ -0,0 +1,166 @@
+import enum
+import gzip
+import hashlib
+import json
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional
+
+from core import AppLogger
+
+
+def json_default(value: Any) -> Any:
+    """Serializa os tipos que aparecem nos dicionários de status e jobs"""
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def encode_json(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=json_default).encode('utf-8')
+
+
+class Snapshot:
+    """Resposta pronta de uma consulta: corpo JSON serializado uma única vez e seu ETag"""
+
+    __slots__ = ('data', 'body', 'etag', 'created', '_gzipped')
+
+    def __init__(self, data: Any) -> None:
+        self.data = data
+        self.body = encode_json(data)
+        # Mesmo conteúdo, mesmo ETag: o cliente recebe 304 mesmo após a renovação
+        self.etag = '"' + hashlib.blake2b(self.body, digest_size=12).hexdigest() + '"'
+        self.created = time.monotonic()
+        self._gzipped: Optional[bytes] = None
+
+    def gzipped(self) -> bytes:
+        """Corpo comprimido (calculado na primeira vez)"""
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=5)
+        return self._gzipped
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+
+class _Entry:
+    __slots__ = ('snapshot', 'ttl', 'loading', 'error')
+
+    def __init__(self) -> None:
+        self.snapshot: Optional[Snapshot] = None
+        self.ttl = 0.0
+        self.loading: Optional[threading.Event] = None
+        self.error: Optional[BaseException] = None
+
+
+class SnapshotStore:
+    """
+    Cache compartilhado de snapshots com consulta única por chave
+
+    Enquanto o snapshot de uma chave (ex: 'jobs:EPSON') tem menos de `ttl`
+    segundos ele é servido a todos os clientes; ao expirar, só a primeira
+    requisição consulta o spooler e as demais aguardam esse resultado. Assim
+    o número de consultas por impressora é no máximo uma por intervalo,
+    independente da quantidade de clientes.
+    """
+
+    def __init__(self, ttl: float = 1.0, stale_on_error: bool = True) -> None:
+        """
+        Args:
+            ttl: Validade padrão (s) de um snapshot
+            stale_on_error: Serve o último snapshot se a renovação falhar
+        """
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.ttl = ttl
+        self.stale_on_error = stale_on_error
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'loads': 0, 'waits': 0, 'errors': 0, 'stale': 0}
+
+    def peek(self, key: str) -> Optional[Snapshot]:
+        """Snapshot ainda válido da chave (sem consultar nada), ou None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.snapshot is None or entry.snapshot.age >= entry.ttl:
+                return None
+            self.stats['hits'] += 1
+            return entry.snapshot
+
+    def get(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None) -> Snapshot:
+        """
+        Retorna o snapshot da chave, consultando `loader` se expirou
+
+        Args:
+            key: Chave do snapshot
+            loader: Função que consulta o spooler e retorna dados serializáveis
+            ttl: Validade deste snapshot (padrão: o da store)
+
+        Returns:
+            Snapshot válido (ou o anterior, se a renovação falhou e stale_on_error)
+
+        Raises:
+            A exceção do loader quando não há snapshot anterior para servir
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.setdefault(key, _Entry())
+                snapshot = entry.snapshot
+                if snapshot is not None and snapshot.age < entry.ttl:
+                    self.stats['hits'] += 1
+                    return snapshot
+                loading = entry.loading
+                if loading is None:
+                    entry.loading = loading = threading.Event()
+                    entry.error = None
+                    self.stats['loads'] += 1
+                    break
+                self.stats['waits'] += 1
+            # Outra thread já está consultando esta chave: aguarda o resultado dela
+            loading.wait()
+            with self._lock:
+                if entry.error is None and entry.snapshot is not None:
+                    return entry.snapshot
+                if entry.error is not None and entry.loading is None:
+                    if self.stale_on_error and entry.snapshot is not None:
+                        return entry.snapshot
+                    raise entry.error
+
+        try:
+            snapshot = Snapshot(loader())
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+                entry.error = e
+                entry.loading = None
+                stale = entry.snapshot if self.stale_on_error else None
+                if stale is not None:
+                    self.stats['stale'] += 1
+            loading.set()
+            if stale is None:
+                raise
+            self.logger.warning(f"Falha ao renovar {key}, servindo snapshot anterior: {e}")
+            return stale
+
+        with self._lock:
+            entry.snapshot = snapshot
+            entry.ttl = self.ttl if ttl is None else ttl
+            entry.loading = None
+        loading.set()
+        return snapshot
+
+    def invalidate(self, key: Optional[str] = None, prefix: Optional[str] = None) -> None:
+        """Expira uma chave, as chaves com um prefixo ou todas"""
+        with self._lock:
+            for name, entry in self._entries.items():
+                if (key is None and prefix is None) or name == key or (prefix and name.startswith(prefix)):
+                    entry.ttl = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, 'keys': len(self._entries)}
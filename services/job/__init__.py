@@ -2,4 +2,5 @@ from .job_history import PrinterJobHistory
 from .job_monitor import PrinterJobMonitor
 from .job_utils import detect_job_changes
 from .parser import format_job_info
-from .job_manager import PrinterJobManager
\ No newline at end of file
+from .job_manager import PrinterJobManager
+from .job_poller import PrinterJobPoller
\ No newline at end of file
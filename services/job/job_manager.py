@@ -1,31 +1,22 @@
 import win32print
 from typing import List, Dict, Optional
 from core import AppLogger, PrinterAccessManager
+from core.job_operations import JobOperations
 from .parser import format_job_info
 
 
-class PrinterJobManager:
-    """Gerencia operações diretas em jobs de impressão"""
+class PrinterJobManager(JobOperations):
+    """Gerencia operações diretas em jobs de impressão (paginação e lotes em JobOperations)"""
 
     def __init__(self):
         self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
         self.access_manager = PrinterAccessManager.instance
 
-    def list_jobs(self, printer_name: str) -> List[Dict]:
-        handle = self.access_manager.open_printer(printer_name)  # type: ignore
-        if not handle:
-            return []
-
-        try:
-            jobs = win32print.EnumJobs(handle, 0, -1, 2)
-            jobs_info = [format_job_info(job, self.access_manager) for job in jobs]
-            self.logger.info(f"Encontrados {len(jobs_info)} jobs em {printer_name}")
-            return jobs_info
-        except Exception as e:
-            self.logger.error(f"Erro ao listar jobs em {printer_name}: {e}", exc_info=True)
-            return []
-        finally:
-            self.access_manager.close_printer(printer_name)  # type: ignore
+    def list_jobs(self, printer_name: str, **filters) -> List[Dict]:
+        """Lista os jobs da impressora (aceita os mesmos filtros de iter_jobs)"""
+        jobs_info = list(self.iter_jobs(printer_name, **filters))
+        self.logger.info(f"Encontrados {len(jobs_info)} jobs em {printer_name}")
+        return jobs_info
 
     def get_job(self, printer_name: str, job_id: int) -> Optional[Dict]:
         handle = self.access_manager.open_printer(printer_name)  # type: ignore
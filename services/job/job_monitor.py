@@ -1,34 +1,61 @@
 import threading
-import time
+import win32print
 from typing import List, Dict, Callable, Optional
-from core import AppLogger, PrinterJobManager
+from core import AppLogger, PrinterJobManager, is_sleeping_status, read_polling_status
+from utils import AdaptivePollingPolicy, EventBus
 from .job_utils import detect_job_changes
+from .job_poller import PrinterJobPoller
 
 
 class PrinterJobMonitor:
-    """Gerencia monitoramento contínuo de jobs"""
+    """
+    Gerencia monitoramento contínuo de jobs
 
-    def __init__(self):
+    O loop de consulta só publica as mudanças no barramento de eventos; os
+    callbacks rodam nas threads dos assinantes e não atrasam a consulta.
+    """
+
+    def __init__(self, event_bus: Optional[EventBus] = None):
         self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.events = event_bus or EventBus()
+        self._subscription = None
         self.job_manager = PrinterJobManager()
+        self.poller = PrinterJobPoller()
         self._monitoring = False
         self._monitor_thread = None
+        self._stop_event = threading.Event()
+        self.polling_policy: Optional[AdaptivePollingPolicy] = None
 
     def monitor_jobs(self, 
                     printer_name: str,
-                    callback: Callable[[Dict], None],
+                    callback: Optional[Callable[[Dict], None]] = None,
                     interval: int = 5,
                     specific_job_ids: Optional[List[int]] = None,
-                    monitor_all: bool = True) -> bool:
+                    monitor_all: bool = True,
+                    polling_policy: Optional[AdaptivePollingPolicy] = None) -> bool:
+        """
+        Inicia o monitoramento de jobs em uma thread
+
+        Args:
+            callback: Assinante das mudanças desta impressora (opcional; outros
+                assinantes podem usar `self.events.subscribe`)
+            interval: Intervalo fixo em segundos (ignorado se polling_policy for informado)
+            polling_policy: Política adaptativa: acelera com jobs ativos e recua com a fila ociosa
+        """
         if self._monitoring:
             self.logger.warning("Monitoramento já em execução")
             return False
         
         self.printer_name = printer_name
+        self.polling_policy = polling_policy
+        if callback is not None:
+            self._subscription = self.events.subscribe(callback, printers=[printer_name],
+                                                       name=f"job-monitor-{printer_name}")
+        self._stop_event.clear()
         self._monitoring = True
         self._monitor_thread = threading.Thread(
             target=self._monitor_loop,
-            args=(printer_name, callback, interval, specific_job_ids, monitor_all),
+            args=(printer_name, interval, specific_job_ids, monitor_all),
             daemon=True
         )
         self._monitor_thread.start()
@@ -37,30 +64,47 @@ class PrinterJobMonitor:
 
     def stop_monitoring(self):
         self._monitoring = False
+        self._stop_event.set()
         if self._monitor_thread and self._monitor_thread.is_alive():
             self._monitor_thread.join(timeout=2.0)
+        if self._subscription is not None:
+            self.events.unsubscribe(self._subscription, timeout=2.0)
+            self._subscription = None
         self.logger.info("Monitoramento parado")
 
     def is_monitoring(self) -> bool:
         return self._monitoring
 
-    def _monitor_loop(self, printer_name, callback, interval, specific_job_ids, monitor_all):
+    def _monitor_loop(self, printer_name, interval, specific_job_ids, monitor_all):
         last_jobs_state = {}
         while self._monitoring:
+            changes = []
             try:
-                current_jobs = self.job_manager.list_jobs(printer_name)
-                jobs_dict = {job['job_id']: job for job in current_jobs}
+                # Varredura nível 1 + GetJob nível 2 só para jobs novos/alterados
+                jobs_dict = self.poller.poll(printer_name)
+                if jobs_dict is None:
+                    raise RuntimeError(f"Não foi possível consultar os jobs de {printer_name}")
 
                 if not monitor_all and specific_job_ids:
                     jobs_dict = {jid: job for jid, job in jobs_dict.items() if jid in specific_job_ids}
 
                 changes = detect_job_changes(last_jobs_state, jobs_dict)
-                if changes:
-                    for change in changes:
-                        callback(change)
+                for change in changes:
+                    self.events.publish({**change, "printer_name": printer_name})
 
                 last_jobs_state = jobs_dict
             except Exception as e:
                 self.logger.error(f"Erro no loop de monitoramento: {e}", exc_info=True)
 
-            time.sleep(interval)
+            self._stop_event.wait(self._next_interval(printer_name, interval, last_jobs_state, bool(changes)))
+
+    def _next_interval(self, printer_name: str, interval: float, jobs: Dict[int, Dict], changed: bool) -> float:
+        if self.polling_policy is None:
+            return interval
+        # Impressora offline/em economia de energia (GetPrinter nível 2, sem
+        # enumerar a fila) ou todos os jobs parados offline: consulta raramente
+        status = read_polling_status(printer_name, self.poller.access_manager)
+        sleeping = is_sleeping_status(status) or (
+            bool(jobs) and all(job["status_code"] & win32print.JOB_STATUS_OFFLINE for job in jobs.values())
+        )
+        return self.polling_policy.next_interval(printer_name, active=bool(jobs), changed=changed, sleeping=sleeping)
@@ -0,0 +1,95 @@
+import threading
+import win32print
+from typing import Any, Dict, Optional, Tuple
+from core import AppLogger, PrinterAccessManager
+from core.job_operations import iter_job_pages
+from .parser import format_job_info
+
+
+class PrinterJobPoller:
+    """
+    Consulta de jobs em duas fases para monitoramento
+
+    1. Varredura barata: EnumJobs nível 1 (IDs, status, páginas - sem DEVMODE)
+    2. Detalhes: GetJob nível 2 apenas para jobs novos ou alterados
+
+    Os detalhes de jobs sem alteração são reaproveitados do cache, então em
+    uma fila grande e estável o payload por ciclo cai para o da varredura.
+    """
+
+    def __init__(self, page_size: int = 500):
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.access_manager = PrinterAccessManager.instance
+        self.page_size = page_size
+        self._cache: Dict[str, Dict[int, Tuple[Tuple, Dict]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'polls': 0, 'summary_jobs': 0, 'detail_fetches': 0, 'cache_hits': 0}
+
+    def poll(self, printer_name: str) -> Optional[Dict[int, Dict]]:
+        """
+        Retorna o estado atual da fila {job_id: job_info}
+
+        Returns:
+            Dicionário de jobs ou None se a impressora não pôde ser consultada
+        """
+        handle = self.access_manager.open_printer(printer_name)  # type: ignore
+        if not handle:
+            return None
+
+        try:
+            summary = self._scan(handle)
+            with self._lock:
+                cached = self._cache.get(printer_name, {})
+            current: Dict[int, Tuple[Tuple, Dict]] = {}
+            fetched = 0
+
+            for job in summary:
+                job_id = job["JobId"]
+                key = self._change_key(job)
+                entry = cached.get(job_id)
+                if entry is not None and entry[0] == key:
+                    current[job_id] = entry
+                    continue
+                try:
+                    details = win32print.GetJob(handle, job_id, 2)
+                except Exception as e:
+                    # O job pode ter saído da fila entre a varredura e o GetJob
+                    self.logger.debug(f"Job {job_id} indisponível em {printer_name}: {e}")
+                    continue
+                fetched += 1
+                current[job_id] = (self._change_key(details), format_job_info(details, self.access_manager))
+
+            with self._lock:
+                self._cache[printer_name] = current
+                self.stats['polls'] += 1
+                self.stats['summary_jobs'] += len(summary)
+                self.stats['detail_fetches'] += fetched
+                self.stats['cache_hits'] += len(current) - fetched
+
+            return {job_id: info for job_id, (_, info) in current.items()}
+        except Exception as e:
+            self.logger.error(f"Erro ao consultar jobs em {printer_name}: {e}", exc_info=True)
+            return None
+        finally:
+            self.access_manager.close_printer(printer_name)  # type: ignore
+
+    def invalidate(self, printer_name: Optional[str] = None) -> None:
+        """Descarta os detalhes em cache de uma impressora (ou de todas)"""
+        with self._lock:
+            if printer_name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(printer_name, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
+
+    def _scan(self, handle) -> list:
+        # Retomada pelo último job visto: jobs que terminam entre as páginas não fazem outros sumirem
+        return [job for page in iter_job_pages(handle, self.page_size, 1) for job in page]
+
+    @staticmethod
+    def _change_key(job) -> Tuple:
+        """Campos de nível 1 cuja alteração exige buscar os detalhes novamente"""
+        return (job["Status"], job["PagesPrinted"], job["TotalPages"], job["Priority"], job["pDocument"])
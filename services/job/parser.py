@@ -1,15 +1,4 @@
-from typing import Dict
-def format_job_info(job, access_manager) -> Dict:
-    return {
-        "job_id": job["JobId"],
-        "document_name": job["pDocument"],
-        "status": access_manager._decode_job_status(job["Status"]),  # type: ignore
-        "status_code": job["Status"],
-        "pages_printed": job["PagesPrinted"],
-        "total_pages": job["TotalPages"],
-        "submitted_time": job["Submitted"].isoformat() if job["Submitted"] else None,
-        "user_name": job["pUserName"],
-        "machine_name": job["pMachineName"],
-        "data_type": job["pDatatype"],
-        "priority": job["Priority"]
-    }
+# Implementado em core: a paginação e as operações em lote de core também formatam jobs
+from core.job_operations import LEVEL2_FIELDS, format_job_info, job_info_level
+
+__all__ = ['LEVEL2_FIELDS', 'format_job_info', 'job_info_level']
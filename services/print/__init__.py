@@ -1 +1,6 @@
-from services.print.print_manager import PrinterPrint
\ No newline at end of file
+from services.print.print_manager import PrinterPrint
+from services.print.dispatcher import PrintDispatcher, PrintPriority, PrintQueueFullError, PrintTicket, TicketState
+from services.print.printer_pool import (PrinterPool, PrinterLoadCache, PrintRouter, RoutingStrategy,
+                                         LeastPagesStrategy, RoundRobinStrategy, StickyUserStrategy,
+                                         ROUTING_STRATEGIES)
+from services.print.render_cache import RenderCache, RENDER_FORMATS
@@ -0,0 +1,498 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from enum import Enum, IntEnum
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+from core import AppLogger
+
+
+class PrintPriority(IntEnum):
+    """Classes de prioridade (menor valor é atendido primeiro)"""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class TicketState(str, Enum):
+    """Estados de um ticket de impressão"""
+    QUEUED = "QUEUED"
+    PRINTING = "PRINTING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
+class PrintQueueFullError(RuntimeError):
+    """Fila da impressora cheia (backpressure)"""
+
+
+class PrintTicket:
+    """
+    Comprovante de um documento enviado ao PrintDispatcher
+
+    Retornado imediatamente por `submit`; `wait()` bloqueia até o envio terminar.
+    """
+
+    def __init__(self, ticket_id: int, printer_name: str, document: Union[str, bytes], kind: str,
+                 priority: PrintPriority, copies: int, doc_name: str, collate: Optional[bool] = None,
+                 duplex: Optional[str] = None) -> None:
+        self.ticket_id = ticket_id
+        self.printer_name = printer_name
+        self.document = document
+        self.kind = kind
+        self.priority = priority
+        self.copies = copies
+        self.collate = collate
+        self.duplex = duplex
+        self.doc_name = doc_name
+        self.state = TicketState.QUEUED
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def queue_wait(self) -> Optional[float]:
+        """Tempo (s) entre a submissão e o início do envio"""
+        return None if self.started_at is None else self.started_at - self.submitted_at
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Aguarda a conclusão do envio
+
+        Returns:
+            Resultado do envio ou None se o timeout expirou
+        """
+        self._done.wait(timeout)
+        return self.result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'ticket_id': self.ticket_id,
+            'printer_name': self.printer_name,
+            'kind': self.kind,
+            'doc_name': self.doc_name,
+            'priority': self.priority.name,
+            'copies': self.copies,
+            'state': self.state.value,
+            'queue_wait': self.queue_wait,
+            'result': self.result
+        }
+
+    def _finish(self, state: TicketState, result: Dict[str, Any]) -> None:
+        self.state = state
+        self.result = result
+        self.finished_at = time.monotonic()
+        self.document = b"" if isinstance(self.document, bytes) else self.document
+        self._done.set()
+
+
+class PrintDispatcher:
+    """
+    Despacho assíncrono de documentos para impressão
+
+    - `submit` retorna um PrintTicket na hora; o envio roda em um pool de workers
+    - No máximo `max_in_flight` envios simultâneos por impressora
+    - Fila limitada por impressora: cheia, `submit` bloqueia (ou levanta
+      PrintQueueFullError com `block=False`/timeout)
+    - Dentro de cada impressora, PrintPriority e depois ordem de chegada
+
+    Tipos de documento: 'raw' (bytes enviados com WritePrinter), 'docx' e 'pdf'
+    (ShellExecute "print", como em PrinterPrint) e 'blank' (página em branco).
+
+    Com `render_cache`, a página em branco é gerada uma única vez; com
+    `renderers[kind]`, DOCX/PDF são convertidos para o formato da impressora,
+    guardados no cache e enviados como RAW, sem abrir o aplicativo associado.
+    """
+
+    # Pausa entre ShellExecute por cópia: o aplicativo associado descarta
+    # pedidos de impressão disparados em sequência
+    SHELL_COPY_DELAY = 2.0
+
+    def __init__(self,
+                 max_workers: int = 4,
+                 max_in_flight: int = 1,
+                 max_queue: int = 100,
+                 send: Optional[Callable[[PrintTicket], Dict[str, Any]]] = None,
+                 metrics_window: float = 60.0,
+                 render_cache=None,
+                 renderers: Optional[Dict[str, Callable[[str, str], bytes]]] = None) -> None:
+        """
+        Args:
+            max_workers: Threads de envio
+            max_in_flight: Envios simultâneos por impressora
+            max_queue: Documentos aguardando por impressora
+            send: Função de envio (padrão: envio real por tipo de documento)
+            metrics_window: Janela (s) do cálculo de vazão
+            render_cache: RenderCache para documentos repetidos
+            renderers: Funções (arquivo, impressora) -> bytes prontos, por tipo de documento
+        """
+        if max_workers < 1 or max_in_flight < 1 or max_queue < 1:
+            raise ValueError("max_workers, max_in_flight e max_queue devem ser >= 1")
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.metrics_window = metrics_window
+        self._send = send or self._send_document
+        self.render_cache = render_cache
+        self.renderers = dict(renderers or {})
+        self._queues: Dict[str, List[Tuple[int, int, PrintTicket]]] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._tickets: Dict[int, PrintTicket] = {}
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._closed = False
+        self._counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'rejected': 0}
+        self._finished_at: Deque[float] = deque()
+        self._waits: Dict[PrintPriority, Deque[float]] = {p: deque(maxlen=1000) for p in PrintPriority}
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def submit(self,
+               printer_name: str,
+               document: Union[str, bytes],
+               kind: Optional[str] = None,
+               priority: PrintPriority = PrintPriority.NORMAL,
+               copies: int = 1,
+               doc_name: Optional[str] = None,
+               collate: Optional[bool] = None,
+               duplex: Optional[str] = None,
+               block: bool = True,
+               timeout: Optional[float] = None) -> PrintTicket:
+        """
+        Enfileira um documento para impressão
+
+        Args:
+            printer_name: Nome da impressora
+            document: Caminho (DOCX/PDF) ou bytes (RAW)
+            kind: 'raw', 'docx', 'pdf' ou 'blank' (padrão: deduzido do documento)
+            priority: Classe de prioridade
+            copies: Número de cópias
+            doc_name: Nome exibido na fila do spooler
+            collate: Agrupar cópias (DOCX/PDF, via DEVMODE; None mantém o padrão do driver)
+            duplex: 'simplex', 'long_edge' ou 'short_edge' (DOCX/PDF, via DEVMODE)
+            block: Se a fila estiver cheia, aguarda vaga (True) ou falha na hora (False)
+            timeout: Tempo máximo (s) aguardando vaga
+
+        Returns:
+            PrintTicket do documento
+
+        Raises:
+            PrintQueueFullError: Fila cheia (sem bloqueio ou timeout esgotado)
+            ValueError: Tipo de documento não suportado
+        """
+        kind = kind or self._detect_kind(document)
+        if kind not in ('raw', 'docx', 'pdf', 'blank'):
+            raise ValueError(f"Tipo de documento {kind} não suportado")
+        if doc_name is None:
+            doc_name = os.path.basename(document) if isinstance(document, str) and document else f"Documento {kind}"
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("PrintDispatcher encerrado")
+            queue = self._queues.setdefault(printer_name, [])
+            while len(queue) >= self.max_queue:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not block or (remaining is not None and remaining <= 0):
+                    self._counters['rejected'] += 1
+                    raise PrintQueueFullError(f"Fila de {printer_name} cheia ({self.max_queue} documentos)")
+                self._cond.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("PrintDispatcher encerrado")
+
+            ticket = PrintTicket(next(self._ids), printer_name, document, kind, PrintPriority(priority),
+                                 copies, doc_name, collate, duplex)
+            heapq.heappush(queue, (ticket.priority, ticket.ticket_id, ticket))
+            self._tickets[ticket.ticket_id] = ticket
+            self._counters['submitted'] += 1
+            self._ensure_workers()
+            self._cond.notify_all()
+
+        self.logger.debug(f"Ticket {ticket.ticket_id} ({kind}, {ticket.priority.name}) enfileirado para {printer_name}")
+        return ticket
+
+    def submit_blank_page(self, printer_name: str, copies: int = 1, **options) -> PrintTicket:
+        """Enfileira uma página em branco (equivalente assíncrono de print_blank_page)"""
+        return self.submit(printer_name, "", kind='blank', copies=copies, doc_name="Página em branco", **options)
+
+    def cancel(self, ticket_id: int) -> bool:
+        """
+        Cancela um ticket ainda na fila
+
+        Returns:
+            True se o ticket foi removido antes do envio
+        """
+        with self._cond:
+            ticket = self._tickets.get(ticket_id)
+            if ticket is None or ticket.state != TicketState.QUEUED:
+                return False
+            queue = self._queues[ticket.printer_name]
+            queue.remove((ticket.priority, ticket.ticket_id, ticket))
+            heapq.heapify(queue)
+            self._counters['cancelled'] += 1
+            self._tickets.pop(ticket_id, None)
+            self._cond.notify_all()
+        ticket._finish(TicketState.CANCELLED, {'success': False, 'error': "Cancelado antes do envio"})
+        return True
+
+    def get_ticket(self, ticket_id: int) -> Optional[PrintTicket]:
+        """Retorna um ticket ainda pendente (na fila ou em envio)"""
+        with self._cond:
+            return self._tickets.get(ticket_id)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Métricas do despacho
+
+        Returns:
+            Contadores, filas e envios por impressora, vazão (documentos/s na
+            janela) e tempo de espera na fila (médio, p95 e máximo) por prioridade
+        """
+        now = time.monotonic()
+        with self._cond:
+            self._trim_finished(now)
+            waits = {priority.name: self._summarize(values) for priority, values in self._waits.items()}
+            return {
+                **self._counters,
+                'queued': {name: len(queue) for name, queue in self._queues.items() if queue},
+                'in_flight': {name: count for name, count in self._in_flight.items() if count},
+                'throughput': len(self._finished_at) / self.metrics_window,
+                'queue_wait': waits,
+                'workers': len(self._workers)
+            }
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        Encerra o despacho
+
+        Args:
+            wait: Aguarda os workers terminarem
+            cancel_pending: Cancela os documentos ainda na fila (senão eles são enviados antes)
+        """
+        with self._cond:
+            self._closed = True
+            pending = []
+            if cancel_pending:
+                for queue in self._queues.values():
+                    pending.extend(ticket for _, _, ticket in queue)
+                    queue.clear()
+                self._counters['cancelled'] += len(pending)
+                for ticket in pending:
+                    self._tickets.pop(ticket.ticket_id, None)
+            self._cond.notify_all()
+            workers = list(self._workers)
+
+        for ticket in pending:
+            ticket._finish(TicketState.CANCELLED, {'success': False, 'error': "Despacho encerrado"})
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    def _ensure_workers(self) -> None:
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._worker_loop, name=f"print-dispatcher-{len(self._workers) + 1}",
+                                      daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_ticket(self) -> Optional[PrintTicket]:
+        """Escolhe o melhor ticket entre as impressoras com vaga (chamado com o lock)"""
+        best = None
+        for name, queue in self._queues.items():
+            if queue and self._in_flight.get(name, 0) < self.max_in_flight:
+                if best is None or queue[0][:2] < best[0][:2]:
+                    best = (queue[0], name)
+        if best is None:
+            return None
+        ticket = heapq.heappop(self._queues[best[1]])[2]
+        self._in_flight[ticket.printer_name] = self._in_flight.get(ticket.printer_name, 0) + 1
+        return ticket
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._cond:
+                ticket = self._next_ticket()
+                while ticket is None:
+                    if self._closed and not any(self._queues.values()):
+                        return
+                    self._cond.wait()
+                    ticket = self._next_ticket()
+                ticket.state = TicketState.PRINTING
+                ticket.started_at = time.monotonic()
+                self._waits[ticket.priority].append(ticket.queue_wait)  # type: ignore
+                # Uma vaga abriu na fila: libera quem está bloqueado em submit
+                self._cond.notify_all()
+
+            try:
+                result = self._send(ticket)
+            except Exception as e:
+                self.logger.error(f"Erro ao enviar ticket {ticket.ticket_id} para {ticket.printer_name}: {e}",
+                                  exc_info=True)
+                result = {'success': False, 'error': str(e)}
+
+            with self._cond:
+                self._in_flight[ticket.printer_name] -= 1
+                self._tickets.pop(ticket.ticket_id, None)
+                self._counters['completed' if result.get('success') else 'failed'] += 1
+                now = time.monotonic()
+                self._finished_at.append(now)
+                self._trim_finished(now)
+                self._cond.notify_all()
+            ticket._finish(TicketState.DONE if result.get('success') else TicketState.FAILED, result)
+
+    def _trim_finished(self, now: float) -> None:
+        while self._finished_at and now - self._finished_at[0] > self.metrics_window:
+            self._finished_at.popleft()
+
+    @staticmethod
+    def _summarize(values: Deque[float]) -> Dict[str, float]:
+        if not values:
+            return {'count': 0, 'avg': 0.0, 'p95': 0.0, 'max': 0.0}
+        ordered = sorted(values)
+        return {
+            'count': len(ordered),
+            'avg': sum(ordered) / len(ordered),
+            'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            'max': ordered[-1]
+        }
+
+    # ------------------------------------------------------------------
+    # Envio
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _detect_kind(document: Union[str, bytes]) -> str:
+        if isinstance(document, (bytes, bytearray, memoryview)):
+            return 'raw'
+        extension = os.path.splitext(document)[1].lower()
+        return {'.docx': 'docx', '.doc': 'docx', '.pdf': 'pdf'}.get(extension, 'raw')
+
+    def _send_document(self, ticket: PrintTicket) -> Dict[str, Any]:
+        result = {
+            'success': False,
+            'printer_name': ticket.printer_name,
+            'kind': ticket.kind,
+            'copies': ticket.copies,
+            'job_ids': [],
+            'cache_hit': False,
+            'error': None
+        }
+        if ticket.kind == 'raw':
+            result['job_ids'] = self._send_raw(ticket, bytes(ticket.document))  # type: ignore
+        elif ticket.kind == 'blank':
+            if self.render_cache is not None:
+                path, result['cache_hit'] = self.render_cache.get_or_render(
+                    b"blank-page", {'kind': 'blank'}, self._render_blank_docx, fmt='docx')
+                self._shell_print(path, ticket)
+            else:
+                from .docx_manager import DocxManager
+                docx_manager = DocxManager(AppLogger.instance)
+                temp_file = docx_manager.create_blank_docx()
+                try:
+                    self._shell_print(temp_file, ticket)
+                finally:
+                    docx_manager.delete_docx(temp_file)
+        else:
+            if not os.path.exists(ticket.document):  # type: ignore
+                result['error'] = f"Arquivo {ticket.document} não encontrado"
+                return result
+            renderer = self.renderers.get(ticket.kind)
+            if renderer is not None:
+                data, result['cache_hit'] = self._render(ticket, renderer)
+                result['job_ids'] = self._send_raw(ticket, data)
+            else:
+                self._shell_print(ticket.document, ticket)  # type: ignore
+        result['success'] = True
+        self.logger.info(f"Ticket {ticket.ticket_id} ({ticket.kind}) enviado para {ticket.printer_name}")
+        return result
+
+    def _render(self, ticket: PrintTicket, renderer: Callable[[str, str], bytes]) -> Tuple[bytes, bool]:
+        """Converte o arquivo para o formato da impressora, passando pelo cache quando configurado"""
+        path = ticket.document
+        if self.render_cache is None:
+            return renderer(path, ticket.printer_name), False  # type: ignore
+        settings = {'kind': ticket.kind, 'printer_name': ticket.printer_name}
+        cached_path, hit = self.render_cache.get_or_render(path, settings,
+                                                           lambda: renderer(path, ticket.printer_name))  # type: ignore
+        with open(cached_path, 'rb') as file:
+            return file.read(), hit
+
+    @staticmethod
+    def _render_blank_docx() -> bytes:
+        from .docx_manager import DocxManager
+        docx_manager = DocxManager(AppLogger.instance)
+        temp_file = docx_manager.create_blank_docx()
+        try:
+            with open(temp_file, 'rb') as file:
+                return file.read()
+        finally:
+            docx_manager.delete_docx(temp_file)
+
+    def _send_raw(self, ticket: PrintTicket, data: bytes) -> List[int]:
+        """Envia bytes diretamente ao spooler (um job por cópia)"""
+        import win32print
+
+        job_ids = []
+        # Handle próprio: envios simultâneos na mesma impressora não podem compartilhar o documento aberto
+        handle = win32print.OpenPrinter(ticket.printer_name)
+        try:
+            for _ in range(ticket.copies):
+                job_id = win32print.StartDocPrinter(handle, 1, (ticket.doc_name, None, "RAW"))
+                try:
+                    win32print.StartPagePrinter(handle)
+                    win32print.WritePrinter(handle, data)
+                    win32print.EndPagePrinter(handle)
+                finally:
+                    win32print.EndDocPrinter(handle)
+                job_ids.append(job_id)
+        finally:
+            win32print.ClosePrinter(handle)
+        return job_ids
+
+    def _shell_print(self, file_path: str, ticket: PrintTicket) -> None:
+        """
+        Imprime DOCX/PDF pelo aplicativo associado (ShellExecute "print")
+
+        Cópias, agrupamento e duplex vão no DEVMODE (um job só); um
+        ShellExecute por cópia apenas se o driver ignorar as cópias. Uma cópia
+        sem duplex não passa pelo DEVMODE.
+        """
+        import pythoncom
+        import win32api
+        from core.devmode import devmode_settings, list_job_ids, needs_devmode, wait_for_new_job
+
+        pythoncom.CoInitialize()
+        try:
+            with devmode_settings(ticket.printer_name, ticket.copies, ticket.collate, ticket.duplex) as native:
+                if not needs_devmode(ticket.copies, ticket.duplex):
+                    # Nada a restaurar: não precisa esperar o job aparecer
+                    win32api.ShellExecute(0, "print", file_path, f'"{ticket.printer_name}"', ".", 0)
+                    return
+                known_ids = list_job_ids(ticket.printer_name)
+                copies = 1 if native else ticket.copies
+                for copy in range(copies):
+                    win32api.ShellExecute(0, "print", file_path, f'"{ticket.printer_name}"', ".", 0)
+                    if copy + 1 < copies:
+                        time.sleep(self.SHELL_COPY_DELAY)
+                if native and wait_for_new_job(ticket.printer_name, known_ids, document=file_path) is None:
+                    self.logger.warning(f"Job do ticket {ticket.ticket_id} não apareceu na fila de "
+                                        f"{ticket.printer_name} dentro do tempo esperado")
+        finally:
+            try:
+                pythoncom.CoUninitialize()
+            except Exception:
+                pass
@@ -1,4 +1,3 @@
-from docx import Document
 import tempfile
 import os
 import time
@@ -10,6 +9,8 @@ class DocxManager:
         self.logger = logger_instance.get_logger(__name__)
     def create_blank_docx(self) -> str:
         """Cria um documento DOCX em branco temporário"""
+        from docx import Document
+
         try:
             doc = Document()
             doc.add_paragraph(" ")  # adiciona parágrafo vazio
@@ -1,7 +1,5 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import time
-import pythoncom
-import win32api
 
 from .docx_manager import DocxManager
 
@@ -14,9 +12,16 @@ class PrinterPrint:
         self.access_manager = PCA
         self.docx_manager = DocxManager(logger_instance)
 
-    def print_blank_page(self, printer_name: str, copies: int = 1) -> Dict[str, Any]:
+    def print_blank_page(self, printer_name: str, copies: int = 1, collate: Optional[bool] = None,
+                         duplex: Optional[str] = None) -> Dict[str, Any]:
         """
         Imprime uma página em branco usando documento DOCX
+
+        Args:
+            printer_name: Nome da impressora
+            copies: Número de cópias (um único job quando o driver aceita cópias no DEVMODE)
+            collate: Agrupar cópias (None mantém o padrão do driver)
+            duplex: 'simplex', 'long_edge' ou 'short_edge'
         """
         result = {
             'success': False,
@@ -26,6 +31,8 @@ class PrinterPrint:
             'temp_file': None
         }
 
+        import pythoncom
+
         temp_file_path = None
         try:
             temp_file_path = self.docx_manager.create_blank_docx()
@@ -34,7 +41,7 @@ class PrinterPrint:
             pythoncom.CoInitialize()
 
             # Imprime o arquivo temporário
-            self._print_docx_file(temp_file_path, printer_name, copies)
+            self._print_docx_file(temp_file_path, printer_name, copies, collate, duplex)
 
             result['success'] = True
             self.logger.info(f"Página em branco enviada para {printer_name}")
@@ -54,20 +61,39 @@ class PrinterPrint:
 
         return result
 
-    def _print_docx_file(self, file_path: str, printer_name: str, copies: int) -> None:
-        """Envia DOCX para impressão no Windows"""
+    def _print_docx_file(self, file_path: str, printer_name: str, copies: int,
+                         collate: Optional[bool] = None, duplex: Optional[str] = None) -> None:
+        """Envia DOCX para impressão no Windows (cópias via DEVMODE, com fallback por cópia)"""
+        import win32api
+        from core.devmode import devmode_settings, list_job_ids, needs_devmode, wait_for_new_job
+
         try:
-            for copy in range(copies):
-                win32api.ShellExecute(
-                    0,
-                    "print",
-                    file_path,
-                    f'"{printer_name}"',
-                    ".",
-                    0
-                )
-                self.logger.info(f"Cópia {copy + 1} enviada para {printer_name}")
-                time.sleep(2)
+            with devmode_settings(printer_name, copies, collate, duplex) as native:
+                if not needs_devmode(copies, duplex):
+                    # Nada a restaurar: não precisa esperar o job aparecer
+                    win32api.ShellExecute(0, "print", file_path, f'"{printer_name}"', ".", 0)
+                    self.logger.info(f"Cópia 1 enviada para {printer_name}")
+                    return
+                known_ids = list_job_ids(printer_name)
+                if native:
+                    win32api.ShellExecute(0, "print", file_path, f'"{printer_name}"', ".", 0)
+                    # Mantém o DEVMODE até o aplicativo criar o job
+                    if wait_for_new_job(printer_name, known_ids, document=file_path) is None:
+                        self.logger.warning(f"Job não apareceu na fila de {printer_name} dentro do tempo esperado")
+                    self.logger.info(f"{copies} cópia(s) enviadas para {printer_name} em um job")
+                    return
+
+                for copy in range(copies):
+                    win32api.ShellExecute(
+                        0,
+                        "print",
+                        file_path,
+                        f'"{printer_name}"',
+                        ".",
+                        0
+                    )
+                    self.logger.info(f"Cópia {copy + 1} enviada para {printer_name}")
+                    time.sleep(2)
 
         except Exception as e:
             self.logger.error(f"Erro ao imprimir DOCX: {e}", exc_info=True)
@@ -0,0 +1,390 @@
+import abc
+import itertools
+import threading
+import time
+import win32print
+from typing import Any, Dict, Iterable, List, Optional, Union
+from core import AppLogger, PrinterAccessManager, PrinterListManager, StatusDetail
+
+_PAPER_ERROR_FLAGS = (win32print.PRINTER_STATUS_PAPER_JAM | win32print.PRINTER_STATUS_PAPER_OUT
+                      | win32print.PRINTER_STATUS_PAPER_PROBLEM)
+_BLOCKING_FLAGS = win32print.PRINTER_STATUS_PAUSED | win32print.PRINTER_STATUS_ERROR
+
+
+class PrinterPool:
+    """Grupo de impressoras intercambiáveis (mesmo modelo ou grupo explícito)"""
+
+    def __init__(self, name: str, printers: Iterable[str]) -> None:
+        self.name = name
+        self.printers = list(dict.fromkeys(printers))
+
+    @classmethod
+    def from_model(cls, model_pattern: str, name: Optional[str] = None,
+                   list_manager: Optional[PrinterListManager] = None) -> "PrinterPool":
+        """
+        Cria um pool com as impressoras cujo nome/modelo corresponde ao padrão
+
+        Args:
+            model_pattern: Padrão do modelo (ex: "L3250")
+            name: Nome do pool (padrão: o próprio padrão)
+            list_manager: PrinterListManager (padrão: instância do container)
+        """
+        list_manager = list_manager or PrinterListManager.instance
+        printers = [printer['display_name'] for printer in list_manager.get_printers_by_model(model_pattern)]  # type: ignore
+        return cls(name or model_pattern, printers)
+
+    def __repr__(self) -> str:
+        return f"PrinterPool({self.name!r}, {self.printers!r})"
+
+
+class PrinterLoadCache:
+    """
+    Cache da carga de cada impressora (status, fila e páginas pendentes)
+
+    Cada leitura custa um GetPrinter nível 2 (cJobs) e, só quando há jobs, um
+    EnumJobs nível 1 para somar as páginas pendentes. Entradas valem por `ttl`
+    segundos; com `start()` uma thread mantém o cache aquecido e o roteamento
+    não consulta o spooler.
+    """
+
+    def __init__(self, checker=None, job_manager=None, ttl: float = 5.0) -> None:
+        """
+        Args:
+            checker: PrinterStatusChecker (padrão: novo, com o PrinterAccessManager do container)
+            job_manager: PrinterJobManager de services.job (padrão: novo)
+            ttl: Validade (s) de cada leitura
+        """
+        if checker is None:
+            from services.status.status_checker import PrinterStatusChecker
+            checker = PrinterStatusChecker(PrinterAccessManager.instance)
+        if job_manager is None:
+            from services.job import PrinterJobManager
+            job_manager = PrinterJobManager()
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.checker = checker
+        self.job_manager = job_manager
+        self.ttl = ttl
+        self._loads: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'hits': 0, 'refreshes': 0}
+
+    def get(self, printer_name: str, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Retorna a carga da impressora, consultando o spooler só se a entrada expirou
+
+        Args:
+            printer_name: Nome da impressora
+            max_age: Idade máxima aceita (padrão: ttl)
+        """
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            load = self._loads.get(printer_name)
+            if load is not None and time.monotonic() - load['updated_at'] <= max_age:
+                self.stats['hits'] += 1
+                return dict(load)
+        return self.refresh(printer_name)
+
+    def refresh(self, printer_name: str) -> Dict[str, Any]:
+        """Lê a carga atual no spooler e atualiza o cache"""
+        status = self.checker.get_printer_status(printer_name, StatusDetail.COUNTERS)
+        status_code = status.get('status_code') or 0
+        job_count = status.get('job_count') or 0
+        pending_pages = 0
+        if job_count:
+            for job in self.job_manager.iter_jobs(printer_name, fields=('total_pages', 'pages_printed')):
+                pending_pages += max(1, (job['total_pages'] or 0) - (job['pages_printed'] or 0))
+
+        load = {
+            'printer_name': printer_name,
+            'available': 'status_code' in status,
+            'is_online': bool(status.get('is_online')),
+            'paper_ok': not status_code & _PAPER_ERROR_FLAGS,
+            'status_code': status_code,
+            'job_count': job_count,
+            'pending_pages': pending_pages,
+            'updated_at': time.monotonic()
+        }
+        with self._lock:
+            self._loads[printer_name] = load
+            self.stats['refreshes'] += 1
+        return dict(load)
+
+    def note_dispatch(self, printer_name: str, pages: int = 1) -> None:
+        """
+        Soma um envio recém-roteado à carga em cache
+
+        Evita que vários roteamentos dentro do mesmo `ttl` escolham todos a
+        mesma impressora "vazia" antes da próxima leitura.
+        """
+        with self._lock:
+            load = self._loads.get(printer_name)
+            if load is not None:
+                load['job_count'] += 1
+                load['pending_pages'] += max(1, pages)
+
+    def invalidate(self, printer_name: Optional[str] = None) -> None:
+        """Descarta a carga em cache de uma impressora (ou de todas)"""
+        with self._lock:
+            if printer_name is None:
+                self._loads.clear()
+            else:
+                self._loads.pop(printer_name, None)
+
+    def start(self, printer_names: Iterable[str], interval: Optional[float] = None) -> None:
+        """
+        Atualiza o cache periodicamente em segundo plano
+
+        Args:
+            printer_names: Impressoras acompanhadas
+            interval: Intervalo entre atualizações (padrão: metade do ttl)
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        names = list(printer_names)
+        interval = interval or self.ttl / 2
+        self._stop_event.clear()
+
+        def loop():
+            while not self._stop_event.is_set():
+                for name in names:
+                    try:
+                        self.refresh(name)
+                    except Exception as e:
+                        self.logger.warning(f"Falha ao atualizar carga de {name}: {e}")
+                self._stop_event.wait(interval)
+
+        self._thread = threading.Thread(target=loop, name="printer-load-cache", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+class RoutingStrategy(abc.ABC):
+    """Estratégia de escolha entre as impressoras elegíveis de um pool"""
+
+    name = ""
+
+    @abc.abstractmethod
+    def choose(self, pool: PrinterPool, loads: List[Dict[str, Any]], user: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Args:
+            pool: Pool consultado
+            loads: Cargas das impressoras elegíveis (não vazio, na ordem do pool)
+            user: Usuário que está imprimindo
+
+        Returns:
+            A carga da impressora escolhida
+        """
+
+
+class LeastPagesStrategy(RoutingStrategy):
+    """Menos páginas pendentes; empate por tamanho da fila e ordem do pool"""
+
+    name = "least-pages"
+
+    def choose(self, pool, loads, user=None):
+        return min(loads, key=lambda load: (load['pending_pages'], load['job_count']))
+
+
+class RoundRobinStrategy(RoutingStrategy):
+    """Rodízio entre as impressoras do pool, pulando as não elegíveis"""
+
+    name = "round-robin"
+
+    def __init__(self) -> None:
+        self._counters: Dict[str, itertools.count] = {}
+        self._lock = threading.Lock()
+
+    def choose(self, pool, loads, user=None):
+        with self._lock:
+            turn = next(self._counters.setdefault(pool.name, itertools.count()))
+        eligible = {load['printer_name']: load for load in loads}
+        for offset in range(len(pool.printers)):
+            name = pool.printers[(turn + offset) % len(pool.printers)]
+            if name in eligible:
+                return eligible[name]
+        return loads[0]
+
+
+class StickyUserStrategy(RoutingStrategy):
+    """
+    Mantém cada usuário na mesma impressora enquanto ela estiver elegível
+
+    O primeiro envio (ou a queda da impressora fixada) usa `fallback`.
+    """
+
+    name = "sticky-user"
+
+    def __init__(self, fallback: Optional[RoutingStrategy] = None, ttl: float = 3600.0) -> None:
+        self.fallback = fallback or LeastPagesStrategy()
+        self.ttl = ttl
+        self._assignments: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    def choose(self, pool, loads, user=None):
+        if not user:
+            return self.fallback.choose(pool, loads, user)
+        key = (pool.name, user.lower())
+        now = time.monotonic()
+        with self._lock:
+            assigned = self._assignments.get(key)
+        if assigned and now - assigned[1] <= self.ttl:
+            for load in loads:
+                if load['printer_name'] == assigned[0]:
+                    with self._lock:
+                        self._assignments[key] = (assigned[0], now)
+                    return load
+        load = self.fallback.choose(pool, loads, user)
+        with self._lock:
+            self._assignments[key] = (load['printer_name'], now)
+        return load
+
+
+ROUTING_STRATEGIES = {
+    LeastPagesStrategy.name: LeastPagesStrategy,
+    RoundRobinStrategy.name: RoundRobinStrategy,
+    StickyUserStrategy.name: StickyUserStrategy,
+}
+
+
+class PrintRouter:
+    """
+    Roteamento de trabalhos de impressão entre as impressoras de um pool
+
+    Elegível = disponível, online, sem erro de papel, sem pausa/erro. A escolha
+    entre as elegíveis fica a cargo da RoutingStrategy do pool.
+    """
+
+    def __init__(self,
+                 load_cache: Optional[PrinterLoadCache] = None,
+                 strategy: Union[str, RoutingStrategy] = "least-pages") -> None:
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.load_cache = load_cache or PrinterLoadCache()
+        self._pools: Dict[str, PrinterPool] = {}
+        self._strategies: Dict[str, RoutingStrategy] = {}
+        self._named_strategies: Dict[str, RoutingStrategy] = {}
+        self.default_strategy = self._resolve_strategy(strategy)
+
+    def add_pool(self, pool: PrinterPool, strategy: Union[str, RoutingStrategy, None] = None) -> PrinterPool:
+        """Registra um pool (opcionalmente com estratégia própria)"""
+        self._pools[pool.name] = pool
+        if strategy is not None:
+            self._strategies[pool.name] = self._resolve_strategy(strategy)
+        self.logger.info(f"Pool {pool.name} registrado com {len(pool.printers)} impressoras")
+        return pool
+
+    def add_model_pool(self, model_pattern: str, name: Optional[str] = None,
+                       strategy: Union[str, RoutingStrategy, None] = None) -> PrinterPool:
+        """Registra um pool com todas as impressoras do modelo"""
+        return self.add_pool(PrinterPool.from_model(model_pattern, name), strategy)
+
+    def get_pool(self, pool_name: str) -> Optional[PrinterPool]:
+        return self._pools.get(pool_name)
+
+    def get_pool_loads(self, pool_name: str) -> List[Dict[str, Any]]:
+        """Carga atual (em cache) de cada impressora do pool"""
+        pool = self._require_pool(pool_name)
+        return [self.load_cache.get(name) for name in pool.printers]
+
+    def route(self, pool_name: str, user: Optional[str] = None, pages: int = 1,
+              strategy: Union[str, RoutingStrategy, None] = None) -> Dict[str, Any]:
+        """
+        Escolhe a impressora do pool que deve receber o próximo trabalho
+
+        Args:
+            pool_name: Nome do pool
+            user: Usuário que está imprimindo (usado por sticky-user)
+            pages: Páginas do trabalho (somadas à carga em cache da escolhida)
+            strategy: Estratégia só para esta chamada
+
+        Returns:
+            Dict com success, pool, printer_name, strategy, load, skipped e error
+        """
+        result: Dict[str, Any] = {
+            'success': False,
+            'pool': pool_name,
+            'printer_name': None,
+            'strategy': None,
+            'load': None,
+            'skipped': {},
+            'error': None
+        }
+        pool = self._pools.get(pool_name)
+        if pool is None:
+            result['error'] = f"Pool {pool_name} não registrado"
+            return result
+
+        chosen_strategy = (self._resolve_strategy(strategy) if strategy is not None
+                           else self._strategies.get(pool_name, self.default_strategy))
+        result['strategy'] = chosen_strategy.name
+
+        eligible = []
+        for name in pool.printers:
+            load = self.load_cache.get(name)
+            reason = self._ineligible_reason(load)
+            if reason:
+                result['skipped'][name] = reason
+            else:
+                eligible.append(load)
+
+        if not eligible:
+            result['error'] = f"Nenhuma impressora elegível no pool {pool_name}"
+            self.logger.warning(f"{result['error']}: {result['skipped']}")
+            return result
+
+        load = chosen_strategy.choose(pool, eligible, user)
+        self.load_cache.note_dispatch(load['printer_name'], pages)
+        result.update({'success': True, 'printer_name': load['printer_name'], 'load': load})
+        self.logger.debug(f"Pool {pool_name}: {load['printer_name']} escolhida ({chosen_strategy.name})")
+        return result
+
+    def submit(self, pool_name: str, document, dispatcher, user: Optional[str] = None, pages: int = 1,
+               strategy: Union[str, RoutingStrategy, None] = None, **options):
+        """
+        Roteia e enfileira um documento no PrintDispatcher
+
+        Returns:
+            PrintTicket do documento
+
+        Raises:
+            RuntimeError: Nenhuma impressora elegível no pool
+        """
+        route = self.route(pool_name, user=user, pages=pages, strategy=strategy)
+        if not route['success']:
+            raise RuntimeError(route['error'])
+        return dispatcher.submit(route['printer_name'], document, **options)
+
+    @staticmethod
+    def _ineligible_reason(load: Dict[str, Any]) -> Optional[str]:
+        if not load['available']:
+            return "indisponível"
+        if not load['is_online']:
+            return "offline"
+        if not load['paper_ok']:
+            return "erro de papel"
+        if load['status_code'] & _BLOCKING_FLAGS:
+            return "pausada ou com erro"
+        return None
+
+    def _resolve_strategy(self, strategy: Union[str, RoutingStrategy]) -> RoutingStrategy:
+        if isinstance(strategy, RoutingStrategy):
+            return strategy
+        # Uma instância por nome: round-robin e sticky-user guardam estado entre chamadas
+        if strategy not in self._named_strategies:
+            strategy_class = ROUTING_STRATEGIES.get(strategy)
+            if strategy_class is None:
+                raise ValueError(f"Estratégia {strategy} inválida")
+            self._named_strategies[strategy] = strategy_class()
+        return self._named_strategies[strategy]
+
+    def _require_pool(self, pool_name: str) -> PrinterPool:
+        pool = self._pools.get(pool_name)
+        if pool is None:
+            raise KeyError(f"Pool {pool_name} não registrado")
+        return pool
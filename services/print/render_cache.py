@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from core import AppLogger
+
+# Extensões aceitas para a saída renderizada
+RENDER_FORMATS = ('emf', 'pdf', 'pcl', 'escp', 'raw', 'docx')
+
+
+class RenderCache:
+    """
+    Cache em disco de documentos já renderizados, indexado por hash do conteúdo
+
+    A chave é o SHA-256 do documento de origem mais as configurações que afetam
+    a renderização (impressora/driver, formato, opções). Reimpressões do mesmo
+    formulário reaproveitam o arquivo pronto sem gerar/converter de novo.
+
+    Remoção por LRU (data de modificação, atualizada a cada acerto) quando o
+    total passa de `max_bytes`. O índice é reconstruído a partir do diretório,
+    então o cache sobrevive a reinícios.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 512 * 1024 * 1024) -> None:
+        """
+        Args:
+            directory: Diretório do cache (padrão: <temp>/printer_render_cache)
+            max_bytes: Tamanho máximo total dos arquivos em cache
+        """
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "printer_render_cache")
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes_saved': 0, 'render_seconds_saved': 0.0}
+        self._render_times: Dict[str, float] = {}
+        os.makedirs(self.directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(content: Union[bytes, str], settings: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Calcula a chave de um documento
+
+        Args:
+            content: Bytes do documento ou caminho do arquivo
+            settings: Configurações que mudam a saída renderizada
+        """
+        digest = hashlib.sha256()
+        if isinstance(content, str):
+            with open(content, 'rb') as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        else:
+            digest.update(content)
+        digest.update(json.dumps(settings or {}, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Retorna o caminho do arquivo em cache (ou None) e o marca como recente
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            path, size = entry
+            if not os.path.exists(path):
+                self._entries.pop(key)
+                self._total_bytes -= size
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            self._stats['bytes_saved'] += size
+            self._stats['render_seconds_saved'] += self._render_times.get(key, 0.0)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def put(self, key: str, data: bytes, fmt: str = 'raw', render_time: float = 0.0) -> str:
+        """
+        Grava uma saída renderizada (escrita atômica) e aplica o limite de tamanho
+
+        Returns:
+            Caminho do arquivo em cache
+        """
+        if fmt not in RENDER_FORMATS:
+            raise ValueError(f"Formato {fmt} não suportado")
+        path = os.path.join(self.directory, f"{key}.{fmt}")
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self._total_bytes -= previous[1]
+            self._entries[key] = (path, len(data))
+            self._total_bytes += len(data)
+            self._render_times[key] = render_time
+            self._evict()
+        return path
+
+    def get_or_render(self, content: Union[bytes, str], settings: Optional[Dict[str, Any]],
+                      render: Callable[[], bytes], fmt: str = 'raw') -> Tuple[str, bool]:
+        """
+        Retorna a saída em cache ou renderiza, grava e retorna
+
+        Args:
+            content: Documento de origem (bytes ou caminho)
+            settings: Configurações de renderização
+            render: Função que produz a saída pronta para a impressora
+            fmt: Formato da saída
+
+        Returns:
+            (caminho do arquivo, True se veio do cache)
+        """
+        key = self.make_key(content, settings)
+        path = self.get(key)
+        if path is not None:
+            return path, True
+        start = time.perf_counter()
+        data = render()
+        path = self.put(key, data, fmt, time.perf_counter() - start)
+        self.logger.debug(f"Renderização {key[:12]} gravada em cache ({len(data)} bytes)")
+        return path, False
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Remove uma entrada (ou todas) do cache"""
+        with self._lock:
+            keys = [key] if key is not None else list(self._entries)
+            for k in keys:
+                entry = self._entries.pop(k, None)
+                if entry:
+                    self._remove_file(k, *entry)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Acertos, falhas, taxa de acerto, bytes e tempo de renderização economizados"""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_rate': self._stats['hits'] / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def _evict(self) -> None:
+        """Remove as entradas menos usadas até caber em max_bytes (chamado com o lock)"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            self._remove_file(key, *entry)
+            self._stats['evictions'] += 1
+
+    def _remove_file(self, key: str, path: str, size: int) -> None:
+        self._total_bytes -= size
+        self._render_times.pop(key, None)
+        try:
+            os.remove(path)
+        except OSError as e:
+            self.logger.warning(f"Erro ao remover {path} do cache: {e}")
+
+    def _load_index(self) -> None:
+        """Reconstrói o índice LRU a partir dos arquivos existentes"""
+        found = []
+        for name in os.listdir(self.directory):
+            key, _, fmt = name.partition('.')
+            if fmt not in RENDER_FORMATS:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found.append((stat.st_mtime, key, path, stat.st_size))
+        with self._lock:
+            for _, key, path, size in sorted(found):
+                self._entries[key] = (path, size)
+                self._total_bytes += size
+            self._evict()
+        if found:
+            self.logger.debug(f"Cache de renderização: {len(self._entries)} entradas em {self.directory}")
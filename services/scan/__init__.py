@@ -0,0 +1,6 @@
+from .scan_engine import ScanEngine, ScanPage, SimulatedScanDevice
+from .page_writers import FormatPageWriter, PageWriter, create_page_writer
+from .capabilities import ScannerCapabilities, ScannerCapabilityCache
+from .postprocess import PagePostProcessor
+from .parallel_encoder import ParallelPageEncoder
+from .scheduler import CancellationToken, ScanJob, ScanQueueFullError, ScanScheduler, ScanState
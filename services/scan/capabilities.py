@@ -0,0 +1,134 @@
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+from core import AppLogger, PrinterListManager
+
+
+class ScannerCapabilities:
+    """
+    Capacidades de um scanner com os conjuntos de validação pré-calculados
+
+    As listas mantêm a ordem de preferência (o primeiro item é o padrão em
+    caso de valor inválido); os frozensets permitem validar em O(1).
+    """
+
+    def __init__(self,
+                 has_scanner: bool,
+                 color_modes: Iterable[str] = (),
+                 resolutions: Iterable[str] = (),
+                 document_sources: Iterable[str] = (),
+                 supported_formats: Iterable[str] = (),
+                 combinations: Optional[Iterable[Tuple[str, str, str, str]]] = None) -> None:
+        """
+        Args:
+            has_scanner: Dispositivo possui scanner
+            color_modes, resolutions, document_sources, supported_formats: Valores aceitos
+            combinations: Tuplas (color_mode, resolution, source, format) válidas;
+                padrão: todas as combinações dos valores aceitos
+        """
+        self.has_scanner = has_scanner
+        self.color_modes = tuple(color_modes)
+        self.resolutions = tuple(resolutions)
+        self.document_sources = tuple(document_sources)
+        self.supported_formats = tuple(supported_formats)
+        self.color_mode_set: FrozenSet[str] = frozenset(self.color_modes)
+        self.resolution_set: FrozenSet[str] = frozenset(self.resolutions)
+        self.source_set: FrozenSet[str] = frozenset(self.document_sources)
+        self.format_set: FrozenSet[str] = frozenset(self.supported_formats)
+        if combinations is None:
+            combinations = itertools.product(self.color_modes, self.resolutions, self.document_sources,
+                                             self.supported_formats)
+        self.combinations: FrozenSet[Tuple[str, str, str, str]] = frozenset(combinations)
+
+    def is_valid(self, color_mode: str, resolution: str, source: str, fmt: str) -> bool:
+        return (color_mode, resolution, source, fmt) in self.combinations
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Formato de check_scanner_capabilities"""
+        return {
+            'has_scanner': self.has_scanner,
+            'color_modes': list(self.color_modes),
+            'resolutions': list(self.resolutions),
+            'document_sources': list(self.document_sources),
+            'supported_formats': list(self.supported_formats),
+            'error': None
+        }
+
+
+class ScannerCapabilityCache:
+    """
+    Cache das capacidades de cada scanner
+
+    Uma entrada vale por `ttl` segundos e deixa de valer quando uma nova
+    enumeração mostra que a entrada do próprio dispositivo no inventário mudou
+    ou que ele saiu (PrinterListManager.printer_generation). Falhas de
+    descoberta não são guardadas.
+    """
+
+    def __init__(self, ttl: float = 600.0, list_manager: Optional[PrinterListManager] = None) -> None:
+        """
+        Args:
+            ttl: Validade (s) de cada entrada
+            list_manager: Fonte da geração de cada dispositivo (padrão: instância do container)
+        """
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.ttl = ttl
+        self._list_manager = list_manager
+        self._entries: Dict[str, Tuple[ScannerCapabilities, float, Optional[int]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def get(self, printer_name: str,
+            discover: Callable[[str], ScannerCapabilities]) -> ScannerCapabilities:
+        """
+        Retorna as capacidades em cache ou executa `discover` e guarda o resultado
+
+        Raises:
+            Exception: Erros de `discover` são propagados (e não guardados)
+        """
+        generation = self._generation(printer_name)
+        with self._lock:
+            entry = self._entries.get(printer_name)
+            if entry is not None:
+                capabilities, discovered_at, entry_generation = entry
+                if entry_generation == generation and time.monotonic() - discovered_at <= self.ttl:
+                    self.stats['hits'] += 1
+                    return capabilities
+                self.stats['invalidations'] += 1
+            self.stats['misses'] += 1
+
+        capabilities = discover(printer_name)
+        with self._lock:
+            self._entries[printer_name] = (capabilities, time.monotonic(), generation)
+        self.logger.debug(f"Capacidades de '{printer_name}' descobertas e guardadas em cache")
+        return capabilities
+
+    def peek(self, printer_name: str) -> Optional[ScannerCapabilities]:
+        """Capacidades em cache ainda válidas, sem descobrir"""
+        generation = self._generation(printer_name)
+        with self._lock:
+            entry = self._entries.get(printer_name)
+        if entry is None:
+            return None
+        capabilities, discovered_at, entry_generation = entry
+        if entry_generation != generation or time.monotonic() - discovered_at > self.ttl:
+            return None
+        return capabilities
+
+    def invalidate(self, printer_name: Optional[str] = None) -> None:
+        """Descarta as capacidades de um scanner (ou de todos)"""
+        with self._lock:
+            if printer_name is None:
+                self.stats['invalidations'] += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(printer_name, None) is not None:
+                self.stats['invalidations'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, 'entries': len(self._entries)}
+
+    def _generation(self, printer_name: str) -> Optional[int]:
+        list_manager = self._list_manager or PrinterListManager.instance
+        return list_manager.printer_generation(printer_name)
@@ -0,0 +1,456 @@
+import abc
+import os
+import struct
+import zlib
+from typing import BinaryIO, Dict, List, Optional, Tuple, Type
+
+from .scan_engine import ScanPage
+
+
+class PageWriter(abc.ABC):
+    """
+    Consumidor de páginas digitalizadas que grava cada faixa assim que chega
+
+    Ordem das chamadas por página: begin_page, write (uma vez por faixa de
+    linhas completas), end_page. O buffer recebido em `write` é reutilizado
+    pela fonte na faixa seguinte, então precisa ser consumido na hora.
+
+    Os arquivos são criados em modo exclusivo: um arquivo existente nunca é
+    sobrescrito (FileExistsError).
+    """
+
+    extension = ""
+
+    def __init__(self, output_base: str) -> None:
+        """
+        Args:
+            output_base: Caminho de saída sem extensão
+        """
+        self.output_base = output_base
+        self.files: List[str] = []
+        self.bytes_written = 0
+
+    @abc.abstractmethod
+    def begin_page(self, page: ScanPage) -> None:
+        """Inicia uma página"""
+
+    @abc.abstractmethod
+    def write(self, chunk: memoryview) -> None:
+        """Grava uma faixa de linhas completas da página atual"""
+
+    @abc.abstractmethod
+    def end_page(self, page: ScanPage) -> None:
+        """Conclui a página atual"""
+
+    def close(self) -> List[str]:
+        """Finaliza a saída e retorna os arquivos gerados"""
+        return self.files
+
+    def abort(self) -> None:
+        """Descarta a saída parcial (digitalização cancelada ou com erro)"""
+        self.close()
+        for path in self.files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.files = []
+
+
+class FormatPageWriter(PageWriter):
+    """
+    Gravador de um formato de arquivo (PAGE_WRITERS)
+
+    Além do fluxo por faixas, comprime páginas inteiras fora do gravador
+    (`encode`) e grava o resultado na ordem das páginas (`add_encoded_page`),
+    o que permite a ParallelPageEncoder comprimir em outros processos.
+    """
+
+    @classmethod
+    @abc.abstractmethod
+    def encode(cls, page: ScanPage, data: memoryview, level: int = 6):
+        """
+        Comprime uma página inteira fora do gravador (ex: em outro processo)
+
+        Não acessa arquivos nem estado do gravador; o resultado vai para
+        `add_encoded_page` na ordem das páginas.
+        """
+
+    @abc.abstractmethod
+    def add_encoded_page(self, page: ScanPage, encoded) -> None:
+        """Grava uma página já comprimida por `encode`"""
+
+    def _page_path(self, page: ScanPage) -> str:
+        return f"{self.output_base}_p{page.index + 1:03d}.{self.extension}"
+
+
+class PnmPageWriter(FormatPageWriter):
+    """Um arquivo PBM/PGM/PPM binário por página (cabeçalho + linhas sem compressão)"""
+
+    extension = "pnm"
+    _MAGIC = {'bw': b"P4", 'gray': b"P5", 'rgb': b"P6"}
+
+    def __init__(self, output_base: str) -> None:
+        super().__init__(output_base)
+        self._file: Optional[BinaryIO] = None
+
+    def begin_page(self, page):
+        path = self._page_path(page)
+        self._file = open(path, 'xb')
+        header = self._MAGIC[page.mode] + f"\n{page.width} {page.height}\n".encode('ascii')
+        if page.mode != 'bw':
+            header += b"255\n"
+        self._file.write(header)
+        self.bytes_written += len(header)
+        self.files.append(path)
+
+    def write(self, chunk):
+        self._file.write(chunk)  # type: ignore
+        self.bytes_written += len(chunk)
+
+    def end_page(self, page):
+        self._file.close()  # type: ignore
+        self._file = None
+
+    @classmethod
+    def encode(cls, page, data, level=6):
+        return bytes(data)
+
+    def add_encoded_page(self, page, encoded):
+        self.begin_page(page)
+        self.write(encoded)
+        self.end_page(page)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        return self.files
+
+
+class PngPageWriter(FormatPageWriter):
+    """Um PNG por página; cada faixa é comprimida e gravada como um bloco IDAT"""
+
+    extension = "png"
+    # PNG 1 bit usa 0 = preto; as páginas P&B chegam com 1 = preto
+    _INVERT = bytes(255 - i for i in range(256))
+
+    def __init__(self, output_base: str, level: int = 6) -> None:
+        super().__init__(output_base)
+        self.level = level
+        self._file: Optional[BinaryIO] = None
+        self._compressor = None
+        self._page: Optional[ScanPage] = None
+
+    def begin_page(self, page):
+        path = self._page_path(page)
+        self._file = open(path, 'xb')
+        self._page = page
+        self._compressor = zlib.compressobj(self.level)
+        color_type = 2 if page.mode == 'rgb' else 0
+        self._file.write(b"\x89PNG\r\n\x1a\n")
+        self.bytes_written += 8
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", page.width, page.height, page.bits_per_sample,
+                                         color_type, 0, 0, 0))
+        pixels_per_meter = round(page.dpi / 0.0254)
+        self._chunk(b"pHYs", struct.pack(">IIB", pixels_per_meter, pixels_per_meter, 1))
+        self.files.append(path)
+
+    def write(self, chunk):
+        compressed = self._compressor.compress(self._filter(self._page, chunk))  # type: ignore
+        if compressed:
+            self._chunk(b"IDAT", compressed)
+
+    def end_page(self, page):
+        self._chunk(b"IDAT", self._compressor.flush())  # type: ignore
+        self._end_file()
+
+    @classmethod
+    def encode(cls, page, data, level=6):
+        return zlib.compress(cls._filter(page, data), level)
+
+    def add_encoded_page(self, page, encoded):
+        self.begin_page(page)
+        self._chunk(b"IDAT", encoded)
+        self._end_file()
+
+    @classmethod
+    def _filter(cls, page, chunk) -> bytes:
+        data = chunk.tobytes()
+        if page.mode == 'bw':
+            data = data.translate(cls._INVERT)
+        row_bytes = page.row_bytes
+        # Filtro 0 (None) no início de cada linha
+        return b"".join(b"\x00" + data[i:i + row_bytes] for i in range(0, len(data), row_bytes))
+
+    def _end_file(self) -> None:
+        self._chunk(b"IEND", b"")
+        self._file.close()  # type: ignore
+        self._file = None
+        self._compressor = None
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        return self.files
+
+    def _chunk(self, kind: bytes, data: bytes) -> None:
+        self._file.write(struct.pack(">I", len(data)) + kind + data  # type: ignore
+                         + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+        self.bytes_written += len(data) + 12
+
+
+class TiffPageWriter(FormatPageWriter):
+    """
+    TIFF de várias páginas gravado em fluxo
+
+    Cada faixa vira uma strip comprimida (Deflate); o IFD da página é gravado
+    depois dos dados e o ponteiro do IFD anterior é corrigido em seguida.
+    """
+
+    extension = "tiff"
+    _PHOTOMETRIC = {'bw': 0, 'gray': 1, 'rgb': 2}  # WhiteIsZero, BlackIsZero, RGB
+
+    def __init__(self, output_base: str, level: int = 6) -> None:
+        super().__init__(output_base)
+        self.level = level
+        self.path = f"{output_base}.{self.extension}"
+        self._file: Optional[BinaryIO] = None
+        self._next_ifd_pointer = 4
+        self._strips: List[Tuple[int, int]] = []
+        self._rows_per_strip = 0
+        self._row_bytes = 0
+
+    def begin_page(self, page):
+        if self._file is None:
+            self._file = open(self.path, 'xb')
+            self._file.write(b"II*\x00\x00\x00\x00\x00")
+            self.files.append(self.path)
+        self._strips = []
+        self._rows_per_strip = 0
+        self._row_bytes = page.row_bytes
+
+    def write(self, chunk):
+        if not self._rows_per_strip:
+            self._rows_per_strip = len(chunk) // self._row_bytes
+        self._write_strip(zlib.compress(chunk, self.level))
+
+    @classmethod
+    def encode(cls, page, data, level=6):
+        """Returns: (linhas por strip, strips comprimidas)"""
+        strip_bytes = page.band_bytes
+        strips = [zlib.compress(data[start:start + strip_bytes], level)
+                  for start in range(0, len(data), strip_bytes)]
+        return page.band_rows, strips
+
+    def add_encoded_page(self, page, encoded):
+        rows_per_strip, strips = encoded
+        self.begin_page(page)
+        self._rows_per_strip = min(rows_per_strip, page.height)
+        for strip in strips:
+            self._write_strip(strip)
+        self.end_page(page)
+
+    def _write_strip(self, data: bytes) -> None:
+        offset = self._tell_aligned()
+        self._file.write(data)  # type: ignore
+        self._strips.append((offset, len(data)))
+
+    def end_page(self, page):
+        file = self._file
+        samples = 3 if page.mode == 'rgb' else 1
+        count = len(self._strips)
+
+        offsets_at = self._write_array("<%dI" % count, [offset for offset, _ in self._strips])
+        counts_at = self._write_array("<%dI" % count, [size for _, size in self._strips])
+        resolution_at = self._write_array("<4I", [page.dpi, 1, page.dpi, 1])
+        bits_at = self._write_array("<3H", [8, 8, 8]) if samples == 3 else None
+
+        entries = [
+            (256, 4, 1, page.width),
+            (257, 4, 1, page.height),
+            (258, 3, samples, bits_at if bits_at is not None else page.bits_per_sample),
+            (259, 3, 1, 8),  # Deflate
+            (262, 3, 1, self._PHOTOMETRIC[page.mode]),
+            (273, 4, count, offsets_at if count > 1 else self._strips[0][0]),
+            (277, 3, 1, samples),
+            (278, 4, 1, self._rows_per_strip or page.height),
+            (279, 4, count, counts_at if count > 1 else self._strips[0][1]),
+            (282, 5, 1, resolution_at),
+            (283, 5, 1, resolution_at + 8),
+            (296, 3, 1, 2),  # polegadas
+        ]
+        ifd_at = self._tell_aligned()
+        data = struct.pack("<H", len(entries))
+        for tag, field_type, field_count, value in entries:
+            if field_type == 3 and field_count == 1:
+                data += struct.pack("<HHIHH", tag, field_type, field_count, value, 0)
+            else:
+                data += struct.pack("<HHII", tag, field_type, field_count, value)
+        data += b"\x00\x00\x00\x00"
+        file.write(data)  # type: ignore
+
+        # Encadeia esta página ao IFD anterior (ou ao cabeçalho)
+        end = file.tell()  # type: ignore
+        file.seek(self._next_ifd_pointer)  # type: ignore
+        file.write(struct.pack("<I", ifd_at))  # type: ignore
+        file.seek(end)  # type: ignore
+        self._next_ifd_pointer = ifd_at + len(data) - 4
+        self.bytes_written = end
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        return self.files
+
+    def _tell_aligned(self) -> int:
+        position = self._file.tell()  # type: ignore
+        if position % 2:
+            self._file.write(b"\x00")  # type: ignore
+            position += 1
+        return position
+
+    def _write_array(self, fmt: str, values) -> int:
+        offset = self._tell_aligned()
+        self._file.write(struct.pack(fmt, *values))  # type: ignore
+        return offset
+
+
+class PdfPageWriter(FormatPageWriter):
+    """
+    PDF de várias páginas gravado em fluxo (uma imagem FlateDecode por página)
+
+    O comprimento de cada stream vai em um objeto indireto escrito depois dos
+    dados, e a árvore de páginas e a tabela xref são gravadas no fechamento.
+    """
+
+    extension = "pdf"
+    _COLOR_SPACE = {'bw': b"/DeviceGray /Decode [1 0]", 'gray': b"/DeviceGray", 'rgb': b"/DeviceRGB"}
+
+    def __init__(self, output_base: str, level: int = 6) -> None:
+        super().__init__(output_base)
+        self.level = level
+        self.path = f"{output_base}.{self.extension}"
+        self._file: Optional[BinaryIO] = None
+        self._offsets: Dict[int, int] = {}
+        self._next_object = 3  # 1 = catálogo, 2 = árvore de páginas
+        self._pages: List[int] = []
+        self._compressor = None
+        self._stream_length = 0
+        self._image_object = 0
+
+    def begin_page(self, page):
+        self._begin_image(page)
+        self._compressor = zlib.compressobj(self.level)
+
+    def _begin_image(self, page) -> None:
+        if self._file is None:
+            self._file = open(self.path, 'xb')
+            self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+            self.files.append(self.path)
+        self._image_object = self._begin_object()
+        length_object = self._image_object + 1
+        self._next_object += 1
+        self._file.write(b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace %s "
+                         b"/BitsPerComponent %d /Filter /FlateDecode /Length %d 0 R >>\nstream\n"
+                         % (page.width, page.height, self._COLOR_SPACE[page.mode], page.bits_per_sample,
+                            length_object))
+        self._stream_length = 0
+
+    def write(self, chunk):
+        data = self._compressor.compress(chunk)  # type: ignore
+        if data:
+            self._file.write(data)  # type: ignore
+            self._stream_length += len(data)
+
+    def end_page(self, page):
+        data = self._compressor.flush()  # type: ignore
+        self._file.write(data)  # type: ignore
+        self._stream_length += len(data)
+        self._compressor = None
+        self._end_image(page)
+
+    @classmethod
+    def encode(cls, page, data, level=6):
+        return zlib.compress(data, level)
+
+    def add_encoded_page(self, page, encoded):
+        self._begin_image(page)
+        self._file.write(encoded)  # type: ignore
+        self._stream_length = len(encoded)
+        self._end_image(page)
+
+    def _end_image(self, page) -> None:
+        file = self._file
+        file.write(b"\nendstream\nendobj\n")  # type: ignore
+
+        self._write_object(self._image_object + 1, b"%d" % self._stream_length)
+
+        width = page.width * 72 / page.dpi
+        height = page.height * 72 / page.dpi
+        content = b"q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q" % (width, height)
+        content_object = self._new_object(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        page_object = self._new_object(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources << /XObject << /Im0 %d 0 R >> >> "
+            b"/Contents %d 0 R >>" % (width, height, self._image_object, content_object))
+        self._pages.append(page_object)
+        self.bytes_written = file.tell()  # type: ignore
+
+    def close(self):
+        file = self._file
+        if file is None:
+            return self.files
+        kids = b" ".join(b"%d 0 R" % number for number in self._pages)
+        self._write_object(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._pages)))
+        self._write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+        xref_at = file.tell()
+        total = self._next_object
+        file.write(b"xref\n0 %d\n0000000000 65535 f \n" % total)
+        for number in range(1, total):
+            file.write(b"%010d 00000 n \n" % self._offsets.get(number, 0))
+        file.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (total, xref_at))
+        self.bytes_written = file.tell()
+        file.close()
+        self._file = None
+        return self.files
+
+    def _begin_object(self, number: Optional[int] = None) -> int:
+        if number is None:
+            number = self._next_object
+            self._next_object += 1
+        self._offsets[number] = self._file.tell()  # type: ignore
+        self._file.write(b"%d 0 obj\n" % number)  # type: ignore
+        return number
+
+    def _write_object(self, number: int, body: bytes) -> None:
+        self._begin_object(number)
+        self._file.write(body + b"\nendobj\n")  # type: ignore
+
+    def _new_object(self, body: bytes) -> int:
+        number = self._begin_object()
+        self._file.write(body + b"\nendobj\n")  # type: ignore
+        return number
+
+
+PAGE_WRITERS: Dict[str, Type[FormatPageWriter]] = {
+    'PDF': PdfPageWriter,
+    'TIFF': TiffPageWriter,
+    'PNG': PngPageWriter,
+    'PNM': PnmPageWriter,
+}
+
+
+def create_page_writer(fmt: str, output_base: str) -> FormatPageWriter:
+    """
+    Cria o gravador em fluxo do formato pedido
+
+    Raises:
+        ValueError: Formato sem gravador em fluxo (ex: JPEG, que exige um codificador)
+    """
+    writer_class = PAGE_WRITERS.get(fmt.upper())
+    if writer_class is None:
+        raise ValueError(f"Formato {fmt} não possui gravador em fluxo")
+    return writer_class(output_base)
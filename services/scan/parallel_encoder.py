@@ -0,0 +1,205 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Deque, List, Optional, Tuple
+
+from core import AppLogger
+from .page_writers import PAGE_WRITERS, PageWriter
+from .scan_engine import ScanPage
+
+
+# Abaixo destes limites, copiar a página para o bloco compartilhado e
+# atravessar o pool custa mais que a compressão (150 dpi ficou 0.44x no
+# scan_encoding_benchmark)
+PARALLEL_MIN_DPI = 300
+PARALLEL_MIN_PAGES = 3
+
+
+def parallel_encoding_pays_off(pages: Optional[int], dpi: int, workers: Optional[int] = None) -> bool:
+    """
+    Indica se comprimir as páginas no pool de processos compensa
+
+    Args:
+        pages: Páginas esperadas (None se desconhecido, ex: ADF)
+        dpi: Resolução da digitalização
+        workers: Processos do pool (padrão: os.cpu_count())
+    """
+    cpus = os.cpu_count() or 1
+    if min(workers or cpus, cpus) < 2:
+        return False
+    if pages is not None and pages < PARALLEL_MIN_PAGES:
+        return False
+    return dpi >= PARALLEL_MIN_DPI
+
+
+def create_encode_executor(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Cria o pool de compressão
+
+    No POSIX, o resource tracker do processo principal é iniciado antes dos
+    workers, que passam a usá-lo: o registro que Python < 3.13 faz ao abrir
+    um bloco vai para o tracker que já conhece o bloco, e nenhum worker
+    remove (ou reporta como vazado) um bloco do processo principal ao sair.
+    """
+    if os.name == 'posix':
+        resource_tracker.ensure_running()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Abre um bloco criado pelo processo principal, que é o responsável por removê-lo"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        # Python < 3.13: registra no tracker compartilhado (ver create_encode_executor)
+        return shared_memory.SharedMemory(name=name)
+
+
+def _encode_shared_page(fmt: str, block_name: str, page_info: Tuple, level: int):
+    """
+    Comprime, em um processo do pool, a página que está no bloco compartilhado
+
+    Só o nome do bloco e os metadados atravessam o pool; o retorno é o dado
+    já comprimido.
+    """
+    page = ScanPage(*page_info, chunks=None)  # type: ignore[arg-type]
+    block = _attach(block_name)
+    try:
+        data = block.buf[:page.nbytes]
+        try:
+            return PAGE_WRITERS[fmt].encode(page, data, level)
+        finally:
+            data.release()
+    finally:
+        block.close()
+
+
+class ParallelPageEncoder(PageWriter):
+    """
+    Gravador que comprime as páginas em um pool de processos
+
+    As faixas de cada página são copiadas para um bloco de memória
+    compartilhada; ao fim da página, um processo do pool comprime o bloco
+    (FormatPageWriter.encode do formato) e o gravador do formato monta a saída
+    na ordem das páginas, à medida que elas ficam prontas. Os blocos
+    liberados são reaproveitados pelas páginas seguintes e no máximo
+    `max_pending` páginas ficam em compressão ao mesmo tempo.
+    """
+
+    def __init__(self,
+                 fmt: str,
+                 output_base: str,
+                 workers: Optional[int] = None,
+                 level: int = 6,
+                 max_pending: Optional[int] = None,
+                 executor: Optional[ProcessPoolExecutor] = None) -> None:
+        """
+        Args:
+            fmt: Formato de saída ('PDF', 'TIFF', 'PNG' ou 'PNM')
+            output_base: Caminho de saída sem extensão
+            workers: Processos do pool (padrão: os.cpu_count())
+            level: Nível de compressão zlib
+            max_pending: Páginas em compressão simultânea (padrão: 2 x workers)
+            executor: Pool existente, criado com create_encode_executor (não é
+                encerrado no close)
+        """
+        fmt = fmt.upper()
+        if fmt not in PAGE_WRITERS:
+            raise ValueError(f"Formato {fmt} não possui gravador em fluxo")
+        self.writer = PAGE_WRITERS[fmt](output_base)
+        super().__init__(output_base)
+        self.extension = self.writer.extension
+        self.fmt = fmt
+        self.level = level
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._pending: Deque[Tuple[ScanPage, shared_memory.SharedMemory, Future]] = deque()
+        self._free_blocks: List[shared_memory.SharedMemory] = []
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self._block: Optional[shared_memory.SharedMemory] = None
+        self._position = 0
+
+    def begin_page(self, page):
+        self._block = self._take_block(page.nbytes)
+        self._position = 0
+
+    def write(self, chunk):
+        size = len(chunk)
+        self._block.buf[self._position:self._position + size] = chunk  # type: ignore
+        self._position += size
+
+    def end_page(self, page):
+        if len(self._pending) >= self.max_pending:
+            self._assemble_next()
+        page_info = (page.index, page.width, page.height, page.mode, page.dpi, page.band_rows)
+        future = self._get_executor().submit(_encode_shared_page, self.fmt, self._block.name,  # type: ignore
+                                             page_info, self.level)
+        self._pending.append((page, self._block, future))  # type: ignore
+        self._block = None
+        # Monta o que já ficou pronto sem esperar
+        while self._pending and self._pending[0][2].done():
+            self._assemble_next()
+
+    def close(self):
+        try:
+            while self._pending:
+                self._assemble_next()
+            self.files = self.writer.close()
+            self.bytes_written = self.writer.bytes_written
+        finally:
+            self._release()
+        return self.files
+
+    def abort(self):
+        for _, _, future in self._pending:
+            future.cancel()
+        for _, _, future in self._pending:
+            if not future.cancelled():
+                try:
+                    future.result()
+                except Exception:
+                    pass
+        self._pending.clear()
+        self._release()
+        self.writer.abort()
+        self.files = []
+
+    def _assemble_next(self) -> None:
+        """Espera a página mais antiga e grava na saída"""
+        page, block, future = self._pending.popleft()
+        try:
+            encoded = future.result()
+        finally:
+            self._free_blocks.append(block)
+        self.writer.add_encoded_page(page, encoded)
+        self.bytes_written = self.writer.bytes_written
+
+    def _take_block(self, size: int) -> shared_memory.SharedMemory:
+        for position, block in enumerate(self._free_blocks):
+            if block.size >= size:
+                return self._free_blocks.pop(position)
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self._blocks.append(block)
+        return block
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = create_encode_executor(self.workers)
+            self.logger.debug(f"Pool de compressão iniciado com {self.workers} processos")
+        return self._executor
+
+    def _release(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for block in self._blocks:
+            try:
+                block.close()
+                block.unlink()
+            except (FileNotFoundError, BufferError):
+                pass
+        self._blocks, self._free_blocks = [], []
@@ -0,0 +1,415 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .scan_engine import COLOR_MODES, ScanPage, page_dimensions
+
+PAPER_WHITE = 255
+
+# Pesos BT.601 (R 0,299 / G 0,587 / B 0,114) em ponto fixo de 8 bits
+_GRAY_WEIGHTS = (77, 150, 29)
+
+
+def page_to_array(page: ScanPage, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Lê as faixas de uma página para um array
+
+    Args:
+        page: Página em aquisição
+        out: Destino pré-alocado (ex: uma posição do lote)
+
+    Returns:
+        (H, W, 3) uint8 para 'rgb', (H, W) uint8 para 'gray' e (H, W) bool
+        para 'bw' (True = preto)
+    """
+    if page.mode == 'bw':
+        target = np.empty((page.height, page.row_bytes), np.uint8)
+    elif out is not None:
+        target = out
+    else:
+        shape = (page.height, page.width, 3) if page.mode == 'rgb' else (page.height, page.width)
+        target = np.empty(shape, np.uint8)
+
+    flat = target.reshape(-1)
+    position = 0
+    for chunk in page.chunks():
+        flat[position:position + len(chunk)] = np.frombuffer(chunk, np.uint8)
+        position += len(chunk)
+
+    if page.mode != 'bw':
+        return target
+    bits = np.unpackbits(target, axis=1, count=page.width).view(bool)
+    if out is None:
+        return bits
+    out[...] = bits
+    return out
+
+
+def page_from_array(image: np.ndarray, index: int, dpi: int, band_rows: int = 128) -> ScanPage:
+    """
+    Embrulha um array processado como ScanPage para os gravadores em fluxo
+
+    Arrays bool viram páginas 'bw' (1 bit por pixel, 1 = preto).
+    """
+    if image.dtype == bool:
+        mode, data = 'bw', np.packbits(image, axis=1)
+    else:
+        mode, data = ('rgb' if image.ndim == 3 else 'gray'), np.ascontiguousarray(image)
+    view = memoryview(data.reshape(-1))
+
+    def chunks(page: ScanPage) -> Iterator[memoryview]:
+        band_bytes = page.band_bytes
+        for start in range(0, len(view), band_bytes):
+            yield view[start:start + band_bytes]
+
+    return ScanPage(index, image.shape[1], image.shape[0], mode, dpi, band_rows, chunks)
+
+
+def brightness_contrast_lut(brightness: float, contrast: float) -> np.ndarray:
+    """
+    Tabela de 256 níveis com brilho e contraste aplicados
+
+    Args:
+        brightness: -100 a 100 (0 = sem ajuste)
+        contrast: -100 a 100 (0 = sem ajuste)
+    """
+    c = float(np.clip(contrast, -100, 100)) * 2.55
+    factor = (259 * (c + 255)) / (255 * (259 - c))
+    levels = factor * (np.arange(256, dtype=np.float32) - 128) + 128
+    levels += float(np.clip(brightness, -100, 100)) * 2.55
+    return np.clip(np.rint(levels), 0, 255).astype(np.uint8)
+
+
+def adjust_brightness_contrast(images: np.ndarray, brightness: float, contrast: float) -> np.ndarray:
+    """Aplica brilho e contraste (qualquer forma, uint8) por tabela"""
+    if not brightness and not contrast:
+        return images
+    return brightness_contrast_lut(brightness, contrast)[images]
+
+
+def to_grayscale(images: np.ndarray) -> np.ndarray:
+    """(..., H, W, 3) uint8 -> (..., H, W) uint8"""
+    gray = images[..., 0].astype(np.uint16)
+    gray *= _GRAY_WEIGHTS[0]
+    for channel in (1, 2):
+        weighted = images[..., channel].astype(np.uint16)
+        weighted *= _GRAY_WEIGHTS[channel]
+        gray += weighted
+    gray >>= 8
+    return gray.astype(np.uint8)
+
+
+def adaptive_binarize(gray: np.ndarray, block: int, sensitivity: float = 0.15) -> np.ndarray:
+    """
+    Binarização adaptativa (limiar pela média local, estilo Bradley)
+
+    A média local é calculada por blocos de `block` pixels com a vizinhança
+    3x3 de blocos, então o custo é de duas reduções e uma comparação por
+    pixel, sem janela deslizante.
+
+    Args:
+        gray: (..., H, W) uint8
+        block: Lado do bloco em pixels
+        sensitivity: Fração abaixo da média local considerada tinta
+
+    Returns:
+        Array bool da mesma forma (True = preto)
+    """
+    height, width = gray.shape[-2:]
+    row_starts = np.arange(0, height, block)
+    col_starts = np.arange(0, width, block)
+    row_sizes = np.diff(np.append(row_starts, height))
+    col_sizes = np.diff(np.append(col_starts, width))
+
+    sums = np.add.reduceat(gray, row_starts, axis=-2, dtype=np.uint32)
+    sums = np.add.reduceat(sums, col_starts, axis=-1).astype(np.float64)
+    counts = np.outer(row_sizes, col_sizes).astype(np.float64)
+
+    pad = [(0, 0)] * (sums.ndim - 2) + [(1, 1), (1, 1)]
+    sums, counts = np.pad(sums, pad), np.pad(counts, 1)
+    rows, cols = len(row_starts), len(col_starts)
+    window_sums = sum(sums[..., dy:dy + rows, dx:dx + cols] for dy in range(3) for dx in range(3))
+    window_counts = sum(counts[dy:dy + rows, dx:dx + cols] for dy in range(3) for dx in range(3))
+
+    thresholds = (window_sums / window_counts * (1.0 - sensitivity)).astype(np.uint8)
+    thresholds = np.repeat(thresholds, col_sizes, axis=-1)
+    # Cada faixa de blocos compara com sua linha de limiares por broadcast
+    ink = np.empty(gray.shape, bool)
+    for band, start in enumerate(row_starts):
+        rows_slice = slice(start, start + row_sizes[band])
+        np.less(gray[..., rows_slice, :], thresholds[..., band:band + 1, :], out=ink[..., rows_slice, :])
+    return ink
+
+
+def estimate_skew(gray: np.ndarray, dpi: int, max_angle: float = 5.0, max_points: int = 200_000) -> float:
+    """
+    Estima a inclinação das linhas de texto em graus (positivo = descendo para a direita)
+
+    Projeta os pixels de tinta de uma versão reduzida (~100 dpi) em cada
+    ângulo candidato e escolhe o histograma de linhas mais concentrado;
+    todos os ângulos de uma passada saem de um único bincount.
+    """
+    factor = max(1, dpi // 100)
+    ys, xs = np.nonzero(gray[::factor, ::factor] < 128)
+    if ys.size < 100:
+        return 0.0
+    if ys.size > max_points:
+        stride = -(-ys.size // max_points)
+        ys, xs = ys[::stride], xs[::stride]
+    ys, xs = ys.astype(np.float32), xs.astype(np.float32)
+
+    def best_angle(angles: np.ndarray) -> float:
+        tangents = np.tan(np.radians(angles)).astype(np.float32)
+        projected = np.rint(ys[None, :] - xs[None, :] * tangents[:, None]).astype(np.int64)
+        projected -= projected.min()
+        length = int(projected.max()) + 1
+        projected += np.arange(len(angles))[:, None] * length
+        histogram = np.bincount(projected.ravel(), minlength=len(angles) * length).reshape(len(angles), length)
+        scores = np.square(histogram, dtype=np.float64).sum(axis=1)
+        return float(angles[int(np.argmax(scores))])
+
+    coarse = best_angle(np.arange(-max_angle, max_angle + 0.25, 0.5))
+    return best_angle(np.arange(coarse - 0.5, coarse + 0.55, 0.05))
+
+
+def _shear_rows(image: np.ndarray, factor: float, fill: int) -> np.ndarray:
+    """Desloca cada linha horizontalmente em (y - centro) * factor pixels"""
+    height, width = image.shape[:2]
+    shifts = np.rint((np.arange(height) - height / 2) * factor).astype(np.int64)
+    out = np.full_like(image, fill)
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(shifts)) + 1, [height]))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        shift = int(shifts[start])
+        if abs(shift) >= width:
+            continue
+        if shift >= 0:
+            out[start:end, shift:] = image[start:end, :width - shift]
+        else:
+            out[start:end, :width + shift] = image[start:end, -shift:]
+    return out
+
+
+def _shear_cols(image: np.ndarray, factor: float, fill: int) -> np.ndarray:
+    """Desloca cada coluna verticalmente em (x - centro) * factor pixels"""
+    height, width = image.shape[:2]
+    shifts = np.rint((np.arange(width) - width / 2) * factor).astype(np.int64)
+    out = np.full_like(image, fill)
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(shifts)) + 1, [width]))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        shift = int(shifts[start])
+        if abs(shift) >= height:
+            continue
+        if shift >= 0:
+            out[shift:, start:end] = image[:height - shift, start:end]
+        else:
+            out[:height + shift, start:end] = image[-shift:, start:end]
+    return out
+
+
+def rotate(image: np.ndarray, angle: float, fill: int = PAPER_WHITE) -> np.ndarray:
+    """
+    Gira a página em `angle` graus em torno do centro (três cisalhamentos)
+
+    Cada cisalhamento copia faixas contíguas com o mesmo deslocamento, então
+    o custo é proporcional ao número de faixas, não de pixels. Mantém o
+    tamanho da página; o que sai dela é descartado e o que entra é `fill`.
+    """
+    theta = math.radians(angle)
+    alpha, beta = -math.tan(theta / 2), math.sin(theta)
+    image = _shear_rows(image, alpha, fill)
+    image = _shear_cols(image, beta, fill)
+    return _shear_rows(image, alpha, fill)
+
+
+def auto_crop(image: np.ndarray, page_size: str, dpi: int, threshold: int = 200,
+              fill: int = PAPER_WHITE) -> np.ndarray:
+    """
+    Recorta a área do tamanho `page_size` centrada no conteúdo da página
+
+    Pressupõe tampa clara: o conteúdo é o que fica abaixo de `threshold`.
+    Se a imagem for menor que a página, completa com `fill`.
+    """
+    target_width, target_height = page_dimensions(page_size, dpi)
+    height, width = image.shape[:2]
+    factor = max(1, dpi // 50)
+    sample = image[::factor, ::factor]
+    ink = (sample if sample.ndim == 2 else sample[..., 1]) < threshold
+    rows, cols = np.flatnonzero(ink.any(axis=1)), np.flatnonzero(ink.any(axis=0))
+    if rows.size:
+        center_y = (rows[0] + rows[-1] + 1) * factor / 2
+        center_x = (cols[0] + cols[-1] + 1) * factor / 2
+    else:
+        center_y, center_x = height / 2, width / 2
+
+    top = int(min(max(round(center_y - target_height / 2), 0), max(height - target_height, 0)))
+    left = int(min(max(round(center_x - target_width / 2), 0), max(width - target_width, 0)))
+    cropped = image[top:top + target_height, left:left + target_width]
+    if cropped.shape[:2] == (target_height, target_width):
+        return cropped
+
+    out = np.full((target_height, target_width) + image.shape[2:], fill, image.dtype)
+    offset_y = (target_height - cropped.shape[0]) // 2
+    offset_x = (target_width - cropped.shape[1]) // 2
+    out[offset_y:offset_y + cropped.shape[0], offset_x:offset_x + cropped.shape[1]] = cropped
+    return out
+
+
+class PagePostProcessor:
+    """
+    Pós-processamento vetorizado das páginas digitalizadas
+
+    Opera sobre arrays de página inteira (lote (N, H, W[, 3])): brilho e
+    contraste por tabela, conversão para cinza, alinhamento (deskew),
+    recorte automático no tamanho da página e binarização adaptativa para
+    preto e branco, nesta ordem. As etapas por pixel rodam no lote todo de
+    uma vez; deskew e recorte rodam por página, em `workers` threads (NumPy
+    libera o GIL nessas operações).
+    """
+
+    def __init__(self,
+                 brightness: float = 0,
+                 contrast: float = 0,
+                 output_mode: str = 'rgb',
+                 deskew: bool = False,
+                 crop_page_size: Optional[str] = None,
+                 sensitivity: float = 0.15,
+                 batch_size: int = 1,
+                 workers: int = 1) -> None:
+        """
+        Args:
+            brightness: -100 a 100
+            contrast: -100 a 100
+            output_mode: 'rgb', 'gray' ou 'bw'
+            deskew: Corrige a inclinação das páginas
+            crop_page_size: Recorta no tamanho de página informado (None desativa)
+            sensitivity: Sensibilidade da binarização adaptativa
+            batch_size: Páginas processadas juntas (acima de 1, a primeira página
+                só é entregue quando o lote inteiro foi adquirido)
+            workers: Threads para as etapas por página
+        """
+        if output_mode not in ('rgb', 'gray', 'bw'):
+            raise ValueError(f"Modo de saída {output_mode} inválido")
+        self.brightness = brightness
+        self.contrast = contrast
+        self.output_mode = output_mode
+        self.deskew = deskew
+        self.crop_page_size = crop_page_size
+        self.sensitivity = sensitivity
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.buffer_bytes = 0
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> Optional["PagePostProcessor"]:
+        """
+        Cria o processador a partir das configurações de digitalização
+
+        Returns:
+            None quando nenhuma etapa se aplica (as páginas vão direto ao gravador)
+        """
+        output_mode = COLOR_MODES.get(settings.get('color_mode', 'Color'), 'rgb')
+        processor = cls(brightness=settings.get('brightness', 0) or 0,
+                        contrast=settings.get('contrast', 0) or 0,
+                        output_mode=output_mode,
+                        deskew=bool(settings.get('deskew')),
+                        crop_page_size=settings.get('page_size') if settings.get('auto_crop') else None,
+                        batch_size=settings.get('batch_size', 1),
+                        workers=settings.get('workers', 1))
+        return processor if processor.is_active else None
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.brightness or self.contrast or self.deskew or self.crop_page_size
+                    or self.output_mode == 'bw')
+
+    @property
+    def acquisition_color_mode(self) -> str:
+        """Modo de cor pedido ao dispositivo (a binarização adaptativa precisa de tons de cinza)"""
+        return {'rgb': 'Color', 'gray': 'Grayscale', 'bw': 'Grayscale'}[self.output_mode]
+
+    def process(self, image: np.ndarray, dpi: int) -> np.ndarray:
+        """Processa uma página (H, W[, 3])"""
+        return self.process_batch(image[None], dpi)[0]
+
+    def process_batch(self, images: np.ndarray, dpi: int) -> np.ndarray:
+        """
+        Processa um lote de páginas do mesmo tamanho
+
+        Args:
+            images: (N, H, W, 3) ou (N, H, W) uint8
+            dpi: Resolução das páginas
+
+        Returns:
+            Lote processado: uint8 para 'rgb'/'gray', bool para 'bw'
+        """
+        # Converte antes para aplicar a tabela em um canal só
+        if images.ndim == 4 and self.output_mode != 'rgb':
+            images = to_grayscale(images)
+        images = adjust_brightness_contrast(images, self.brightness, self.contrast)
+
+        if self.deskew:
+            self._map_pages(images, lambda image: self._deskew(image, dpi), images)
+
+        if self.crop_page_size:
+            width, height = page_dimensions(self.crop_page_size, dpi)
+            cropped = np.empty((len(images), height, width) + images.shape[3:], np.uint8)
+            self._map_pages(images, lambda image: auto_crop(image, self.crop_page_size, dpi), cropped)
+            images = cropped
+
+        if self.output_mode == 'bw':
+            images = adaptive_binarize(images, block=max(8, dpi // 4), sensitivity=self.sensitivity)
+        return images
+
+    def process_pages(self, pages: Iterable[ScanPage]) -> Iterator[ScanPage]:
+        """
+        Lê as páginas em lotes de `batch_size`, processa e entrega como ScanPage
+
+        Páginas de tamanhos ou modos diferentes fecham o lote corrente.
+        """
+        batch: List[ScanPage] = []
+        for page in pages:
+            if batch and (page.width, page.height, page.mode) != (batch[0].width, batch[0].height, batch[0].mode):
+                yield from self._flush(batch)
+                batch = []
+            batch.append(page)
+            if len(batch) == self.batch_size:
+                yield from self._flush(batch)
+                batch = []
+        if batch:
+            yield from self._flush(batch)
+
+    def _flush(self, pages: List[ScanPage]) -> Iterator[ScanPage]:
+        first = pages[0]
+        shape = (len(pages), first.height, first.width) + ((3,) if first.mode == 'rgb' else ())
+        if first.mode == 'bw':
+            # Sem tons de cinza: só as etapas geométricas se aplicam
+            bits = np.stack([page_to_array(page) for page in pages])
+            images = np.where(bits, np.uint8(0), np.uint8(PAPER_WHITE))
+        else:
+            images = np.empty(shape, np.uint8)
+            for position, page in enumerate(pages):
+                page_to_array(page, out=images[position])
+
+        processed = self.process_batch(images, first.dpi)
+        self.buffer_bytes = max(self.buffer_bytes, images.nbytes + processed.nbytes)
+        for page, image in zip(pages, processed):
+            yield page_from_array(image, page.index, page.dpi, page.band_rows)
+
+    def _deskew(self, image: np.ndarray, dpi: int) -> np.ndarray:
+        gray = image if image.ndim == 2 else image[..., 1]
+        angle = estimate_skew(gray, dpi)
+        return image if abs(angle) < 0.05 else rotate(image, -angle)
+
+    def _map_pages(self, images: np.ndarray, function, out: np.ndarray) -> None:
+        """Aplica `function` a cada página gravando em `out[i]`"""
+        def apply(position: int) -> None:
+            out[position] = function(images[position])
+
+        if self.workers == 1 or len(images) == 1:
+            for position in range(len(images)):
+                apply(position)
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(apply, range(len(images))))
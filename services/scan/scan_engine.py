@@ -0,0 +1,272 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from core import AppLogger
+
+# Tamanhos de página em milímetros (largura, altura)
+PAGE_SIZES_MM = {
+    'A4': (210.0, 297.0),
+    'A5': (148.0, 210.0),
+    'Letter': (215.9, 279.4),
+    'Legal': (215.9, 355.6),
+}
+
+# Modo de cor das configurações -> modo interno das páginas
+COLOR_MODES = {'Color': 'rgb', 'Grayscale': 'gray', 'Black & White': 'bw'}
+
+
+def parse_resolution(resolution: Any) -> int:
+    """Converte '300 dpi' (ou 300) em inteiro"""
+    if isinstance(resolution, int):
+        return resolution
+    return int(str(resolution).lower().replace('dpi', '').strip())
+
+
+def page_dimensions(page_size: str, dpi: int) -> tuple:
+    """Largura e altura da página em pixels"""
+    width_mm, height_mm = PAGE_SIZES_MM.get(page_size, PAGE_SIZES_MM['A4'])
+    return round(width_mm / 25.4 * dpi), round(height_mm / 25.4 * dpi)
+
+
+class ScanPage:
+    """
+    Página em aquisição
+
+    Os dados não ficam na página: `chunks()` entrega faixas de linhas completas
+    como memoryview sobre um buffer reutilizado pela fonte. Cada faixa deve ser
+    consumida antes de pedir a próxima.
+    """
+
+    def __init__(self, index: int, width: int, height: int, mode: str, dpi: int, band_rows: int,
+                 chunks: Callable[["ScanPage"], Iterator[memoryview]]) -> None:
+        self.index = index
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.dpi = dpi
+        self.band_rows = band_rows
+        self.bits_per_sample = 1 if mode == 'bw' else 8
+        self.samples = 3 if mode == 'rgb' else 1
+        self.row_bytes = (width + 7) // 8 if mode == 'bw' else width * self.samples
+        self._chunks = chunks
+
+    @property
+    def nbytes(self) -> int:
+        return self.row_bytes * self.height
+
+    @property
+    def band_bytes(self) -> int:
+        return self.row_bytes * self.band_rows
+
+    def chunks(self) -> Iterator[memoryview]:
+        return self._chunks(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'index': self.index, 'width': self.width, 'height': self.height, 'mode': self.mode,
+                'dpi': self.dpi, 'bytes': self.nbytes}
+
+
+class SimulatedScanDevice:
+    """
+    Scanner simulado que produz imagens reais (margens, linhas de "texto" e
+    cabeçalho) na velocidade configurada
+
+    As linhas são montadas a partir de modelos pré-calculados copiados para
+    um único buffer de faixa, então gerar uma página de 600 dpi não aloca a
+    página inteira.
+    """
+
+    def __init__(self,
+                 pages: int = 1,
+                 lines_per_second: Optional[float] = None,
+                 band_rows: int = 128,
+                 seed: Optional[int] = None,
+                 name: str = "Scanner simulado") -> None:
+        """
+        Args:
+            pages: Páginas entregues por digitalização (ADF)
+            lines_per_second: Velocidade do sensor; None entrega o mais rápido possível
+            band_rows: Linhas por faixa entregue
+            seed: Semente do conteúdo gerado
+            name: Nome do dispositivo
+        """
+        self.page_count = pages
+        self.lines_per_second = lines_per_second
+        self.band_rows = band_rows
+        self.name = name
+        self._rng = random.Random(seed)
+
+    def pages(self, settings: Dict[str, Any]) -> Iterator[ScanPage]:
+        """
+        Gera as páginas da digitalização
+
+        Args:
+            settings: Configurações preparadas (resolution, color_mode, page_size)
+        """
+        dpi = parse_resolution(settings.get('resolution', 300))
+        mode = COLOR_MODES.get(settings.get('color_mode', 'Color'), 'rgb')
+        width, height = page_dimensions(settings.get('page_size', 'A4'), dpi)
+        buffer = bytearray()
+        for index in range(self.page_count):
+            page = ScanPage(index, width, height, mode, dpi, self.band_rows,
+                            lambda page: self._page_chunks(page, buffer))
+            yield page
+
+    def _page_chunks(self, page: ScanPage, buffer: bytearray) -> Iterator[memoryview]:
+        if len(buffer) != page.band_bytes:
+            buffer[:] = bytes(page.band_bytes)
+        view = memoryview(buffer)
+        templates = self._row_templates(page)
+        white = templates[0]
+        margin = page.dpi // 2
+        pitch = max(4, page.dpi // 6)
+        text_height = max(2, pitch * 3 // 5)
+        header_rows = range(margin, margin + page.dpi // 4)
+        line_templates = [self._rng.randrange(1, len(templates)) for _ in range(page.height // pitch + 1)]
+        row_bytes = page.row_bytes
+        delay = page.band_rows / self.lines_per_second if self.lines_per_second else 0.0
+
+        for start in range(0, page.height, page.band_rows):
+            rows = min(page.band_rows, page.height - start)
+            for offset, y in enumerate(range(start, start + rows)):
+                if y in header_rows:
+                    row = templates[-1]
+                elif margin <= y < page.height - margin and (y - margin) % pitch < text_height:
+                    row = templates[line_templates[(y - margin) // pitch]]
+                else:
+                    row = white
+                position = offset * row_bytes
+                buffer[position:position + row_bytes] = row
+            if delay:
+                time.sleep(delay * rows / page.band_rows)
+            yield view[:rows * row_bytes]
+
+    def _row_templates(self, page: ScanPage) -> List[bytes]:
+        """Linha branca, variações de linha de texto e a barra de cabeçalho"""
+        if page.mode == 'rgb':
+            paper, ink, unit = b"\xfa\xf8\xf5", b"\x1c\x1c\x30", 1
+        elif page.mode == 'gray':
+            paper, ink, unit = b"\xf8", b"\x20", 1
+        else:
+            # 1 bit por pixel (1 = preto), montado em blocos de 8 pixels
+            paper, ink, unit = b"\x00", b"\xff", 8
+        cells = page.row_bytes if page.mode == 'bw' else page.width
+        margin = page.dpi // 2 // unit
+
+        def row_from_runs(runs) -> bytes:
+            parts = []
+            for ink_run, length in runs:
+                parts.append((ink if ink_run else paper) * length)
+            row = b"".join(parts)
+            return (row + paper * cells)[:cells * len(paper)]
+
+        templates = [paper * cells]
+        for _ in range(7):
+            runs, position = [(False, margin)], margin
+            limit = cells - margin - self._rng.randrange(0, max(1, cells // 3))
+            while position < limit:
+                word = self._rng.randrange(max(1, page.dpi // (12 * unit)), max(2, page.dpi // (3 * unit)))
+                space = max(1, page.dpi // (20 * unit))
+                runs += [(True, word), (False, space)]
+                position += word + space
+            templates.append(row_from_runs(runs))
+        templates.append(row_from_runs([(False, margin), (True, cells - 2 * margin)]))
+        return templates
+
+
+class ScanEngine:
+    """
+    Pipeline de aquisição em fluxo: fonte -> gravador, página a página
+
+    Cada faixa vai para o gravador assim que chega; a memória usada fica no
+    tamanho de uma faixa, independentemente do número de páginas no ADF.
+    """
+
+    def __init__(self) -> None:
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+
+    def acquire(self, device, settings: Dict[str, Any],
+                cancel_event: Optional[threading.Event] = None,
+                processor=None) -> Iterator[ScanPage]:
+        """
+        Gera as páginas do dispositivo, parando entre páginas se `cancel_event` for sinalizado
+        
+        Com `processor` (PagePostProcessor), o dispositivo é lido no modo de cor
+        que o processador pede e as páginas saem já processadas (em lotes de `batch_size`).
+        """
+        if processor is not None:
+            settings = {**settings, 'color_mode': processor.acquisition_color_mode}
+            yield from processor.process_pages(self.acquire(device, settings, cancel_event))
+            return
+        pages = device.pages(settings)
+        try:
+            for page in pages:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                yield page
+        finally:
+            pages.close()
+
+    def run(self,
+            device,
+            settings: Dict[str, Any],
+            writer,
+            cancel_event: Optional[threading.Event] = None,
+            on_page: Optional[Callable[[Dict[str, Any]], None]] = None,
+            keep_partial: bool = False,
+            processor=None) -> Dict[str, Any]:
+        """
+        Digitaliza gravando cada página conforme chega
+
+        Args:
+            device: Fonte com `pages(settings)` (ex: SimulatedScanDevice)
+            settings: Configurações preparadas
+            writer: PageWriter de destino
+            cancel_event: Cancela a aquisição entre páginas
+            on_page: Chamado ao concluir cada página (com ScanPage.to_dict)
+            keep_partial: Em cancelamento, mantém as páginas já gravadas
+            processor: PagePostProcessor aplicado antes da gravação (None grava direto)
+
+        Returns:
+            Dict com success, files, pages_scanned, bytes_acquired, bytes_written,
+            buffer_bytes, cancelled e error
+        """
+        result: Dict[str, Any] = {
+            'success': False,
+            'files': [],
+            'pages_scanned': 0,
+            'bytes_acquired': 0,
+            'bytes_written': 0,
+            'buffer_bytes': 0,
+            'cancelled': False,
+            'error': None
+        }
+        try:
+            for page in self.acquire(device, settings, cancel_event, processor):
+                writer.begin_page(page)
+                for chunk in page.chunks():
+                    writer.write(chunk)
+                    result['bytes_acquired'] += len(chunk)
+                writer.end_page(page)
+                result['pages_scanned'] += 1
+                result['buffer_bytes'] = max(result['buffer_bytes'], page.band_bytes,
+                                             processor.buffer_bytes if processor is not None else 0)
+                if on_page:
+                    on_page(page.to_dict())
+
+            result['cancelled'] = cancel_event is not None and cancel_event.is_set()
+            if result['cancelled'] and not keep_partial:
+                writer.abort()
+                result['error'] = "Digitalização cancelada"
+                self.logger.info(f"Digitalização cancelada após {result['pages_scanned']} página(s)")
+                return result
+
+            result['files'] = writer.close()
+            result['bytes_written'] = writer.bytes_written
+            result['success'] = True
+        except Exception as e:
+            writer.abort()
+            result['error'] = str(e)
+            self.logger.error(f"Erro na aquisição: {e}", exc_info=True)
+        return result
@@ -1,22 +1,41 @@
 import win32print
+import os
+import re
+import tempfile
+import threading
 import time
-from typing import Dict, List, Optional, Any
+import uuid
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .capabilities import ScannerCapabilities, ScannerCapabilityCache
+from .postprocess import PagePostProcessor
+from .scan_engine import ScanEngine, ScanPage, SimulatedScanDevice
 
 
 class PrinterScannerManager:
     """Classe para gerenciar digitalização de documentos em impressoras multifuncionais"""
     
-    def __init__(self, access_manager, logger_instance) -> None:
+    def __init__(self, access_manager, logger_instance, capability_ttl: float = 600.0,
+                 encode_workers: Optional[int] = None) -> None:
         """
         Inicializa o gerenciador de digitalização
         
         Args:
             access_manager: Instância do PrinterAccessManager
             logger_instance: Instância do logger
+            capability_ttl: Validade (s) das capacidades em cache
+            encode_workers: Processos do pool de compressão (padrão: os.cpu_count())
         """
         self.access_manager = access_manager
         self.logger = logger_instance.get_logger(__name__)
         self.scan_handles: Dict[str, Any] = {}
+        self.engine = ScanEngine()
+        self.capability_cache = ScannerCapabilityCache(ttl=capability_ttl)
+        self.encode_workers = encode_workers
+        self._encode_executor = None
+        self._encode_lock = threading.Lock()
+        self._active_scans: Dict[str, threading.Event] = {}
+        self._active_lock = threading.Lock()
     
     def _get_scanner_handle(self, printer_name: str) -> Optional[Any]:
         """
@@ -46,49 +65,63 @@ class PrinterScannerManager:
             self.logger.error(f"Erro ao abrir scanner da impressora {printer_name}: {e}", exc_info=True)
             return None
     
-    def check_scanner_capabilities(self, printer_name: str) -> Dict[str, Any]:
+    def check_scanner_capabilities(self, printer_name: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Verifica as capacidades de digitalização da impressora
         
         Args:
             printer_name: Nome da impressora/scanner
+            use_cache: Usa as capacidades em cache quando ainda válidas
             
         Returns:
             Dicionário com informações das capacidades do scanner
         """
-        capabilities = {
-            'has_scanner': False,
-            'color_modes': [],
-            'resolutions': [],
-            'document_sources': [],
-            'supported_formats': [],
-            'error': None
-        }
-        
         try:
-            handle = self._get_scanner_handle(printer_name)
-            if not handle:
-                capabilities['error'] = "Não foi possível acessar o scanner"
-                return capabilities
-            
-            # Obtém informações do dispositivo
-            printer_info = win32print.GetPrinter(handle, 2)
-            capabilities['has_scanner'] = self._detect_scanner_functionality(printer_info)
-            
-            if capabilities['has_scanner']:
-                # Simula capacidades básicas (em implementação real, usaria WIA ou TWAIN)
-                capabilities['color_modes'] = ['Color', 'Grayscale', 'Black & White']
-                capabilities['resolutions'] = ['75 dpi', '150 dpi', '200 dpi', '300 dpi', '600 dpi']
-                capabilities['document_sources'] = ['Flatbed', 'ADF', 'Duplex ADF']
-                capabilities['supported_formats'] = ['PDF', 'JPEG', 'TIFF', 'PNG']
-            
-            self.logger.info(f"Capacidades do scanner verificadas para '{printer_name}'")
-            
+            return self.get_capabilities(printer_name, use_cache).to_dict()
         except Exception as e:
-            capabilities['error'] = str(e)
             self.logger.error(f"Erro ao verificar capacidades do scanner {printer_name}: {e}", exc_info=True)
+            capabilities = ScannerCapabilities(False).to_dict()
+            capabilities['error'] = str(e)
+            return capabilities
+    
+    def get_capabilities(self, printer_name: str, use_cache: bool = True) -> ScannerCapabilities:
+        """
+        Capacidades do scanner, descobertas uma vez e mantidas em cache
+        
+        Args:
+            printer_name: Nome da impressora/scanner
+            use_cache: False força nova descoberta
+            
+        Returns:
+            ScannerCapabilities com os conjuntos de validação
+            
+        Raises:
+            RuntimeError: Se o scanner não puder ser acessado
+        """
+        if not use_cache:
+            self.capability_cache.invalidate(printer_name)
+        return self.capability_cache.get(printer_name, self._discover_capabilities)
+    
+    def _discover_capabilities(self, printer_name: str) -> ScannerCapabilities:
+        """Consulta o dispositivo (handle + GetPrinter nível 2)"""
+        handle = self._get_scanner_handle(printer_name)
+        if not handle:
+            raise RuntimeError("Não foi possível acessar o scanner")
+        
+        # Obtém informações do dispositivo
+        printer_info = win32print.GetPrinter(handle, 2)
+        if not self._detect_scanner_functionality(printer_info):
+            return ScannerCapabilities(False)
         
-        return capabilities
+        self.logger.info(f"Capacidades do scanner verificadas para '{printer_name}'")
+        # Simula capacidades básicas (em implementação real, usaria WIA ou TWAIN)
+        return ScannerCapabilities(
+            True,
+            color_modes=['Color', 'Grayscale', 'Black & White'],
+            resolutions=['75 dpi', '150 dpi', '200 dpi', '300 dpi', '600 dpi'],
+            document_sources=['Flatbed', 'ADF', 'Duplex ADF'],
+            supported_formats=['PDF', 'JPEG', 'TIFF', 'PNG']
+        )
     
     def _detect_scanner_functionality(self, printer_info: Dict) -> bool:
         """
@@ -118,12 +151,19 @@ class PrinterScannerManager:
             self.logger.warning(f"Erro ao detectar funcionalidade de scanner: {e}")
             return False
     
-    def scan(self, printer_name: str, **scan_settings) -> Dict[str, Any]:
+    def scan(self, printer_name: str, cancel_event: Optional[threading.Event] = None,
+             on_page: Optional[Callable[[Dict[str, Any]], None]] = None, **scan_settings) -> Dict[str, Any]:
         """
         Executa a digitalização de um documento
         
+        Bloqueia até o fim da aquisição; para digitalizar em segundo plano ou
+        em vários dispositivos ao mesmo tempo, use ScanScheduler.
+        
         Args:
             printer_name: Nome da impressora/scanner
+            cancel_event: Interrompe a aquisição entre páginas (padrão: criado
+                aqui e sinalizado por cancel_scan)
+            on_page: Chamado ao concluir cada página
             **scan_settings: Configurações de digitalização
             
         Returns:
@@ -134,22 +174,27 @@ class PrinterScannerManager:
             'file_path': None,
             'pages_scanned': 0,
             'scan_time': 0,
+            'cancelled': False,
             'error': None,
             'warnings': []
         }
         
         start_time = time.time()
+        cancel_event = cancel_event if cancel_event is not None else threading.Event()
+        with self._active_lock:
+            self._active_scans[printer_name] = cancel_event
         
         try:
-            # Verifica se o scanner está disponível
-            capabilities = self.check_scanner_capabilities(printer_name)
-            if not capabilities['has_scanner']:
-                scan_result['error'] = "Impressora não possui funcionalidade de scanner"
-                self.logger.error(f"Tentativa de digitalização em impressora sem scanner: {printer_name}")
+            # Verifica se o scanner está disponível (sem consulta ao dispositivo com o cache válido)
+            try:
+                capabilities = self.get_capabilities(printer_name)
+            except Exception as e:
+                scan_result['error'] = f"Erro nas capacidades do scanner: {e}"
                 return scan_result
             
-            if capabilities['error']:
-                scan_result['error'] = f"Erro nas capacidades do scanner: {capabilities['error']}"
+            if not capabilities.has_scanner:
+                scan_result['error'] = "Impressora não possui funcionalidade de scanner"
+                self.logger.error(f"Tentativa de digitalização em impressora sem scanner: {printer_name}")
                 return scan_result
             
             # Aplica configurações padrão
@@ -160,11 +205,13 @@ class PrinterScannerManager:
             # Simula o processo de digitalização
             # Em implementação real, aqui seria integrado com WIA (Windows Image Acquisition) ou TWAIN
             
-            scan_result = self._execute_scan_simulation(printer_name, settings)
+            scan_result = self._execute_scan_simulation(printer_name, settings, cancel_event, on_page)
             scan_result['scan_time'] = time.time() - start_time
             
             if scan_result['success']:
                 self.logger.info(f"Digitalização concluída com sucesso em {scan_result['scan_time']:.2f}s")
+            elif scan_result['cancelled']:
+                self.logger.info(f"Digitalização cancelada na impressora '{printer_name}'")
             else:
                 self.logger.error(f"Falha na digitalização: {scan_result['error']}")
             
@@ -172,10 +219,14 @@ class PrinterScannerManager:
             scan_result['error'] = str(e)
             scan_result['scan_time'] = time.time() - start_time
             self.logger.error(f"Erro durante a digitalização na impressora {printer_name}: {e}", exc_info=True)
+        finally:
+            with self._active_lock:
+                if self._active_scans.get(printer_name) is cancel_event:
+                    del self._active_scans[printer_name]
         
         return scan_result
     
-    def _prepare_scan_settings(self, user_settings: Dict, capabilities: Dict) -> Dict[str, Any]:
+    def _prepare_scan_settings(self, user_settings: Dict, capabilities: ScannerCapabilities) -> Dict[str, Any]:
         """
         Prepara as configurações de digitalização com valores padrão
         
@@ -194,66 +245,151 @@ class PrinterScannerManager:
             'duplex': False,
             'brightness': 0,
             'contrast': 0,
-            'page_size': 'A4'
+            'page_size': 'A4',
+            'deskew': False,
+            'auto_crop': False,
+            'parallel_encoding': True,
+            'output_dir': None
         }
         
         # Aplica configurações do usuário, validando contra as capacidades
         settings = default_settings.copy()
         settings.update(user_settings)
         
+        # Combinação já validada: nenhum ajuste necessário
+        if capabilities.is_valid(settings['color_mode'], settings['resolution'], settings['source'],
+                                 settings['format']):
+            return settings
+        
         # Validações
-        if settings['color_mode'] not in capabilities.get('color_modes', []):
-            settings['color_mode'] = capabilities.get('color_modes', ['Color'])[0]
+        if settings['color_mode'] not in capabilities.color_mode_set:
+            settings['color_mode'] = (capabilities.color_modes or ('Color',))[0]
         
-        if settings['resolution'] not in capabilities.get('resolutions', []):
-            settings['resolution'] = capabilities.get('resolutions', ['300 dpi'])[0]
+        if settings['resolution'] not in capabilities.resolution_set:
+            settings['resolution'] = (capabilities.resolutions or ('300 dpi',))[0]
         
-        if settings['source'] not in capabilities.get('document_sources', []):
-            settings['source'] = capabilities.get('document_sources', ['Flatbed'])[0]
+        if settings['source'] not in capabilities.source_set:
+            settings['source'] = (capabilities.document_sources or ('Flatbed',))[0]
         
-        if settings['format'] not in capabilities.get('supported_formats', []):
-            settings['format'] = capabilities.get('supported_formats', ['PDF'])[0]
+        if settings['format'] not in capabilities.format_set:
+            settings['format'] = (capabilities.supported_formats or ('PDF',))[0]
         
         return settings
     
-    def _execute_scan_simulation(self, printer_name: str, settings: Dict) -> Dict[str, Any]:
+    def _create_device(self, printer_name: str, settings: Dict) -> SimulatedScanDevice:
+        """
+        Cria a fonte de páginas do scanner (simulada; em produção, WIA ou TWAIN)
+        
+        A velocidade do sensor reproduz o tempo de _calculate_scan_delay.
+        """
+        pages = 3 if settings['source'] in ['ADF', 'Duplex ADF'] else 1
+        dpi = int(settings['resolution'].split()[0])
+        lines = int(297 / 25.4 * dpi) * pages
+        return SimulatedScanDevice(pages=pages, lines_per_second=lines / self._calculate_scan_delay(settings),
+                                   name=printer_name)
+    
+    def _create_writer(self, printer_name: str, settings: Dict, pages: Optional[int] = None):
+        """
+        Cria o gravador em fluxo do formato pedido (PNG quando o formato exige codificador)
+        
+        Digitalizações pelo ADF com `parallel_encoding` comprimem as páginas no
+        pool de processos compartilhado do gerenciador, desde que o número de
+        páginas e a resolução compensem o custo (parallel_encoding_pays_off).
+        
+        Args:
+            printer_name: Nome da impressora/scanner
+            settings: Configurações preparadas
+            pages: Páginas esperadas (None se desconhecido)
+        """
+        from .page_writers import PAGE_WRITERS, create_page_writer
+        from .parallel_encoder import ParallelPageEncoder, parallel_encoding_pays_off
+        
+        output_dir = settings.get('output_dir') or tempfile.gettempdir()
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        safe_name = re.sub(r'[^\w.-]+', '_', printer_name)
+        # Sufixo aleatório: digitalizações no mesmo segundo não disputam os
+        # mesmos arquivos (incluindo as páginas _pNNN do fallback para PNG)
+        output_base = os.path.join(output_dir, f"scan_{safe_name}_{timestamp}_{uuid.uuid4().hex[:8]}")
+        fmt = settings['format'] if settings['format'].upper() in PAGE_WRITERS else 'PNG'
+        dpi = int(settings['resolution'].split()[0])
+        if (settings.get('parallel_encoding') and settings['source'] in ['ADF', 'Duplex ADF']
+                and parallel_encoding_pays_off(pages, dpi, self.encode_workers)):
+            return ParallelPageEncoder(fmt, output_base, executor=self._get_encode_executor())
+        return create_page_writer(fmt, output_base)
+    
+    def _get_encode_executor(self):
+        """Pool de processos de compressão, criado no primeiro uso e mantido entre digitalizações"""
+        with self._encode_lock:
+            if self._encode_executor is None:
+                from .parallel_encoder import create_encode_executor
+                self._encode_executor = create_encode_executor(self.encode_workers)
+            return self._encode_executor
+    
+    def scan_stream(self, printer_name: str, cancel_event=None, **scan_settings) -> Iterator[ScanPage]:
+        """
+        Digitaliza entregando as páginas conforme são adquiridas
+        
+        Cada ScanPage expõe `chunks()` com faixas em memoryview; consuma as
+        faixas de uma página antes de avançar para a próxima.
+        
+        Args:
+            printer_name: Nome da impressora/scanner
+            cancel_event: threading.Event que interrompe a aquisição entre páginas
+            **scan_settings: Configurações de digitalização
+        """
+        capabilities = self.get_capabilities(printer_name)
+        if not capabilities.has_scanner:
+            raise RuntimeError("Impressora não possui funcionalidade de scanner")
+        settings = self._prepare_scan_settings(scan_settings, capabilities)
+        device = self._create_device(printer_name, settings)
+        processor = PagePostProcessor.from_settings(settings)
+        return self.engine.acquire(device, settings, cancel_event, processor)
+    
+    def _execute_scan_simulation(self, printer_name: str, settings: Dict,
+                                 cancel_event: Optional[threading.Event] = None,
+                                 on_page: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
-        Simula o processo de digitalização (substituir por implementação real)
+        Executa a digitalização no dispositivo simulado, gravando cada página assim que chega
         
         Args:
             printer_name: Nome da impressora/scanner
             settings: Configurações de digitalização
+            cancel_event: Interrompe a aquisição entre páginas
+            on_page: Chamado ao concluir cada página
             
         Returns:
-            Resultado da simulação de digitalização
+            Resultado da digitalização
         """
-        # Esta é uma simulação - em produção, integrar com WIA ou TWAIN
-        
         result = {
             'success': False,
             'file_path': None,
+            'files': [],
             'pages_scanned': 0,
-            'error': None
+            'bytes_written': 0,
+            'cancelled': False,
+            'error': None,
+            'warnings': []
         }
         
         try:
-            # Simula tempo de digitalização baseado na resolução e fonte
-            scan_delay = self._calculate_scan_delay(settings)
-            time.sleep(scan_delay)
-            
-            # Simula detecção de páginas
-            if settings['source'] in ['ADF', 'Duplex ADF']:
-                result['pages_scanned'] = 3  # Simula 3 páginas no ADF
-            else:
-                result['pages_scanned'] = 1  # Flatbed - 1 página
-            
-            # Gera nome de arquivo simulado
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            result['file_path'] = f"scan_{printer_name.replace(' ', '_')}_{timestamp}.{settings['format'].lower()}"
-            
-            result['success'] = True
-            
-            self.logger.debug(f"Simulação de digitalização concluída: {result['pages_scanned']} páginas")
+            device = self._create_device(printer_name, settings)
+            writer = self._create_writer(printer_name, settings, pages=device.page_count)
+            if writer.extension.upper() != settings['format'].upper():
+                result['warnings'].append(f"Formato {settings['format']} sem gravador em fluxo; gravado como PNG")
+            
+            processor = PagePostProcessor.from_settings(settings)
+            engine_result = self.engine.run(device, settings, writer, cancel_event, on_page, processor=processor)
+            result.update({
+                'success': engine_result['success'],
+                'files': engine_result['files'],
+                'file_path': engine_result['files'][0] if engine_result['files'] else None,
+                'pages_scanned': engine_result['pages_scanned'],
+                'bytes_written': engine_result['bytes_written'],
+                'cancelled': engine_result['cancelled'],
+                'error': engine_result['error']
+            })
+            
+            self.logger.debug(f"Digitalização concluída: {result['pages_scanned']} páginas")
             
         except Exception as e:
             result['error'] = f"Erro na simulação de digitalização: {str(e)}"
@@ -298,11 +434,18 @@ class PrinterScannerManager:
             printer_name: Nome da impressora/scanner
             
         Returns:
-            True se cancelado com sucesso, False caso contrário
+            True se havia digitalização em andamento (ela para antes da próxima página)
         """
         try:
-            # Em implementação real, cancelaria o processo de digitalização
-            self.logger.info(f"Digitalização cancelada para a impressora '{printer_name}'")
+            with self._active_lock:
+                cancel_event = self._active_scans.get(printer_name)
+            if cancel_event is None:
+                self.logger.warning(f"Nenhuma digitalização em andamento na impressora '{printer_name}'")
+                return False
+            
+            # A aquisição para antes da próxima página
+            cancel_event.set()
+            self.logger.info(f"Cancelamento solicitado para a digitalização na impressora '{printer_name}'")
             return True
             
         except Exception as e:
@@ -343,6 +486,11 @@ class PrinterScannerManager:
             if not self.close_scanner(printer_name):
                 success = False
         
+        with self._encode_lock:
+            executor, self._encode_executor = self._encode_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
         if success:
             self.logger.info("Todas as conexões com scanners foram fechadas.")
         else:
@@ -0,0 +1,439 @@
+import itertools
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+from core import AppLogger
+
+
+class ScanState(str, Enum):
+    """Estados de uma digitalização agendada"""
+    QUEUED = "QUEUED"
+    SCANNING = "SCANNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
+class ScanQueueFullError(RuntimeError):
+    """Fila do dispositivo cheia (backpressure)"""
+
+
+class CancellationToken:
+    """
+    Sinal de cancelamento de uma digitalização
+
+    Compatível com threading.Event (`is_set`), que é o que o ScanEngine
+    consulta entre uma página e outra.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "Digitalização cancelada") -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+
+class ScanJob:
+    """
+    Digitalização enviada ao ScanScheduler
+
+    Retornada imediatamente por `submit`; `wait()` bloqueia até o fim.
+    """
+
+    def __init__(self, job_id: int, printer_name: str, settings: Dict[str, Any]) -> None:
+        self.job_id = job_id
+        self.printer_name = printer_name
+        self.settings = settings
+        self.token = CancellationToken()
+        self.state = ScanState.QUEUED
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.pages_scanned = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def queue_wait(self) -> Optional[float]:
+        """Tempo (s) entre a submissão e o início da aquisição"""
+        return None if self.started_at is None else self.started_at - self.submitted_at
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Tempo (s) de aquisição"""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def cancel(self, reason: str = "Digitalização cancelada") -> None:
+        """Sinaliza o cancelamento; use ScanScheduler.cancel para tirar da fila na hora"""
+        self.token.cancel(reason)
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Aguarda o fim da digitalização
+
+        Returns:
+            Resultado de PrinterScannerManager.scan ou None se o timeout expirou
+        """
+        self._done.wait(timeout)
+        return self.result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'printer_name': self.printer_name,
+            'state': self.state.value,
+            'pages_scanned': self.pages_scanned,
+            'queue_wait': self.queue_wait,
+            'duration': self.duration,
+            'result': self.result
+        }
+
+    def _finish(self, state: ScanState, result: Dict[str, Any]) -> None:
+        self.state = state
+        self.result = result
+        self.finished_at = time.monotonic()
+        self._done.set()
+
+
+class ScanScheduler:
+    """
+    Agendador de digitalizações em vários dispositivos
+
+    - `submit` retorna um ScanJob na hora; a aquisição roda em um pool de threads
+    - Um dispositivo digitaliza uma coisa de cada vez; dispositivos diferentes
+      digitalizam em paralelo
+    - Fila limitada por dispositivo, atendida por ordem de chegada: cheia,
+      `submit` bloqueia (ou levanta ScanQueueFullError com `block=False`/timeout)
+    - Cada job tem um CancellationToken: na fila, o job sai na hora; em
+      andamento, a aquisição para antes da página seguinte
+    """
+
+    def __init__(self,
+                 scanner=None,
+                 max_workers: int = 4,
+                 max_queue: int = 20,
+                 metrics_window: float = 300.0,
+                 scan: Optional[Callable[[ScanJob], Dict[str, Any]]] = None) -> None:
+        """
+        Args:
+            scanner: PrinterScannerManager (padrão: um novo, com o PrinterAccessManager do container)
+            max_workers: Digitalizações simultâneas (em dispositivos diferentes)
+            max_queue: Digitalizações aguardando por dispositivo
+            metrics_window: Janela (s) do cálculo de vazão
+            scan: Função de digitalização (padrão: scanner.scan com o token e o progresso do job)
+        """
+        if max_workers < 1 or max_queue < 1:
+            raise ValueError("max_workers e max_queue devem ser >= 1")
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self._scanner = scanner
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.metrics_window = metrics_window
+        self._scan = scan or self._run_scan
+        self._queues: Dict[str, Deque[ScanJob]] = {}
+        self._active: Dict[str, ScanJob] = {}
+        self._jobs: Dict[int, ScanJob] = {}
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._closed = False
+        self._counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'rejected': 0}
+        self._waits: Deque[float] = deque(maxlen=1000)
+        # (instante do fim, dispositivo, páginas, segundos de aquisição)
+        self._finished: Deque[tuple] = deque()
+        self._device_totals: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def scanner(self):
+        if self._scanner is None:
+            from core import PrinterAccessManager
+            from .scan_manager import PrinterScannerManager
+            self._scanner = PrinterScannerManager(PrinterAccessManager.instance, AppLogger.instance)
+        return self._scanner
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def submit(self, printer_name: str, block: bool = True, timeout: Optional[float] = None,
+               **scan_settings) -> ScanJob:
+        """
+        Enfileira uma digitalização
+
+        Args:
+            printer_name: Nome da impressora/scanner
+            block: Se a fila do dispositivo estiver cheia, aguarda vaga (True) ou falha na hora (False)
+            timeout: Tempo máximo (s) aguardando vaga
+            **scan_settings: Configurações de digitalização (como em PrinterScannerManager.scan)
+
+        Returns:
+            ScanJob da digitalização
+
+        Raises:
+            ScanQueueFullError: Fila cheia (sem bloqueio ou timeout esgotado)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ScanScheduler encerrado")
+            queue = self._queues.setdefault(printer_name, deque())
+            while len(queue) >= self.max_queue:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not block or (remaining is not None and remaining <= 0):
+                    self._counters['rejected'] += 1
+                    raise ScanQueueFullError(f"Fila de {printer_name} cheia ({self.max_queue} digitalizações)")
+                self._cond.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("ScanScheduler encerrado")
+
+            job = ScanJob(next(self._ids), printer_name, dict(scan_settings))
+            queue.append(job)
+            self._jobs[job.job_id] = job
+            self._counters['submitted'] += 1
+            self._ensure_workers()
+            self._cond.notify_all()
+
+        self.logger.debug(f"Digitalização {job.job_id} enfileirada para {printer_name}")
+        return job
+
+    def cancel(self, job_id: int, reason: str = "Digitalização cancelada") -> bool:
+        """
+        Cancela uma digitalização
+
+        Na fila, o job é removido e finalizado na hora; em andamento, a
+        aquisição para antes da próxima página e o job termina como CANCELLED.
+
+        Returns:
+            True se o job ainda não tinha terminado
+        """
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            job.cancel(reason)
+            if job.state != ScanState.QUEUED:
+                self.logger.info(f"Cancelamento da digitalização {job_id} em {job.printer_name} solicitado")
+                return True
+            self._queues[job.printer_name].remove(job)
+            self._jobs.pop(job_id, None)
+            self._counters['cancelled'] += 1
+            self._cond.notify_all()
+        job._finish(ScanState.CANCELLED, {'success': False, 'cancelled': True, 'error': reason})
+        return True
+
+    def cancel_device(self, printer_name: str, reason: str = "Digitalização cancelada") -> int:
+        """
+        Cancela a digitalização em andamento e as enfileiradas de um dispositivo
+
+        Returns:
+            Quantidade de jobs cancelados
+        """
+        with self._cond:
+            job_ids = [job.job_id for job in self._queues.get(printer_name, ())]
+            active = self._active.get(printer_name)
+            if active is not None:
+                job_ids.append(active.job_id)
+        return sum(1 for job_id in job_ids if self.cancel(job_id, reason))
+
+    def get_job(self, job_id: int) -> Optional[ScanJob]:
+        """Retorna um job ainda pendente (na fila ou em andamento)"""
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def get_device_status(self, printer_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Situação de cada dispositivo
+
+        Args:
+            printer_name: Um dispositivo específico (padrão: todos os conhecidos)
+
+        Returns:
+            Dict dispositivo -> state ('idle' ou 'scanning'), active_job,
+            pages_scanned do job atual, queued, scans e pages concluídos
+        """
+        with self._cond:
+            names = [printer_name] if printer_name else sorted(set(self._queues) | set(self._device_totals))
+            status = {}
+            for name in names:
+                active = self._active.get(name)
+                totals = self._device_totals.get(name, {})
+                status[name] = {
+                    'state': 'scanning' if active is not None else 'idle',
+                    'active_job': active.job_id if active is not None else None,
+                    'pages_scanned': active.pages_scanned if active is not None else 0,
+                    'cancelling': bool(active is not None and active.token.cancelled),
+                    'queued': len(self._queues.get(name, ())),
+                    'scans': int(totals.get('scans', 0)),
+                    'pages': int(totals.get('pages', 0))
+                }
+            return status
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Métricas do agendador
+
+        Returns:
+            Contadores, dispositivos ativos, filas, tempo de espera na fila
+            (médio, p95 e máximo) e vazão na janela: digitalizações/min,
+            páginas/min e páginas/min por dispositivo durante a aquisição
+        """
+        now = time.monotonic()
+        with self._cond:
+            self._trim_finished(now)
+            pages_by_device: Dict[str, List[float]] = {}
+            for _, name, pages, seconds in self._finished:
+                totals = pages_by_device.setdefault(name, [0, 0.0])
+                totals[0] += pages
+                totals[1] += seconds
+            minutes = self.metrics_window / 60
+            return {
+                **self._counters,
+                'active': {name: job.job_id for name, job in self._active.items()},
+                'queued': {name: len(queue) for name, queue in self._queues.items() if queue},
+                'queue_wait': self._summarize(self._waits),
+                'throughput': {
+                    'scans_per_minute': len(self._finished) / minutes,
+                    'pages_per_minute': sum(pages for _, _, pages, _ in self._finished) / minutes,
+                    'device_pages_per_minute': {name: pages * 60 / seconds if seconds else 0.0
+                                                for name, (pages, seconds) in pages_by_device.items()}
+                },
+                'workers': len(self._workers)
+            }
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False, cancel_active: bool = False) -> None:
+        """
+        Encerra o agendador
+
+        Args:
+            wait: Aguarda os workers terminarem
+            cancel_pending: Cancela as digitalizações na fila (senão elas rodam antes)
+            cancel_active: Interrompe as digitalizações em andamento
+        """
+        with self._cond:
+            self._closed = True
+            pending = []
+            if cancel_pending:
+                for queue in self._queues.values():
+                    pending.extend(queue)
+                    queue.clear()
+                self._counters['cancelled'] += len(pending)
+                for job in pending:
+                    self._jobs.pop(job.job_id, None)
+            if cancel_active:
+                for job in self._active.values():
+                    job.cancel("Agendador encerrado")
+            self._cond.notify_all()
+            workers = list(self._workers)
+
+        for job in pending:
+            job.token.cancel("Agendador encerrado")
+            job._finish(ScanState.CANCELLED, {'success': False, 'cancelled': True, 'error': "Agendador encerrado"})
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    def _ensure_workers(self) -> None:
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._worker_loop, name=f"scan-scheduler-{len(self._workers) + 1}",
+                                      daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_job(self) -> Optional[ScanJob]:
+        """Job mais antigo entre os dispositivos livres (chamado com o lock)"""
+        best = None
+        for name, queue in self._queues.items():
+            if queue and name not in self._active and (best is None or queue[0].job_id < best.job_id):
+                best = queue[0]
+        if best is None:
+            return None
+        self._queues[best.printer_name].popleft()
+        self._active[best.printer_name] = best
+        return best
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    if self._closed and not any(self._queues.values()):
+                        return
+                    self._cond.wait()
+                    job = self._next_job()
+                job.state = ScanState.SCANNING
+                job.started_at = time.monotonic()
+                self._waits.append(job.queue_wait)  # type: ignore
+                # Uma vaga abriu na fila: libera quem está bloqueado em submit
+                self._cond.notify_all()
+
+            try:
+                result = self._scan(job)
+            except Exception as e:
+                self.logger.error(f"Erro na digitalização {job.job_id} em {job.printer_name}: {e}", exc_info=True)
+                result = {'success': False, 'error': str(e)}
+
+            if result.get('success'):
+                state = ScanState.DONE
+            elif job.token.cancelled or result.get('cancelled'):
+                state = ScanState.CANCELLED
+            else:
+                state = ScanState.FAILED
+            with self._cond:
+                self._active.pop(job.printer_name, None)
+                self._jobs.pop(job.job_id, None)
+                self._counters[{ScanState.DONE: 'completed', ScanState.FAILED: 'failed',
+                                ScanState.CANCELLED: 'cancelled'}[state]] += 1
+                now = time.monotonic()
+                pages = result.get('pages_scanned', job.pages_scanned) or 0
+                self._finished.append((now, job.printer_name, pages, now - job.started_at))  # type: ignore
+                self._trim_finished(now)
+                totals = self._device_totals.setdefault(job.printer_name, {'scans': 0, 'pages': 0})
+                totals['scans'] += 1
+                totals['pages'] += pages
+                self._cond.notify_all()
+            job._finish(state, result)
+
+    def _run_scan(self, job: ScanJob) -> Dict[str, Any]:
+        def on_page(page: Dict[str, Any]) -> None:
+            job.pages_scanned += 1
+
+        return self.scanner.scan(job.printer_name, cancel_event=job.token, on_page=on_page, **job.settings)
+
+    def _trim_finished(self, now: float) -> None:
+        while self._finished and now - self._finished[0][0] > self.metrics_window:
+            self._finished.popleft()
+
+    @staticmethod
+    def _summarize(values: Deque[float]) -> Dict[str, float]:
+        if not values:
+            return {'count': 0, 'avg': 0.0, 'p95': 0.0, 'max': 0.0}
+        ordered = sorted(values)
+        return {
+            'count': len(ordered),
+            'avg': sum(ordered) / len(ordered),
+            'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            'max': ordered[-1]
+        }
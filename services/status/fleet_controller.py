@@ -0,0 +1,225 @@
+import queue
+import time
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from core import AppLogger
+from services.job import PrinterJobManager
+from .status_controller import PrinterStatusController
+
+ProgressCallback = Callable[[Dict[str, Any], int, int], None]
+
+
+class PrinterFleetController:
+    """Executa operações administrativas em várias impressoras em paralelo"""
+
+    def __init__(self, access_manager, max_workers: int = 8, timeout: float = 30.0):
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.access_manager = access_manager
+        self.controller = PrinterStatusController(access_manager)
+        self.job_manager = PrinterJobManager()
+        self.max_workers = max_workers
+        self.timeout = timeout
+        # Impressoras com operação em execução; uma chamada travada mantém a impressora aqui
+        self._in_flight: Set[str] = set()
+        self._in_flight_lock = threading.Lock()
+
+    def pause(self, printer_names: Iterable[str], **options) -> Dict[str, Any]:
+        """Pausa todas as impressoras informadas"""
+        return self.run("pause", printer_names,
+                        lambda name: self.controller.modify_printer_status(name, "pause"), **options)
+
+    def resume(self, printer_names: Iterable[str], **options) -> Dict[str, Any]:
+        """Retoma todas as impressoras informadas"""
+        return self.run("resume", printer_names,
+                        lambda name: self.controller.modify_printer_status(name, "resume"), **options)
+
+    def purge(self, printer_names: Iterable[str], **options) -> Dict[str, Any]:
+        """Cancela todos os jobs de todas as impressoras informadas"""
+        return self.run("purge", printer_names, self.job_manager.cancel_all_jobs, **options)
+
+    def test_connection(self, printer_names: Iterable[str], **options) -> Dict[str, Any]:
+        """Testa a conexão com todas as impressoras informadas"""
+        return self.run("test_connection", printer_names,
+                        self.access_manager.test_printer_connection, **options)  # type: ignore
+
+    def run(self,
+            action: str,
+            printer_names: Iterable[str],
+            operation: Callable[[str], Any],
+            timeout: Optional[float] = None,
+            max_workers: Optional[int] = None,
+            on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """
+        Executa uma operação em cada impressora em um pool de threads limitado
+
+        O prazo de cada impressora começa a contar quando a operação dela
+        inicia (tempo em fila não conta). Uma impressora que estoura o prazo é
+        marcada como timeout e não atrasa as demais; a chamada ao spooler não
+        pode ser interrompida e termina em segundo plano, numa thread daemon
+        que não impede o processo de encerrar (outra thread assume a fila no
+        lugar dela). Enquanto essa chamada não termina, novas operações na
+        mesma impressora (ex: o snapshot seguinte de run_periodic) não abrem
+        outra thread e são marcadas como timeout de imediato.
+
+        Args:
+            action: Nome da ação (para logs e resultado)
+            printer_names: Impressoras alvo
+            operation: Função chamada com o nome da impressora; retorna bool
+                ou dict com 'success'
+            timeout: Prazo por impressora em segundos (padrão: self.timeout)
+            max_workers: Tamanho do pool (padrão: self.max_workers)
+            on_progress: Chamado com (resultado_da_impressora, concluídas, total)
+                assim que cada impressora termina
+
+        Returns:
+            Dict com 'succeeded', 'failed', 'timed_out', 'results' por impressora
+            e 'elapsed'
+        """
+        names = list(dict.fromkeys(printer_names))
+        timeout = self.timeout if timeout is None else timeout
+        summary: Dict[str, Any] = {
+            'success': False,
+            'action': action,
+            'total': len(names),
+            'succeeded': [],
+            'failed': [],
+            'timed_out': [],
+            'results': {},
+            'elapsed': 0.0
+        }
+        if not names:
+            summary['success'] = True
+            return summary
+
+        start_time = time.monotonic()
+        with self._in_flight_lock:
+            busy = [name for name in names if name in self._in_flight]
+            runnable = [name for name in names if name not in self._in_flight]
+            self._in_flight.update(runnable)
+
+        started: Dict[str, float] = {}
+        started_lock = threading.Lock()
+        queued: "queue.Queue[str]" = queue.Queue()
+        results: "queue.Queue" = queue.Queue()
+        for name in runnable:
+            queued.put(name)
+
+        def worker() -> None:
+            while True:
+                try:
+                    name = queued.get_nowait()
+                except queue.Empty:
+                    return
+                with started_lock:
+                    started[name] = time.monotonic()
+                value, error = None, None
+                try:
+                    value = operation(name)
+                except Exception as e:
+                    error = e
+                finally:
+                    with self._in_flight_lock:
+                        self._in_flight.discard(name)
+                results.put((name, value, error))
+
+        def start_worker() -> None:
+            # Daemon: uma chamada travada no spooler não segura o encerramento do processo
+            threading.Thread(target=worker, name=f"fleet-{action}", daemon=True).start()
+
+        self.logger.info(f"Ação {action} iniciada em {len(names)} impressoras")
+        for name in busy:
+            self.logger.warning(f"Ação {action} em {name} ignorada: a operação anterior ainda não terminou")
+            self._record(summary, {
+                'printer_name': name,
+                'status': 'timeout',
+                'error': "Operação anterior ainda em andamento",
+                'elapsed': 0.0,
+                'result': None
+            }, on_progress)
+
+        for _ in range(min(max_workers or self.max_workers, len(runnable))):
+            start_worker()
+        remaining = set(runnable)
+        while remaining:
+            with started_lock:
+                running = {name: started[name] for name in remaining if name in started}
+            try:
+                name, value, error = results.get(timeout=self._next_wait(running, timeout))
+                if name in remaining:
+                    remaining.discard(name)
+                    self._record(summary, self._outcome(name, value, error, started.get(name)), on_progress)
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            for name, begun in running.items():
+                if name in remaining and now - begun >= timeout:
+                    remaining.discard(name)
+                    outcome = {
+                        'printer_name': name,
+                        'status': 'timeout',
+                        'error': f"Prazo de {timeout:.1f}s excedido",
+                        'elapsed': now - begun,
+                        'result': None
+                    }
+                    self.logger.warning(f"Ação {action} em {name} excedeu o prazo de {timeout:.1f}s")
+                    self._record(summary, outcome, on_progress)
+                    # A thread dessa impressora continua presa no spooler: outra assume a fila
+                    if not queued.empty():
+                        start_worker()
+
+        summary['elapsed'] = time.monotonic() - start_time
+        summary['success'] = not summary['failed'] and not summary['timed_out']
+        self.logger.info(
+            f"Ação {action} concluída em {summary['elapsed']:.2f}s: {len(summary['succeeded'])} ok, "
+            f"{len(summary['failed'])} falhas, {len(summary['timed_out'])} timeouts"
+        )
+        return summary
+
+    def in_flight(self) -> Set[str]:
+        """Impressoras com uma operação ainda em execução (inclusive as que estouraram o prazo)"""
+        with self._in_flight_lock:
+            return set(self._in_flight)
+
+    def _next_wait(self, running: Dict[str, float], timeout: float) -> float:
+        """Tempo até o prazo mais próximo entre as impressoras em execução"""
+        now = time.monotonic()
+        remaining: List[float] = [begun + timeout - now for begun in running.values()]
+        # Operações ainda na fila podem começar a qualquer momento
+        return max(0.0, min(remaining + [0.1]))
+
+    def _outcome(self, name: str, value: Any, error: Optional[Exception], begun: Optional[float]) -> Dict[str, Any]:
+        elapsed = time.monotonic() - begun if begun is not None else 0.0
+        if error is not None:
+            self.logger.error(f"Erro na operação em {name}: {error}", exc_info=error)
+            return {'printer_name': name, 'status': 'failed', 'error': str(error), 'elapsed': elapsed, 'result': None}
+
+        success = value.get('success', False) if isinstance(value, dict) else bool(value)
+        error_message = None
+        if not success:
+            error_message = value.get('error') if isinstance(value, dict) else None
+            error_message = error_message or "Operação não concluída"
+        return {
+            'printer_name': name,
+            'status': 'success' if success else 'failed',
+            'error': error_message,
+            'elapsed': elapsed,
+            'result': value
+        }
+
+    def _record(self, summary: Dict[str, Any], outcome: Dict[str, Any],
+                on_progress: Optional[ProgressCallback]) -> None:
+        name = outcome['printer_name']
+        summary['results'][name] = outcome
+        if outcome['status'] == 'success':
+            summary['succeeded'].append(name)
+        elif outcome['status'] == 'timeout':
+            summary['timed_out'].append(name)
+        else:
+            summary['failed'].append({'printer_name': name, 'error': outcome['error']})
+
+        if on_progress:
+            try:
+                on_progress(outcome, len(summary['results']), summary['total'])
+            except Exception as e:
+                self.logger.error(f"Erro no callback de progresso: {e}", exc_info=True)
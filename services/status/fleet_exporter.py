@@ -0,0 +1,235 @@
+import enum
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional
+
+from core import AppLogger, PrinterListManager, PrinterStatus, StatusDetail
+from services.job import PrinterJobManager
+from .fleet_controller import PrinterFleetController
+from .status_checker import PrinterStatusChecker
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """Uma linha NDJSON (UTF-8, terminada em \\n)"""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=_json_default).encode('utf-8') + b'\n'
+
+
+class RotatingNdjsonWriter:
+    """
+    Arquivo NDJSON em modo append com rotação por tamanho
+
+    Segue a convenção de RotatingFileHandler: ao passar de `max_bytes` o
+    arquivo atual vira `.1` (ou `.1.gz` com `compress`), os anteriores sobem
+    um número e só `backup_count` ficam guardados. A rotação só acontece
+    entre snapshots (rollover_if_needed), nunca no meio de um, para que cada
+    arquivo traga snapshots completos com a linha de resumo. O arquivo ativo
+    é sempre texto simples, então um processo interrompido não deixa gzip
+    truncado.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, backup_count: int = 10,
+                 compress: bool = False) -> None:
+        """
+        Args:
+            path: Arquivo de saída
+            max_bytes: Tamanho a partir do qual o arquivo é rotacionado (0 = nunca)
+            backup_count: Arquivos rotacionados mantidos
+            compress: Comprime os arquivos rotacionados com gzip
+        """
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file: IO[bytes] = open(path, 'ab')
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    def rollover_if_needed(self) -> bool:
+        """Rotaciona se o arquivo já passou de `max_bytes`; retorna True se rotacionou"""
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self.rotate()
+            return True
+        return False
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _backup_name(self, index: int) -> str:
+        return f"{self.path}.{index}" + ('.gz' if self.compress else '')
+
+    def rotate(self) -> None:
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self._backup_name(index)
+                if os.path.exists(source):
+                    os.replace(source, self._backup_name(index + 1))
+            target = self._backup_name(1)
+            if self.compress:
+                with open(self.path, 'rb') as source_file, gzip.open(target, 'wb') as target_file:
+                    shutil.copyfileobj(source_file, target_file)
+                os.remove(self.path)
+            else:
+                os.replace(self.path, target)
+        else:
+            os.remove(self.path)
+        self.logger.info(f"Exportação rotacionada: {self.path}")
+        self._file = open(self.path, 'ab')
+
+
+class FleetSnapshotExporter:
+    """
+    Exporta inventário, status e jobs de todas as impressoras em NDJSON
+
+    As impressoras são consultadas em paralelo por PrinterFleetController
+    (prazo próprio por impressora) e cada registro é gravado assim que a
+    impressora termina, sem esperar as demais. Uma exportação gera uma
+    linha 'printer' por impressora e, por último, uma linha 'snapshot'
+    com o resumo.
+    """
+
+    def __init__(self,
+                 access_manager,
+                 max_workers: int = 16,
+                 timeout: float = 10.0,
+                 include_jobs: bool = True,
+                 detail: StatusDetail = StatusDetail.FULL) -> None:
+        """
+        Args:
+            access_manager: PrinterAccessManager
+            max_workers: Impressoras consultadas ao mesmo tempo
+            timeout: Prazo (s) por impressora
+            include_jobs: Inclui a lista de jobs de cada impressora
+            detail: Nível de detalhe do status
+        """
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.printer_list = PrinterListManager.instance
+        self.checker = PrinterStatusChecker(access_manager)
+        self.job_manager = PrinterJobManager()
+        self.fleet = PrinterFleetController(access_manager, max_workers=max_workers, timeout=timeout)
+        self.include_jobs = include_jobs
+        self.detail = detail
+
+    def inventory(self) -> List[Dict[str, Any]]:
+        return self.printer_list.organize_printer_data(self.printer_list.list_available_printers())  # type: ignore
+
+    def snapshot_printer(self, printer_name: str) -> Dict[str, Any]:
+        """Status e jobs de uma impressora (executado nas threads do pool)"""
+        status = self.checker.get_printer_status(printer_name, self.detail)
+        # Falhas de consulta vêm como PrinterStatus.UNKNOWN (sem handle) ou ['ERROR']
+        failed = not isinstance(status.get('status'), list) or status['status'] == [PrinterStatus.ERROR.name]
+        result: Dict[str, Any] = {'success': not failed, 'status': status}
+        if self.include_jobs:
+            result['jobs'] = self.job_manager.list_jobs(printer_name)
+        if not result['success']:
+            result['error'] = status.get('details') or "Falha ao consultar o status"
+        return result
+
+    def export(self,
+               write: Callable[[bytes], Any],
+               printers: Optional[Iterable[str]] = None,
+               flush: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+        """
+        Exporta um snapshot da frota
+
+        Args:
+            write: Recebe cada linha NDJSON (bytes) assim que fica pronta
+            printers: Impressoras a exportar (padrão: todo o inventário)
+            flush: Chamado após cada linha (ex: sys.stdout.flush)
+
+        Returns:
+            O registro 'snapshot' (resumo) gravado por último
+        """
+        started_at = datetime.now()
+        snapshot_id = started_at.strftime('%Y%m%dT%H%M%S.%f')
+        try:
+            inventory = {printer['display_name']: printer for printer in self.inventory()}
+        except Exception as e:
+            self.logger.error(f"Erro ao listar impressoras: {e}", exc_info=True)
+            inventory = {}
+        names = list(printers) if printers is not None else list(inventory)
+
+        def emit(outcome: Dict[str, Any], completed: int, total: int) -> None:
+            name = outcome['printer_name']
+            value = outcome['result'] if isinstance(outcome['result'], dict) else {}
+            record = {'record': 'printer', 'snapshot': snapshot_id, 'captured_at': datetime.now().isoformat(),
+                      'printer_name': name, 'outcome': outcome['status'],
+                      'elapsed_ms': round(outcome['elapsed'] * 1000, 1),
+                      'inventory': inventory.get(name), 'status': value.get('status')}
+            if self.include_jobs:
+                record['jobs'] = value.get('jobs')
+            if outcome['error']:
+                record['error'] = outcome['error']
+            write(encode_record(record))
+            if flush:
+                flush()
+
+        summary = self.fleet.run('export', names, self.snapshot_printer, on_progress=emit)
+        record = {'record': 'snapshot', 'snapshot': snapshot_id, 'started_at': started_at.isoformat(),
+                  'finished_at': datetime.now().isoformat(), 'printers': summary['total'],
+                  'succeeded': len(summary['succeeded']), 'failed': len(summary['failed']),
+                  'timed_out': len(summary['timed_out']), 'elapsed_ms': round(summary['elapsed'] * 1000, 1)}
+        write(encode_record(record))
+        if flush:
+            flush()
+        return record
+
+    def run_periodic(self,
+                     writer: RotatingNdjsonWriter,
+                     interval: float,
+                     count: Optional[int] = None,
+                     printers: Optional[Iterable[str]] = None,
+                     stop_event: Optional[threading.Event] = None) -> int:
+        """
+        Acrescenta um snapshot ao arquivo a cada `interval` segundos
+
+        O intervalo é contado entre inícios de exportação; uma exportação
+        mais longa que o intervalo faz a seguinte começar em seguida. Uma
+        impressora cuja consulta anterior ainda está travada no spooler entra
+        como timeout sem ser consultada de novo (ver PrinterFleetController.run).
+
+        Args:
+            writer: Arquivo rotativo de saída
+            interval: Intervalo (s) entre snapshots
+            count: Número de snapshots (None = até stop_event)
+            printers: Impressoras a exportar (padrão: todo o inventário a cada snapshot)
+            stop_event: Encerra o laço
+
+        Returns:
+            Número de snapshots gravados
+        """
+        stop_event = stop_event or threading.Event()
+        names = list(printers) if printers is not None else None
+        exported = 0
+        next_run = time.monotonic()
+        while not stop_event.is_set() and (count is None or exported < count):
+            writer.rollover_if_needed()
+            summary = self.export(writer.write, names, writer.flush)
+            exported += 1
+            self.logger.info(f"Snapshot {summary['snapshot']}: {summary['succeeded']}/{summary['printers']} "
+                             f"impressoras em {summary['elapsed_ms']:.0f} ms")
+            next_run += interval
+            if count is not None and exported >= count:
+                break
+            stop_event.wait(max(0.0, next_run - time.monotonic()))
+        return exported
@@ -10,11 +10,11 @@ class PrinterStatusController:
         self.access_manager = access_manager
 
     def modify_printer_status(self, printer_name: str, action: str) -> bool:
-        try:
-            handle = self.access_manager.open_printer(printer_name, win32print.PRINTER_ACCESS_ADMINISTER)  # type: ignore
-            if not handle:
-                return False
+        handle = self.access_manager.open_printer(printer_name, win32print.PRINTER_ACCESS_ADMINISTER)  # type: ignore
+        if not handle:
+            return False
 
+        try:
             if action == "pause":
                 win32print.SetPrinter(handle, 0, None, win32print.PRINTER_CONTROL_PAUSE)
             elif action == "resume":
@@ -29,4 +29,4 @@ class PrinterStatusController:
             self.logger.error(f"Erro ao executar {action} em {printer_name}: {e}", exc_info=True)
             return False
         finally:
-            self.access_manager.close_printer(printer_name)  # type: ignore
+            self.access_manager.close_printer(printer_name, win32print.PRINTER_ACCESS_ADMINISTER)  # type: ignore
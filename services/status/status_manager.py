@@ -1,7 +1,8 @@
-from core import AppLogger
+from core import AppLogger, StatusDetail
 from .status_checker import PrinterStatusChecker
 from .status_monitor import PrinterStatusMonitor
 from .status_controller import PrinterStatusController
+from .fleet_controller import PrinterFleetController
 
 class PrinterStatusManager:
     """API de alto nível para status da impressora"""
@@ -12,9 +13,25 @@ class PrinterStatusManager:
         self.checker = PrinterStatusChecker(access_manager)
         self.monitor = PrinterStatusMonitor(self.checker)
         self.controller = PrinterStatusController(access_manager)
-    def get_status(self, printer_name: str):
-        return self.checker.get_printer_status(printer_name)
+        self.fleet = PrinterFleetController(access_manager)
+    def get_status(self, printer_name: str, detail: StatusDetail = StatusDetail.FULL):
+        return self.checker.get_printer_status(printer_name, detail)
     def monitor_status(self, printer_name: str, interval=5, duration=60):
         return self.monitor.monitor_printer_status(printer_name, interval, duration)
+    def stream_status(self, printer_names, interval=5, stop_event=None, last_state=None, polling_policy=None):
+        return self.monitor.stream_status_changes(printer_names, interval, stop_event, last_state,
+                                                  polling_policy=polling_policy)
+    def publish_status(self, printer_names, event_bus, interval=5, stop_event=None, last_state=None,
+                       polling_policy=None):
+        return self.monitor.publish_status_changes(printer_names, event_bus, interval, stop_event, last_state,
+                                                   polling_policy)
     def change_status(self, printer_name: str, action: str):
         return self.controller.modify_printer_status(printer_name, action)
+    def change_status_many(self, printer_names, action: str, **options):
+        if action == "pause":
+            return self.fleet.pause(printer_names, **options)
+        if action == "resume":
+            return self.fleet.resume(printer_names, **options)
+        if action == "purge":
+            return self.fleet.purge(printer_names, **options)
+        raise ValueError(f"Ação {action} inválida")
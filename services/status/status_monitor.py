@@ -1,25 +1,209 @@
+import asyncio
+import threading
 import time
-from core import AppLogger
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Union
+from core import AppLogger, StatusDetail, is_sleeping_status
+from utils import AdaptivePollingPolicy, EventBus
 from .status_checker import PrinterStatusChecker
+from .status_utils import build_status_snapshot, detect_status_changes
 
 
 class PrinterStatusMonitor:
     """Monitoramento contínuo do status da impressora"""
 
-    def __init__(self, checker: PrinterStatusChecker):
+    def __init__(self, checker: PrinterStatusChecker, max_workers: int = 8):
         self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
         self.checker = checker
+        self.max_workers = max_workers
+        self._last_state: Dict[str, Dict] = {}
+        self._state_lock = threading.Lock()
 
     def monitor_printer_status(self, printer_name: str, interval: int = 5, duration: int = 60):
         self.logger.info(f"Iniciando monitoramento da impressora {printer_name}")
 
-        start_time = time.time()
-        while time.time() - start_time < duration:
-            status = self.checker.get_printer_status(printer_name)
-            self.logger.info(
-                f"[Monitoramento] {printer_name}: {status['status']} | "
-                f"Online: {status['is_online']} | Jobs: {status['job_count']}"
-            )
-            time.sleep(interval)
+        stop_event = threading.Event()
+        timer = threading.Timer(duration, stop_event.set)
+        timer.daemon = True
+        timer.start()
+        try:
+            for change in self.stream_status_changes(printer_name, interval=interval, stop_event=stop_event):
+                state = change["state"]
+                self.logger.info(
+                    f"[Monitoramento] {printer_name}: {change['type'].value} | "
+                    f"Online: {state['is_online']} | Jobs: {state['job_count']}"
+                )
+        finally:
+            timer.cancel()
 
         self.logger.info(f"Monitoramento da impressora {printer_name} concluído")
+
+    def stream_status_changes(self,
+                              printer_names: Union[str, Iterable[str]],
+                              interval: float = 5,
+                              stop_event: Optional[threading.Event] = None,
+                              last_state: Optional[Dict[str, Dict]] = None,
+                              emit_initial: bool = True,
+                              polling_policy: Optional[AdaptivePollingPolicy] = None) -> Iterator[Dict]:
+        """
+        Gera eventos de mudança de status de uma ou várias impressoras
+
+        O gerador só produz algo quando um status muda; enquanto as impressoras
+        estão estáveis o consumidor permanece bloqueado em `next()`.
+
+        Args:
+            printer_names: Impressora ou lista de impressoras
+            interval: Intervalo entre consultas em segundos
+            stop_event: Evento que encerra o gerador (cancelamento imediato)
+            last_state: Snapshots anteriores (de `get_last_state()`) para retomar
+                sem reemitir o estado inicial
+            emit_initial: Se True, emite INITIAL_STATE para impressoras sem snapshot
+            polling_policy: Política adaptativa por impressora; substitui `interval`
+
+        Yields:
+            Dicionários com 'type' (StatusEventType), 'printer_name', 'state',
+            'old_value'/'new_value' e 'timestamp'
+        """
+        names = [printer_names] if isinstance(printer_names, str) else list(printer_names)
+        stop_event = stop_event or threading.Event()
+        # Cada stream compara com os próprios snapshots: streams paralelas na
+        # mesma instância não consomem as mudanças umas das outras
+        state = dict(last_state or {})
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(names)),
+                                      thread_name_prefix="status-monitor") if len(names) > 1 else None
+        next_poll = {name: 0.0 for name in names}
+        try:
+            while not stop_event.is_set():
+                now = time.monotonic()
+                due = [name for name in names if next_poll[name] <= now]
+                changes = self.poll_changes(due, executor, emit_initial, state) if due else []
+                changed = {change["printer_name"] for change in changes}
+                for name in due:
+                    next_poll[name] = now + self._next_interval(state.get(name), name, interval,
+                                                                name in changed, polling_policy)
+
+                for change in changes:
+                    yield change
+                    if stop_event.is_set():
+                        return
+                stop_event.wait(max(0.0, min(next_poll.values()) - time.monotonic()))
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def publish_status_changes(self,
+                               printer_names: Union[str, Iterable[str]],
+                               event_bus: EventBus,
+                               interval: float = 5,
+                               stop_event: Optional[threading.Event] = None,
+                               last_state: Optional[Dict[str, Dict]] = None,
+                               polling_policy: Optional[AdaptivePollingPolicy] = None) -> threading.Thread:
+        """
+        Publica as mudanças de status no barramento de eventos em uma thread
+
+        A thread só consulta e publica; cada assinante recebe os eventos na
+        própria thread, então consumidores lentos nunca atrasam a consulta.
+
+        Args:
+            printer_names: Impressora ou lista de impressoras
+            event_bus: Barramento onde os eventos são publicados
+            interval: Intervalo entre consultas em segundos
+            stop_event: Evento que encerra a thread
+            last_state: Snapshots anteriores para retomar sem reemitir o estado inicial
+            polling_policy: Política adaptativa por impressora; substitui `interval`
+
+        Returns:
+            Thread (daemon) já iniciada
+        """
+        changes = self.stream_status_changes(printer_names, interval, stop_event, last_state,
+                                             polling_policy=polling_policy)
+
+        def run():
+            try:
+                for change in changes:
+                    event_bus.publish(change)
+            except Exception as e:
+                self.logger.error(f"Erro ao publicar mudanças de status: {e}", exc_info=True)
+
+        thread = threading.Thread(target=run, name="status-publisher", daemon=True)
+        thread.start()
+        return thread
+
+    async def astream_status_changes(self,
+                                     printer_names: Union[str, Iterable[str]],
+                                     interval: float = 5,
+                                     last_state: Optional[Dict[str, Dict]] = None,
+                                     emit_initial: bool = True) -> AsyncIterator[Dict]:
+        """
+        Versão assíncrona de stream_status_changes
+
+        As consultas ao spooler rodam em threads (asyncio.to_thread); o
+        cancelamento da task que consome o iterador encerra o monitoramento.
+        """
+        names = [printer_names] if isinstance(printer_names, str) else list(printer_names)
+        state = dict(last_state or {})
+
+        while True:
+            changes = await asyncio.to_thread(self.poll_changes, names, None, emit_initial, state)
+            for change in changes:
+                yield change
+            await asyncio.sleep(interval)
+
+    def _next_interval(self, state: Optional[Dict], printer_name: str, interval: float, changed: bool,
+                       polling_policy: Optional[AdaptivePollingPolicy]) -> float:
+        if polling_policy is None:
+            return interval
+        state = state or {}
+        return polling_policy.next_interval(printer_name,
+                                            active=bool(state.get("job_count")),
+                                            changed=changed,
+                                            sleeping=is_sleeping_status(state))
+
+    def poll_changes(self,
+                     printer_names: List[str],
+                     executor: Optional[ThreadPoolExecutor] = None,
+                     emit_initial: bool = True,
+                     state: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+        """
+        Consulta as impressoras uma vez e retorna apenas as mudanças
+
+        Args:
+            state: Snapshots anteriores de quem consulta, atualizados no lugar
+                (padrão: o estado da instância, o mesmo de get_last_state)
+        """
+        # O snapshot usa apenas status_code, is_online e job_count: nível COUNTERS basta
+        if executor:
+            statuses = list(executor.map(self._get_counters, printer_names))
+        else:
+            statuses = [self._get_counters(name) for name in printer_names]
+
+        changes = []
+        with self._state_lock:
+            if state is None:
+                state = self._last_state
+            for name, status in zip(printer_names, statuses):
+                snapshot = build_status_snapshot(status)
+                previous = state.get(name)
+                state[name] = snapshot
+                self._last_state[name] = snapshot
+                if previous is None and not emit_initial:
+                    continue
+                changes.extend(detect_status_changes(name, previous, snapshot))
+        return changes
+
+    def _get_counters(self, printer_name: str) -> Dict:
+        return self.checker.get_printer_status(printer_name, StatusDetail.COUNTERS)
+
+    def get_last_state(self) -> Dict[str, Dict]:
+        """Retorna o último snapshot visto de cada impressora (para retomar o monitoramento)"""
+        with self._state_lock:
+            return {name: dict(state) for name, state in self._last_state.items()}
+
+    def reset_state(self, printer_name: Optional[str] = None) -> None:
+        """Descarta o último snapshot de uma impressora (ou de todas)"""
+        with self._state_lock:
+            if printer_name is None:
+                self._last_state.clear()
+            else:
+                self._last_state.pop(printer_name, None)
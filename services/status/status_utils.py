@@ -0,0 +1,85 @@
+from enum import Enum
+from typing import Dict, List, Optional
+from datetime import datetime
+import win32print
+
+
+class StatusEventType(str, Enum):
+    """Tipos de evento de mudança de status da impressora"""
+    INITIAL_STATE = "INITIAL_STATE"
+    PRINTER_ONLINE = "PRINTER_ONLINE"
+    PRINTER_OFFLINE = "PRINTER_OFFLINE"
+    PAPER_CHANGED = "PAPER_CHANGED"
+    TONER_CHANGED = "TONER_CHANGED"
+    DOOR_CHANGED = "DOOR_CHANGED"
+    JOB_COUNT_CHANGED = "JOB_COUNT_CHANGED"
+    STATUS_CHANGED = "STATUS_CHANGED"
+
+
+def build_status_snapshot(status: Dict) -> Dict:
+    """
+    Reduz o resultado de PrinterStatusChecker aos campos acompanhados pelo monitor
+    """
+    status_code = status.get("status_code")
+    code = status_code or 0
+
+    if code & win32print.PRINTER_STATUS_PAPER_JAM:
+        paper = "jam"
+    elif code & win32print.PRINTER_STATUS_PAPER_OUT:
+        paper = "out"
+    elif code & win32print.PRINTER_STATUS_PAPER_PROBLEM:
+        paper = "problem"
+    else:
+        paper = "ok"
+
+    if code & win32print.PRINTER_STATUS_NO_TONER:
+        toner = "empty"
+    elif code & win32print.PRINTER_STATUS_TONER_LOW:
+        toner = "low"
+    else:
+        toner = "ok"
+
+    return {
+        "status_code": status_code,
+        "is_online": bool(status.get("is_online")),
+        "paper": paper,
+        "toner": toner,
+        "door_open": bool(code & win32print.PRINTER_STATUS_DOOR_OPEN),
+        "job_count": status.get("job_count"),
+    }
+
+
+def detect_status_changes(printer_name: str, old: Optional[Dict], new: Dict) -> List[Dict]:
+    """
+    Compara dois snapshots de status e retorna os eventos de mudança
+
+    Sem snapshot anterior, retorna um único evento INITIAL_STATE.
+    """
+    now = datetime.now().isoformat()
+
+    def event(event_type: StatusEventType, field: Optional[str] = None) -> Dict:
+        change = {"type": event_type, "printer_name": printer_name, "state": new, "timestamp": now}
+        if field is not None:
+            change["old_value"] = old[field]  # type: ignore
+            change["new_value"] = new[field]
+        return change
+
+    if old is None:
+        return [event(StatusEventType.INITIAL_STATE)]
+
+    changes = []
+    if old["is_online"] != new["is_online"]:
+        changes.append(event(StatusEventType.PRINTER_ONLINE if new["is_online"] else StatusEventType.PRINTER_OFFLINE,
+                             "is_online"))
+    if old["paper"] != new["paper"]:
+        changes.append(event(StatusEventType.PAPER_CHANGED, "paper"))
+    if old["toner"] != new["toner"]:
+        changes.append(event(StatusEventType.TONER_CHANGED, "toner"))
+    if old["door_open"] != new["door_open"]:
+        changes.append(event(StatusEventType.DOOR_CHANGED, "door_open"))
+    if old["job_count"] != new["job_count"]:
+        changes.append(event(StatusEventType.JOB_COUNT_CHANGED, "job_count"))
+    if not changes and old["status_code"] != new["status_code"]:
+        # Outras flags (pausa, aquecimento, economia de energia...)
+        changes.append(event(StatusEventType.STATUS_CHANGED, "status_code"))
+    return changes
@@ -1,2 +1,5 @@
-from .singleton import LockApp, Singleton
+from .singleton import LockApp
+from .container import ServiceContainer, ServiceRef, ServiceResolutionError, container, current_container
+from .polling import AdaptivePollingPolicy
+from .event_bus import EventBus, Subscription
 from .identify_model import _extract_model, detect_printer_model
\ No newline at end of file
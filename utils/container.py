@@ -0,0 +1,316 @@
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+Factory = Union[Callable[[], Any], str]
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceResolutionError(RuntimeError):
+    """Erro ao resolver um serviço (não registrado ou dependência circular)"""
+
+
+class _Registration:
+    def __init__(self, name: str, factory: Factory, depends_on: Tuple[str, ...]):
+        self.name = name
+        self.factory = factory
+        self.depends_on = depends_on
+
+    def build(self) -> Any:
+        factory = self.factory
+        if isinstance(factory, str):
+            # "pacote.modulo:Atributo" - importa só quando o serviço é construído
+            module_name, _, attr = factory.partition(':')
+            factory = getattr(import_module(module_name), attr)
+        return factory()
+
+
+class ServiceContainer:
+    """
+    Container de serviços com construção tardia, única e thread-safe.
+
+    Cada serviço é construído na primeira chamada a `get()`, depois das suas
+    dependências (na ordem declarada), sob um lock próprio - duas threads
+    nunca constroem o mesmo serviço. Containers filhos (`scope()`) herdam os
+    registros do pai e mantêm substituições próprias.
+    """
+
+    def __init__(self, parent: Optional['ServiceContainer'] = None) -> None:
+        self._parent = parent
+        self._registrations: Dict[str, _Registration] = {}
+        self._instances: Dict[str, Any] = {}
+        self._overrides: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.RLock] = {}
+        self._timings: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._resolving = threading.local()
+
+    def register(self, name: str, factory: Factory, depends_on: Iterable[str] = ()) -> None:
+        """
+        Registra um serviço
+
+        Args:
+            name: Nome do serviço
+            factory: Callable sem argumentos ou string "modulo:Atributo" (importada sob demanda)
+            depends_on: Serviços que devem estar construídos antes deste
+        """
+        with self._lock:
+            self._registrations[name] = _Registration(name, factory, tuple(depends_on))
+            self._instances.pop(name, None)
+
+    def is_registered(self, name: str) -> bool:
+        """Verifica se o serviço está registrado neste container ou em um pai"""
+        return self._find_registration(name) is not None
+
+    def is_built(self, name: str) -> bool:
+        """Verifica se o serviço já foi construído (ou substituído) neste container"""
+        return name in self._overrides or name in self._instances
+
+    def get(self, name: str) -> Any:
+        """
+        Retorna a instância do serviço, construindo-a (e suas dependências) se necessário
+
+        Raises:
+            ServiceResolutionError: serviço não registrado ou dependência circular
+        """
+        if name in self._overrides:
+            return self._overrides[name]
+        if name in self._instances:
+            return self._instances[name]
+
+        registration = self._find_registration(name)
+        if registration is None:
+            raise ServiceResolutionError(f"Serviço '{name}' não registrado")
+
+        if self._parent is not None and not self._depends_on_override(registration):
+            # Nada na árvore de dependências foi substituído: compartilha a instância do pai
+            return self._parent.get(name)
+
+        stack = self._resolving_stack()
+        if name in stack:
+            cycle = ' -> '.join(stack + [name])
+            raise ServiceResolutionError(f"Dependência circular: {cycle}")
+
+        stack.append(name)
+        try:
+            for dependency in registration.depends_on:
+                self.get(dependency)
+
+            with self._lock_for(name):
+                if name in self._instances:
+                    return self._instances[name]
+                start = time.perf_counter()
+                with self.activate():
+                    instance = registration.build()
+                elapsed = time.perf_counter() - start
+                self._instances[name] = instance
+                self._timings[name] = elapsed
+                logger.debug(f"Serviço '{name}' construído em {elapsed * 1000:.1f} ms")
+                return instance
+        finally:
+            stack.pop()
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, max_workers: Optional[int] = None) -> Dict[str, float]:
+        """
+        Constrói antecipadamente os serviços, em paralelo quando independentes
+
+        Os serviços são agrupados em níveis de dependência; cada nível é
+        construído em um pool de threads depois que o anterior termina.
+
+        Args:
+            names: Serviços a aquecer (padrão: todos os registrados)
+            max_workers: Tamanho máximo do pool
+
+        Returns:
+            Tempo de construção (s) de cada serviço
+        """
+        if names is None:
+            names = self._all_names()
+        levels = self.dependency_levels(names)
+
+        for level in levels:
+            pending = [name for name in level if not self.is_built(name)]
+            if len(pending) <= 1:
+                for name in pending:
+                    self.get(name)
+                continue
+            with ThreadPoolExecutor(max_workers=max_workers or len(pending),
+                                    thread_name_prefix="service-warmup") as executor:
+                for future in [executor.submit(self._get_in_context, name) for name in pending]:
+                    future.result()
+
+        return {name: self._timings.get(name, 0.0) for level in levels for name in level}
+
+    def dependency_levels(self, names: Iterable[str]) -> List[List[str]]:
+        """
+        Agrupa os serviços (e suas dependências) em níveis topológicos
+
+        Returns:
+            Lista de níveis; cada nível só depende de níveis anteriores
+        """
+        depth: Dict[str, int] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> int:
+            if name in depth:
+                return depth[name]
+            if name in path:
+                raise ServiceResolutionError(f"Dependência circular: {' -> '.join(path + (name,))}")
+            registration = self._find_registration(name)
+            if registration is None:
+                raise ServiceResolutionError(f"Serviço '{name}' não registrado")
+            level = 0
+            for dependency in registration.depends_on:
+                level = max(level, visit(dependency, path + (name,)) + 1)
+            depth[name] = level
+            return level
+
+        for name in names:
+            visit(name, ())
+
+        levels: List[List[str]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for name, level in depth.items():
+            levels[level].append(name)
+        return levels
+
+    def construction_times(self) -> Dict[str, float]:
+        """Retorna o tempo de construção (s) de cada serviço já construído"""
+        return dict(self._timings)
+
+    @contextmanager
+    def override(self, name: str, instance: Any) -> Iterator[Any]:
+        """
+        Substitui temporariamente um serviço (útil em testes)
+
+        Example:
+            with container.override('printer_access_manager', fake):
+                ...
+        """
+        with self._lock:
+            previous = self._overrides.get(name, _MISSING)
+            self._overrides[name] = instance
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                if previous is _MISSING:
+                    self._overrides.pop(name, None)
+                else:
+                    self._overrides[name] = previous
+
+    @contextmanager
+    def scope(self, **overrides: Any) -> Iterator['ServiceContainer']:
+        """
+        Cria um container filho e o ativa no contexto atual
+
+        Dentro do bloco, `ServiceRef` resolve serviços pelo container filho.
+        Serviços que dependem (direta ou indiretamente) de uma substituição
+        são construídos novamente no filho; os demais são compartilhados com o pai.
+
+        Args:
+            **overrides: Instâncias que substituem serviços dentro do escopo
+        """
+        child = ServiceContainer(parent=self)
+        child._overrides.update(overrides)
+        with child.activate():
+            yield child
+
+    @contextmanager
+    def activate(self) -> Iterator['ServiceContainer']:
+        """Torna este container o container corrente no contexto atual"""
+        token = _current_container.set(self)
+        try:
+            yield self
+        finally:
+            _current_container.reset(token)
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Descarta a instância de um serviço (ou de todos) para reconstrução tardia"""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+                self._timings.clear()
+            else:
+                self._instances.pop(name, None)
+                self._timings.pop(name, None)
+
+    def _get_in_context(self, name: str) -> Any:
+        with self.activate():
+            return self.get(name)
+
+    def _find_registration(self, name: str) -> Optional[_Registration]:
+        container: Optional[ServiceContainer] = self
+        while container is not None:
+            registration = container._registrations.get(name)
+            if registration is not None:
+                return registration
+            container = container._parent
+        return None
+
+    def _depends_on_override(self, registration: _Registration) -> bool:
+        for dependency in registration.depends_on:
+            if dependency in self._overrides:
+                return True
+            if dependency in self._instances:
+                continue
+            child_registration = self._find_registration(dependency)
+            if child_registration is not None and self._depends_on_override(child_registration):
+                return True
+        return False
+
+    def _all_names(self) -> List[str]:
+        names: List[str] = []
+        container: Optional[ServiceContainer] = self
+        while container is not None:
+            names.extend(name for name in container._registrations if name not in names)
+            container = container._parent
+        return names
+
+    def _lock_for(self, name: str) -> threading.RLock:
+        with self._lock:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = threading.RLock()
+            return lock
+
+    def _resolving_stack(self) -> List[str]:
+        stack = getattr(self._resolving, 'stack', None)
+        if stack is None:
+            stack = self._resolving.stack = []
+        return stack
+
+
+_MISSING = object()
+
+container = ServiceContainer()
+_current_container: ContextVar[ServiceContainer] = ContextVar('current_service_container', default=container)
+
+
+def current_container() -> ServiceContainer:
+    """Retorna o container ativo no contexto atual (padrão: o container global)"""
+    return _current_container.get()
+
+
+class ServiceRef:
+    """
+    Descritor que resolve um serviço do container corrente.
+
+    Substitui o antigo decorator `@Singleton`: a classe continua sendo uma
+    classe normal (isinstance e herança funcionam) e `Classe.instance`
+    constrói o serviço na primeira leitura.
+
+    Example:
+        class AppLogger:
+            instance = ServiceRef('app_logger')
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Any:
+        return current_container().get(self.name)
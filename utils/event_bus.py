@@ -0,0 +1,257 @@
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+# Eventos de job que podem ser fundidos com um evento pendente do mesmo job
+JOB_EVENT_TYPES = ("JOB_ADDED", "JOB_REMOVED", "JOB_UPDATED")
+
+
+def default_coalesce_key(event: Dict[str, Any]) -> Optional[Hashable]:
+    """
+    Chave de fusão de um evento (None = nunca fundir)
+
+    - Eventos de job: (impressora, job_id)
+    - Mudanças de campo de status (com 'old_value'): (impressora, tipo)
+    """
+    event_type = str(getattr(event.get("type"), "value", event.get("type")))
+    if event_type in JOB_EVENT_TYPES:
+        return ("job", event.get("printer_name"), event.get("job_id"))
+    if "old_value" in event:
+        return ("status", event.get("printer_name"), event_type)
+    return None
+
+
+def merge_events(pending: Dict[str, Any], event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Funde `event` no evento `pending` ainda não entregue
+
+    JOB_UPDATED sobre JOB_UPDATED fica com o estado mais recente e os
+    valores 'old_*' do primeiro; JOB_UPDATED sobre JOB_ADDED vira um
+    JOB_ADDED com o job_info atual; mudanças de status do mesmo tipo ficam
+    com o 'old_value' do primeiro evento.
+
+    Returns:
+        Evento fundido ou None se os dois precisam ser entregues separadamente
+    """
+    pending_type = str(getattr(pending["type"], "value", pending["type"]))
+    event_type = str(getattr(event["type"], "value", event["type"]))
+    if event_type == "JOB_UPDATED" and pending_type == "JOB_UPDATED":
+        merged = dict(event)
+        merged.update({key: value for key, value in pending.items() if key.startswith("old_")})
+        return merged
+    if event_type == "JOB_UPDATED" and pending_type == "JOB_ADDED":
+        return {**pending, "job_info": event.get("job_info", pending.get("job_info")),
+                "timestamp": event.get("timestamp", pending.get("timestamp"))}
+    if event_type == pending_type and "old_value" in event and "old_value" in pending:
+        return {**event, "old_value": pending["old_value"]}
+    return None
+
+
+class Subscription:
+    """
+    Assinante do EventBus com fila limitada e thread de entrega própria
+
+    `publish` nunca bloqueia: um evento para um job (ou campo de status) que
+    já tem evento pendente é fundido nele; com a fila cheia, o evento
+    pendente mais antigo é descartado. Contadores por assinante em `stats`.
+    """
+
+    def __init__(self,
+                 callback: Callable[[Dict[str, Any]], None],
+                 name: str,
+                 maxsize: int,
+                 event_types: Optional[Iterable[str]] = None,
+                 printers: Optional[Iterable[str]] = None,
+                 coalesce: bool = True,
+                 coalesce_key: Callable[[Dict[str, Any]], Optional[Hashable]] = default_coalesce_key,
+                 logger=None) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize deve ser >= 1")
+        self.callback = callback
+        self.name = name
+        self.maxsize = maxsize
+        self.event_types = frozenset(str(getattr(t, "value", t)) for t in event_types) if event_types else None
+        self.printers = frozenset(printers) if printers else None
+        self.coalesce = coalesce
+        self.coalesce_key = coalesce_key
+        self.logger = logger
+        self.stats = {'published': 0, 'delivered': 0, 'coalesced': 0, 'dropped': 0, 'errors': 0,
+                      'pending': 0, 'max_pending': 0}
+        self._pending: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._keys: Dict[Hashable, int] = {}
+        self._key_of: Dict[int, Hashable] = {}
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._dispatch_loop, name=f"event-bus-{name}", daemon=True)
+        self._thread.start()
+
+    def accepts(self, event: Dict[str, Any]) -> bool:
+        if self.printers is not None and event.get("printer_name") not in self.printers:
+            return False
+        if self.event_types is not None:
+            return str(getattr(event.get("type"), "value", event.get("type"))) in self.event_types
+        return True
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        """Enfileira sem bloquear (chamado por EventBus.publish)"""
+        key = self.coalesce_key(event) if self.coalesce else None
+        with self._cond:
+            if self._closed:
+                return
+            self.stats['published'] += 1
+            if key is not None and key in self._keys:
+                sequence = self._keys[key]
+                merged = merge_events(self._pending[sequence], event)
+                if merged is not None:
+                    self._pending[sequence] = merged
+                    self.stats['coalesced'] += 1
+                    return
+            if len(self._pending) >= self.maxsize:
+                dropped, _ = self._pending.popitem(last=False)
+                self._forget(dropped)
+                self.stats['dropped'] += 1
+            sequence = next(self._sequence)
+            self._pending[sequence] = event
+            if key is not None:
+                self._keys[key] = sequence
+                self._key_of[sequence] = key
+            self.stats['pending'] = len(self._pending)
+            self.stats['max_pending'] = max(self.stats['max_pending'], len(self._pending))
+            self._cond.notify()
+
+    def close(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Encerra a entrega
+
+        Args:
+            drain: Entrega os eventos pendentes antes de encerrar (senão descarta)
+            timeout: Tempo máximo (s) aguardando a thread de entrega
+        """
+        with self._cond:
+            self._closed = True
+            if not drain:
+                self.stats['dropped'] += len(self._pending)
+                self._pending.clear()
+                self._keys.clear()
+                self._key_of.clear()
+                self.stats['pending'] = 0
+            self._cond.notify_all()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {'name': self.name, **self.stats}
+
+    def _forget(self, sequence: int) -> None:
+        key = self._key_of.pop(sequence, None)
+        if key is not None and self._keys.get(key) == sequence:
+            del self._keys[key]
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                sequence, event = self._pending.popitem(last=False)
+                self._forget(sequence)
+                self.stats['pending'] = len(self._pending)
+            try:
+                self.callback(event)
+                delivered = True
+            except Exception as e:
+                delivered = False
+                if self.logger:
+                    self.logger.error(f"Erro no assinante {self.name} ao tratar {event.get('type')}: {e}",
+                                      exc_info=True)
+            with self._cond:
+                self.stats['delivered' if delivered else 'errors'] += 1
+
+
+class EventBus:
+    """
+    Barramento de eventos em processo (mudanças de jobs e de status)
+
+    Os publicadores (loops de monitoramento) apenas colocam o evento na fila
+    de cada assinante interessado; cada assinante tem fila limitada e thread
+    de entrega própria, então um callback lento atrasa só a si mesmo.
+    """
+
+    def __init__(self, maxsize: int = 1000) -> None:
+        """
+        Args:
+            maxsize: Tamanho padrão da fila de cada assinante
+        """
+        from core import AppLogger
+        self.logger = AppLogger.instance.get_logger(__name__)  # type: ignore
+        self.maxsize = maxsize
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self,
+                  callback: Callable[[Dict[str, Any]], None],
+                  event_types: Optional[Iterable[str]] = None,
+                  printers: Optional[Iterable[str]] = None,
+                  maxsize: Optional[int] = None,
+                  coalesce: bool = True,
+                  name: Optional[str] = None) -> Subscription:
+        """
+        Registra um assinante
+
+        Args:
+            callback: Função chamada (na thread do assinante) com cada evento
+            event_types: Tipos aceitos (ex: 'JOB_ADDED', StatusEventType.PRINTER_OFFLINE); padrão: todos
+            printers: Impressoras aceitas; padrão: todas
+            maxsize: Tamanho da fila (padrão: o do barramento)
+            coalesce: Funde eventos pendentes do mesmo job / campo de status
+            name: Nome do assinante nas estatísticas
+
+        Returns:
+            Subscription (use `unsubscribe` ou `Subscription.close` para encerrar)
+        """
+        subscription = Subscription(callback, name or f"subscriber-{next(self._ids)}", maxsize or self.maxsize,
+                                    event_types, printers, coalesce, logger=self.logger)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """Remove o assinante e encerra a thread de entrega"""
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+        subscription.close(drain, timeout)
+
+    def publish(self, event: Dict[str, Any]) -> int:
+        """
+        Entrega o evento às filas dos assinantes interessados (não bloqueia)
+
+        Returns:
+            Quantidade de assinantes que receberam o evento
+        """
+        # Cópia imutável da lista: publicar não disputa lock com subscribe/unsubscribe
+        subscriptions = self._subscriptions
+        count = 0
+        for subscription in subscriptions:
+            if subscription.accepts(event):
+                subscription.offer(event)
+                count += 1
+        return count
+
+    def publish_many(self, events: Iterable[Dict[str, Any]]) -> int:
+        return sum(self.publish(event) for event in events)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Contadores de cada assinante (published, delivered, coalesced, dropped, errors, pending)"""
+        return [subscription.get_stats() for subscription in self._subscriptions]
+
+    def close(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """Encerra todos os assinantes"""
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            subscription.close(drain, timeout)
@@ -0,0 +1,133 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Optional
+
+
+class AdaptivePollingPolicy:
+    """
+    Política de intervalo de consulta adaptativa por impressora.
+
+    - Jobs ativos ou mudanças recentes: volta ao intervalo mínimo
+    - Fila ociosa: recua exponencialmente até o intervalo máximo
+    - Impressora em economia de energia ou offline: usa `sleep_interval`
+      (consultar com frequência poderia até mantê-la acordada)
+
+    Cada intervalo recebe um jitter aleatório para que impressoras diferentes
+    não sejam consultadas em sincronia.
+    """
+
+    def __init__(self,
+                 min_interval: float = 0.5,
+                 max_interval: float = 30.0,
+                 backoff: float = 2.0,
+                 sleep_interval: Optional[float] = None,
+                 jitter: float = 0.1,
+                 rate_window: float = 60.0,
+                 rng: Optional[random.Random] = None) -> None:
+        """
+        Args:
+            min_interval: Intervalo mínimo em segundos (fila ativa)
+            max_interval: Intervalo máximo em segundos (fila ociosa)
+            backoff: Fator multiplicativo a cada consulta ociosa
+            sleep_interval: Intervalo com a impressora dormindo/offline (padrão: 2x max_interval)
+            jitter: Variação relativa aplicada a cada intervalo (0.1 = ±10%)
+            rate_window: Janela (s) usada no cálculo da taxa efetiva de consultas
+            rng: Gerador aleatório (permite resultados reproduzíveis)
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Intervalos inválidos: exige 0 < min_interval <= max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = max(1.0, backoff)
+        self.sleep_interval = sleep_interval if sleep_interval is not None else max_interval * 2
+        self.jitter = max(0.0, min(jitter, 0.5))
+        self.rate_window = rate_window
+        self._rng = rng or random.Random()
+        self._intervals: Dict[Hashable, float] = {}
+        self._polls: Dict[Hashable, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def next_interval(self,
+                      key: Hashable,
+                      active: bool = False,
+                      changed: bool = False,
+                      sleeping: bool = False) -> float:
+        """
+        Registra uma consulta e calcula o intervalo até a próxima
+
+        Args:
+            key: Identificador da impressora
+            active: Há jobs ativos na fila
+            changed: A última consulta detectou mudanças
+            sleeping: Impressora em economia de energia ou offline
+
+        Returns:
+            Intervalo em segundos (com jitter)
+        """
+        now = time.monotonic()
+        with self._lock:
+            if sleeping and not changed:
+                base = self.sleep_interval
+            elif active or changed:
+                base = self.min_interval
+            else:
+                previous = self._intervals.get(key, self.min_interval)
+                base = min(max(previous, self.min_interval) * self.backoff, self.max_interval)
+            self._intervals[key] = base
+
+            polls = self._polls.setdefault(key, deque())
+            polls.append(now)
+            while polls and now - polls[0] > self.rate_window:
+                polls.popleft()
+
+        if self.jitter:
+            base *= 1 + self._rng.uniform(-self.jitter, self.jitter)
+        return max(self.min_interval * (1 - self.jitter), base)
+
+    def reset(self, key: Optional[Hashable] = None) -> None:
+        """Volta uma impressora (ou todas) ao intervalo mínimo"""
+        with self._lock:
+            if key is None:
+                self._intervals.clear()
+                self._polls.clear()
+            else:
+                self._intervals.pop(key, None)
+                self._polls.pop(key, None)
+
+    def current_interval(self, key: Hashable) -> float:
+        """Intervalo base (sem jitter) atualmente aplicado à impressora"""
+        with self._lock:
+            return self._intervals.get(key, self.min_interval)
+
+    def poll_rate(self, key: Optional[Hashable] = None) -> float:
+        """
+        Taxa efetiva de consultas (consultas/s) na janela recente
+
+        Args:
+            key: Impressora; se None, soma de todas
+        """
+        now = time.monotonic()
+        with self._lock:
+            keys = [key] if key is not None else list(self._polls)
+            total = 0
+            for k in keys:
+                total += sum(1 for t in self._polls.get(k, ()) if now - t <= self.rate_window)
+        return total / self.rate_window
+
+    def stats(self) -> Dict[str, Any]:
+        """Resumo por impressora: intervalo atual e taxa efetiva"""
+        with self._lock:
+            keys = list(self._intervals)
+        per_key = {
+            str(key): {'interval': self.current_interval(key), 'poll_rate': self.poll_rate(key)}
+            for key in keys
+        }
+        return {
+            'min_interval': self.min_interval,
+            'max_interval': self.max_interval,
+            'sleep_interval': self.sleep_interval,
+            'poll_rate': self.poll_rate(),
+            'printers': per_key
+        }
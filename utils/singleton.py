@@ -1,39 +1,20 @@
-import win32event
-import win32api
-import winerror
-import win32gui
-import win32con
-
-
-class Singleton:
-    """
-    Implementação do Singleton como uma classe decorator.
-    Mais robusta para preservar o nome e docstring da classe original.
-    """
-    def __init__(self, cls):
-        self.cls = cls
-        self.instance = None
-    
-    def __call__(self, *args, **kwargs):
-        if self.instance is None:
-            self.instance = self.cls(*args, **kwargs)
-        return self.instance
-    
-    def __instancecheck__(self, instance):
-        return isinstance(instance, self.cls)
-    
 class LockApp:
     def __init__(self, app_name="MyApp", window_title=None):
+        import win32event
+        import win32api
         self.app_name = app_name
         self.window_title = window_title
         self.mutex = win32event.CreateMutex(None, False, app_name) # type: ignore
         self.last_error = win32api.GetLastError()
     
     def is_already_running(self):
+        import winerror
         return self.last_error == winerror.ERROR_ALREADY_EXISTS
     
     def bring_to_front(self):
         """Traz a janela existente para frente"""
+        import win32gui
+        import win32con
         if self.window_title:
             hwnd = win32gui.FindWindow(None, self.window_title)
             if hwnd:
@@ -47,4 +28,5 @@ class LockApp:
     
     def __del__(self):
         if self.mutex:
+            import win32api
             win32api.CloseHandle(self.mutex)
\ No newline at end of file
@@ -0,0 +1,691 @@
+"""
+Spooler simulado com a mesma interface (subconjunto) do módulo win32print.
+
+Permite rodar benchmarks, testes de carga e demonstrações fora do Windows ou
+sem impressoras reais. `install()` registra um módulo `win32print` em
+`sys.modules` que delega para uma instância de SimulatedSpooler; deve ser
+chamado antes de importar `core`/`services`.
+
+Além de reproduzir o comportamento das chamadas, o simulador contabiliza o
+número de chamadas e uma estimativa do payload (bytes) que o spooler real
+devolveria para cada nível de informação, o que torna mensurável o custo de
+EnumJobs nível 2 (com DEVMODE) versus nível 1.
+
+Example:
+    from utils.spooler_simulator import install
+    spooler = install(latency=0.002)
+    spooler.add_printer("EPSON L3250 #1")
+    spooler.add_jobs("EPSON L3250 #1", 500)
+    from core import PrinterAccessManager  # usa o win32print simulado
+"""
+import sys
+import threading
+import time
+import types
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# Constantes com os mesmos valores do win32print/winspool.h
+PRINTER_ENUM_DEFAULT = 0x1
+PRINTER_ENUM_LOCAL = 0x2
+PRINTER_ENUM_CONNECTIONS = 0x4
+PRINTER_ENUM_NAME = 0x8
+PRINTER_ENUM_REMOTE = 0x10
+PRINTER_ENUM_SHARED = 0x20
+PRINTER_ENUM_NETWORK = 0x40
+
+PRINTER_ACCESS_ADMINISTER = 0x4
+PRINTER_ACCESS_USE = 0x8
+PRINTER_ALL_ACCESS = 0xF000C
+
+PRINTER_CONTROL_PAUSE = 1
+PRINTER_CONTROL_RESUME = 2
+PRINTER_CONTROL_PURGE = 3
+PRINTER_CONTROL_SET_STATUS = 4
+
+PRINTER_STATUS_PAUSED = 0x1
+PRINTER_STATUS_ERROR = 0x2
+PRINTER_STATUS_PENDING_DELETION = 0x4
+PRINTER_STATUS_PAPER_JAM = 0x8
+PRINTER_STATUS_PAPER_OUT = 0x10
+PRINTER_STATUS_MANUAL_FEED = 0x20
+PRINTER_STATUS_PAPER_PROBLEM = 0x40
+PRINTER_STATUS_OFFLINE = 0x80
+PRINTER_STATUS_IO_ACTIVE = 0x100
+PRINTER_STATUS_BUSY = 0x200
+PRINTER_STATUS_PRINTING = 0x400
+PRINTER_STATUS_OUTPUT_BIN_FULL = 0x800
+PRINTER_STATUS_NOT_AVAILABLE = 0x1000
+PRINTER_STATUS_WAITING = 0x2000
+PRINTER_STATUS_PROCESSING = 0x4000
+PRINTER_STATUS_INITIALIZING = 0x8000
+PRINTER_STATUS_WARMING_UP = 0x10000
+PRINTER_STATUS_TONER_LOW = 0x20000
+PRINTER_STATUS_NO_TONER = 0x40000
+PRINTER_STATUS_PAGE_PUNT = 0x80000
+PRINTER_STATUS_USER_INTERVENTION = 0x100000
+PRINTER_STATUS_OUT_OF_MEMORY = 0x200000
+PRINTER_STATUS_DOOR_OPEN = 0x400000
+PRINTER_STATUS_SERVER_UNKNOWN = 0x800000
+PRINTER_STATUS_POWER_SAVE = 0x1000000
+
+PRINTER_ATTRIBUTE_QUEUED = 0x1
+PRINTER_ATTRIBUTE_DIRECT = 0x2
+PRINTER_ATTRIBUTE_DEFAULT = 0x4
+PRINTER_ATTRIBUTE_SHARED = 0x8
+PRINTER_ATTRIBUTE_NETWORK = 0x10
+PRINTER_ATTRIBUTE_HIDDEN = 0x20
+PRINTER_ATTRIBUTE_LOCAL = 0x40
+PRINTER_ATTRIBUTE_ENABLE_DEVQ = 0x80
+PRINTER_ATTRIBUTE_KEEPPRINTEDJOBS = 0x100
+PRINTER_ATTRIBUTE_DO_COMPLETE_FIRST = 0x200
+PRINTER_ATTRIBUTE_WORK_OFFLINE = 0x400
+PRINTER_ATTRIBUTE_ENABLE_BIDI = 0x800
+PRINTER_ATTRIBUTE_RAW_ONLY = 0x1000
+PRINTER_ATTRIBUTE_PUBLISHED = 0x2000
+
+JOB_STATUS_PAUSED = 0x1
+JOB_STATUS_ERROR = 0x2
+JOB_STATUS_DELETING = 0x4
+JOB_STATUS_SPOOLING = 0x8
+JOB_STATUS_PRINTING = 0x10
+JOB_STATUS_OFFLINE = 0x20
+JOB_STATUS_PAPEROUT = 0x40
+JOB_STATUS_PRINTED = 0x80
+JOB_STATUS_DELETED = 0x100
+JOB_STATUS_BLOCKED_DEVQ = 0x200
+JOB_STATUS_USER_INTERVENTION = 0x400
+JOB_STATUS_RESTART = 0x800
+JOB_STATUS_COMPLETE = 0x1000
+JOB_STATUS_RETAINED = 0x2000
+
+JOB_CONTROL_PAUSE = 1
+JOB_CONTROL_RESUME = 2
+JOB_CONTROL_CANCEL = 3
+JOB_CONTROL_RESTART = 4
+JOB_CONTROL_DELETE = 5
+JOB_CONTROL_SENT_TO_PRINTER = 6
+JOB_CONTROL_LAST_PAGE_EJECTED = 7
+
+JOB_POSITION_UNSPECIFIED = 0
+MIN_PRIORITY = 1
+MAX_PRIORITY = 99
+DEF_PRIORITY = 1
+
+# Tamanhos aproximados das estruturas retornadas pelo spooler (x64)
+_JOB_INFO_1_FIXED = 64
+_JOB_INFO_2_FIXED = 136
+_PRINTER_INFO_2_FIXED = 136
+_DEVMODE_SIZE = 220
+
+
+class SimulatedSpoolerError(Exception):
+    """Erro equivalente a pywintypes.error do spooler real"""
+
+    def __init__(self, winerror: int, funcname: str, strerror: str):
+        super().__init__(winerror, funcname, strerror)
+        self.winerror = winerror
+        self.funcname = funcname
+        self.strerror = strerror
+
+
+class SimulatedDevMode:
+    """DEVMODE mínimo (atributos com os mesmos nomes do PyDEVMODE do pywin32)"""
+
+    def __init__(self, device_name: str) -> None:
+        self.DeviceName = device_name[:32]
+        self.Copies = 1
+        self.Collate = 0
+        self.Duplex = 1
+        self.Fields = 0x00000100 | 0x00008000 | 0x00001000  # DM_COPIES | DM_COLLATE | DM_DUPLEX
+        self.DriverExtra = 0
+
+    def copy(self) -> "SimulatedDevMode":
+        clone = SimulatedDevMode(self.DeviceName)
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+
+class _Handle:
+    def __init__(self, printer_name: Optional[str], server: Optional[str], access: int):
+        self.printer_name = printer_name
+        self.server = server
+        self.access = access
+        self.closed = False
+        self.job_id: Optional[int] = None
+
+
+def _str_bytes(value: Optional[str]) -> int:
+    """Bytes ocupados por uma string UTF-16 terminada em zero"""
+    return 2 * (len(value) + 1) if value else 0
+
+
+class SimulatedSpooler:
+    """Spooler em memória com latência configurável e contabilização de payload"""
+
+    def __init__(self,
+                 latency: float = 0.0,
+                 driver_extra_bytes: int = 2048,
+                 seed: Optional[int] = None) -> None:
+        """
+        Args:
+            latency: Atraso (s) aplicado a cada chamada ao spooler
+            driver_extra_bytes: Bytes privados do driver anexados a cada DEVMODE
+            seed: Semente para a geração de jobs
+        """
+        self.latency = latency
+        self.driver_extra_bytes = driver_extra_bytes
+        self.printers: Dict[str, Dict[str, Any]] = {}
+        self.jobs: Dict[str, List[Dict[str, Any]]] = {}
+        self.server_latency: Dict[Optional[str], float] = {}
+        self.unreachable_servers: set = set()
+        self.hanging_printers: Dict[str, float] = {}
+        self.devmodes: Dict[str, SimulatedDevMode] = {}
+        self.user_devmodes: Dict[str, SimulatedDevMode] = {}
+        self.capabilities: Dict[str, Dict[str, Any]] = {}
+        self.calls: Dict[str, int] = {}
+        self.bytes_returned = 0
+        self._next_job_id = 1
+        self._lock = threading.RLock()
+        self._rng = random.Random(seed)
+
+    # ------------------------------------------------------------------
+    # Configuração do cenário
+    # ------------------------------------------------------------------
+    def add_printer(self,
+                    name: str,
+                    server: Optional[str] = None,
+                    status: int = 0,
+                    attributes: Optional[int] = None,
+                    driver_name: str = "EPSON L3250 Series",
+                    port_name: str = "USB001",
+                    share_name: str = "",
+                    location: str = "",
+                    comment: str = "") -> str:
+        """
+        Adiciona uma impressora; com `server`, o nome completo vira \\\\server\\name
+
+        Returns:
+            Nome completo da impressora
+        """
+        full_name = f"\\\\{server}\\{name}" if server else name
+        if attributes is None:
+            attributes = PRINTER_ATTRIBUTE_NETWORK if server else PRINTER_ATTRIBUTE_LOCAL
+        with self._lock:
+            self.printers[full_name] = {
+                "pServerName": f"\\\\{server}" if server else None,
+                "pPrinterName": full_name,
+                "pShareName": share_name,
+                "pPortName": port_name,
+                "pDriverName": driver_name,
+                "pComment": comment,
+                "pLocation": location,
+                "pSepFile": "",
+                "pPrintProcessor": "winprint",
+                "pDatatype": "RAW",
+                "pParameters": "",
+                "Attributes": attributes,
+                "Priority": 1,
+                "DefaultPriority": 0,
+                "StartTime": 0,
+                "UntilTime": 0,
+                "Status": status,
+                "AveragePPM": 0,
+                "server": server,
+            }
+            self.jobs.setdefault(full_name, [])
+            self.devmodes[full_name] = SimulatedDevMode(full_name)
+            self.capabilities[full_name] = {"max_copies": 999, "honors_copies": True, "duplex": True,
+                                            "collate": True}
+        return full_name
+
+    def set_driver_capabilities(self, printer_name: str, **capabilities) -> None:
+        """
+        Ajusta o que o driver aceita: max_copies, honors_copies (False = ignora
+        cópias no DEVMODE), duplex e collate
+        """
+        with self._lock:
+            self.capabilities[printer_name].update(capabilities)
+
+    def set_printer_status(self, printer_name: str, status: int) -> None:
+        with self._lock:
+            self.printers[printer_name]["Status"] = status
+
+    def set_server_latency(self, server: Optional[str], latency: float) -> None:
+        """Latência adicional para chamadas a impressoras de um servidor"""
+        self.server_latency[server] = latency
+
+    def set_server_unreachable(self, server: str, unreachable: bool = True) -> None:
+        """Simula um servidor de impressão inacessível (RPC indisponível)"""
+        if unreachable:
+            self.unreachable_servers.add(server)
+        else:
+            self.unreachable_servers.discard(server)
+
+    def set_printer_hang(self, printer_name: str, seconds: float) -> None:
+        """Faz toda chamada a esta impressora travar por `seconds` (fila de rede travada)"""
+        if seconds > 0:
+            self.hanging_printers[printer_name] = seconds
+        else:
+            self.hanging_printers.pop(printer_name, None)
+
+    def add_job(self,
+                printer_name: str,
+                document: str = "Documento",
+                user: str = "operador",
+                machine: str = "\\\\ESTACAO01",
+                total_pages: int = 1,
+                status: int = 0,
+                priority: int = DEF_PRIORITY,
+                submitted: Optional[datetime] = None,
+                datatype: str = "RAW") -> int:
+        """Adiciona um job à fila e retorna o JobId"""
+        with self._lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            queue = self.jobs[printer_name]
+            queue.append({
+                "JobId": job_id,
+                "pPrinterName": printer_name,
+                "pMachineName": machine,
+                "pUserName": user,
+                "pDocument": document,
+                "pNotifyName": user,
+                "pDatatype": datatype,
+                "pPrintProcessor": "winprint",
+                "pParameters": "",
+                "pDriverName": self.printers[printer_name]["pDriverName"],
+                "pStatus": None,
+                "Status": status,
+                "Priority": priority,
+                "Position": len(queue) + 1,
+                "StartTime": 0,
+                "UntilTime": 0,
+                "TotalPages": total_pages,
+                "Size": 40960 * total_pages,
+                "Submitted": submitted or datetime.now(),
+                "Time": 0,
+                "PagesPrinted": 0,
+            })
+            return job_id
+
+    def add_jobs(self, printer_name: str, count: int, max_pages: int = 10,
+                 users: Tuple[str, ...] = ("ana", "bruno", "carla", "diego")) -> List[int]:
+        """Adiciona `count` jobs com dados variados"""
+        now = datetime.now()
+        return [
+            self.add_job(printer_name,
+                         document=f"Relatorio_{i:05d}.docx",
+                         user=self._rng.choice(users),
+                         machine=f"\\\\ESTACAO{self._rng.randint(1, 40):02d}",
+                         total_pages=self._rng.randint(1, max_pages),
+                         submitted=now - timedelta(minutes=self._rng.randint(0, 48 * 60)))
+            for i in range(count)
+        ]
+
+    def tick(self, pages: int = 1) -> None:
+        """Avança a impressão: o primeiro job de cada fila não pausada imprime `pages` páginas"""
+        with self._lock:
+            for name, queue in self.jobs.items():
+                printer = self.printers[name]
+                if not queue or printer["Status"] & (PRINTER_STATUS_PAUSED | PRINTER_STATUS_OFFLINE):
+                    continue
+                job = next((j for j in queue if not j["Status"] & JOB_STATUS_PAUSED), None)
+                if job is None:
+                    continue
+                job["Status"] |= JOB_STATUS_PRINTING
+                job["PagesPrinted"] = min(job["TotalPages"], job["PagesPrinted"] + pages)
+                if job["PagesPrinted"] >= job["TotalPages"]:
+                    queue.remove(job)
+                    self._renumber(queue)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.bytes_returned = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": dict(self.calls), "total_calls": sum(self.calls.values()),
+                    "bytes_returned": self.bytes_returned}
+
+    # ------------------------------------------------------------------
+    # API compatível com win32print
+    # ------------------------------------------------------------------
+    def OpenPrinter(self, printer_name: Optional[str], defaults: Optional[Dict] = None) -> _Handle:
+        self._enter("OpenPrinter", printer_name)
+        access = (defaults or {}).get("DesiredAccess", PRINTER_ACCESS_USE)
+        if printer_name is None:
+            return _Handle(None, None, access)
+        with self._lock:
+            printer = self.printers.get(printer_name)
+        if printer is None:
+            raise SimulatedSpoolerError(1801, "OpenPrinter", "O nome da impressora é inválido.")
+        return _Handle(printer_name, printer["server"], access)
+
+    def ClosePrinter(self, handle: _Handle) -> None:
+        self._count("ClosePrinter")
+        if handle.closed:
+            raise SimulatedSpoolerError(6, "ClosePrinter", "O identificador é inválido.")
+        handle.closed = True
+
+    def GetPrinter(self, handle: _Handle, level: int = 2) -> Dict[str, Any]:
+        printer = self._printer(handle, "GetPrinter")
+        with self._lock:
+            queue = self.jobs[handle.printer_name]  # type: ignore
+            if level == 2:
+                info = {k: v for k, v in printer.items() if k != "server"}
+                info["cJobs"] = len(queue)
+                info["pDevMode"] = self.devmodes[handle.printer_name].copy()  # type: ignore
+                self._add_bytes(_PRINTER_INFO_2_FIXED + _DEVMODE_SIZE + self.driver_extra_bytes
+                                + sum(_str_bytes(v) for v in info.values() if isinstance(v, str)))
+                return info
+            if level in (8, 9):
+                devmodes = self.devmodes if level == 8 else self.user_devmodes
+                devmode = devmodes.get(handle.printer_name)  # type: ignore
+                self._add_bytes(8 + (_DEVMODE_SIZE + self.driver_extra_bytes if devmode else 0))
+                return {"pDevMode": devmode.copy() if devmode else None}
+            if level == 4:
+                info = {"pPrinterName": printer["pPrinterName"], "pServerName": printer["pServerName"],
+                        "Attributes": printer["Attributes"]}
+                self._add_bytes(24 + _str_bytes(printer["pPrinterName"]))
+                return info
+        raise SimulatedSpoolerError(124, "GetPrinter", "O nível de chamada do sistema não está correto.")
+
+    def GetPrinterDriver(self, handle: _Handle, environment: Optional[str] = None, level: int = 2) -> Dict[str, Any]:
+        printer = self._printer(handle, "GetPrinterDriver")
+        if level != 2:
+            raise SimulatedSpoolerError(124, "GetPrinterDriver", "O nível de chamada do sistema não está correto.")
+        driver = printer["pDriverName"]
+        info = {
+            "Version": 3,
+            "Name": driver,
+            "Environment": environment or "Windows x64",
+            "DriverPath": f"C:\\Windows\\System32\\spool\\DRIVERS\\x64\\3\\{driver}.dll",
+            "DataFile": f"C:\\Windows\\System32\\spool\\DRIVERS\\x64\\3\\{driver}.gpd",
+            "ConfigFile": f"C:\\Windows\\System32\\spool\\DRIVERS\\x64\\3\\{driver}UI.dll",
+        }
+        with self._lock:
+            self._add_bytes(24 + sum(_str_bytes(v) for v in info.values() if isinstance(v, str)))
+        return info
+
+    def DocumentProperties(self, hwnd: int, handle: _Handle, device_name: str, devmode_output,
+                           devmode_input, mode: int) -> int:
+        self._printer(handle, "DocumentProperties")
+        with self._lock:
+            capabilities = self.capabilities[handle.printer_name]  # type: ignore
+        if devmode_output is not None and devmode_input is not None:
+            devmode_output.__dict__.update(devmode_input.__dict__)
+            if not capabilities["honors_copies"]:
+                devmode_output.Copies = 1
+            devmode_output.Copies = min(devmode_output.Copies, capabilities["max_copies"])
+            if not capabilities["duplex"]:
+                devmode_output.Duplex = 1
+        return 1
+
+    def DeviceCapabilities(self, device: str, port: str, capability: int, devmode=None) -> int:
+        self._enter("DeviceCapabilities", device)
+        with self._lock:
+            capabilities = self.capabilities.get(device)
+        if capabilities is None:
+            raise SimulatedSpoolerError(1801, "DeviceCapabilities", "O nome da impressora é inválido.")
+        if capability == 18:  # DC_COPIES
+            return capabilities["max_copies"]
+        if capability == 7:  # DC_DUPLEX
+            return int(capabilities["duplex"])
+        if capability == 22:  # DC_COLLATE
+            return int(capabilities["collate"])
+        return 0
+
+    def SetPrinter(self, handle: _Handle, level: int, info: Optional[Dict], command: int) -> None:
+        printer = self._printer(handle, "SetPrinter")
+        if not handle.access & PRINTER_ACCESS_ADMINISTER and command in (PRINTER_CONTROL_PAUSE,
+                                                                            PRINTER_CONTROL_RESUME):
+            raise SimulatedSpoolerError(5, "SetPrinter", "Acesso negado.")
+        if level == 8 and not handle.access & PRINTER_ACCESS_ADMINISTER:
+            raise SimulatedSpoolerError(5, "SetPrinter", "Acesso negado.")
+        with self._lock:
+            if level in (8, 9) and isinstance(info, dict):
+                devmodes = self.devmodes if level == 8 else self.user_devmodes
+                if info.get("pDevMode") is None:
+                    devmodes.pop(handle.printer_name, None)  # type: ignore
+                else:
+                    devmodes[handle.printer_name] = info["pDevMode"].copy()  # type: ignore
+            elif command == PRINTER_CONTROL_PAUSE:
+                printer["Status"] |= PRINTER_STATUS_PAUSED
+            elif command == PRINTER_CONTROL_RESUME:
+                printer["Status"] &= ~PRINTER_STATUS_PAUSED
+            elif command == PRINTER_CONTROL_PURGE:
+                self.jobs[handle.printer_name].clear()  # type: ignore
+            elif command == PRINTER_CONTROL_SET_STATUS and info is not None:
+                printer["Status"] = info
+
+    def EnumJobs(self, handle: _Handle, first_job: int, no_jobs: int, level: int = 1) -> Tuple[Dict, ...]:
+        self._printer(handle, "EnumJobs")
+        with self._lock:
+            queue = self.jobs[handle.printer_name]  # type: ignore
+            end = len(queue) if no_jobs < 0 else first_job + no_jobs
+            return tuple(self._job_info(job, level) for job in queue[first_job:end])
+
+    def GetJob(self, handle: _Handle, job_id: int, level: int = 1) -> Dict:
+        self._printer(handle, "GetJob")
+        with self._lock:
+            job = self._find_job(handle.printer_name, job_id, "GetJob")  # type: ignore
+            return self._job_info(job, level)
+
+    def SetJob(self, handle: _Handle, job_id: int, level: int, info: Optional[Dict], command: int) -> None:
+        self._printer(handle, "SetJob")
+        with self._lock:
+            queue = self.jobs[handle.printer_name]  # type: ignore
+            job = self._find_job(handle.printer_name, job_id, "SetJob")  # type: ignore
+            if level == 1 and info is not None:
+                job["Priority"] = info.get("Priority", job["Priority"])
+            if command in (JOB_CONTROL_CANCEL, JOB_CONTROL_DELETE):
+                queue.remove(job)
+                self._renumber(queue)
+            elif command == JOB_CONTROL_PAUSE:
+                job["Status"] |= JOB_STATUS_PAUSED
+            elif command == JOB_CONTROL_RESUME:
+                job["Status"] &= ~JOB_STATUS_PAUSED
+            elif command == JOB_CONTROL_RESTART:
+                job["PagesPrinted"] = 0
+                job["Status"] |= JOB_STATUS_RESTART
+
+    def EnumPrinters(self, flags: int, name: Optional[str] = None, level: int = 1) -> Tuple:
+        server = name.lstrip("\\") if name else None
+        self._enter("EnumPrinters", None, server)
+        with self._lock:
+            printers = [p for p in self.printers.values()
+                        if (server is None and (flags & PRINTER_ENUM_LOCAL and p["server"] is None
+                                                or flags & PRINTER_ENUM_CONNECTIONS and p["server"] is not None))
+                        or (server is not None and p["server"] and p["server"].lower() == server.lower())]
+            if level == 1:
+                result = tuple((0x800000, f"{p['pPrinterName']},{p['pDriverName']},{p['pLocation']}",
+                                p["pPrinterName"], p["pComment"]) for p in printers)
+                self._add_bytes(sum(16 + _str_bytes(r[1]) + _str_bytes(r[2]) + _str_bytes(r[3]) for r in result))
+                return result
+            if level == 2:
+                result = tuple({k: v for k, v in p.items() if k != "server"} for p in printers)
+                self._add_bytes(len(result) * (_PRINTER_INFO_2_FIXED + _DEVMODE_SIZE + self.driver_extra_bytes))
+                return result
+            if level == 4:
+                result = tuple({"pPrinterName": p["pPrinterName"], "pServerName": p["pServerName"],
+                                "Attributes": p["Attributes"]} for p in printers)
+                self._add_bytes(sum(24 + _str_bytes(p["pPrinterName"]) for p in printers))
+                return result
+        raise SimulatedSpoolerError(124, "EnumPrinters", "O nível de chamada do sistema não está correto.")
+
+    def GetDefaultPrinter(self) -> str:
+        self._count("GetDefaultPrinter")
+        with self._lock:
+            for name, printer in self.printers.items():
+                if printer["Attributes"] & PRINTER_ATTRIBUTE_DEFAULT:
+                    return name
+            return next(iter(self.printers), "")
+
+    def StartDocPrinter(self, handle: _Handle, level: int, doc_info: Tuple) -> int:
+        self._printer(handle, "StartDocPrinter")
+        document, _, datatype = (list(doc_info) + [None, None, "RAW"])[:3]
+        job_id = self.add_job(handle.printer_name, document=document or "Documento",  # type: ignore
+                              datatype=datatype or "RAW", status=JOB_STATUS_SPOOLING)
+        handle.job_id = job_id
+        return job_id
+
+    def StartPagePrinter(self, handle: _Handle) -> None:
+        self._printer(handle, "StartPagePrinter")
+
+    def WritePrinter(self, handle: _Handle, data: bytes) -> int:
+        self._printer(handle, "WritePrinter")
+        with self._lock:
+            job = self._find_job(handle.printer_name, handle.job_id, "WritePrinter")  # type: ignore
+            job["Size"] = job.get("Size", 0) + len(data)
+        return len(data)
+
+    def EndPagePrinter(self, handle: _Handle) -> None:
+        self._printer(handle, "EndPagePrinter")
+
+    def EndDocPrinter(self, handle: _Handle) -> None:
+        self._printer(handle, "EndDocPrinter")
+        with self._lock:
+            job = self._find_job(handle.printer_name, handle.job_id, "EndDocPrinter")  # type: ignore
+            job["Status"] &= ~JOB_STATUS_SPOOLING
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _count(self, funcname: str) -> None:
+        with self._lock:
+            self.calls[funcname] = self.calls.get(funcname, 0) + 1
+
+    def _add_bytes(self, amount: int) -> None:
+        with self._lock:
+            self.bytes_returned += amount
+
+    def _enter(self, funcname: str, printer_name: Optional[str], server: Optional[str] = None) -> None:
+        self._count(funcname)
+        if printer_name is not None:
+            with self._lock:
+                printer = self.printers.get(printer_name)
+            server = printer["server"] if printer else server
+        if server is not None and server in self.unreachable_servers:
+            time.sleep(self.server_latency.get(server, 0.0))
+            raise SimulatedSpoolerError(1722, funcname, "O servidor RPC não está disponível.")
+        delay = self.latency + self.server_latency.get(server, 0.0)
+        if printer_name is not None:
+            delay += self.hanging_printers.get(printer_name, 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _printer(self, handle: _Handle, funcname: str) -> Dict[str, Any]:
+        if handle.closed:
+            raise SimulatedSpoolerError(6, funcname, "O identificador é inválido.")
+        self._enter(funcname, handle.printer_name)
+        with self._lock:
+            printer = self.printers.get(handle.printer_name)  # type: ignore
+        if printer is None:
+            raise SimulatedSpoolerError(1801, funcname, "O nome da impressora é inválido.")
+        return printer
+
+    def _find_job(self, printer_name: str, job_id: int, funcname: str) -> Dict[str, Any]:
+        for job in self.jobs[printer_name]:
+            if job["JobId"] == job_id:
+                return job
+        raise SimulatedSpoolerError(87, funcname, "O parâmetro está incorreto.")
+
+    def _renumber(self, queue: List[Dict[str, Any]]) -> None:
+        for position, job in enumerate(queue, 1):
+            job["Position"] = position
+
+    def _job_info(self, job: Dict[str, Any], level: int) -> Dict[str, Any]:
+        strings1 = ("pPrinterName", "pMachineName", "pUserName", "pDocument", "pDatatype", "pStatus")
+        info = {
+            "JobId": job["JobId"],
+            "pPrinterName": job["pPrinterName"],
+            "pMachineName": job["pMachineName"],
+            "pUserName": job["pUserName"],
+            "pDocument": job["pDocument"],
+            "pDatatype": job["pDatatype"],
+            "pStatus": job["pStatus"],
+            "Status": job["Status"],
+            "Priority": job["Priority"],
+            "Position": job["Position"],
+            "TotalPages": job["TotalPages"],
+            "PagesPrinted": job["PagesPrinted"],
+            "Submitted": job["Submitted"],
+        }
+        size = _JOB_INFO_1_FIXED + sum(_str_bytes(job[k]) for k in strings1)
+        if level == 2:
+            info.update({
+                "pNotifyName": job["pNotifyName"],
+                "pPrintProcessor": job["pPrintProcessor"],
+                "pParameters": job["pParameters"],
+                "pDriverName": job["pDriverName"],
+                "pDevMode": None,
+                "pSecurityDescriptor": None,
+                "StartTime": job["StartTime"],
+                "UntilTime": job["UntilTime"],
+                "Size": job["Size"],
+                "Time": job["Time"],
+            })
+            size = (_JOB_INFO_2_FIXED + _DEVMODE_SIZE + self.driver_extra_bytes
+                    + sum(_str_bytes(job[k]) for k in strings1 + ("pNotifyName", "pPrintProcessor",
+                                                                  "pParameters", "pDriverName")))
+        elif level != 1:
+            raise SimulatedSpoolerError(124, "EnumJobs", "O nível de chamada do sistema não está correto.")
+        self._add_bytes(size)
+        return info
+
+
+_installed: Optional[SimulatedSpooler] = None
+_previous_module: Optional[types.ModuleType] = None
+
+
+def install(spooler: Optional[SimulatedSpooler] = None, **options) -> SimulatedSpooler:
+    """
+    Registra o spooler simulado como módulo `win32print`
+
+    Args:
+        spooler: Instância a usar (padrão: nova instância com `options`)
+        **options: Argumentos de SimulatedSpooler
+
+    Returns:
+        A instância instalada
+    """
+    global _installed, _previous_module
+    spooler = spooler or SimulatedSpooler(**options)
+    module = types.ModuleType("win32print", "win32print simulado (utils.spooler_simulator)")
+    for name, value in globals().items():
+        if name.isupper():
+            setattr(module, name, value)
+    for name in ("OpenPrinter", "ClosePrinter", "GetPrinter", "GetPrinterDriver", "SetPrinter", "EnumJobs",
+                 "GetJob", "SetJob", "DocumentProperties", "DeviceCapabilities", "EnumPrinters",
+                 "GetDefaultPrinter", "StartDocPrinter", "StartPagePrinter", "WritePrinter", "EndPagePrinter",
+                 "EndDocPrinter"):
+        setattr(module, name, getattr(spooler, name))
+    module.error = SimulatedSpoolerError  # type: ignore
+    module.spooler = spooler  # type: ignore
+
+    if _installed is None:
+        _previous_module = sys.modules.get("win32print")
+    sys.modules["win32print"] = module
+    _installed = spooler
+    return spooler
+
+
+def uninstall() -> None:
+    """Restaura o módulo win32print anterior"""
+    global _installed, _previous_module
+    if _installed is None:
+        return
+    if _previous_module is not None:
+        sys.modules["win32print"] = _previous_module
+    else:
+        sys.modules.pop("win32print", None)
+    _installed = None
+    _previous_module = None
+
+
+def installed() -> Optional[SimulatedSpooler]:
+    """Retorna o spooler instalado (ou None)"""
+    return _installed